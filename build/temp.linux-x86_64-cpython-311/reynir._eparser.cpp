@@ -0,0 +1,1931 @@
+#define _CFFI_
+
+/* We try to define Py_LIMITED_API before including Python.h.
+
+   Mess: we can only define it if Py_DEBUG, Py_TRACE_REFS and
+   Py_REF_DEBUG are not defined.  This is a best-effort approximation:
+   we can learn about Py_DEBUG from pyconfig.h, but it is unclear if
+   the same works for the other two macros.  Py_DEBUG implies them,
+   but not the other way around.
+
+   The implementation is messy (issue #350): on Windows, with _MSC_VER,
+   we have to define Py_LIMITED_API even before including pyconfig.h.
+   In that case, we guess what pyconfig.h will do to the macros above,
+   and check our guess after the #include.
+
+   Note that on Windows, with CPython 3.x, you need >= 3.5 and virtualenv
+   version >= 16.0.0.  With older versions of either, you don't get a
+   copy of PYTHON3.DLL in the virtualenv.  We can't check the version of
+   CPython *before* we even include pyconfig.h.  ffi.set_source() puts
+   a ``#define _CFFI_NO_LIMITED_API'' at the start of this file if it is
+   running on Windows < 3.5, as an attempt at fixing it, but that's
+   arguably wrong because it may not be the target version of Python.
+   Still better than nothing I guess.  As another workaround, you can
+   remove the definition of Py_LIMITED_API here.
+
+   See also 'py_limited_api' in cffi/setuptools_ext.py.
+*/
+#if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
+#  ifdef _MSC_VER
+#    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+
+#    include <pyconfig.h>
+     /* sanity-check: Py_LIMITED_API will cause crashes if any of these
+        are also defined.  Normally, the Python file PC/pyconfig.h does not
+        cause any of these to be defined, with the exception that _DEBUG
+        causes Py_DEBUG.  Double-check that. */
+#    ifdef Py_LIMITED_API
+#      if defined(Py_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_TRACE_REFS)
+#        error "pyconfig.h unexpectedly defines Py_TRACE_REFS, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_REF_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_REF_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#    endif
+#  else
+#    include <pyconfig.h>
+#    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+#  endif
+#endif
+
+#include <Python.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+/* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
+   beginning of C sources generated by CFFI's ffi.set_source(). */
+
+typedef void *_cffi_opcode_t;
+
+#define _CFFI_OP(opcode, arg)   (_cffi_opcode_t)(opcode | (((uintptr_t)(arg)) << 8))
+#define _CFFI_GETOP(cffi_opcode)    ((unsigned char)(uintptr_t)cffi_opcode)
+#define _CFFI_GETARG(cffi_opcode)   (((intptr_t)cffi_opcode) >> 8)
+
+#define _CFFI_OP_PRIMITIVE       1
+#define _CFFI_OP_POINTER         3
+#define _CFFI_OP_ARRAY           5
+#define _CFFI_OP_OPEN_ARRAY      7
+#define _CFFI_OP_STRUCT_UNION    9
+#define _CFFI_OP_ENUM           11
+#define _CFFI_OP_FUNCTION       13
+#define _CFFI_OP_FUNCTION_END   15
+#define _CFFI_OP_NOOP           17
+#define _CFFI_OP_BITFIELD       19
+#define _CFFI_OP_TYPENAME       21
+#define _CFFI_OP_CPYTHON_BLTN_V 23   // varargs
+#define _CFFI_OP_CPYTHON_BLTN_N 25   // noargs
+#define _CFFI_OP_CPYTHON_BLTN_O 27   // O  (i.e. a single arg)
+#define _CFFI_OP_CONSTANT       29
+#define _CFFI_OP_CONSTANT_INT   31
+#define _CFFI_OP_GLOBAL_VAR     33
+#define _CFFI_OP_DLOPEN_FUNC    35
+#define _CFFI_OP_DLOPEN_CONST   37
+#define _CFFI_OP_GLOBAL_VAR_F   39
+#define _CFFI_OP_EXTERN_PYTHON  41
+
+#define _CFFI_PRIM_VOID          0
+#define _CFFI_PRIM_BOOL          1
+#define _CFFI_PRIM_CHAR          2
+#define _CFFI_PRIM_SCHAR         3
+#define _CFFI_PRIM_UCHAR         4
+#define _CFFI_PRIM_SHORT         5
+#define _CFFI_PRIM_USHORT        6
+#define _CFFI_PRIM_INT           7
+#define _CFFI_PRIM_UINT          8
+#define _CFFI_PRIM_LONG          9
+#define _CFFI_PRIM_ULONG        10
+#define _CFFI_PRIM_LONGLONG     11
+#define _CFFI_PRIM_ULONGLONG    12
+#define _CFFI_PRIM_FLOAT        13
+#define _CFFI_PRIM_DOUBLE       14
+#define _CFFI_PRIM_LONGDOUBLE   15
+
+#define _CFFI_PRIM_WCHAR        16
+#define _CFFI_PRIM_INT8         17
+#define _CFFI_PRIM_UINT8        18
+#define _CFFI_PRIM_INT16        19
+#define _CFFI_PRIM_UINT16       20
+#define _CFFI_PRIM_INT32        21
+#define _CFFI_PRIM_UINT32       22
+#define _CFFI_PRIM_INT64        23
+#define _CFFI_PRIM_UINT64       24
+#define _CFFI_PRIM_INTPTR       25
+#define _CFFI_PRIM_UINTPTR      26
+#define _CFFI_PRIM_PTRDIFF      27
+#define _CFFI_PRIM_SIZE         28
+#define _CFFI_PRIM_SSIZE        29
+#define _CFFI_PRIM_INT_LEAST8   30
+#define _CFFI_PRIM_UINT_LEAST8  31
+#define _CFFI_PRIM_INT_LEAST16  32
+#define _CFFI_PRIM_UINT_LEAST16 33
+#define _CFFI_PRIM_INT_LEAST32  34
+#define _CFFI_PRIM_UINT_LEAST32 35
+#define _CFFI_PRIM_INT_LEAST64  36
+#define _CFFI_PRIM_UINT_LEAST64 37
+#define _CFFI_PRIM_INT_FAST8    38
+#define _CFFI_PRIM_UINT_FAST8   39
+#define _CFFI_PRIM_INT_FAST16   40
+#define _CFFI_PRIM_UINT_FAST16  41
+#define _CFFI_PRIM_INT_FAST32   42
+#define _CFFI_PRIM_UINT_FAST32  43
+#define _CFFI_PRIM_INT_FAST64   44
+#define _CFFI_PRIM_UINT_FAST64  45
+#define _CFFI_PRIM_INTMAX       46
+#define _CFFI_PRIM_UINTMAX      47
+#define _CFFI_PRIM_FLOATCOMPLEX 48
+#define _CFFI_PRIM_DOUBLECOMPLEX 49
+#define _CFFI_PRIM_CHAR16       50
+#define _CFFI_PRIM_CHAR32       51
+
+#define _CFFI__NUM_PRIM         52
+#define _CFFI__UNKNOWN_PRIM           (-1)
+#define _CFFI__UNKNOWN_FLOAT_PRIM     (-2)
+#define _CFFI__UNKNOWN_LONG_DOUBLE    (-3)
+
+#define _CFFI__IO_FILE_STRUCT         (-1)
+
+
+struct _cffi_global_s {
+    const char *name;
+    void *address;
+    _cffi_opcode_t type_op;
+    void *size_or_direct_fn;  // OP_GLOBAL_VAR: size, or 0 if unknown
+                              // OP_CPYTHON_BLTN_*: addr of direct function
+};
+
+struct _cffi_getconst_s {
+    unsigned long long value;
+    const struct _cffi_type_context_s *ctx;
+    int gindex;
+};
+
+struct _cffi_struct_union_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_STRUCT_UNION
+    int flags;               // _CFFI_F_* flags below
+    size_t size;
+    int alignment;
+    int first_field_index;   // -> _cffi_fields array
+    int num_fields;
+};
+#define _CFFI_F_UNION         0x01   // is a union, not a struct
+#define _CFFI_F_CHECK_FIELDS  0x02   // complain if fields are not in the
+                                     // "standard layout" or if some are missing
+#define _CFFI_F_PACKED        0x04   // for CHECK_FIELDS, assume a packed struct
+#define _CFFI_F_EXTERNAL      0x08   // in some other ffi.include()
+#define _CFFI_F_OPAQUE        0x10   // opaque
+
+struct _cffi_field_s {
+    const char *name;
+    size_t field_offset;
+    size_t field_size;
+    _cffi_opcode_t field_type_op;
+};
+
+struct _cffi_enum_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_ENUM
+    int type_prim;           // _CFFI_PRIM_xxx
+    const char *enumerators; // comma-delimited string
+};
+
+struct _cffi_typename_s {
+    const char *name;
+    int type_index;   /* if opaque, points to a possibly artificial
+                         OP_STRUCT which is itself opaque */
+};
+
+struct _cffi_type_context_s {
+    _cffi_opcode_t *types;
+    const struct _cffi_global_s *globals;
+    const struct _cffi_field_s *fields;
+    const struct _cffi_struct_union_s *struct_unions;
+    const struct _cffi_enum_s *enums;
+    const struct _cffi_typename_s *typenames;
+    int num_globals;
+    int num_struct_unions;
+    int num_enums;
+    int num_typenames;
+    const char *const *includes;
+    int num_types;
+    int flags;      /* future extension */
+};
+
+struct _cffi_parse_info_s {
+    const struct _cffi_type_context_s *ctx;
+    _cffi_opcode_t *output;
+    unsigned int output_size;
+    size_t error_location;
+    const char *error_message;
+};
+
+struct _cffi_externpy_s {
+    const char *name;
+    size_t size_of_result;
+    void *reserved1, *reserved2;
+};
+
+#ifdef _CFFI_INTERNAL
+static int parse_c_type(struct _cffi_parse_info_s *info, const char *input);
+static int search_in_globals(const struct _cffi_type_context_s *ctx,
+                             const char *search, size_t search_len);
+static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
+                                   const char *search, size_t search_len);
+#endif
+
+/* this block of #ifs should be kept exactly identical between
+   c/_cffi_backend.c, cffi/vengine_cpy.py, cffi/vengine_gen.py
+   and cffi/_cffi_include.h */
+#if defined(_MSC_VER)
+# include <malloc.h>   /* for alloca() */
+# if _MSC_VER < 1600   /* MSVC < 2010 */
+   typedef __int8 int8_t;
+   typedef __int16 int16_t;
+   typedef __int32 int32_t;
+   typedef __int64 int64_t;
+   typedef unsigned __int8 uint8_t;
+   typedef unsigned __int16 uint16_t;
+   typedef unsigned __int32 uint32_t;
+   typedef unsigned __int64 uint64_t;
+   typedef __int8 int_least8_t;
+   typedef __int16 int_least16_t;
+   typedef __int32 int_least32_t;
+   typedef __int64 int_least64_t;
+   typedef unsigned __int8 uint_least8_t;
+   typedef unsigned __int16 uint_least16_t;
+   typedef unsigned __int32 uint_least32_t;
+   typedef unsigned __int64 uint_least64_t;
+   typedef __int8 int_fast8_t;
+   typedef __int16 int_fast16_t;
+   typedef __int32 int_fast32_t;
+   typedef __int64 int_fast64_t;
+   typedef unsigned __int8 uint_fast8_t;
+   typedef unsigned __int16 uint_fast16_t;
+   typedef unsigned __int32 uint_fast32_t;
+   typedef unsigned __int64 uint_fast64_t;
+   typedef __int64 intmax_t;
+   typedef unsigned __int64 uintmax_t;
+# else
+#  include <stdint.h>
+# endif
+# if _MSC_VER < 1800   /* MSVC < 2013 */
+#  ifndef __cplusplus
+    typedef unsigned char _Bool;
+#  endif
+# endif
+# define _cffi_float_complex_t   _Fcomplex    /* include <complex.h> for it */
+# define _cffi_double_complex_t  _Dcomplex    /* include <complex.h> for it */
+#else
+# include <stdint.h>
+# if (defined (__SVR4) && defined (__sun)) || defined(_AIX) || defined(__hpux)
+#  include <alloca.h>
+# endif
+# define _cffi_float_complex_t   float _Complex
+# define _cffi_double_complex_t  double _Complex
+#endif
+
+#ifdef __GNUC__
+# define _CFFI_UNUSED_FN  __attribute__((unused))
+#else
+# define _CFFI_UNUSED_FN  /* nothing */
+#endif
+
+#ifdef __cplusplus
+# ifndef _Bool
+   typedef bool _Bool;   /* semi-hackish: C++ has no _Bool; bool is builtin */
+# endif
+#endif
+
+/**********  CPython-specific section  **********/
+#ifndef PYPY_VERSION
+
+
+#define _cffi_from_c_double PyFloat_FromDouble
+#define _cffi_from_c_float PyFloat_FromDouble
+#define _cffi_from_c_long PyLong_FromLong
+#define _cffi_from_c_ulong PyLong_FromUnsignedLong
+#define _cffi_from_c_longlong PyLong_FromLongLong
+#define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
+#define _cffi_from_c__Bool PyBool_FromLong
+
+#define _cffi_to_c_double PyFloat_AsDouble
+#define _cffi_to_c_float PyFloat_AsDouble
+
+#define _cffi_from_c_int(x, type)                                        \
+    (((type)-1) > 0 ? /* unsigned */                                     \
+        (sizeof(type) < sizeof(long) ?                                   \
+            PyLong_FromLong((long)x) :                                   \
+         sizeof(type) == sizeof(long) ?                                  \
+            PyLong_FromUnsignedLong((unsigned long)x) :                  \
+            PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
+        (sizeof(type) <= sizeof(long) ?                                  \
+            PyLong_FromLong((long)x) :                                   \
+            PyLong_FromLongLong((long long)x)))
+
+#define _cffi_to_c_int(o, type)                                          \
+    ((type)(                                                             \
+     sizeof(type) == 1 ? (((type)-1) > 0 ? (type)_cffi_to_c_u8(o)        \
+                                         : (type)_cffi_to_c_i8(o)) :     \
+     sizeof(type) == 2 ? (((type)-1) > 0 ? (type)_cffi_to_c_u16(o)       \
+                                         : (type)_cffi_to_c_i16(o)) :    \
+     sizeof(type) == 4 ? (((type)-1) > 0 ? (type)_cffi_to_c_u32(o)       \
+                                         : (type)_cffi_to_c_i32(o)) :    \
+     sizeof(type) == 8 ? (((type)-1) > 0 ? (type)_cffi_to_c_u64(o)       \
+                                         : (type)_cffi_to_c_i64(o)) :    \
+     (Py_FatalError("unsupported size for type " #type), (type)0)))
+
+#define _cffi_to_c_i8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[1])
+#define _cffi_to_c_u8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[2])
+#define _cffi_to_c_i16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[3])
+#define _cffi_to_c_u16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[4])
+#define _cffi_to_c_i32                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[5])
+#define _cffi_to_c_u32                                                   \
+                 ((unsigned int(*)(PyObject *))_cffi_exports[6])
+#define _cffi_to_c_i64                                                   \
+                 ((long long(*)(PyObject *))_cffi_exports[7])
+#define _cffi_to_c_u64                                                   \
+                 ((unsigned long long(*)(PyObject *))_cffi_exports[8])
+#define _cffi_to_c_char                                                  \
+                 ((int(*)(PyObject *))_cffi_exports[9])
+#define _cffi_from_c_pointer                                             \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[10])
+#define _cffi_to_c_pointer                                               \
+    ((char *(*)(PyObject *, struct _cffi_ctypedescr *))_cffi_exports[11])
+#define _cffi_get_struct_layout                                          \
+    not used any more
+#define _cffi_restore_errno                                              \
+    ((void(*)(void))_cffi_exports[13])
+#define _cffi_save_errno                                                 \
+    ((void(*)(void))_cffi_exports[14])
+#define _cffi_from_c_char                                                \
+    ((PyObject *(*)(char))_cffi_exports[15])
+#define _cffi_from_c_deref                                               \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[16])
+#define _cffi_to_c                                                       \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[17])
+#define _cffi_from_c_struct                                              \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[18])
+#define _cffi_to_c_wchar_t                                               \
+    ((_cffi_wchar_t(*)(PyObject *))_cffi_exports[19])
+#define _cffi_from_c_wchar_t                                             \
+    ((PyObject *(*)(_cffi_wchar_t))_cffi_exports[20])
+#define _cffi_to_c_long_double                                           \
+    ((long double(*)(PyObject *))_cffi_exports[21])
+#define _cffi_to_c__Bool                                                 \
+    ((_Bool(*)(PyObject *))_cffi_exports[22])
+#define _cffi_prepare_pointer_call_argument                              \
+    ((Py_ssize_t(*)(struct _cffi_ctypedescr *,                           \
+                    PyObject *, char **))_cffi_exports[23])
+#define _cffi_convert_array_from_object                                  \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[24])
+#define _CFFI_CPIDX  25
+#define _cffi_call_python                                                \
+    ((void(*)(struct _cffi_externpy_s *, char *))_cffi_exports[_CFFI_CPIDX])
+#define _cffi_to_c_wchar3216_t                                           \
+    ((int(*)(PyObject *))_cffi_exports[26])
+#define _cffi_from_c_wchar3216_t                                         \
+    ((PyObject *(*)(int))_cffi_exports[27])
+#define _CFFI_NUM_EXPORTS 28
+
+struct _cffi_ctypedescr;
+
+static void *_cffi_exports[_CFFI_NUM_EXPORTS];
+
+#define _cffi_type(index)   (                           \
+    assert((((uintptr_t)_cffi_types[index]) & 1) == 0), \
+    (struct _cffi_ctypedescr *)_cffi_types[index])
+
+static PyObject *_cffi_init(const char *module_name, Py_ssize_t version,
+                            const struct _cffi_type_context_s *ctx)
+{
+    PyObject *module, *o_arg, *new_module;
+    void *raw[] = {
+        (void *)module_name,
+        (void *)version,
+        (void *)_cffi_exports,
+        (void *)ctx,
+    };
+
+    module = PyImport_ImportModule("_cffi_backend");
+    if (module == NULL)
+        goto failure;
+
+    o_arg = PyLong_FromVoidPtr((void *)raw);
+    if (o_arg == NULL)
+        goto failure;
+
+    new_module = PyObject_CallMethod(
+        module, (char *)"_init_cffi_1_0_external_module", (char *)"O", o_arg);
+
+    Py_DECREF(o_arg);
+    Py_DECREF(module);
+    return new_module;
+
+  failure:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+#ifdef HAVE_WCHAR_H
+typedef wchar_t _cffi_wchar_t;
+#else
+typedef uint16_t _cffi_wchar_t;   /* same random pick as _cffi_backend.c */
+#endif
+
+_CFFI_UNUSED_FN static uint16_t _cffi_to_c_char16_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return (uint16_t)_cffi_to_c_wchar_t(o);
+    else
+        return (uint16_t)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char16_t(uint16_t x)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+_CFFI_UNUSED_FN static int _cffi_to_c_char32_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return (int)_cffi_to_c_wchar_t(o);
+    else
+        return (int)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char32_t(unsigned int x)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+union _cffi_union_alignment_u {
+    unsigned char m_char;
+    unsigned short m_short;
+    unsigned int m_int;
+    unsigned long m_long;
+    unsigned long long m_longlong;
+    float m_float;
+    double m_double;
+    long double m_longdouble;
+};
+
+struct _cffi_freeme_s {
+    struct _cffi_freeme_s *next;
+    union _cffi_union_alignment_u alignment;
+};
+
+_CFFI_UNUSED_FN static int
+_cffi_convert_array_argument(struct _cffi_ctypedescr *ctptr, PyObject *arg,
+                             char **output_data, Py_ssize_t datasize,
+                             struct _cffi_freeme_s **freeme)
+{
+    char *p;
+    if (datasize < 0)
+        return -1;
+
+    p = *output_data;
+    if (p == NULL) {
+        struct _cffi_freeme_s *fp = (struct _cffi_freeme_s *)PyObject_Malloc(
+            offsetof(struct _cffi_freeme_s, alignment) + (size_t)datasize);
+        if (fp == NULL)
+            return -1;
+        fp->next = *freeme;
+        *freeme = fp;
+        p = *output_data = (char *)&fp->alignment;
+    }
+    memset((void *)p, 0, (size_t)datasize);
+    return _cffi_convert_array_from_object(p, ctptr, arg);
+}
+
+_CFFI_UNUSED_FN static void
+_cffi_free_array_arguments(struct _cffi_freeme_s *freeme)
+{
+    do {
+        void *p = (void *)freeme;
+        freeme = freeme->next;
+        PyObject_Free(p);
+    } while (freeme != NULL);
+}
+
+/**********  end CPython-specific section  **********/
+#else
+_CFFI_UNUSED_FN
+static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
+# define _cffi_call_python  _cffi_call_python_org
+#endif
+
+
+#define _cffi_array_len(array)   (sizeof(array) / sizeof((array)[0]))
+
+#define _cffi_prim_int(size, sign)                                      \
+    ((size) == 1 ? ((sign) ? _CFFI_PRIM_INT8  : _CFFI_PRIM_UINT8)  :    \
+     (size) == 2 ? ((sign) ? _CFFI_PRIM_INT16 : _CFFI_PRIM_UINT16) :    \
+     (size) == 4 ? ((sign) ? _CFFI_PRIM_INT32 : _CFFI_PRIM_UINT32) :    \
+     (size) == 8 ? ((sign) ? _CFFI_PRIM_INT64 : _CFFI_PRIM_UINT64) :    \
+     _CFFI__UNKNOWN_PRIM)
+
+#define _cffi_prim_float(size)                                          \
+    ((size) == sizeof(float) ? _CFFI_PRIM_FLOAT :                       \
+     (size) == sizeof(double) ? _CFFI_PRIM_DOUBLE :                     \
+     (size) == sizeof(long double) ? _CFFI__UNKNOWN_LONG_DOUBLE :       \
+     _CFFI__UNKNOWN_FLOAT_PRIM)
+
+#define _cffi_check_int(got, got_nonpos, expected)      \
+    ((got_nonpos) == (expected <= 0) &&                 \
+     (got) == (unsigned long long)expected)
+
+#ifdef MS_WIN32
+# define _cffi_stdcall  __stdcall
+#else
+# define _cffi_stdcall  /* nothing */
+#endif
+
+#ifdef __cplusplus
+}
+#endif
+
+/************************************************************/
+
+extern "C" {
+
+
+    typedef unsigned int UINT;
+    typedef unsigned long long UINT64;
+    typedef int INT;
+    typedef int BOOL; // Different from C++
+    typedef char CHAR;
+    typedef unsigned char BYTE;
+
+    struct Grammar {
+        UINT nNonterminals;   // Number of nonterminals
+        UINT nTerminals;      // Number of terminals (indexed from 1)
+        INT iRoot;            // Index of root nonterminal (negative)
+    };
+
+    struct Parser {
+        struct Grammar* pGrammar;
+    };
+
+    struct Production {
+        UINT nId;
+        UINT nPriority;
+        UINT n;
+        INT* pList;
+    };
+
+    struct Label {
+        INT iNt;
+        UINT nDot;
+        struct Production* pProd;
+        UINT nI;
+        UINT nJ;
+    };
+
+    struct FamilyEntry {
+        struct Production* pProd;
+        struct Node* p1;
+        struct Node* p2;
+        struct FamilyEntry* pNext;
+    };
+
+    struct Node {
+        struct Label label;
+        struct FamilyEntry* pHead;
+        UINT nRefCount;
+    };
+
+    struct FlatForest {
+        UINT64 nCombinations; // Number of parse trees (saturating)
+        UINT nNodes;          // Number of nodes (6 integers each)
+        INT* pNodes;
+        UINT nFamilies;       // Number of families (3 integers each)
+        INT* pFamilies;
+        UINT nChildren;       // Number of child indices
+        INT* pChildren;
+        INT* pScores;         // Node scores, once reduced, or NULL
+    };
+
+    struct ParseBudget {
+        UINT nMaxStates;      // Maximum number of Earley states, or 0
+        UINT nMaxNodes;       // Maximum number of SPPF nodes, or 0
+        UINT nMaxMillis;      // Maximum wall-clock time in milliseconds, or 0
+        UINT nExceeded;       // Out: PARSE_BUDGET_* flags of exceeded limits
+        UINT nStates;         // Out: number of Earley states created
+        UINT nNodes;          // Out: number of SPPF nodes created
+        UINT nMillis;         // Out: elapsed wall-clock time in milliseconds
+        UINT nFamilies;       // Out: number of SPPF family entries created
+        UINT64 nPeakBytes;    // Out: estimated peak bytes held by the parser
+    };
+
+    struct AllocationCounts {
+        UINT nNodes;
+        UINT nStates;
+        UINT nDiscardedStates;
+        UINT nStateChunks;
+        UINT nColumns;
+        UINT nHNodes;
+        UINT nNodeDictLookups;
+        UINT nMatchingCalls;
+    };
+
+    struct ReducerInfo {
+        UINT nNonterminals;
+        const UINT* pnNtFlags;        // REDUCE_NT_* flags, by -iNt - 1
+        const INT* pnNtScores;        // Score adjustments, by -iNt - 1
+        UINT nTerminals;
+        const UINT* pnTerminalFlags;  // REDUCE_TERMINAL_* flags, by terminal index
+        UINT nProductions;
+        const UINT* pnPriorities;     // Production priorities, by production id
+        INT nVerbPrepBonus;
+        INT nLengthBonusFactor;
+    };
+
+    typedef BOOL (*MatchingFunc)(UINT nHandle, UINT nToken, UINT nTerminal);
+    typedef BYTE* (*AllocFunc)(UINT nHandle, UINT nToken, UINT nSize);
+    typedef INT (*PrepBonusFunc)(UINT nHandle, UINT nPrepNode, UINT nVerbNode);
+
+    struct Node* earleyParse(struct Parser*, UINT nTokens, INT iRoot, UINT nHandle, UINT* pnErrorToken);
+    struct Node* earleyParseWithMatrix(struct Parser*, UINT nTokens, INT iRoot, const BYTE* pbMatrix, struct ParseBudget* pBudget, UINT* pnErrorToken);
+    UINT matrixStride(struct Parser*);
+    struct Grammar* newGrammar(const CHAR* pszGrammarFile);
+    void deleteGrammar(struct Grammar*);
+    struct Parser* newParser(struct Grammar*, MatchingFunc fpMatcher, AllocFunc fpAlloc);
+    void deleteParser(struct Parser*);
+    void deleteForest(struct Node*);
+    void dumpForest(struct Node*, struct Grammar*);
+    struct FlatForest* flattenForest(struct Node*);
+    void deleteFlatForest(struct FlatForest*);
+    UINT64 numCombinations(struct Node*);
+    INT reduceForest(struct FlatForest*, const struct ReducerInfo*, const INT* pnTokenScores, UINT nHandle, PrepBonusFunc fpPrepBonus);
+
+    void printAllocationReport(void);
+    void getAllocationCounts(struct AllocationCounts*);
+
+
+}
+
+
+/************************************************************/
+
+static void *_cffi_types[] = {
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 21), // int()(struct FlatForest *, struct ReducerInfo const *, int const *, unsigned int, int(*)(unsigned int, unsigned int, unsigned int))
+/*  1 */ _CFFI_OP(_CFFI_OP_POINTER, 75), // struct FlatForest *
+/*  2 */ _CFFI_OP(_CFFI_OP_POINTER, 83), // struct ReducerInfo const *
+/*  3 */ _CFFI_OP(_CFFI_OP_POINTER, 21), // int const *
+/*  4 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8), // unsigned int
+/*  5 */ _CFFI_OP(_CFFI_OP_POINTER, 7), // int(*)(unsigned int, unsigned int, unsigned int)
+/*  6 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  7 */ _CFFI_OP(_CFFI_OP_FUNCTION, 21), // int()(unsigned int, unsigned int, unsigned int)
+/*  8 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/*  9 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 10 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 11 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 12 */ _CFFI_OP(_CFFI_OP_FUNCTION, 1), // struct FlatForest *()(struct Node *)
+/* 13 */ _CFFI_OP(_CFFI_OP_POINTER, 78), // struct Node *
+/* 14 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 15 */ _CFFI_OP(_CFFI_OP_FUNCTION, 34), // struct Grammar *()(char const *)
+/* 16 */ _CFFI_OP(_CFFI_OP_POINTER, 70), // char const *
+/* 17 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 18 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // struct Node *()(struct Parser *, unsigned int, int, unsigned char const *, struct ParseBudget *, unsigned int *)
+/* 19 */ _CFFI_OP(_CFFI_OP_POINTER, 80), // struct Parser *
+/* 20 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 21 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/* 22 */ _CFFI_OP(_CFFI_OP_POINTER, 85), // unsigned char const *
+/* 23 */ _CFFI_OP(_CFFI_OP_POINTER, 79), // struct ParseBudget *
+/* 24 */ _CFFI_OP(_CFFI_OP_POINTER, 4), // unsigned int *
+/* 25 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 26 */ _CFFI_OP(_CFFI_OP_FUNCTION, 13), // struct Node *()(struct Parser *, unsigned int, int, unsigned int, unsigned int *)
+/* 27 */ _CFFI_OP(_CFFI_OP_NOOP, 19),
+/* 28 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 29 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7),
+/* 30 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 31 */ _CFFI_OP(_CFFI_OP_NOOP, 24),
+/* 32 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 33 */ _CFFI_OP(_CFFI_OP_FUNCTION, 19), // struct Parser *()(struct Grammar *, int(*)(unsigned int, unsigned int, unsigned int), unsigned char *(*)(unsigned int, unsigned int, unsigned int))
+/* 34 */ _CFFI_OP(_CFFI_OP_POINTER, 76), // struct Grammar *
+/* 35 */ _CFFI_OP(_CFFI_OP_NOOP, 5),
+/* 36 */ _CFFI_OP(_CFFI_OP_POINTER, 38), // unsigned char *(*)(unsigned int, unsigned int, unsigned int)
+/* 37 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 38 */ _CFFI_OP(_CFFI_OP_FUNCTION, 84), // unsigned char *()(unsigned int, unsigned int, unsigned int)
+/* 39 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 40 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 41 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 42 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 43 */ _CFFI_OP(_CFFI_OP_FUNCTION, 4), // unsigned int()(struct Parser *)
+/* 44 */ _CFFI_OP(_CFFI_OP_NOOP, 19),
+/* 45 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 46 */ _CFFI_OP(_CFFI_OP_FUNCTION, 87), // unsigned long long()(struct Node *)
+/* 47 */ _CFFI_OP(_CFFI_OP_NOOP, 13),
+/* 48 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 49 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(struct AllocationCounts *)
+/* 50 */ _CFFI_OP(_CFFI_OP_POINTER, 72), // struct AllocationCounts *
+/* 51 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 52 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(struct FlatForest *)
+/* 53 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/* 54 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 55 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(struct Grammar *)
+/* 56 */ _CFFI_OP(_CFFI_OP_NOOP, 34),
+/* 57 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 58 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(struct Node *)
+/* 59 */ _CFFI_OP(_CFFI_OP_NOOP, 13),
+/* 60 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 61 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(struct Node *, struct Grammar *)
+/* 62 */ _CFFI_OP(_CFFI_OP_NOOP, 13),
+/* 63 */ _CFFI_OP(_CFFI_OP_NOOP, 34),
+/* 64 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 65 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(struct Parser *)
+/* 66 */ _CFFI_OP(_CFFI_OP_NOOP, 19),
+/* 67 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 68 */ _CFFI_OP(_CFFI_OP_FUNCTION, 88), // void()(void)
+/* 69 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 70 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 71 */ _CFFI_OP(_CFFI_OP_POINTER, 21), // int *
+/* 72 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // struct AllocationCounts
+/* 73 */ _CFFI_OP(_CFFI_OP_POINTER, 74), // struct FamilyEntry *
+/* 74 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // struct FamilyEntry
+/* 75 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // struct FlatForest
+/* 76 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 3), // struct Grammar
+/* 77 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 4), // struct Label
+/* 78 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 5), // struct Node
+/* 79 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 6), // struct ParseBudget
+/* 80 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 7), // struct Parser
+/* 81 */ _CFFI_OP(_CFFI_OP_POINTER, 82), // struct Production *
+/* 82 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 8), // struct Production
+/* 83 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 9), // struct ReducerInfo
+/* 84 */ _CFFI_OP(_CFFI_OP_POINTER, 85), // unsigned char *
+/* 85 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 4), // unsigned char
+/* 86 */ _CFFI_OP(_CFFI_OP_POINTER, 4), // unsigned int const *
+/* 87 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 12), // unsigned long long
+/* 88 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
+};
+
+static struct _cffi_externpy_s _cffi_externpy__alloc_func =
+  { "reynir._eparser.alloc_func", (int)sizeof(unsigned char *), 0, 0 };
+
+static unsigned char * alloc_func(unsigned int a0, unsigned int a1, unsigned int a2)
+{
+  char a[24];
+  char *p = a;
+  *(unsigned int *)(p + 0) = a0;
+  *(unsigned int *)(p + 8) = a1;
+  *(unsigned int *)(p + 16) = a2;
+  _cffi_call_python(&_cffi_externpy__alloc_func, p);
+  return *(unsigned char * *)p;
+}
+
+static struct _cffi_externpy_s _cffi_externpy__matching_func =
+  { "reynir._eparser.matching_func", (int)sizeof(int), 0, 0 };
+
+static int matching_func(unsigned int a0, unsigned int a1, unsigned int a2)
+{
+  char a[24];
+  char *p = a;
+  *(unsigned int *)(p + 0) = a0;
+  *(unsigned int *)(p + 8) = a1;
+  *(unsigned int *)(p + 16) = a2;
+  _cffi_call_python(&_cffi_externpy__matching_func, p);
+  return *(int *)p;
+}
+
+static struct _cffi_externpy_s _cffi_externpy__prep_bonus_func =
+  { "reynir._eparser.prep_bonus_func", (int)sizeof(int), 0, 0 };
+
+static int prep_bonus_func(unsigned int a0, unsigned int a1, unsigned int a2)
+{
+  char a[24];
+  char *p = a;
+  *(unsigned int *)(p + 0) = a0;
+  *(unsigned int *)(p + 8) = a1;
+  *(unsigned int *)(p + 16) = a2;
+  _cffi_call_python(&_cffi_externpy__prep_bonus_func, p);
+  return *(int *)p;
+}
+
+static void _cffi_d_deleteFlatForest(struct FlatForest * x0)
+{
+  deleteFlatForest(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_deleteFlatForest(PyObject *self, PyObject *arg0)
+{
+  struct FlatForest * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct FlatForest *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { deleteFlatForest(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_deleteFlatForest _cffi_d_deleteFlatForest
+#endif
+
+static void _cffi_d_deleteForest(struct Node * x0)
+{
+  deleteForest(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_deleteForest(PyObject *self, PyObject *arg0)
+{
+  struct Node * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(13), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Node *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(13), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { deleteForest(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_deleteForest _cffi_d_deleteForest
+#endif
+
+static void _cffi_d_deleteGrammar(struct Grammar * x0)
+{
+  deleteGrammar(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_deleteGrammar(PyObject *self, PyObject *arg0)
+{
+  struct Grammar * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(34), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Grammar *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(34), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { deleteGrammar(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_deleteGrammar _cffi_d_deleteGrammar
+#endif
+
+static void _cffi_d_deleteParser(struct Parser * x0)
+{
+  deleteParser(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_deleteParser(PyObject *self, PyObject *arg0)
+{
+  struct Parser * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(19), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Parser *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(19), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { deleteParser(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_deleteParser _cffi_d_deleteParser
+#endif
+
+static void _cffi_d_dumpForest(struct Node * x0, struct Grammar * x1)
+{
+  dumpForest(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_dumpForest(PyObject *self, PyObject *args)
+{
+  struct Node * x0;
+  struct Grammar * x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "dumpForest", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(13), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Node *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(13), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(34), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (struct Grammar *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(34), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { dumpForest(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_dumpForest _cffi_d_dumpForest
+#endif
+
+static struct Node * _cffi_d_earleyParse(struct Parser * x0, unsigned int x1, int x2, unsigned int x3, unsigned int * x4)
+{
+  return earleyParse(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_earleyParse(PyObject *self, PyObject *args)
+{
+  struct Parser * x0;
+  unsigned int x1;
+  int x2;
+  unsigned int x3;
+  unsigned int * x4;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  struct Node * result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "earleyParse", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(19), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Parser *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(19), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, unsigned int);
+  if (x1 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, int);
+  if (x2 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, unsigned int);
+  if (x3 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(24), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (unsigned int *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(24), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = earleyParse(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(13));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_earleyParse _cffi_d_earleyParse
+#endif
+
+static struct Node * _cffi_d_earleyParseWithMatrix(struct Parser * x0, unsigned int x1, int x2, unsigned char const * x3, struct ParseBudget * x4, unsigned int * x5)
+{
+  return earleyParseWithMatrix(x0, x1, x2, x3, x4, x5);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_earleyParseWithMatrix(PyObject *self, PyObject *args)
+{
+  struct Parser * x0;
+  unsigned int x1;
+  int x2;
+  unsigned char const * x3;
+  struct ParseBudget * x4;
+  unsigned int * x5;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  struct Node * result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+  PyObject *arg5;
+
+  if (!PyArg_UnpackTuple(args, "earleyParseWithMatrix", 6, 6, &arg0, &arg1, &arg2, &arg3, &arg4, &arg5))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(19), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Parser *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(19), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, unsigned int);
+  if (x1 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, int);
+  if (x2 == (int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(22), arg3, (char **)&x3);
+  if (datasize != 0) {
+    x3 = ((size_t)datasize) <= 640 ? (unsigned char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(22), arg3, (char **)&x3,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(23), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (struct ParseBudget *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(23), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(24), arg5, (char **)&x5);
+  if (datasize != 0) {
+    x5 = ((size_t)datasize) <= 640 ? (unsigned int *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(24), arg5, (char **)&x5,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = earleyParseWithMatrix(x0, x1, x2, x3, x4, x5); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(13));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_earleyParseWithMatrix _cffi_d_earleyParseWithMatrix
+#endif
+
+static struct FlatForest * _cffi_d_flattenForest(struct Node * x0)
+{
+  return flattenForest(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_flattenForest(PyObject *self, PyObject *arg0)
+{
+  struct Node * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  struct FlatForest * result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(13), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Node *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(13), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = flattenForest(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(1));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_flattenForest _cffi_d_flattenForest
+#endif
+
+static void _cffi_d_getAllocationCounts(struct AllocationCounts * x0)
+{
+  getAllocationCounts(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_getAllocationCounts(PyObject *self, PyObject *arg0)
+{
+  struct AllocationCounts * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(50), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct AllocationCounts *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(50), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { getAllocationCounts(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_getAllocationCounts _cffi_d_getAllocationCounts
+#endif
+
+static unsigned int _cffi_d_matrixStride(struct Parser * x0)
+{
+  return matrixStride(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_matrixStride(PyObject *self, PyObject *arg0)
+{
+  struct Parser * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  unsigned int result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(19), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Parser *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(19), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = matrixStride(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, unsigned int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_matrixStride _cffi_d_matrixStride
+#endif
+
+static struct Grammar * _cffi_d_newGrammar(char const * x0)
+{
+  return newGrammar(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_newGrammar(PyObject *self, PyObject *arg0)
+{
+  char const * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  struct Grammar * result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(16), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(16), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = newGrammar(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(34));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_newGrammar _cffi_d_newGrammar
+#endif
+
+static struct Parser * _cffi_d_newParser(struct Grammar * x0, int(* x1)(unsigned int, unsigned int, unsigned int), unsigned char *(* x2)(unsigned int, unsigned int, unsigned int))
+{
+  return newParser(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_newParser(PyObject *self, PyObject *args)
+{
+  struct Grammar * x0;
+  int(* x1)(unsigned int, unsigned int, unsigned int);
+  unsigned char *(* x2)(unsigned int, unsigned int, unsigned int);
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  struct Parser * result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "newParser", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(34), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Grammar *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(34), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = (int(*)(unsigned int, unsigned int, unsigned int))_cffi_to_c_pointer(arg1, _cffi_type(5));
+  if (x1 == (int(*)(unsigned int, unsigned int, unsigned int))NULL && PyErr_Occurred())
+    return NULL;
+
+  x2 = (unsigned char *(*)(unsigned int, unsigned int, unsigned int))_cffi_to_c_pointer(arg2, _cffi_type(36));
+  if (x2 == (unsigned char *(*)(unsigned int, unsigned int, unsigned int))NULL && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = newParser(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(19));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_newParser _cffi_d_newParser
+#endif
+
+static unsigned long long _cffi_d_numCombinations(struct Node * x0)
+{
+  return numCombinations(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_numCombinations(PyObject *self, PyObject *arg0)
+{
+  struct Node * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  unsigned long long result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(13), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct Node *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(13), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = numCombinations(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, unsigned long long);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_numCombinations _cffi_d_numCombinations
+#endif
+
+static void _cffi_d_printAllocationReport(void)
+{
+  printAllocationReport();
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_printAllocationReport(PyObject *self, PyObject *noarg)
+{
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { printAllocationReport(); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  (void)noarg; /* unused */
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_printAllocationReport _cffi_d_printAllocationReport
+#endif
+
+static int _cffi_d_reduceForest(struct FlatForest * x0, struct ReducerInfo const * x1, int const * x2, unsigned int x3, int(* x4)(unsigned int, unsigned int, unsigned int))
+{
+  return reduceForest(x0, x1, x2, x3, x4);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_reduceForest(PyObject *self, PyObject *args)
+{
+  struct FlatForest * x0;
+  struct ReducerInfo const * x1;
+  int const * x2;
+  unsigned int x3;
+  int(* x4)(unsigned int, unsigned int, unsigned int);
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+
+  if (!PyArg_UnpackTuple(args, "reduceForest", 5, 5, &arg0, &arg1, &arg2, &arg3, &arg4))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct FlatForest *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(2), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (struct ReducerInfo const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(2), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(3), arg2, (char **)&x2);
+  if (datasize != 0) {
+    x2 = ((size_t)datasize) <= 640 ? (int const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(3), arg2, (char **)&x2,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x3 = _cffi_to_c_int(arg3, unsigned int);
+  if (x3 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x4 = (int(*)(unsigned int, unsigned int, unsigned int))_cffi_to_c_pointer(arg4, _cffi_type(5));
+  if (x4 == (int(*)(unsigned int, unsigned int, unsigned int))NULL && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = reduceForest(x0, x1, x2, x3, x4); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_reduceForest _cffi_d_reduceForest
+#endif
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_AllocationCounts(struct AllocationCounts *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->nNodes) | 0);  /* check that 'struct AllocationCounts.nNodes' is an integer */
+  (void)((p->nStates) | 0);  /* check that 'struct AllocationCounts.nStates' is an integer */
+  (void)((p->nDiscardedStates) | 0);  /* check that 'struct AllocationCounts.nDiscardedStates' is an integer */
+  (void)((p->nStateChunks) | 0);  /* check that 'struct AllocationCounts.nStateChunks' is an integer */
+  (void)((p->nColumns) | 0);  /* check that 'struct AllocationCounts.nColumns' is an integer */
+  (void)((p->nHNodes) | 0);  /* check that 'struct AllocationCounts.nHNodes' is an integer */
+  (void)((p->nNodeDictLookups) | 0);  /* check that 'struct AllocationCounts.nNodeDictLookups' is an integer */
+  (void)((p->nMatchingCalls) | 0);  /* check that 'struct AllocationCounts.nMatchingCalls' is an integer */
+}
+struct _cffi_align_struct_AllocationCounts { char x; struct AllocationCounts y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_FamilyEntry(struct FamilyEntry *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { struct Production * *tmp = &p->pProd; (void)tmp; }
+  { struct Node * *tmp = &p->p1; (void)tmp; }
+  { struct Node * *tmp = &p->p2; (void)tmp; }
+  { struct FamilyEntry * *tmp = &p->pNext; (void)tmp; }
+}
+struct _cffi_align_struct_FamilyEntry { char x; struct FamilyEntry y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_FlatForest(struct FlatForest *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->nCombinations) | 0);  /* check that 'struct FlatForest.nCombinations' is an integer */
+  (void)((p->nNodes) | 0);  /* check that 'struct FlatForest.nNodes' is an integer */
+  { int * *tmp = &p->pNodes; (void)tmp; }
+  (void)((p->nFamilies) | 0);  /* check that 'struct FlatForest.nFamilies' is an integer */
+  { int * *tmp = &p->pFamilies; (void)tmp; }
+  (void)((p->nChildren) | 0);  /* check that 'struct FlatForest.nChildren' is an integer */
+  { int * *tmp = &p->pChildren; (void)tmp; }
+  { int * *tmp = &p->pScores; (void)tmp; }
+}
+struct _cffi_align_struct_FlatForest { char x; struct FlatForest y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_Grammar(struct Grammar *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->nNonterminals) | 0);  /* check that 'struct Grammar.nNonterminals' is an integer */
+  (void)((p->nTerminals) | 0);  /* check that 'struct Grammar.nTerminals' is an integer */
+  (void)((p->iRoot) | 0);  /* check that 'struct Grammar.iRoot' is an integer */
+}
+struct _cffi_align_struct_Grammar { char x; struct Grammar y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_Label(struct Label *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->iNt) | 0);  /* check that 'struct Label.iNt' is an integer */
+  (void)((p->nDot) | 0);  /* check that 'struct Label.nDot' is an integer */
+  { struct Production * *tmp = &p->pProd; (void)tmp; }
+  (void)((p->nI) | 0);  /* check that 'struct Label.nI' is an integer */
+  (void)((p->nJ) | 0);  /* check that 'struct Label.nJ' is an integer */
+}
+struct _cffi_align_struct_Label { char x; struct Label y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_Node(struct Node *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { struct Label *tmp = &p->label; (void)tmp; }
+  { struct FamilyEntry * *tmp = &p->pHead; (void)tmp; }
+  (void)((p->nRefCount) | 0);  /* check that 'struct Node.nRefCount' is an integer */
+}
+struct _cffi_align_struct_Node { char x; struct Node y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_ParseBudget(struct ParseBudget *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->nMaxStates) | 0);  /* check that 'struct ParseBudget.nMaxStates' is an integer */
+  (void)((p->nMaxNodes) | 0);  /* check that 'struct ParseBudget.nMaxNodes' is an integer */
+  (void)((p->nMaxMillis) | 0);  /* check that 'struct ParseBudget.nMaxMillis' is an integer */
+  (void)((p->nExceeded) | 0);  /* check that 'struct ParseBudget.nExceeded' is an integer */
+  (void)((p->nStates) | 0);  /* check that 'struct ParseBudget.nStates' is an integer */
+  (void)((p->nNodes) | 0);  /* check that 'struct ParseBudget.nNodes' is an integer */
+  (void)((p->nMillis) | 0);  /* check that 'struct ParseBudget.nMillis' is an integer */
+  (void)((p->nFamilies) | 0);  /* check that 'struct ParseBudget.nFamilies' is an integer */
+  (void)((p->nPeakBytes) | 0);  /* check that 'struct ParseBudget.nPeakBytes' is an integer */
+}
+struct _cffi_align_struct_ParseBudget { char x; struct ParseBudget y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_Parser(struct Parser *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  { struct Grammar * *tmp = &p->pGrammar; (void)tmp; }
+}
+struct _cffi_align_struct_Parser { char x; struct Parser y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_Production(struct Production *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->nId) | 0);  /* check that 'struct Production.nId' is an integer */
+  (void)((p->nPriority) | 0);  /* check that 'struct Production.nPriority' is an integer */
+  (void)((p->n) | 0);  /* check that 'struct Production.n' is an integer */
+  { int * *tmp = &p->pList; (void)tmp; }
+}
+struct _cffi_align_struct_Production { char x; struct Production y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_ReducerInfo(struct ReducerInfo *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->nNonterminals) | 0);  /* check that 'struct ReducerInfo.nNonterminals' is an integer */
+  { unsigned int const * *tmp = &p->pnNtFlags; (void)tmp; }
+  { int const * *tmp = &p->pnNtScores; (void)tmp; }
+  (void)((p->nTerminals) | 0);  /* check that 'struct ReducerInfo.nTerminals' is an integer */
+  { unsigned int const * *tmp = &p->pnTerminalFlags; (void)tmp; }
+  (void)((p->nProductions) | 0);  /* check that 'struct ReducerInfo.nProductions' is an integer */
+  { unsigned int const * *tmp = &p->pnPriorities; (void)tmp; }
+  (void)((p->nVerbPrepBonus) | 0);  /* check that 'struct ReducerInfo.nVerbPrepBonus' is an integer */
+  (void)((p->nLengthBonusFactor) | 0);  /* check that 'struct ReducerInfo.nLengthBonusFactor' is an integer */
+}
+struct _cffi_align_struct_ReducerInfo { char x; struct ReducerInfo y; };
+
+static const struct _cffi_global_s _cffi_globals[] = {
+  { "alloc_func", (void *)&_cffi_externpy__alloc_func, _CFFI_OP(_CFFI_OP_EXTERN_PYTHON, 36), (void *)alloc_func },
+  { "deleteFlatForest", (void *)_cffi_f_deleteFlatForest, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 52), (void *)_cffi_d_deleteFlatForest },
+  { "deleteForest", (void *)_cffi_f_deleteForest, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 58), (void *)_cffi_d_deleteForest },
+  { "deleteGrammar", (void *)_cffi_f_deleteGrammar, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 55), (void *)_cffi_d_deleteGrammar },
+  { "deleteParser", (void *)_cffi_f_deleteParser, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 65), (void *)_cffi_d_deleteParser },
+  { "dumpForest", (void *)_cffi_f_dumpForest, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 61), (void *)_cffi_d_dumpForest },
+  { "earleyParse", (void *)_cffi_f_earleyParse, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 26), (void *)_cffi_d_earleyParse },
+  { "earleyParseWithMatrix", (void *)_cffi_f_earleyParseWithMatrix, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 18), (void *)_cffi_d_earleyParseWithMatrix },
+  { "flattenForest", (void *)_cffi_f_flattenForest, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 12), (void *)_cffi_d_flattenForest },
+  { "getAllocationCounts", (void *)_cffi_f_getAllocationCounts, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 49), (void *)_cffi_d_getAllocationCounts },
+  { "matching_func", (void *)&_cffi_externpy__matching_func, _CFFI_OP(_CFFI_OP_EXTERN_PYTHON, 5), (void *)matching_func },
+  { "matrixStride", (void *)_cffi_f_matrixStride, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 43), (void *)_cffi_d_matrixStride },
+  { "newGrammar", (void *)_cffi_f_newGrammar, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 15), (void *)_cffi_d_newGrammar },
+  { "newParser", (void *)_cffi_f_newParser, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 33), (void *)_cffi_d_newParser },
+  { "numCombinations", (void *)_cffi_f_numCombinations, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 46), (void *)_cffi_d_numCombinations },
+  { "prep_bonus_func", (void *)&_cffi_externpy__prep_bonus_func, _CFFI_OP(_CFFI_OP_EXTERN_PYTHON, 5), (void *)prep_bonus_func },
+  { "printAllocationReport", (void *)_cffi_f_printAllocationReport, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_N, 68), (void *)_cffi_d_printAllocationReport },
+  { "reduceForest", (void *)_cffi_f_reduceForest, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 0), (void *)_cffi_d_reduceForest },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "nNodes", offsetof(struct AllocationCounts, nNodes),
+              sizeof(((struct AllocationCounts *)0)->nNodes),
+              _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nStates", offsetof(struct AllocationCounts, nStates),
+               sizeof(((struct AllocationCounts *)0)->nStates),
+               _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nDiscardedStates", offsetof(struct AllocationCounts, nDiscardedStates),
+                        sizeof(((struct AllocationCounts *)0)->nDiscardedStates),
+                        _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nStateChunks", offsetof(struct AllocationCounts, nStateChunks),
+                    sizeof(((struct AllocationCounts *)0)->nStateChunks),
+                    _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nColumns", offsetof(struct AllocationCounts, nColumns),
+                sizeof(((struct AllocationCounts *)0)->nColumns),
+                _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nHNodes", offsetof(struct AllocationCounts, nHNodes),
+               sizeof(((struct AllocationCounts *)0)->nHNodes),
+               _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nNodeDictLookups", offsetof(struct AllocationCounts, nNodeDictLookups),
+                        sizeof(((struct AllocationCounts *)0)->nNodeDictLookups),
+                        _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nMatchingCalls", offsetof(struct AllocationCounts, nMatchingCalls),
+                      sizeof(((struct AllocationCounts *)0)->nMatchingCalls),
+                      _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pProd", offsetof(struct FamilyEntry, pProd),
+             sizeof(((struct FamilyEntry *)0)->pProd),
+             _CFFI_OP(_CFFI_OP_NOOP, 81) },
+  { "p1", offsetof(struct FamilyEntry, p1),
+          sizeof(((struct FamilyEntry *)0)->p1),
+          _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "p2", offsetof(struct FamilyEntry, p2),
+          sizeof(((struct FamilyEntry *)0)->p2),
+          _CFFI_OP(_CFFI_OP_NOOP, 13) },
+  { "pNext", offsetof(struct FamilyEntry, pNext),
+             sizeof(((struct FamilyEntry *)0)->pNext),
+             _CFFI_OP(_CFFI_OP_NOOP, 73) },
+  { "nCombinations", offsetof(struct FlatForest, nCombinations),
+                     sizeof(((struct FlatForest *)0)->nCombinations),
+                     _CFFI_OP(_CFFI_OP_NOOP, 87) },
+  { "nNodes", offsetof(struct FlatForest, nNodes),
+              sizeof(((struct FlatForest *)0)->nNodes),
+              _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pNodes", offsetof(struct FlatForest, pNodes),
+              sizeof(((struct FlatForest *)0)->pNodes),
+              _CFFI_OP(_CFFI_OP_NOOP, 71) },
+  { "nFamilies", offsetof(struct FlatForest, nFamilies),
+                 sizeof(((struct FlatForest *)0)->nFamilies),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pFamilies", offsetof(struct FlatForest, pFamilies),
+                 sizeof(((struct FlatForest *)0)->pFamilies),
+                 _CFFI_OP(_CFFI_OP_NOOP, 71) },
+  { "nChildren", offsetof(struct FlatForest, nChildren),
+                 sizeof(((struct FlatForest *)0)->nChildren),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pChildren", offsetof(struct FlatForest, pChildren),
+                 sizeof(((struct FlatForest *)0)->pChildren),
+                 _CFFI_OP(_CFFI_OP_NOOP, 71) },
+  { "pScores", offsetof(struct FlatForest, pScores),
+               sizeof(((struct FlatForest *)0)->pScores),
+               _CFFI_OP(_CFFI_OP_NOOP, 71) },
+  { "nNonterminals", offsetof(struct Grammar, nNonterminals),
+                     sizeof(((struct Grammar *)0)->nNonterminals),
+                     _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nTerminals", offsetof(struct Grammar, nTerminals),
+                  sizeof(((struct Grammar *)0)->nTerminals),
+                  _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "iRoot", offsetof(struct Grammar, iRoot),
+             sizeof(((struct Grammar *)0)->iRoot),
+             _CFFI_OP(_CFFI_OP_NOOP, 21) },
+  { "iNt", offsetof(struct Label, iNt),
+           sizeof(((struct Label *)0)->iNt),
+           _CFFI_OP(_CFFI_OP_NOOP, 21) },
+  { "nDot", offsetof(struct Label, nDot),
+            sizeof(((struct Label *)0)->nDot),
+            _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pProd", offsetof(struct Label, pProd),
+             sizeof(((struct Label *)0)->pProd),
+             _CFFI_OP(_CFFI_OP_NOOP, 81) },
+  { "nI", offsetof(struct Label, nI),
+          sizeof(((struct Label *)0)->nI),
+          _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nJ", offsetof(struct Label, nJ),
+          sizeof(((struct Label *)0)->nJ),
+          _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "label", offsetof(struct Node, label),
+             sizeof(((struct Node *)0)->label),
+             _CFFI_OP(_CFFI_OP_NOOP, 77) },
+  { "pHead", offsetof(struct Node, pHead),
+             sizeof(((struct Node *)0)->pHead),
+             _CFFI_OP(_CFFI_OP_NOOP, 73) },
+  { "nRefCount", offsetof(struct Node, nRefCount),
+                 sizeof(((struct Node *)0)->nRefCount),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nMaxStates", offsetof(struct ParseBudget, nMaxStates),
+                  sizeof(((struct ParseBudget *)0)->nMaxStates),
+                  _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nMaxNodes", offsetof(struct ParseBudget, nMaxNodes),
+                 sizeof(((struct ParseBudget *)0)->nMaxNodes),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nMaxMillis", offsetof(struct ParseBudget, nMaxMillis),
+                  sizeof(((struct ParseBudget *)0)->nMaxMillis),
+                  _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nExceeded", offsetof(struct ParseBudget, nExceeded),
+                 sizeof(((struct ParseBudget *)0)->nExceeded),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nStates", offsetof(struct ParseBudget, nStates),
+               sizeof(((struct ParseBudget *)0)->nStates),
+               _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nNodes", offsetof(struct ParseBudget, nNodes),
+              sizeof(((struct ParseBudget *)0)->nNodes),
+              _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nMillis", offsetof(struct ParseBudget, nMillis),
+               sizeof(((struct ParseBudget *)0)->nMillis),
+               _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nFamilies", offsetof(struct ParseBudget, nFamilies),
+                 sizeof(((struct ParseBudget *)0)->nFamilies),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nPeakBytes", offsetof(struct ParseBudget, nPeakBytes),
+                  sizeof(((struct ParseBudget *)0)->nPeakBytes),
+                  _CFFI_OP(_CFFI_OP_NOOP, 87) },
+  { "pGrammar", offsetof(struct Parser, pGrammar),
+                sizeof(((struct Parser *)0)->pGrammar),
+                _CFFI_OP(_CFFI_OP_NOOP, 34) },
+  { "nId", offsetof(struct Production, nId),
+           sizeof(((struct Production *)0)->nId),
+           _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "nPriority", offsetof(struct Production, nPriority),
+                 sizeof(((struct Production *)0)->nPriority),
+                 _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "n", offsetof(struct Production, n),
+         sizeof(((struct Production *)0)->n),
+         _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pList", offsetof(struct Production, pList),
+             sizeof(((struct Production *)0)->pList),
+             _CFFI_OP(_CFFI_OP_NOOP, 71) },
+  { "nNonterminals", offsetof(struct ReducerInfo, nNonterminals),
+                     sizeof(((struct ReducerInfo *)0)->nNonterminals),
+                     _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pnNtFlags", offsetof(struct ReducerInfo, pnNtFlags),
+                 sizeof(((struct ReducerInfo *)0)->pnNtFlags),
+                 _CFFI_OP(_CFFI_OP_NOOP, 86) },
+  { "pnNtScores", offsetof(struct ReducerInfo, pnNtScores),
+                  sizeof(((struct ReducerInfo *)0)->pnNtScores),
+                  _CFFI_OP(_CFFI_OP_NOOP, 3) },
+  { "nTerminals", offsetof(struct ReducerInfo, nTerminals),
+                  sizeof(((struct ReducerInfo *)0)->nTerminals),
+                  _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pnTerminalFlags", offsetof(struct ReducerInfo, pnTerminalFlags),
+                       sizeof(((struct ReducerInfo *)0)->pnTerminalFlags),
+                       _CFFI_OP(_CFFI_OP_NOOP, 86) },
+  { "nProductions", offsetof(struct ReducerInfo, nProductions),
+                    sizeof(((struct ReducerInfo *)0)->nProductions),
+                    _CFFI_OP(_CFFI_OP_NOOP, 4) },
+  { "pnPriorities", offsetof(struct ReducerInfo, pnPriorities),
+                    sizeof(((struct ReducerInfo *)0)->pnPriorities),
+                    _CFFI_OP(_CFFI_OP_NOOP, 86) },
+  { "nVerbPrepBonus", offsetof(struct ReducerInfo, nVerbPrepBonus),
+                      sizeof(((struct ReducerInfo *)0)->nVerbPrepBonus),
+                      _CFFI_OP(_CFFI_OP_NOOP, 21) },
+  { "nLengthBonusFactor", offsetof(struct ReducerInfo, nLengthBonusFactor),
+                          sizeof(((struct ReducerInfo *)0)->nLengthBonusFactor),
+                          _CFFI_OP(_CFFI_OP_NOOP, 21) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "AllocationCounts", 72, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct AllocationCounts), offsetof(struct _cffi_align_struct_AllocationCounts, y), 0, 8 },
+  { "FamilyEntry", 74, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct FamilyEntry), offsetof(struct _cffi_align_struct_FamilyEntry, y), 8, 4 },
+  { "FlatForest", 75, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct FlatForest), offsetof(struct _cffi_align_struct_FlatForest, y), 12, 8 },
+  { "Grammar", 76, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct Grammar), offsetof(struct _cffi_align_struct_Grammar, y), 20, 3 },
+  { "Label", 77, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct Label), offsetof(struct _cffi_align_struct_Label, y), 23, 5 },
+  { "Node", 78, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct Node), offsetof(struct _cffi_align_struct_Node, y), 28, 3 },
+  { "ParseBudget", 79, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct ParseBudget), offsetof(struct _cffi_align_struct_ParseBudget, y), 31, 9 },
+  { "Parser", 80, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct Parser), offsetof(struct _cffi_align_struct_Parser, y), 40, 1 },
+  { "Production", 82, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct Production), offsetof(struct _cffi_align_struct_Production, y), 41, 4 },
+  { "ReducerInfo", 83, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct ReducerInfo), offsetof(struct _cffi_align_struct_ReducerInfo, y), 45, 9 },
+};
+
+static const struct _cffi_typename_s _cffi_typenames[] = {
+  { "AllocFunc", 36 },
+  { "BOOL", 21 },
+  { "BYTE", 85 },
+  { "CHAR", 70 },
+  { "INT", 21 },
+  { "MatchingFunc", 5 },
+  { "PrepBonusFunc", 5 },
+  { "UINT", 4 },
+  { "UINT64", 87 },
+};
+
+static const struct _cffi_type_context_s _cffi_type_context = {
+  _cffi_types,
+  _cffi_globals,
+  _cffi_fields,
+  _cffi_struct_unions,
+  NULL,  /* no enums */
+  _cffi_typenames,
+  18,  /* num_globals */
+  10,  /* num_struct_unions */
+  0,  /* num_enums */
+  9,  /* num_typenames */
+  NULL,  /* no includes */
+  89,  /* num_types */
+  1,  /* flags */
+};
+
+#ifdef __GNUC__
+#  pragma GCC visibility push(default)  /* for -fvisibility= */
+#endif
+
+#ifdef PYPY_VERSION
+PyMODINIT_FUNC
+_cffi_pypyinit__eparser(const void *p[])
+{
+    if (((intptr_t)p[0]) >= 0x0A03) {
+        _cffi_call_python_org = (void(*)(struct _cffi_externpy_s *, char *))p[1];
+    }
+    p[0] = (const void *)0x2601;
+    p[1] = &_cffi_type_context;
+    return NULL;
+}
+#  ifdef _MSC_VER
+     PyMODINIT_FUNC
+     PyInit__eparser(void) { return NULL; }
+#  endif
+#else
+PyMODINIT_FUNC
+PyInit__eparser(void)
+{
+  return _cffi_init("reynir._eparser", 0x2601, &_cffi_type_context);
+}
+#endif
+
+#ifdef __GNUC__
+#  pragma GCC visibility pop
+#endif
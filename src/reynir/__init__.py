@@ -41,6 +41,7 @@ from .reynir import (
     Terminal,
     LemmaTuple,
     ProgressFunc,
+    StreamProgressFunc,
     ParseResult,
     Sentence,
     Paragraph,
@@ -55,8 +56,13 @@ from .reynir import (
     _Paragraph,
 )
 from .nounphrase import NounPhrase
+from .asyncreynir import AsyncGreynir, AsyncJob
+from .parsecache import ParseCache
+from .metrics import Metrics
+from .corpus import Corpus, CorpusWriter, CorpusSentence
 from .fastparser import ParseForestPrinter, ParseForestDumper, ParseForestFlattener
 from .fastparser import ParseError, ParseForestNavigator
+from .fastparser import ParseBudget, ParseBudgetExceeded, ParseStats
 from .settings import Settings
 from .bintokenizer import tokenize, TokenList
 
@@ -94,9 +100,17 @@ __all__ = (
     "KLUDGY_ORDINALS_TRANSLATE",
     "Greynir",
     "Reynir",
+    "AsyncGreynir",
+    "AsyncJob",
+    "ParseCache",
+    "Metrics",
+    "Corpus",
+    "CorpusWriter",
+    "CorpusSentence",
     "Terminal",
     "LemmaTuple",
     "ProgressFunc",
+    "StreamProgressFunc",
     "ParseResult",
     "Sentence",
     "Paragraph",
@@ -114,6 +128,9 @@ __all__ = (
     "ParseForestDumper",
     "ParseForestFlattener",
     "ParseError",
+    "ParseBudget",
+    "ParseBudgetExceeded",
+    "ParseStats",
     "ParseForestNavigator",
     "Settings",
     "tokenize",
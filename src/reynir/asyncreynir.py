@@ -0,0 +1,368 @@
+"""
+
+    Greynir: Natural language processing for Icelandic
+
+    Asynchronous (asyncio) front-end for the Greynir class
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    This module implements the AsyncGreynir class, which allows
+    asyncio-based applications, such as web services, to tokenize and
+    parse text without blocking their event loop. The CPU-bound work
+    is offloaded to an executor, by default a pool of threads (the C++
+    parser runs without holding the global interpreter lock).
+
+    AsyncGreynir additionally provides:
+
+    * Request coalescing: concurrent requests for the same text share
+      a single parse.
+
+    * Backpressure: the number of requests in flight in the executor
+      is bounded. Waiting requests are admitted shortest text first,
+      so that short requests are not starved by long ones.
+
+    * Cancellation: if all callers awaiting a request are cancelled,
+      the request is aborted between sentences.
+
+    Typical usage:
+
+    ```
+    ag = AsyncGreynir()
+    result = await ag.parse("Ása sá sól. Hún sá líka tunglið.")
+    sent = await ag.parse_single("Ása sá sól.")
+    job = await ag.submit("Ása sá sól. Hún sá líka tunglið.")
+    async for sent in job:
+        ...
+    await ag.close()
+    ```
+
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import asyncio
+import heapq
+import threading
+from itertools import count
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from .reynir import (
+    DEFAULT_MAX_SENT_TOKENS,
+    Greynir,
+    ParseResult,
+    _Job,
+    _Sentence,
+)
+
+
+T = TypeVar("T")
+
+# The default maximum number of requests in flight in the executor
+DEFAULT_MAX_IN_FLIGHT = 16
+
+
+class ParseCancelled(Exception):
+
+    """Raised within an executor thread to abort a request
+    whose callers have all been cancelled"""
+
+    pass
+
+
+class _PriorityGate:
+
+    """Bounds the number of requests in flight, admitting
+    waiting requests in order of priority (lowest first),
+    and in order of arrival within the same priority"""
+
+    def __init__(self, limit: int) -> None:
+        self._free = limit
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._seq = count()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until a slot is available"""
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # We were handed a slot just as we were cancelled:
+                # pass it on to the next waiter
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a slot, handing it to the highest-priority waiter, if any"""
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                # Skip waiters that have been cancelled in the meantime
+                fut.set_result(None)
+                return
+        self._free += 1
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of waiting requests"""
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+
+class _Request:
+
+    """A request in progress, possibly shared by multiple callers"""
+
+    __slots__ = ("task", "callers", "cancelled")
+
+    def __init__(self) -> None:
+        self.task: Optional["asyncio.Future[Any]"] = None
+        # The number of callers currently awaiting the request
+        self.callers = 0
+        # Set when all callers have been cancelled
+        self.cancelled = threading.Event()
+
+
+class AsyncJob:
+
+    """An asynchronous wrapper for a _Job, returned from
+    AsyncGreynir.submit(). Sentences are parsed one by one
+    in the executor as the job is iterated with async for.
+    Cancelling the iteration aborts the job between sentences."""
+
+    def __init__(self, ag: "AsyncGreynir", job: _Job, priority: int) -> None:
+        self._ag = ag
+        self._job = job
+        self._it = iter(job)
+        self._priority = priority
+
+    @property
+    def job(self) -> _Job:
+        """Return the underlying synchronous job object"""
+        return self._job
+
+    def __aiter__(self) -> "AsyncJob":
+        return self
+
+    async def __anext__(self) -> _Sentence:
+        sent = await self._ag._call(self._priority, next, self._it, None)
+        if sent is None:
+            raise StopAsyncIteration
+        return cast(_Sentence, sent)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate job statistics, such as num_sentences
+        and parse_time, to the underlying job"""
+        return getattr(self._job, name)
+
+
+class AsyncGreynir:
+
+    """An asyncio front-end for a Greynir instance. The tokenizer and
+    parser are run in an executor, so that the event loop is not blocked.
+    If no executor is given, a pool of max_workers threads is created.
+    If no Greynir instance is given, one is created, passing any
+    additional keyword arguments to its constructor.
+
+    Concurrent parse() and parse_single() requests for the same text
+    are coalesced, i.e. they share a single parse and its result objects.
+    At most max_in_flight requests are in the executor at any time;
+    waiting requests are admitted shortest text first.
+    A request is aborted between sentences once all of its
+    callers have been cancelled."""
+
+    def __init__(
+        self,
+        greynir: Optional[Greynir] = None,
+        *,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        **options: Any,
+    ) -> None:
+        self._greynir = greynir if greynir is not None else Greynir(**options)
+        self._own_executor = executor is None
+        self._executor: Executor = (
+            ThreadPoolExecutor(max_workers=max_workers) if executor is None else executor
+        )
+        self._gate = _PriorityGate(max(max_in_flight, 1))
+        self._requests: Dict[Hashable, _Request] = {}
+
+    @property
+    def greynir(self) -> Greynir:
+        """Return the underlying Greynir instance"""
+        return self._greynir
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting to enter the executor"""
+        return self._gate.waiting
+
+    async def _call(self, priority: int, func: Callable[..., T], *args: Any) -> T:
+        """Call the given function in the executor, once a slot is available"""
+        loop = asyncio.get_running_loop()
+        await self._gate.acquire(priority)
+        try:
+            cf = self._executor.submit(func, *args)
+        except BaseException:
+            self._gate.release()
+            raise
+        # Release the slot only once the executor is really done with the
+        # request, even if the caller is cancelled before that
+        cf.add_done_callback(lambda _: loop.call_soon_threadsafe(self._gate.release))
+        return await asyncio.wrap_future(cf)
+
+    async def _coalesce(
+        self, key: Hashable, priority: int, func: Callable[..., T], *args: Any
+    ) -> T:
+        """Run a request, or join an identical request that is
+        already in progress. The function is called with a
+        threading.Event as an additional last argument; the event
+        is set if all callers of the request have been cancelled."""
+        req = self._requests.get(key)
+        if req is None:
+            req = self._requests[key] = _Request()
+
+            async def run(req: _Request) -> T:
+                try:
+                    return await self._call(priority, func, *args, req.cancelled)
+                finally:
+                    if self._requests.get(key) is req:
+                        del self._requests[key]
+
+            req.task = asyncio.ensure_future(run(req))
+        assert req.task is not None
+        req.callers += 1
+        try:
+            return await asyncio.shield(req.task)
+        finally:
+            req.callers -= 1
+            if req.callers == 0 and not req.task.done():
+                # All callers have been cancelled: abort the request
+                req.cancelled.set()
+                req.task.cancel()
+                if self._requests.get(key) is req:
+                    del self._requests[key]
+
+    def _parse(
+        self, text: str, max_sent_tokens: int, cancelled: threading.Event
+    ) -> ParseResult:
+        """Parse a text in the executor, checking for
+        cancellation between sentences"""
+        job = self._greynir.submit(text, parse=True, max_sent_tokens=max_sent_tokens)
+        sentences: List[_Sentence] = []
+        for sent in job:
+            sentences.append(sent)
+            if cancelled.is_set():
+                raise ParseCancelled()
+        return ParseResult(
+            sentences=sentences,
+            num_sentences=job.num_sentences,
+            num_parsed=job.num_parsed,
+            num_tokens=job.num_tokens,
+            ambiguity=job.ambiguity,
+            parse_time=job.parse_time,
+            reduce_time=job.reduce_time,
+        )
+
+    def _parse_single(
+        self, text: str, max_sent_tokens: int, cancelled: threading.Event
+    ) -> Optional[_Sentence]:
+        """Parse a single sentence in the executor"""
+        if cancelled.is_set():
+            raise ParseCancelled()
+        return self._greynir.parse_single(text, max_sent_tokens=max_sent_tokens)
+
+    async def parse(
+        self, text: str, *, max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS
+    ) -> ParseResult:
+        """Parse a text asynchronously and return a summary of all
+        contained sentences, as returned from Greynir.parse()"""
+        return await self._coalesce(
+            ("parse", text, max_sent_tokens),
+            len(text),
+            self._parse,
+            text,
+            max_sent_tokens,
+        )
+
+    async def parse_single(
+        self, sentence: str, *, max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS
+    ) -> Optional[_Sentence]:
+        """Parse a single sentence asynchronously, as Greynir.parse_single()"""
+        return await self._coalesce(
+            ("parse_single", sentence, max_sent_tokens),
+            len(sentence),
+            self._parse_single,
+            sentence,
+            max_sent_tokens,
+        )
+
+    async def submit(
+        self,
+        text: str,
+        parse: bool = True,
+        *,
+        split_paragraphs: bool = False,
+        max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS,
+    ) -> AsyncJob:
+        """Submit a text to the tokenizer and parser, returning an
+        AsyncJob whose sentences can be iterated with async for.
+        Each sentence is parsed in the executor as it is requested."""
+        job = await self._call(
+            len(text),
+            lambda: self._greynir.submit(
+                text,
+                parse,
+                split_paragraphs=split_paragraphs,
+                max_sent_tokens=max_sent_tokens,
+            ),
+        )
+        return AsyncJob(self, job, len(text))
+
+    async def close(self) -> None:
+        """Shut down the executor, if it was created by this instance"""
+        if self._own_executor:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._executor.shutdown
+            )
+
+    async def __aenter__(self) -> "AsyncGreynir":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await self.close()
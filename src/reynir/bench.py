@@ -0,0 +1,559 @@
+"""
+
+    Greynir: Natural language processing for Icelandic
+
+    Benchmark module
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    This module implements a benchmark suite for Greynir, which is run
+    from the command line as follows:
+
+        python -m reynir.bench [--mode MODE] [--repeat N] [--workers N]
+            [--grade GRADE ...] [--input FILE] [--output FILE]
+
+    The benchmark uses a fixed corpus of Icelandic sentences, graded by
+    length and ambiguity. The corpus is versioned (cf. CORPUS_VERSION),
+    and the version is included in the output, so that results are only
+    compared between runs on the same corpus.
+
+    The following modes are available:
+
+    * single: Each sentence is processed in the current process, and the
+      time spent in each stage (tokenization, Earley parsing, counting of
+      parse tree combinations, reduction, SimpleTree construction and
+      serialization, as well as parsing with C++ reduction, which is
+      Greynir's default) is measured separately. The allocation counts of
+      the C++ parser are also reported.
+
+    * multiprocess: The whole corpus is parsed via Greynir.parse() in a pool
+      of worker processes, measuring the total throughput.
+
+    * cold-start: A fresh Python process is started for each repetition,
+      measuring the time taken to import the reynir package, to load the
+      grammar and to parse the first sentence.
+
+    * codec: The sentences are parsed, and then serialized and loaded again,
+      both as JSON (Greynir.dumps_single() and loads_single()) and in the
+      compact binary form (Greynir.dumpb_single() and loadb_single()),
+      measuring the time taken and the size of the serialized data, also
+      after zlib compression.
+
+    * matching: Each distinct token in the sentences is matched with the
+      grammar terminals, once with only the candidate terminals found via
+      the terminal index (as the parser does) and once with all terminals,
+      counting the BIN_Token.matches() calls and measuring the time taken
+      in each case. The resulting matching rows must be identical. Instead
+      of the corpus, the sentences can be read from a file given with
+      --input; for a .py file, its string literals are used, so that e.g.
+      --input test/test_parse.py matches the tokens of the parser tests.
+
+    The results are written as JSON, to stdout by default.
+
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import zlib
+from time import perf_counter
+
+from tokenizer import Tok, paragraphs
+
+from .reynir import Greynir
+from .binparser import BIN_Token
+from .grammar import Terminal
+from .fastparser import Fast_Parser, ParseError
+from .simpletree import SimpleTree
+
+
+# Increment this when the corpus is modified, since results
+# obtained with different corpus versions are not comparable
+CORPUS_VERSION = 1
+
+# The benchmark corpus, graded by sentence length and ambiguity
+CORPUS: Dict[str, Sequence[str]] = {
+    # Short sentences with few parse tree combinations
+    "short": (
+        "Hundurinn gelti.",
+        "Ég keypti Húsið.",
+        "Páll varð skemmtilegur.",
+        "Mig brestur þolinmæði.",
+        "Það var 17. júní árið 2020.",
+        "Dómarinn frestaði mótinu vegna veðurs.",
+        "Ég setti gleraugun ofan á kommóðuna.",
+        "Hún tapaði öllu sínu í spilakössum.",
+        "Barnið fór í augnrannsóknina fyrir húsnæðiskaupin.",
+        "Páll hafði getað átt að verða skemmtilegur.",
+    ),
+    # Sentences of medium length, with tens to hundreds of combinations
+    "medium": (
+        "Hann var hálf-þýskur og fæddist í Vestur-Þýskalandi.",
+        "Hér er verið að gera tilraunir með þáttun.",
+        "Efsta húsið er það síðasta sem var lokið við.",
+        "Schengen rekur mun öflugri gagnagrunn en Ísland gæti gert.",
+        "Ég hef ætíð látið þess getið að Jón sé frábær.",
+        "Ég veipaði af miklum krafti og fór á marga vegu.",
+        "Það var ekki bara á þann hátt að glútenið vantaði.",
+        "Hann eignaðist hús við ströndina og henni tókst að mála það.",
+        "Hitastig vatnsins var 30,5 gráður og ég var ánægð með það.",
+        "Ég fór að kaupa inn en hún var að selja eignir.",
+    ),
+    # Long sentences with thousands to millions of combinations
+    "long": (
+        "Auk alls þessa þá getum við líka einfaldlega vandað okkur meira.",
+        "Jón hefur aðgang að gögnum þeirra starfssviða sem eiga að vera aðskilin.",
+        "Það sem þeir vilja berjast fyrir er ekki loforð, heldur áherslur.",
+        "Það að þau viðurkenna ekki að þjóðin er ósátt við gjörðir þeirra "
+        "er alvarlegt.",
+        "Jón Jónsson keypti 3 bíla á 5 milljónir króna 17. júní 2020 og seldi "
+        "þá aftur í vikunni á eftir.",
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær og við sáum "
+        "marga báta sigla inn í höfnina í góðu veðri.",
+        "Forstjóri fyrirtækisins sagði í viðtali við blaðið að hagnaður ársins "
+        "hefði verið meiri en gert var ráð fyrir í áætlunum stjórnarinnar.",
+        "Þá þarf minna fylgi nú en áður til að ná inn borgarfulltrúa, því "
+        "borgarfulltrúum verður fjölgað úr fimmtán í tuttugu og þrjá.",
+        "Ríkisstjórnin hefur ákveðið að leggja fram frumvarp um breytingar á "
+        "lögum um tekjuskatt, sem ætlað er að létta skattbyrði fjölskyldna "
+        "með lágar tekjur.",
+    ),
+}
+
+GRADES = tuple(CORPUS.keys())
+
+# The stages that are timed in the single mode
+STAGES = (
+    "tokenize",
+    "parse",
+    "num_combinations",
+    "reduce",
+    "simple_tree",
+    "serialize",
+    "parse_reduced",
+)
+
+MODES = ("single", "multiprocess", "cold-start", "codec", "matching")
+
+# The script that is run in a fresh process in the cold-start mode
+_COLD_START_SCRIPT = """
+import json, sys
+from time import perf_counter
+t0 = perf_counter()
+import reynir
+t1 = perf_counter()
+g = reynir.Greynir()
+g.parser
+t2 = perf_counter()
+g.parse_single(sys.argv[1])
+t3 = perf_counter()
+json.dump(dict(import_time=t1 - t0, load_time=t2 - t1, first_parse_time=t3 - t2), sys.stdout)
+"""
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Return the peak resident set size of this process, in kilobytes,
+    or None if not available on this platform"""
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # On macOS, ru_maxrss is in bytes
+        rss //= 1024
+    return rss
+
+
+def _environment() -> Dict[str, Any]:
+    """Return a description of the environment that the benchmark runs in"""
+    from . import __version__
+
+    return dict(
+        reynir_version=__version__,
+        python=platform.python_implementation() + " " + platform.python_version(),
+        platform=platform.platform(),
+        cpu_count=os.cpu_count(),
+    )
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    """Return the best and median values of the given timing samples"""
+    return dict(best=min(samples), median=statistics.median(samples))
+
+
+def _sentence_tokens(g: Greynir, text: str) -> List[Tok]:
+    """Tokenize a single sentence, cutting off the sentence begin and end tokens"""
+    return list(g.tokenize(text))[1:-1]
+
+
+def run_single(repeat: int, grades: Iterable[str]) -> Dict[str, Any]:
+    """Process the sentences of the given grades in this process,
+    timing each stage separately"""
+    g = Greynir()
+    # Load the grammar and create the parser and reducer up front
+    parser = g.parser
+    reducer = g.reducer
+    grades = list(grades)
+    # Timing samples, by grade and stage, one per repetition
+    samples: Dict[str, Dict[str, List[float]]] = {
+        grade: {stage: [] for stage in STAGES} for grade in grades
+    }
+    allocations: List[Dict[str, int]] = []
+    num_tokens: Dict[str, int] = dict()
+    combinations: Dict[str, int] = dict()
+    failures: Dict[str, int] = dict()
+
+    for _ in range(repeat):
+        counts_before = Fast_Parser.allocation_counts()
+        for grade in grades:
+            times = dict.fromkeys(STAGES, 0.0)
+            num_tokens[grade] = combinations[grade] = failures[grade] = 0
+            for text in CORPUS[grade]:
+                t0 = perf_counter()
+                tokens = _sentence_tokens(g, text)
+                t1 = perf_counter()
+                times["tokenize"] += t1 - t0
+                num_tokens[grade] += len(tokens)
+                try:
+                    forest = parser.go(tokens)
+                except ParseError:
+                    times["parse"] += perf_counter() - t1
+                    failures[grade] += 1
+                    continue
+                t2 = perf_counter()
+                num = Fast_Parser.num_combinations(forest)
+                t3 = perf_counter()
+                tree, _ = reducer.go_with_score(forest)
+                t4 = perf_counter()
+                stree = SimpleTree.from_deep_tree(tree, tokens)
+                t5 = perf_counter()
+                json.dumps(
+                    dict(
+                        tokens=[g._dump_token(t) for t in tokens],
+                        tree=None if stree is None else stree._head,
+                    ),
+                    ensure_ascii=False,
+                )
+                t6 = perf_counter()
+                parser.go_reduced(tokens, reducer)
+                t7 = perf_counter()
+                times["parse"] += t2 - t1
+                times["num_combinations"] += t3 - t2
+                times["reduce"] += t4 - t3
+                times["simple_tree"] += t5 - t4
+                times["serialize"] += t6 - t5
+                times["parse_reduced"] += t7 - t6
+                combinations[grade] += num
+            for stage, t in times.items():
+                samples[grade][stage].append(t)
+        counts_after = Fast_Parser.allocation_counts()
+        allocations.append(
+            {key: counts_after[key] - val for key, val in counts_before.items()}
+        )
+
+    result_grades: Dict[str, Any] = dict()
+    for grade in grades:
+        result_grades[grade] = dict(
+            sentences=len(CORPUS[grade]),
+            tokens=num_tokens[grade],
+            combinations=combinations[grade],
+            failures=failures[grade],
+            stages={stage: _summary(s) for stage, s in samples[grade].items()},
+        )
+    totals = {
+        stage: _summary(
+            [sum(samples[grade][stage][i] for grade in grades) for i in range(repeat)]
+        )
+        for stage in STAGES
+    }
+    return dict(
+        grades=result_grades,
+        stages=totals,
+        # The allocation counts of the C++ parser in the first repetition
+        allocations=allocations[0],
+        peak_rss_kb=peak_rss_kb(),
+    )
+
+
+def run_multiprocess(repeat: int, grades: Iterable[str], workers: int) -> Dict[str, Any]:
+    """Parse the sentences of the given grades in a pool of worker processes,
+    measuring the total wall clock time"""
+    g = Greynir()
+    sentences = [text for grade in grades for text in CORPUS[grade]]
+    text = " ".join(sentences)
+    samples: List[float] = []
+    try:
+        for _ in range(repeat):
+            t0 = perf_counter()
+            result = g.parse(text, workers=workers)
+            samples.append(perf_counter() - t0)
+    finally:
+        g.shutdown()
+    best = min(samples)
+    return dict(
+        workers=workers,
+        sentences=len(sentences),
+        parsed=result["num_parsed"],
+        # The first repetition includes the startup of the worker processes
+        times=samples,
+        wall_time=_summary(samples),
+        sentences_per_second=len(sentences) / best if best > 0.0 else None,
+        peak_rss_kb=peak_rss_kb(),
+    )
+
+
+def run_cold_start(repeat: int) -> Dict[str, Any]:
+    """Start a fresh Python process for each repetition, measuring the time
+    taken to import reynir, load the grammar and parse a single sentence"""
+    samples: Dict[str, List[float]] = dict(
+        import_time=[], load_time=[], first_parse_time=[], process_time=[]
+    )
+    for _ in range(repeat):
+        t0 = perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SCRIPT, CORPUS["short"][0]],
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        samples["process_time"].append(perf_counter() - t0)
+        for key, t in json.loads(output).items():
+            samples[key].append(t)
+    return {key: _summary(s) for key, s in samples.items()}
+
+
+def run_codec(repeat: int, grades: Iterable[str]) -> Dict[str, Any]:
+    """Serialize and load the parsed sentences of the given grades, both as
+    JSON and in the compact binary form, comparing the time taken and the size"""
+    g = Greynir()
+    sentences = [g.parse_single(text) for grade in grades for text in CORPUS[grade]]
+    formats = dict(
+        json=(g.dumps_single, g.loads_single),
+        binary=(g.dumpb_single, g.loadb_single),
+    )
+    results: Dict[str, Any] = dict()
+    for name, (dump, load) in formats.items():
+        dump_times: List[float] = []
+        load_times: List[float] = []
+        for _ in range(repeat):
+            t0 = perf_counter()
+            data = [dump(s) for s in sentences]
+            t1 = perf_counter()
+            for d in data:
+                load(d)
+            t2 = perf_counter()
+            dump_times.append(t1 - t0)
+            load_times.append(t2 - t1)
+        raw = [d.encode("utf-8") if isinstance(d, str) else d for d in data]
+        results[name] = dict(
+            bytes=sum(len(d) for d in raw),
+            compressed_bytes=sum(len(zlib.compress(d)) for d in raw),
+            dump=_summary(dump_times),
+            load=_summary(load_times),
+        )
+    return dict(
+        sentences=len(sentences),
+        formats=results,
+        size_ratio=results["json"]["bytes"] / results["binary"]["bytes"],
+    )
+
+
+def read_texts(fname: str) -> List[str]:
+    """Read the texts to benchmark from a file: the string literals of
+    a Python source file, or else the nonblank lines of a text file"""
+    with open(fname, "r", encoding="utf-8") as f:
+        source = f.read()
+    if fname.endswith(".py"):
+        return [
+            node.value
+            for node in ast.walk(ast.parse(source, fname))
+            if isinstance(node, ast.Constant)
+            and isinstance(node.value, str)
+            and node.value.strip()
+        ]
+    return [line.strip() for line in source.splitlines() if line.strip()]
+
+
+def _match_rows(
+    tokens: Iterable[BIN_Token], terminals: Any
+) -> Tuple[List[int], int]:
+    """Return the matching rows of the given tokens, as integer bitmaps,
+    and the number of BIN_Token.matches() calls made. The terminals
+    argument is a function returning a dict of the terminals to match
+    each token with."""
+    rows: List[int] = []
+    calls = 0
+    for t in tokens:
+        bits = 0
+        candidates: Dict[int, Terminal] = terminals(t)
+        for ix, terminal in candidates.items():
+            if t.matches(terminal):
+                bits |= 1 << ix
+        calls += len(candidates)
+        rows.append(bits)
+    return rows, calls
+
+
+def run_matching(
+    repeat: int, grades: Iterable[str], texts: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Match the distinct tokens of the given texts (by default the sentences
+    of the given grades) with the grammar terminals, both with and without
+    the terminal index, counting the matching calls and timing them"""
+    g = Greynir()
+    parser = g.parser
+    grammar = parser.grammar
+    if texts is None:
+        texts = [text for grade in grades for text in CORPUS[grade]]
+    texts = list(texts)
+    # Collect the wrapped tokens of all sentences, one per distinct
+    # token key, as the matching cache of the parser would
+    tokens: Dict[Any, BIN_Token] = dict()
+    num_sentences = 0
+    for text in texts:
+        for p in paragraphs(g.tokenize(text)):
+            for _, sent in p:
+                num_sentences += 1
+                for t in parser._wrap(sent):
+                    tokens.setdefault(t.key, t)
+    wrapped = list(tokens.values())
+    all_terminals = grammar.terminals_by_ix
+    index = grammar.terminal_index
+    methods = dict(
+        indexed=index.candidates,
+        full=lambda t: all_terminals,
+    )
+    results: Dict[str, Any] = dict()
+    rows: Dict[str, List[int]] = dict()
+    for name, terminals in methods.items():
+        samples: List[float] = []
+        for _ in range(repeat):
+            t0 = perf_counter()
+            rows[name], calls = _match_rows(wrapped, terminals)
+            samples.append(perf_counter() - t0)
+        results[name] = dict(calls=calls, time=_summary(samples))
+    return dict(
+        texts=len(texts),
+        sentences=num_sentences,
+        tokens=len(wrapped),
+        terminals=len(all_terminals),
+        methods=results,
+        call_ratio=results["full"]["calls"] / max(1, results["indexed"]["calls"]),
+        rows_identical=rows["indexed"] == rows["full"],
+    )
+
+
+def run_benchmark(
+    mode: str = "single",
+    *,
+    repeat: int = 3,
+    workers: int = 2,
+    grades: Optional[Iterable[str]] = None,
+    texts: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """Run the benchmark in the given mode, returning a JSON-serializable
+    dict with the results. The texts argument, which is only used in the
+    matching mode, replaces the corpus sentences."""
+    if mode not in MODES:
+        raise ValueError("Unknown benchmark mode: {0}".format(mode))
+    if repeat < 1:
+        raise ValueError("The benchmark must be repeated at least once")
+    grades = list(GRADES if grades is None else grades)
+    for grade in grades:
+        if grade not in CORPUS:
+            raise ValueError("Unknown sentence grade: {0}".format(grade))
+    if mode == "single":
+        results = run_single(repeat, grades)
+    elif mode == "multiprocess":
+        results = run_multiprocess(repeat, grades, workers)
+    elif mode == "codec":
+        results = run_codec(repeat, grades)
+    elif mode == "matching":
+        results = run_matching(repeat, grades, texts)
+    else:
+        results = run_cold_start(repeat)
+    return dict(
+        corpus_version=CORPUS_VERSION,
+        mode=mode,
+        repeat=repeat,
+        grades=grades,
+        environment=_environment(),
+        results=results,
+    )
+
+
+def main(args: Optional[Sequence[str]] = None) -> None:
+    """Run the benchmark from the command line"""
+    ap = argparse.ArgumentParser(
+        prog="python -m reynir.bench", description="Greynir benchmark suite"
+    )
+    ap.add_argument("--mode", choices=MODES, default="single", help="benchmark mode")
+    ap.add_argument(
+        "--repeat", type=int, default=3, help="number of repetitions (default 3)"
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="number of worker processes in the multiprocess mode (default 2)",
+    )
+    ap.add_argument(
+        "--grade",
+        choices=GRADES,
+        action="append",
+        help="sentence grade to include (may be repeated, default all)",
+    )
+    ap.add_argument(
+        "--input",
+        help="file of texts to use instead of the corpus in the matching mode "
+        "(string literals of a .py file, otherwise one text per line)",
+    )
+    ap.add_argument("--output", help="output file name (default stdout)")
+    a = ap.parse_args(args)
+    result = run_benchmark(
+        a.mode,
+        repeat=a.repeat,
+        workers=a.workers,
+        grades=a.grade,
+        texts=read_texts(a.input) if a.input else None,
+    )
+    if a.output:
+        with open(a.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+
+    main()
@@ -32,7 +32,7 @@
 
 """
 
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from functools import lru_cache
 
 from islenska.basics import make_bin_entry, ALL_CASES
@@ -40,15 +40,21 @@ from islenska.bindb import GreynirBin as GBin, PERSON_NAME_FL
 
 from tokenizer.definitions import BIN_Tuple
 
+from .cache import LFU_Cache
 from .settings import StaticPhrases
 
 # SHSnid tuple as seen by the Greynir compatibility layer
 ResultTuple = Tuple[str, List[BIN_Tuple]]
+# Key of a word form lookup: (word form, at_sentence_start, auto_uppercase)
+LookupKey = Tuple[str, bool, bool]
 
 
 # Size of name cache for lookup_name_gender
 _NAME_GENDER_CACHE_SIZE = 128
 
+# Size of the process-wide word form lookup cache for lookup_g
+LOOKUP_CACHE_SIZE = 100_000
+
 
 class GreynirBin(GBin):
 
@@ -57,6 +63,17 @@ class GreynirBin(GBin):
 
     _singleton: Optional["GreynirBin"] = None
 
+    # Process-wide cache of lookup_g() results, shared by all instances
+    # of the class. Each derived class gets its own cache, since it may
+    # override the lookup functions that the results depend on.
+    _lookup_cache: LFU_Cache[LookupKey, Tuple[str, Tuple[BIN_Tuple, ...]]] = (
+        LFU_Cache(maxsize=LOOKUP_CACHE_SIZE)
+    )
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._lookup_cache = LFU_Cache(maxsize=LOOKUP_CACHE_SIZE)
+
     @classmethod
     def get_db(cls) -> "GreynirBin":
         if cls._singleton is None:
@@ -74,7 +91,33 @@ class GreynirBin(GBin):
         self, w: str, at_sentence_start: bool = False, auto_uppercase: bool = False
     ) -> ResultTuple:
         """Returns BIN_Tuple instances, which are the Greynir version
-        of islenska.BinEntry"""
+        of islenska.BinEntry. The results are cached in a process-wide,
+        size-bounded cache, keyed by the word form and the flags."""
+        w, m = self._lookup_cache.lookup(
+            (w, at_sentence_start, auto_uppercase), self._uncached_lookup_g
+        )
+        # Return a fresh list, since the caller may modify it
+        return w, list(m)
+
+    def lookup_g_batch(self, keys: Iterable[LookupKey]) -> Dict[LookupKey, ResultTuple]:
+        """Look up a batch of (word form, at_sentence_start, auto_uppercase)
+        keys, returning a dict of results. Each distinct key is only looked up
+        once, making this suitable for resolving the word forms of a chunk
+        of text in one pass."""
+        lookup = self._lookup_cache.lookup
+        func = self._uncached_lookup_g
+        result: Dict[LookupKey, ResultTuple] = dict()
+        for key in keys:
+            if key not in result:
+                w, m = lookup(key, func)
+                result[key] = (w, list(m))
+        return result
+
+    def _uncached_lookup_g(
+        self, key: LookupKey
+    ) -> Tuple[str, Tuple[BIN_Tuple, ...]]:
+        """Look up a word form in BÍN, bypassing the lookup_g() cache"""
+        w, at_sentence_start, auto_uppercase = key
         w, m = self._lookup(
             w,
             at_sentence_start,
@@ -82,7 +125,13 @@ class GreynirBin(GBin):
             self._meanings_cache_lookup,
             make_bin_entry,
         )
-        return w, [BIN_Tuple._make(mm) for mm in m]
+        return w, tuple(BIN_Tuple._make(mm) for mm in m)
+
+    @classmethod
+    def lookup_cache_stats(cls) -> Dict[str, int]:
+        """Return a dict of statistics for the lookup_g() cache"""
+        cache = cls._lookup_cache
+        return dict(size=len(cache.cache), hits=cache.hits, misses=cache.misses)
 
     def lookup_nominative_g(self, w: str, **options: Any) -> List[BIN_Tuple]:
         """Returns the Greynir version of islenska.BinEntry"""
@@ -1559,7 +1559,7 @@ class BIN_Token(Token):
         """Return a hashable key that partitions tokens based on
         effective identity, i.e. tokens with the same hash can be considered
         equivalent for parsing purposes. This hash is inter alia used by the
-        alloc_cache() function in fastparser.py to optimize token/terminal
+        match_row() function in fastparser.py to optimize token/terminal
         matching calls."""
         if self.t0 == TOK.WORD:
             # For words, the t2 tuple is significant because it may have been
@@ -1589,10 +1589,11 @@ class VariantHandler:
     querying of terminal variants as well as mapping of variants to
     bit arrays for speed"""
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, vbits: Optional[int] = None) -> None:
         super().__init__(name)  # type: ignore
         # Do a bit of pre-calculation to speed up various
-        # checks against this terminal
+        # checks against this terminal. The variant bits (vbits)
+        # may have been pre-calculated and stored in a binary grammar file.
         # pylint: disable=no-member
         n = cast(str, self._name)  # type: ignore
         q = n[0]
@@ -1628,18 +1629,21 @@ class VariantHandler:
         self._vparts: List[str] = parts[1:]
         self._vcount = len(self._vparts)
         self._vset = set(self._vparts)
-        # Also map variant names to bits in self._vbits
-        bit = BIN_Token.VBIT
-        self._vbits = reduce(
-            lambda x, y: (x | y), (bit.get(v, 0) for v in self._vset), 0
-        )
-        # Handle the ending constraint variants (_xsomething and _zsomething)
-        # specially
-        for v in self._vset:
-            if v[0] == "x":
-                self._vbits |= BIN_Token.VBIT_LEMMA_ENDING
-            elif v[0] == "z":
-                self._vbits |= BIN_Token.VBIT_WORD_ENDING
+        if vbits is not None:
+            self._vbits = vbits
+        else:
+            # Map variant names to bits in self._vbits
+            bit = BIN_Token.VBIT
+            self._vbits = reduce(
+                lambda x, y: (x | y), (bit.get(v, 0) for v in self._vset), 0
+            )
+            # Handle the ending constraint variants (_xsomething and _zsomething)
+            # specially
+            for v in self._vset:
+                if v[0] == "x":
+                    self._vbits |= BIN_Token.VBIT_LEMMA_ENDING
+                elif v[0] == "z":
+                    self._vbits |= BIN_Token.VBIT_WORD_ENDING
         # fbits are like vbits but leave out variants that have no BIN meaning
         self._fbits = self._vbits & (~BIN_Token.FBIT_MASK)
         # For speed, store the cases associated with a verb
@@ -1843,8 +1847,8 @@ class BIN_Terminal(VariantHandler, Terminal):
     for variants in terminal names, including optimizations of variant
     checks and lookups"""
 
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
+    def __init__(self, name: str, vbits: Optional[int] = None) -> None:
+        super().__init__(name, vbits)
         # This type of terminal always requires full matching
         # as appropriate for each token kind
         self.shortcut_match: Optional[Callable[[str], Optional[bool]]] = None
@@ -1877,8 +1881,8 @@ class BIN_LiteralTerminal(VariantHandler, LiteralTerminal):
     """Subclass of LiteralTerminal that mixes in support from VariantHandler
     for variants in terminal names"""
 
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
+    def __init__(self, name: str, vbits: Optional[int] = None) -> None:
+        super().__init__(name, vbits)
         # Peel off the quotes from the first part
         assert len(self._first) >= 2  # The string can be ""
         assert self._first[0] == self._first[-1]
@@ -2060,6 +2064,15 @@ class BIN_Grammar(Grammar):
 
     def __init__(self):
         super().__init__()
+        self._terminal_index: Optional["TerminalIndex"] = None
+
+    @property
+    def terminal_index(self) -> "TerminalIndex":
+        """Return an index of the grammar's terminals by the tokens
+        that can possibly match them, creating it on first use"""
+        if self._terminal_index is None:
+            self._terminal_index = TerminalIndex(self.terminals_by_ix)
+        return self._terminal_index
 
     @staticmethod
     def _make_terminal(name: str) -> BIN_Terminal:
@@ -2083,6 +2096,201 @@ class BIN_Grammar(Grammar):
         plain-vanilla Terminals"""
         return BIN_Nonterminal(name, fname, line)
 
+    def _binary_fingerprint(self) -> str:
+        """The variant bits of terminals are stored in the binary
+        grammar file: make sure that they are recalculated if the
+        variant bit assignments change"""
+        return "{0}/{1}/{2}".format(
+            super()._binary_fingerprint(),
+            ",".join(BIN_Token.VARIANT.keys()),
+            BIN_Token.FBIT_MASK,
+        )
+
+    def _terminal_meta(self, t: Terminal) -> int:
+        """Store the variant bits of each terminal in the binary grammar file"""
+        return cast(VariantHandler, t)._vbits
+
+    def _load_terminal(self, name: str, literal: bool, meta: int) -> Terminal:
+        """Create a terminal from a binary grammar file,
+        using its pre-calculated variant bits"""
+        cls = type(self)
+        if literal:
+            if cls._make_literal_terminal is BIN_Grammar._make_literal_terminal:
+                return BIN_LiteralTerminal(name, meta)
+        elif cls._make_terminal is BIN_Grammar._make_terminal:
+            if name == "sequence":
+                return SequenceTerminal()
+            return BIN_Terminal(name, meta)
+        # A derived class creates its own terminals
+        return super()._load_terminal(name, literal, meta)
+
+
+# A mapping of terminal indices to terminals
+TerminalDict = Dict[int, Terminal]
+
+
+class TerminalIndex:
+
+    """An index of grammar terminals by the token kinds, word categories,
+    lemmas and literal texts that can possibly match them. A token can only
+    match the candidate terminals returned from candidates(), so all other
+    terminals can be ruled out without calling BIN_Token.matches().
+    The index mirrors the logic of BIN_Token.match_with_meaning() and
+    the WordMatchers functions; terminals whose matching logic it does not
+    know are always included among the candidates."""
+
+    # The word category (BIN_Token.KIND value) that a meaning of a word
+    # token must have to be accepted by each category-specific matcher
+    _MATCHER_CATEGORY: Mapping[MatcherFunc, str] = {
+        WordMatchers.matcher_so: "so",
+        WordMatchers.matcher_no: "no",
+        WordMatchers.matcher_lo: "lo",
+        WordMatchers.matcher_abfn: "abfn",
+        WordMatchers.matcher_pfn: "pfn",
+        WordMatchers.matcher_stt: "st",
+        WordMatchers.matcher_ao: "ao",
+        WordMatchers.matcher_töl: "töl",
+        WordMatchers.matcher_gata: "no",
+    }
+
+    # The first parts of the names of non-literal terminals that can
+    # match each token kind, cf. the BIN_Token.matches_XXX() functions
+    _KIND_FIRSTS: Mapping[int, Tuple[str, ...]] = {
+        TOK.PERSON: ("sérnafn", "person"),
+        TOK.ENTITY: ("entity",),
+        TOK.PUNCTUATION: ("punctuation",),
+        TOK.CURRENCY: ("currency", "no"),
+        TOK.AMOUNT: ("amount", "no"),
+        TOK.NUMWLETTER: ("talameðbókstaf",),
+        TOK.NUMBER: ("tala", "ártal", "töl", "to"),
+        TOK.PERCENT: ("töl", "prósenta", "no"),
+        TOK.ORDINAL: ("raðnr",),
+        TOK.YEAR: ("töl", "ártal", "tala"),
+        TOK.DATE: ("dags",),
+        TOK.DATEREL: ("dagsafs",),
+        TOK.DATEABS: ("dagsföst",),
+        TOK.TIME: ("tími",),
+        TOK.TIMESTAMP: ("tímapunktur",),
+        TOK.TIMESTAMPREL: ("tímapunkturafs",),
+        TOK.TIMESTAMPABS: ("tímapunkturfast",),
+        TOK.MEASUREMENT: ("mælieining",),
+        TOK.DOMAIN: ("lén",),
+        TOK.HASHTAG: ("myllumerki",),
+        TOK.SSN: ("kennitala",),
+        TOK.MOLECULE: ("sameind",),
+        TOK.USERNAME: ("notandanafn",),
+        TOK.URL: ("vefslóð",),
+        TOK.EMAIL: ("tölvupóstfang",),
+        TOK.SERIALNUMBER: ("vörunúmer",),
+        TOK.TELNO: ("símanúmer",),
+        TOK.COMPANY: ("fyrirtæki",),
+        # Words that are not found in BÍN
+        TOK.WORD: ("sérnafn", "no"),
+    }
+
+    # Lemma literal terminals can match number and year tokens
+    # if their lemma coincides with a terminal category name
+    _KIND_LEMMAS: Mapping[int, Tuple[str, ...]] = {
+        TOK.NUMBER: ("tala", "ártal", "töl", "to"),
+        TOK.YEAR: ("töl", "ártal", "tala"),
+    }
+
+    def __init__(self, terminals: TerminalDict) -> None:
+        self._all = terminals
+        # Terminals that are candidates for any token
+        self._always: TerminalDict = {}
+        # Terminals that are candidates for any word token found in BÍN
+        self._always_word: TerminalDict = {}
+        # Strong literal terminals ("x"), by literal text
+        self._by_text: Dict[str, TerminalDict] = {}
+        # Lemma literal terminals ('x'), by lemma
+        self._by_lemma: Dict[str, TerminalDict] = {}
+        # Non-literal terminals, by the first part of their name
+        self._by_first: Dict[str, TerminalDict] = {}
+        # Non-literal terminals, by the word category that they accept
+        self._by_category: Dict[str, TerminalDict] = {}
+        # Token classes that are known to use the standard matching logic
+        self._standard: Dict[type, bool] = {}
+        for ix, t in terminals.items():
+            self._add(ix, t)
+
+    def _add(self, ix: int, t: Terminal) -> None:
+        """Add a terminal to the index"""
+        if isinstance(t, BIN_LiteralTerminal):
+            d = self._by_text if t._strong else self._by_lemma
+            d.setdefault(t.first, {})[ix] = t
+            return
+        if not isinstance(t, BIN_Terminal) or t.shortcut_match is not None:
+            # Unknown terminal type, or a terminal such as 'sequence'
+            # that matches on the token text
+            self._always[ix] = t
+            return
+        self._by_first.setdefault(t.first, {})[ix] = t
+        matcher = t.matcher
+        if matcher is WordMatchers.matcher_default:
+            cat: Optional[str] = t.first
+        else:
+            cat = self._MATCHER_CATEGORY.get(matcher)
+        if cat is None:
+            # The matcher does not require a particular word category
+            # (such as for the 'fs', 'eo', 'person' and 'sérnafn' terminals)
+            self._always_word[ix] = t
+        else:
+            self._by_category.setdefault(cat, {})[ix] = t
+
+    def _is_standard(self, cls: type) -> bool:
+        """Return True if the given token class uses the standard
+        BIN_Token matching logic, which the index mirrors"""
+        standard = self._standard.get(cls)
+        if standard is None:
+            standard = self._standard[cls] = (
+                issubclass(cls, BIN_Token)
+                and cls.matches is BIN_Token.matches
+                and cls.match_with_meaning is BIN_Token.match_with_meaning
+                and cls._MATCHING_FUNC is BIN_Token._MATCHING_FUNC
+            )
+        return standard
+
+    def candidates(self, token: BIN_Token) -> TerminalDict:
+        """Return the terminals that the given token can possibly match"""
+        firsts = self._KIND_FIRSTS.get(token.t0)
+        if firsts is None or not self._is_standard(type(token)):
+            return self._all
+        result = dict(self._always)
+        by_lemma = self._by_lemma
+        d = self._by_text.get(token.t1_lower)
+        if d:
+            result.update(d)
+        lemmas: Iterable[str]
+        if token.t0 == TOK.WORD and token.t2:
+            # Word found in BÍN: look up terminals by the word categories
+            # and lemmas of its meanings
+            result.update(self._always_word)
+            by_category = self._by_category
+            meanings = token.meanings
+            for cat in {BIN_Token.KIND.get(m.ordfl, m.ordfl) for m in meanings}:
+                d = by_category.get(cat)
+                if d:
+                    result.update(d)
+            lemmas = {m.stofn for m in meanings}
+        else:
+            by_first = self._by_first
+            for first in firsts:
+                d = by_first.get(first)
+                if d:
+                    result.update(d)
+            if token.t0 == TOK.PERSON:
+                lemmas = {pn.name for pn in token.person_names}
+            elif token.t0 == TOK.PUNCTUATION:
+                lemmas = (token.t1,)
+            else:
+                lemmas = self._KIND_LEMMAS.get(token.t0, ())
+        for lemma in lemmas:
+            d = by_lemma.get(lemma)
+            if d:
+                result.update(d)
+        return result
+
 
 class BIN_Parser(Base_Parser):
     """BIN_Parser parses sentences according to the Icelandic
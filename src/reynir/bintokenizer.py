@@ -58,6 +58,7 @@ from typing_extensions import TypedDict
 import sys
 import re
 from collections import defaultdict
+from time import thread_time
 
 from tokenizer import (
     TOK,
@@ -78,7 +79,7 @@ from tokenizer.definitions import (
 from tokenizer.abbrev import Abbreviations
 
 from .settings import StaticPhrases, AmbigPhrases, DisallowedNames, NamePreferences
-from .bindb import GreynirBin
+from .bindb import GreynirBin, LookupKey
 
 
 class TokenDict(TypedDict, total=False):
@@ -137,6 +138,25 @@ class CanonicalTokenDict(TypedDict, total=False):
     v: Union[str, float, Dict[str, Any]]
 
 
+class PhaseStats(TypedDict):
+
+    """Statistics for a single phase of an instrumented tokenization
+    pipeline, as returned from DefaultPipeline.report"""
+
+    # Name of the phase, e.g. 'annotate'
+    phase: str
+    # Number of tokens read from the previous phase
+    tokens_in: int
+    # Number of tokens yielded by this phase
+    tokens_out: int
+    # CPU time, in seconds, spent within this phase,
+    # excluding the time spent in previous phases
+    cpu_time: float
+    # Maximum number of tokens that the phase read from the previous
+    # phase before yielding a token, i.e. its peak look-ahead
+    max_lookahead: int
+
+
 if "PyPy 7.3.0" in sys.version or "PyPy 7.2." in sys.version:
     # Patch bug in PyPy 7.2/7.3.0, which may raise an erroneous exception on str.rsplit()
     def all_except_suffix(s: str) -> str:  # type: ignore
@@ -612,26 +632,37 @@ class Bin_TOK(TOK):
         pass
 
 
+# A suggested number of tokens whose word forms are looked up together
+# in annotate(), when batching is requested
+ANNOTATE_BATCH_SIZE = 500
+
+
 def annotate(
     db: GreynirBin,
     token_ctor: TokenConstructor,
     token_stream: TokenIterator,
     *,
     auto_uppercase: bool = False,
-    no_sentence_start: bool = False
+    no_sentence_start: bool = False,
+    batch_size: int = 1
 ):
     """Look up word forms in the BIN word database. If auto_uppercase
     is True, change lower case words to uppercase if it looks likely
     that they should be uppercase. If no_sentence_start is True,
-    don't assume that the token stream starts a sentence."""
+    don't assume that the token stream starts a sentence. If batch_size
+    is greater than 1, the tokens are processed in batches of up to
+    batch_size tokens, where each distinct word form within a batch is
+    only looked up once. A batch always ends at the end of a sentence,
+    so that a finished sentence is never held back waiting for input."""
 
     at_sentence_start = False
+    batch: List[Tuple[Tok, bool]] = []
 
     # Consume the iterable source in token_stream (which may be a generator)
     for t in token_stream:
+        # Note whether the token is at a sentence starting point
+        batch.append((t, at_sentence_start))
         if t.kind != TOK.WORD:
-            # Not a word: relay the token unchanged
-            yield t
             if t.kind == TOK.S_BEGIN or t.punctuation == ":":
                 # After an S_BEGIN, and also after a colon, we consider ourselves
                 # to be at a sentence starting point - unless
@@ -641,16 +672,49 @@ def annotate(
                 # Wait until we have something other than punctuation or an
                 # ordinal number to conclude that the sentence has started
                 at_sentence_start = False
+        else:
+            # After a word token: definitely no longer at sentence start
+            at_sentence_start = False
+        if len(batch) >= batch_size or t.kind == TOK.S_END:
+            yield from _annotate_batch(db, token_ctor, batch, auto_uppercase)
+            batch = []
+    if batch:
+        yield from _annotate_batch(db, token_ctor, batch, auto_uppercase)
+
+
+def _annotate_batch(
+    db: GreynirBin,
+    token_ctor: TokenConstructor,
+    batch: List[Tuple[Tok, bool]],
+    auto_uppercase: bool,
+) -> TokenIterator:
+    """Annotate a batch of (token, at_sentence_start) tuples"""
+
+    def lookup_key(t: Tok, at_sentence_start: bool) -> LookupKey:
+        # If word is found in PREFER_LOWERCASE we skip searching uppercase meanings
+        # (if auto_uppercase is True)
+        w = t.txt
+        return w, at_sentence_start, auto_uppercase and w not in PREFER_LOWERCASE
+
+    # Look up the distinct word forms of the batch in the BÍN database
+    found = db.lookup_g_batch(
+        lookup_key(t, at_sentence_start)
+        for t, at_sentence_start in batch
+        if t.kind == TOK.WORD and not t.val
+    )
+
+    for t, at_sentence_start in batch:
+        if t.kind != TOK.WORD:
+            # Not a word: relay the token unchanged
+            yield t
             continue
         # This is a word token
         w = t.txt
         if not t.val:
-            # Look up word in BÍN database
-            # If word is found in PREFER_LOWERCASE we skip searching uppercase meanings
-            # (if auto_uppercase is True)
-            w, m = db.lookup_g(
-                w, at_sentence_start, auto_uppercase and w not in PREFER_LOWERCASE
-            )
+            # Get the meanings of the word from the batch lookup,
+            # making a copy since the same word may occur more than once
+            w, m = found[lookup_key(t, at_sentence_start)]
+            m = list(m)
             if not m:
                 # No meaning found in BÍN
                 # Check exceptional cases involving hyphens
@@ -748,8 +812,6 @@ def annotate(
                     if auto_uppercase:
                         w = w_new
             yield token_ctor.Word(w, meanings, token=t)
-        # We have yielded a word token: definitely no longer at sentence start
-        at_sentence_start = False
 
 
 def match_stem_list(
@@ -2093,6 +2155,78 @@ def disambiguate_phrases(
     yield from ds.process(token_stream)
 
 
+class PhaseMeter:
+
+    """An iterator that wraps the token stream of a tokenization phase,
+    counting its tokens and measuring the CPU time spent producing them"""
+
+    __slots__ = (
+        "name",
+        "upstream",
+        "tokens_out",
+        "cpu_time",
+        "max_lookahead",
+        "_stream",
+        "_last_in",
+    )
+
+    def __init__(
+        self, name: str, stream: TokenIterator, upstream: Optional["PhaseMeter"]
+    ) -> None:
+        self.name = name
+        self.upstream = upstream
+        self.tokens_out = 0
+        # Cumulative CPU time, including the time spent in previous phases
+        self.cpu_time = 0.0
+        self.max_lookahead = 0
+        self._stream = iter(stream)
+        # Number of tokens read from the previous phase at the last yield
+        self._last_in = 0
+
+    def __iter__(self) -> "PhaseMeter":
+        return self
+
+    def __next__(self) -> Tok:
+        t0 = thread_time()
+        try:
+            tok = next(self._stream)
+        finally:
+            self.cpu_time += thread_time() - t0
+        self.tokens_out += 1
+        upstream = self.upstream
+        if upstream is not None:
+            tokens_in = upstream.tokens_out
+            lookahead = tokens_in - self._last_in
+            if lookahead > self.max_lookahead:
+                self.max_lookahead = lookahead
+            self._last_in = tokens_in
+        return tok
+
+    def stats(self) -> PhaseStats:
+        """Return the statistics for this phase"""
+        upstream = self.upstream
+        return PhaseStats(
+            phase=self.name,
+            tokens_in=0 if upstream is None else upstream.tokens_out,
+            tokens_out=self.tokens_out,
+            cpu_time=max(
+                0.0, self.cpu_time - (0.0 if upstream is None else upstream.cpu_time)
+            ),
+            max_lookahead=self.max_lookahead,
+        )
+
+    def report(self) -> List[PhaseStats]:
+        """Return a list of statistics for this phase and all previous
+        phases, in pipeline order"""
+        result: List[PhaseStats] = []
+        meter: Optional[PhaseMeter] = self
+        while meter is not None:
+            result.append(meter.stats())
+            meter = meter.upstream
+        result.reverse()
+        return result
+
+
 class DefaultPipeline:
 
     """A DefaultPipeline encapsulates a sequence of tokenization
@@ -2108,8 +2242,16 @@ class DefaultPipeline:
         self._auto_uppercase: bool = options.pop("auto_uppercase", False)
         self._no_sentence_start: bool = options.pop("no_sentence_start", False)
         self._no_multiply_numbers: bool = options.pop("no_multiply_numbers", False)
+        # Set instrument to True to collect statistics on each phase,
+        # available from the report property after tokenization
+        self._instrument: bool = options.pop("instrument", False)
+        # Set annotate_batch_size to a number greater than 1, such as
+        # ANNOTATE_BATCH_SIZE, to look up word forms in batches
+        self._annotate_batch_size: int = options.pop("annotate_batch_size", 1)
         self._options = options
         self._db: Optional[GreynirBin] = None
+        # The meter wrapping the last phase, if instrumented
+        self._meter: Optional[PhaseMeter] = None
         # Initialize the default tokenizer pipeline.
         # This sequence of phases can be modified in derived classes.
         self._phases: List[PhaseFunction] = [
@@ -2149,6 +2291,7 @@ class DefaultPipeline:
             stream,
             auto_uppercase=self._auto_uppercase,
             no_sentence_start=self._no_sentence_start,
+            batch_size=self._annotate_batch_size,
         )
 
     def recognize_entities(self, stream: TokenIterator) -> TokenIterator:
@@ -2211,15 +2354,31 @@ class DefaultPipeline:
             try:
                 self._db = db
                 # First tokenization phase
-                token_stream = cast(FirstPhaseFunction, self._phases[0])()
+                first_phase = self._phases[0]
+                token_stream = cast(FirstPhaseFunction, first_phase)()
+                if self._instrument:
+                    token_stream = self._meter = PhaseMeter(
+                        first_phase.__name__, token_stream, None
+                    )
                 # Stack the other phases on top of each other
                 for phase in self._phases[1:]:
                     token_stream = cast(FollowingPhaseFunction, phase)(token_stream)
+                    if self._instrument:
+                        token_stream = self._meter = PhaseMeter(
+                            phase.__name__, token_stream, self._meter
+                        )
                 # ...and return the resulting chained generator
                 return token_stream
             finally:
                 self._db = None
 
+    @property
+    def report(self) -> Optional[List[PhaseStats]]:
+        """Return a list of statistics for each phase of the pipeline,
+        in order, or None if the pipeline is not instrumented. The
+        statistics cover the tokens that have been generated so far."""
+        return None if self._meter is None else self._meter.report()
+
 
 def tokenize(text: StringIterable, **options: Any) -> TokenIterator:
     """Tokenize text using the default pipeline"""
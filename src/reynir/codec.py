@@ -0,0 +1,395 @@
+"""
+
+    Greynir: Natural language processing for Icelandic
+
+    Compact binary codec
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    This module implements a compact binary encoding of JSON-compatible
+    data, i.e. None, booleans, integers, floats, strings, lists (and tuples)
+    and dicts, which is used to serialize parsed sentences via
+    _Sentence.dumpb() and Greynir.dumpb_single().
+
+    decode(encode(obj)) returns exactly what json.loads(json.dumps(obj))
+    would: tuples become lists and non-string dict keys are converted
+    to strings, as in JSON, while the order of dict keys is retained.
+
+    The encoding starts with a magic number and a schema version,
+    followed by a single encoded value. Each value starts with a tag
+    byte, whose high three bits give its type and whose low five bits
+    hold a small number: the value of an integer, the length of a string,
+    list or dict, or the index of a previously seen string. Numbers
+    that do not fit in the tag byte follow it as unsigned LEB128 varints.
+
+    Each distinct string is stored only once. Later occurrences refer to
+    it by index into a table that starts with the predefined strings in
+    STATIC_STRINGS, namely the dict keys and the most frequent values of
+    the canonical token dicts of simplified trees, and continues with
+    the strings of the encoded value in order of first occurrence.
+
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import struct
+
+
+# Increment this when the encoding or STATIC_STRINGS are modified
+SCHEMA_VERSION = 1
+
+MAGIC = b"GRB"
+
+# Strings that are implicitly present at the start of the string table.
+# The first 31 of these are referred to by a single byte.
+STATIC_STRINGS: Tuple[str, ...] = (
+    # Keys of the sentence dump and of canonical token dicts
+    "tokens",
+    "tree",
+    "k",
+    "x",
+    "t",
+    "s",
+    "c",
+    "f",
+    "b",
+    "a",
+    "ix",
+    "v",
+    "i",
+    "n",
+    "p",
+    "o",
+    # Frequent values
+    "NONTERMINAL",
+    "WORD",
+    "PUNCTUATION",
+    "alm",
+    "kk",
+    "kvk",
+    "hk",
+    "so",
+    "lo",
+    "fs",
+    "ao",
+    "st",
+    "-",
+    "abfn",
+    "pfn",
+)
+
+# Value types, kept in the high three bits of the tag byte
+_SPECIAL = 0 << 5
+_UINT = 1 << 5
+_NEGINT = 2 << 5
+_STRREF = 3 << 5
+_STR = 4 << 5
+_LIST = 5 << 5
+_DICT = 6 << 5
+
+# Small numbers are kept in the low five bits of the tag byte,
+# while this value signals that a varint follows
+_IMMEDIATE_MAX = 31
+
+# Tags below this value refer to strings by a single byte
+_STRREF_MAX = _STRREF | _IMMEDIATE_MAX
+
+# Special values
+_NONE = _SPECIAL | 0
+_FALSE = _SPECIAL | 1
+_TRUE = _SPECIAL | 2
+_FLOAT = _SPECIAL | 3
+
+_DOUBLE = struct.Struct("<d")
+
+# Marks a dict that is waiting for a key, while decoding
+_NO_KEY = object()
+
+
+
+def write_varint(out: bytearray, n: int) -> None:
+    """Append a non-negative integer to out, as an unsigned LEB128 varint"""
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint from data at the given position,
+    returning the number and the position following it"""
+    n = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _string_ref(ix: int) -> bytes:
+    """Return the encoded reference to the string at the given index
+    of the string table"""
+    if ix < _IMMEDIATE_MAX:
+        return bytes([_STRREF | ix])
+    ref = bytearray([_STRREF | _IMMEDIATE_MAX])
+    write_varint(ref, ix - _IMMEDIATE_MAX)
+    return bytes(ref)
+
+
+# The encoded references to the static strings
+_STATIC_REFS: Dict[str, bytes] = {
+    s: _string_ref(ix) for ix, s in enumerate(STATIC_STRINGS)
+}
+
+
+def _json_key(key: Any) -> str:
+    """Convert a dict key to a string, as the json module does"""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    raise TypeError(
+        "Keys must be str, int, float, bool or None, not {0}".format(
+            key.__class__.__name__
+        )
+    )
+
+
+def encode(obj: Any) -> bytes:
+    """Encode a JSON-compatible object as bytes"""
+    out = bytearray(MAGIC)
+    write_varint(out, SCHEMA_VERSION)
+    append = out.append
+    extend = out.extend
+    # The encoded references to the strings seen so far, starting
+    # with the (pre-encoded) static strings
+    refs: Dict[str, bytes] = dict(_STATIC_REFS)
+
+    def head(kind: int, n: int) -> None:
+        if n < _IMMEDIATE_MAX:
+            append(kind | n)
+        else:
+            append(kind | _IMMEDIATE_MAX)
+            write_varint(out, n - _IMMEDIATE_MAX)
+
+    def new_string(s: str) -> None:
+        # Store a string that has not been seen before, noting
+        # the encoded reference to it for later occurrences
+        refs[s] = _string_ref(len(refs))
+        b = s.encode("utf-8")
+        head(_STR, len(b))
+        extend(b)
+
+    def value(obj: Any) -> None:
+        # The most frequent types are checked first, by identity, and
+        # the strings and integers within containers are encoded inline
+        t = type(obj)
+        if t is str:
+            ref = refs.get(obj)
+            if ref is None:
+                new_string(obj)
+            else:
+                extend(ref)
+        elif t is dict:
+            n = len(obj)
+            if n < _IMMEDIATE_MAX:
+                append(_DICT | n)
+            else:
+                head(_DICT, n)
+            for key, val in obj.items():
+                if type(key) is not str:
+                    key = _json_key(key)
+                ref = refs.get(key)
+                if ref is None:
+                    new_string(key)
+                else:
+                    extend(ref)
+                if type(val) is str:
+                    ref = refs.get(val)
+                    if ref is None:
+                        new_string(val)
+                    else:
+                        extend(ref)
+                else:
+                    value(val)
+        elif t is list:
+            n = len(obj)
+            if n < _IMMEDIATE_MAX:
+                append(_LIST | n)
+            else:
+                head(_LIST, n)
+            for item in obj:
+                item_type = type(item)
+                if item_type is str:
+                    ref = refs.get(item)
+                    if ref is None:
+                        new_string(item)
+                    else:
+                        extend(ref)
+                elif item_type is int and item >= 0:
+                    if item < _IMMEDIATE_MAX:
+                        append(_UINT | item)
+                    else:
+                        append(_UINT | _IMMEDIATE_MAX)
+                        write_varint(out, item - _IMMEDIATE_MAX)
+                else:
+                    value(item)
+        elif obj is None:
+            append(_NONE)
+        elif obj is True:
+            append(_TRUE)
+        elif obj is False:
+            append(_FALSE)
+        elif isinstance(obj, int):
+            if obj >= 0:
+                head(_UINT, obj)
+            else:
+                head(_NEGINT, -obj - 1)
+        elif isinstance(obj, float):
+            append(_FLOAT)
+            extend(_DOUBLE.pack(obj))
+        elif isinstance(obj, str):
+            # A str subclass
+            value(str(obj))
+        elif isinstance(obj, dict):
+            value(dict(obj))
+        elif isinstance(obj, (list, tuple)):
+            value(list(obj))
+        else:
+            raise TypeError(
+                "Object of type {0} cannot be encoded".format(obj.__class__.__name__)
+            )
+
+    value(obj)
+    return bytes(out)
+
+
+def decode(data: bytes) -> Any:
+    """Decode an object from bytes that were created by encode()"""
+    if data[0 : len(MAGIC)] != MAGIC:
+        raise ValueError("Data is not in the binary sentence format")
+    version, pos = read_varint(data, len(MAGIC))
+    if version != SCHEMA_VERSION:
+        raise ValueError(
+            "Unsupported schema version {0}, expected {1}".format(
+                version, SCHEMA_VERSION
+            )
+        )
+    strings: List[str] = list(STATIC_STRINGS)
+    # The containers that are being filled, innermost last, each with the
+    # number of items that remain to be read into it and, for dicts,
+    # the key read for the next item. Containers are filled in a loop,
+    # without recursion, and the result is the single item of root.
+    root: List[Any] = []
+    stack: List[Tuple[Any, bool, int, Any]] = []
+    container: Any = root
+    is_list = True
+    remaining = 1
+    key: Any = _NO_KEY
+    try:
+        while True:
+            tag = data[pos]
+            pos += 1
+            if _STRREF <= tag < _STRREF_MAX:
+                # Shortcut for strings referred to by a single tag byte
+                item = strings[tag - _STRREF]
+            elif tag == _STRREF_MAX and data[pos] < 0x80:
+                # Shortcut for strings referred to by a single-byte varint
+                item = strings[_IMMEDIATE_MAX + data[pos]]
+                pos += 1
+            else:
+                n = tag & _IMMEDIATE_MAX
+                if n == _IMMEDIATE_MAX:
+                    m, pos = read_varint(data, pos)
+                    n += m
+                kind = tag & 0xE0
+                if kind == _STR:
+                    item = str(data[pos : pos + n], "utf-8")
+                    pos += n
+                    strings.append(item)
+                elif kind == _UINT:
+                    item = n
+                elif kind == _STRREF:
+                    item = strings[n]
+                elif kind == _LIST or kind == _DICT:
+                    item = [] if kind == _LIST else {}
+                    if n:
+                        # Read the items of the new container
+                        stack.append((container, is_list, remaining, key))
+                        container = item
+                        is_list = kind == _LIST
+                        remaining = n
+                        key = _NO_KEY
+                        continue
+                elif kind == _NEGINT:
+                    item = -n - 1
+                elif tag == _NONE:
+                    item = None
+                elif tag == _TRUE:
+                    item = True
+                elif tag == _FALSE:
+                    item = False
+                elif tag == _FLOAT:
+                    item = _DOUBLE.unpack_from(data, pos)[0]
+                    pos += _DOUBLE.size
+                else:
+                    raise ValueError(
+                        "Invalid tag {0:#04x} at position {1}".format(tag, pos - 1)
+                    )
+            # Put the item into the innermost container, and
+            # close the containers that are thereby completed
+            while True:
+                if is_list:
+                    container.append(item)
+                elif key is _NO_KEY:
+                    # This is a dict key: the value follows
+                    key = item
+                    break
+                else:
+                    container[key] = item
+                    key = _NO_KEY
+                remaining -= 1
+                if remaining or not stack:
+                    break
+                item = container
+                container, is_list, remaining, key = stack.pop()
+            if not remaining and not stack:
+                break
+    except (IndexError, struct.error):
+        raise ValueError("Binary sentence data is truncated or corrupt")
+    result = root[0]
+    if pos != len(data):
+        raise ValueError("Unexpected data at position {0}".format(pos))
+    return result
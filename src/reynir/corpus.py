@@ -0,0 +1,740 @@
+"""
+
+    Greynir: Natural language processing for Icelandic
+
+    Columnar corpus store
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    This module implements a file format for storing a large number of
+    parsed sentences, i.e. a corpus. CorpusWriter writes the file and
+    Corpus reads it.
+
+    The data of all sentences is stored in columns, i.e. flat arrays of
+    fixed-size integers, one for each attribute of tokens and tree nodes:
+    token kinds and texts, and the kind, text, lemma, terminal, category
+    etc. of each node of the simplified trees, in preorder. Strings are
+    stored once, in a string table, and referred to by index. Per-sentence
+    offset columns give the first token and the first node of each
+    sentence. The tree topology is kept in a column holding, for each node,
+    the index of the node that follows its subtree.
+
+    A corpus file is opened with mmap, so that opening it takes constant
+    time, sentences are accessed by index in constant time, and only the
+    pages that are actually touched are read from disk. The simplified tree
+    of a stored sentence is a SimpleTree wrapping lazy node records, which
+    read their attributes from the columns on demand, and a sentence's
+    lemmas can be read from the columns without creating a tree at all.
+
+    The file starts with a magic number, a version number and a JSON
+    directory giving the type, position and length of each column.
+    All numbers are little-endian.
+
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import json
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from .codec import encode, decode
+from .simpletree import SimpleTree
+from .reynir import Greynir, GreynirType, _Sentence
+
+
+# Increment this when the file format is modified
+CORPUS_VERSION = 1
+
+MAGIC = b"GRCORPUS"
+
+_HEADER = struct.Struct("<II")
+
+# Columns are aligned to this number of bytes within the file
+_ALIGNMENT = 8
+
+# The number of items that are buffered in memory for each column
+# before being written to a temporary file
+_FLUSH_SIZE = 1 << 16
+
+# Keys of canonical node dicts whose string values are stored in columns
+# of string table indices. Values that are not strings are stored with
+# the other node values (see below).
+STRING_KEYS = ("k", "n", "i", "x", "t", "s", "o", "c", "f", "b", "a")
+
+# The columns of a corpus file, with their array type codes
+COLUMNS: Dict[str, str] = {
+    # Offsets of each sentence's first token and first node,
+    # with a final entry giving the total count
+    "sent_tokens": "Q",
+    "sent_nodes": "Q",
+    # Offsets of each sentence's encoded token values and node values
+    # within the value heaps, with a final entry giving the heap size
+    "sent_tok_values": "Q",
+    "sent_node_values": "Q",
+    # Token kinds, and string table index + 1 of token texts (0 for None)
+    "tok_kind": "i",
+    "tok_txt": "I",
+    # For each node, the sentence-relative index of the node following
+    # its subtree (the node's own index + 1 for a node without children)
+    "node_end": "I",
+    # For each node, the index of its key tuple within the directory's
+    # list of shapes, giving the keys of the node dict in order
+    "node_shape": "I",
+    # Token indices of terminal nodes, or -1 if not present as an integer
+    "node_ix": "i",
+    # String table index + 1 of the values of the keys in STRING_KEYS,
+    # or 0 if not present as a string
+    **{"node_" + key: "I" for key in STRING_KEYS},
+    # Heaps of encoded token values and of node values that are not
+    # stored in the columns above, such as the 'v' values of terminals
+    "tok_values": "B",
+    "node_values": "B",
+    # The string table: offsets into the UTF-8 encoded heap
+    "str_off": "Q",
+    "str_heap": "B",
+}
+
+NodeDict = Dict[str, Any]
+
+
+class _Column:
+
+    """A column that is being written. Items are buffered in memory
+    and spilled to a temporary file."""
+
+    def __init__(self, typecode: str) -> None:
+        self.typecode = typecode
+        self.count = 0
+        self._buffer = array(typecode)
+        self._file = tempfile.TemporaryFile()
+
+    def append(self, item: int) -> None:
+        self._buffer.append(item)
+        if len(self._buffer) >= _FLUSH_SIZE:
+            self.flush()
+
+    def extend(self, items: Union[Sequence[int], bytes]) -> None:
+        if isinstance(items, bytes):
+            self._buffer.frombytes(items)
+        else:
+            self._buffer.extend(items)
+        if len(self._buffer) >= _FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        buf = self._buffer
+        if buf:
+            self.count += len(buf)
+            if sys.byteorder == "big":
+                buf.byteswap()
+            buf.tofile(self._file)
+            self._buffer = array(self.typecode)
+
+    @property
+    def nbytes(self) -> int:
+        return self.count * self._buffer.itemsize
+
+    def copy_to(self, f: Any) -> None:
+        """Copy the column's data to the given file object"""
+        self._file.seek(0)
+        shutil.copyfileobj(self._file, f)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CorpusWriter:
+
+    """Writes parsed sentences to a corpus file, which can be read
+    using the Corpus class. Sentences are added with add() and the file
+    is written by close(), which is also called on exiting a with block.
+    The column data is kept in temporary files until then, while the
+    string table is kept in memory."""
+
+    def __init__(
+        self, path: str, greynir_cls: Optional[GreynirType] = None
+    ) -> None:
+        self._path = path
+        self._greynir_cls = greynir_cls or Greynir
+        self._columns = {name: _Column(tc) for name, tc in COLUMNS.items()}
+        self._strings: Dict[str, int] = {}
+        self._shapes: Dict[Tuple[str, ...], int] = {}
+        self._count = 0
+        self._closed = False
+        # The current values of the offset columns, which start with 0
+        self._offsets: Dict[str, int] = {}
+        for name in (
+            "sent_tokens",
+            "sent_nodes",
+            "sent_tok_values",
+            "sent_node_values",
+            "str_off",
+        ):
+            self._offsets[name] = 0
+            self._columns[name].append(0)
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of sentences added so far"""
+        return self._count
+
+    def _string(self, s: str) -> int:
+        """Return the string table index + 1 of the given string"""
+        ix = self._strings.get(s)
+        if ix is None:
+            ix = self._strings[s] = len(self._strings)
+            b = s.encode("utf-8")
+            self._columns["str_heap"].extend(b)
+            self._advance("str_off", len(b))
+        return ix + 1
+
+    def _advance(self, name: str, n: int) -> None:
+        """Append the next entry of an offset column"""
+        offset = self._offsets[name] + n
+        self._offsets[name] = offset
+        self._columns[name].append(offset)
+
+    def _add_values(self, name: str, offsets: str, values: Any) -> None:
+        """Append encoded values to a value heap, if any"""
+        b = encode(values) if values else b""
+        self._columns[name].extend(b)
+        self._advance(offsets, len(b))
+
+    def add(self, sent: _Sentence) -> int:
+        """Add a sentence to the corpus, returning its index"""
+        d = sent.dump(self._greynir_cls)
+        return self.add_dump(d["tokens"], d["tree"])
+
+    def add_dump(
+        self, tokens: Sequence[Sequence[Any]], tree: Optional[Mapping[str, Any]]
+    ) -> int:
+        """Add a sentence in the form returned by _Sentence.dump(),
+        i.e. a list of (kind, txt, val) token tuples and the simplified
+        tree as a nested dict, or None. Return the sentence's index."""
+        if self._closed:
+            raise ValueError("Corpus has already been written")
+        columns = self._columns
+        string = self._string
+        kinds: List[int] = []
+        txts: List[int] = []
+        vals: List[Any] = []
+        for kind, txt, val in tokens:
+            kinds.append(kind)
+            txts.append(0 if txt is None else string(txt))
+            vals.append(val)
+        columns["tok_kind"].extend(kinds)
+        columns["tok_txt"].extend(txts)
+        self._advance("sent_tokens", len(kinds))
+        # Don't store anything if all token values are None
+        self._add_values(
+            "tok_values",
+            "sent_tok_values",
+            vals if any(v is not None for v in vals) else None,
+        )
+
+        ends: List[int] = []
+        shapes: List[int] = []
+        ixs: List[int] = []
+        strs: Dict[str, List[int]] = {key: [] for key in STRING_KEYS}
+        # (node index, dict of values not stored in columns) tuples
+        node_values: List[Tuple[int, NodeDict]] = []
+
+        def walk(node: Mapping[str, Any]) -> None:
+            ix = len(ends)
+            ends.append(0)
+            keys = tuple(node.keys())
+            shape = self._shapes.get(keys)
+            if shape is None:
+                shape = self._shapes[keys] = len(self._shapes)
+            shapes.append(shape)
+            other: NodeDict = {}
+            for key in STRING_KEYS:
+                val = node.get(key)
+                if isinstance(val, str):
+                    strs[key].append(string(val))
+                else:
+                    strs[key].append(0)
+                    if key in node:
+                        other[key] = val
+            val = node.get("ix")
+            if type(val) is int and 0 <= val < 1 << 31:
+                ixs.append(val)
+            else:
+                ixs.append(-1)
+                if "ix" in node:
+                    other["ix"] = val
+            for key in keys:
+                if key not in strs and key != "p" and key != "ix":
+                    other[key] = node[key]
+            if other:
+                node_values.append((ix, other))
+            if "p" in node:
+                children = node["p"]
+                if not isinstance(children, list):
+                    raise ValueError("Node children must be given in a list")
+                for child in children:
+                    walk(child)
+            ends[ix] = len(ends)
+
+        if tree is not None:
+            walk(tree)
+        columns["node_end"].extend(ends)
+        columns["node_shape"].extend(shapes)
+        columns["node_ix"].extend(ixs)
+        for key, ids in strs.items():
+            columns["node_" + key].extend(ids)
+        self._advance("sent_nodes", len(ends))
+        self._add_values("node_values", "sent_node_values", node_values)
+        self._count += 1
+        return self._count - 1
+
+    def close(self) -> None:
+        """Write the corpus file"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            directory: Dict[str, Any] = {
+                "sentences": self._count,
+                "shapes": list(self._shapes),
+                "columns": {},
+            }
+            offset = 0
+            for name, column in self._columns.items():
+                column.flush()
+                directory["columns"][name] = [column.typecode, offset, column.count]
+                offset += column.nbytes
+                offset += -offset % _ALIGNMENT
+            dir_bytes = json.dumps(directory, ensure_ascii=False).encode("utf-8")
+            with open(self._path, "wb") as f:
+                f.write(MAGIC)
+                f.write(_HEADER.pack(CORPUS_VERSION, len(dir_bytes)))
+                f.write(dir_bytes)
+                f.write(bytes(-f.tell() % _ALIGNMENT))
+                for column in self._columns.values():
+                    column.copy_to(f)
+                    f.write(bytes(-column.nbytes % _ALIGNMENT))
+        finally:
+            for column in self._columns.values():
+                column.close()
+
+
+class _CorpusNode(Mapping[str, Any]):
+
+    """A read-only, dict-like record for a node of a simplified tree
+    within a corpus, which reads its values from the corpus columns
+    when they are accessed. SimpleTree can wrap these records
+    instead of the canonical node dicts."""
+
+    __slots__ = ("_sent", "_ix", "_keys", "_children")
+
+    def __init__(self, sent: "CorpusSentence", ix: int) -> None:
+        self._sent = sent
+        # Index of this node within its sentence
+        self._ix = ix
+        corpus = sent._corpus
+        self._keys = corpus._shapes[corpus._node_shape[sent._first_node + ix]]
+        self._children: Optional[List["_CorpusNode"]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._value(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._keys:
+            return default
+        return self._value(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def _value(self, key: str) -> Any:
+        """Return the value of a key that is known to be present"""
+        if key == "p":
+            return self.children
+        sent = self._sent
+        corpus = sent._corpus
+        column = corpus._string_columns.get(key)
+        if column is not None:
+            sid = column[sent._first_node + self._ix]
+            if sid:
+                return corpus.string(sid - 1)
+        elif key == "ix":
+            ix = corpus._node_ix[sent._first_node + self._ix]
+            if ix >= 0:
+                return ix
+        return sent._node_values()[self._ix][key]
+
+    @property
+    def children(self) -> List["_CorpusNode"]:
+        """The records of this node's children, created on first access.
+        The same record objects are returned on each access."""
+        if self._children is None:
+            sent = self._sent
+            end = sent._corpus._node_end
+            first = sent._first_node
+            children: List["_CorpusNode"] = []
+            ix = self._ix + 1
+            stop = end[first + self._ix]
+            while ix < stop:
+                children.append(_CorpusNode(sent, ix))
+                ix = end[first + ix]
+            self._children = children
+        return self._children
+
+    def to_dict(self) -> NodeDict:
+        """Return the node, including its subtree, as a canonical dict"""
+        return {
+            key: [c.to_dict() for c in self.children] if key == "p" else self[key]
+            for key in self._keys
+        }
+
+
+class CorpusSentence:
+
+    """A view of a sentence within a corpus. Its tokens, lemmas
+    and simplified tree are read from the corpus columns on demand."""
+
+    def __init__(self, corpus: "Corpus", index: int) -> None:
+        self._corpus = corpus
+        self._index = index
+        self._first_node = corpus._sent_nodes[index]
+        self._num_nodes = corpus._sent_nodes[index + 1] - self._first_node
+        self._root: Optional[_CorpusNode] = None
+        self._tree: Optional[SimpleTree] = None
+        self._values: Optional[Dict[int, NodeDict]] = None
+
+    def __repr__(self) -> str:
+        return "<CorpusSentence {0}>".format(self._index)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __len__(self) -> int:
+        """Return the number of tokens in the sentence"""
+        tokens = self._corpus._sent_tokens
+        return tokens[self._index + 1] - tokens[self._index]
+
+    @property
+    def index(self) -> int:
+        """The index of this sentence within the corpus"""
+        return self._index
+
+    def _node_values(self) -> Dict[int, NodeDict]:
+        """Return the node values that are not stored in columns,
+        keyed by node index, decoding them on first access"""
+        if self._values is None:
+            self._values = {
+                ix: values
+                for ix, values in self._corpus._decode_values(
+                    "node_values", "sent_node_values", self._index
+                )
+                or ()
+            }
+        return self._values
+
+    @property
+    def token_texts(self) -> List[Optional[str]]:
+        """The original texts of the sentence's tokens"""
+        corpus = self._corpus
+        tokens = corpus._sent_tokens
+        string = corpus.string
+        return [
+            None if sid == 0 else string(sid - 1)
+            for sid in corpus._tok_txt[tokens[self._index] : tokens[self._index + 1]]
+        ]
+
+    @property
+    def tokens(self) -> List[List[Any]]:
+        """The sentence's tokens as [kind, txt, val] lists,
+        as in the JSON form of a dumped sentence"""
+        corpus = self._corpus
+        tokens = corpus._sent_tokens
+        kinds = corpus._tok_kind[tokens[self._index] : tokens[self._index + 1]]
+        vals = corpus._decode_values("tok_values", "sent_tok_values", self._index)
+        if vals is None:
+            vals = [None] * len(kinds)
+        return [
+            [kind, txt, val] for kind, txt, val in zip(kinds, self.token_texts, vals)
+        ]
+
+    @property
+    def text(self) -> str:
+        """Return a raw text representation of the sentence,
+        with spaces between all tokens"""
+        return " ".join(t for t in self.token_texts if t)
+
+    @property
+    def lemmas(self) -> Optional[List[str]]:
+        """The lemmas of the sentence's terminals, or None
+        if the sentence has no parse tree"""
+        return self._corpus.lemmas(self._index)
+
+    @property
+    def tree(self) -> Optional[SimpleTree]:
+        """The simplified tree of the sentence, or None if it has
+        no parse tree. Tree nodes are read on demand."""
+        if self._tree is None and self._num_nodes:
+            self._root = _CorpusNode(self, 0)
+            self._tree = SimpleTree([[cast(Any, self._root)]])
+        return self._tree
+
+    def dump(self) -> Dict[str, Any]:
+        """Return the sentence as plain lists and dicts,
+        as json.loads() returns them from Greynir.dumps_single()"""
+        return {
+            "tokens": self.tokens,
+            "tree": _CorpusNode(self, 0).to_dict() if self._num_nodes else None,
+        }
+
+    def to_sentence(self, greynir_cls: Optional[GreynirType] = None) -> _Sentence:
+        """Return a _Sentence object for this sentence, whose simplified
+        tree reads its nodes from the corpus on demand"""
+        tree = self.tree
+        return _Sentence.load(
+            greynir_cls or Greynir,
+            self.tokens,
+            None if tree is None else cast(Any, self._root),
+        )
+
+
+class Corpus:
+
+    """A read-only corpus of parsed sentences in a file written
+    by CorpusWriter. The file is memory-mapped, and sentences are
+    accessed by index, via corpus[index], or by iteration."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        with open(path, "rb") as f:
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self._views: List[memoryview] = []
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        data = self._mmap
+        assert data is not None
+        if data[0 : len(MAGIC)] != MAGIC:
+            raise ValueError("{0} is not a corpus file".format(self._path))
+        pos = len(MAGIC)
+        version, dir_len = _HEADER.unpack_from(data, pos)
+        if version != CORPUS_VERSION:
+            raise ValueError(
+                "Unsupported corpus file version {0}, expected {1}".format(
+                    version, CORPUS_VERSION
+                )
+            )
+        pos += _HEADER.size
+        directory = json.loads(str(data[pos : pos + dir_len], "utf-8"))
+        pos += dir_len
+        base = pos + -pos % _ALIGNMENT
+        self._len: int = directory["sentences"]
+        self._shapes: List[Tuple[str, ...]] = [tuple(s) for s in directory["shapes"]]
+        buffer = memoryview(data)
+        self._views.append(buffer)
+        columns: Dict[str, Sequence[int]] = {}
+        for name, (typecode, offset, count) in directory["columns"].items():
+            size = array(typecode).itemsize
+            start = base + offset
+            if start + count * size > len(data):
+                raise ValueError("Corpus file {0} is truncated".format(self._path))
+            view = buffer[start : start + count * size]
+            self._views.append(view)
+            if sys.byteorder == "big" and size > 1:
+                # The file is little-endian: copy and convert
+                column = array(typecode)
+                column.frombytes(view)
+                column.byteswap()
+                columns[name] = column
+            else:
+                cv = view.cast(typecode)
+                self._views.append(cv)
+                columns[name] = cv
+        self._columns = columns
+        self._sent_tokens = columns["sent_tokens"]
+        self._sent_nodes = columns["sent_nodes"]
+        self._tok_kind = columns["tok_kind"]
+        self._tok_txt = columns["tok_txt"]
+        self._node_end = columns["node_end"]
+        self._node_shape = columns["node_shape"]
+        self._node_ix = columns["node_ix"]
+        self._string_columns = {key: columns["node_" + key] for key in STRING_KEYS}
+        self._str_off = columns["str_off"]
+        self._str_heap = columns["str_heap"]
+        # Decoded strings, filled on demand
+        self._strings: List[Optional[str]] = [None] * (len(self._str_off) - 1)
+
+    def close(self) -> None:
+        """Close the corpus file. Sentences and trees obtained from
+        the corpus can no longer be accessed after this. If slices of
+        columns obtained via column() are still alive, the file remains
+        mapped into memory until they have been released."""
+        if self._mmap is None:
+            return
+        for view in reversed(self._views):
+            try:
+                view.release()
+            except BufferError:
+                # The caller holds a view of this view
+                pass
+        self._views = []
+        mm, self._mmap = self._mmap, None
+        try:
+            mm.close()
+        except BufferError:
+            # Views of the file are still alive, or (on PyPy) have not yet
+            # been garbage collected: the file is unmapped once they are gone
+            pass
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of sentences in the corpus"""
+        return self._len
+
+    def __getitem__(self, index: int) -> CorpusSentence:
+        """Return the sentence with the given index"""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("Corpus sentence index out of range")
+        return CorpusSentence(self, index)
+
+    def __iter__(self) -> Iterator[CorpusSentence]:
+        for index in range(self._len):
+            yield CorpusSentence(self, index)
+
+    @property
+    def shapes(self) -> List[Tuple[str, ...]]:
+        """The distinct key tuples of the tree nodes in the corpus,
+        indexed by the values of the node_shape column"""
+        return self._shapes
+
+    def column(self, name: str) -> Sequence[int]:
+        """Return the column with the given name (cf. COLUMNS) as a
+        read-only sequence of integers, typically a memoryview
+        of the memory-mapped file. The column can not be used
+        after the corpus has been closed."""
+        return self._columns[name]
+
+    def string(self, ix: int) -> str:
+        """Return the string with the given index within the string table"""
+        s = self._strings[ix]
+        if s is None:
+            off = self._str_off
+            s = self._strings[ix] = str(
+                self._str_heap[off[ix] : off[ix + 1]], "utf-8"
+            )
+        return s
+
+    def _decode_values(self, heap: str, offsets: str, index: int) -> Any:
+        """Decode the values stored for a sentence in a value heap,
+        returning None if there are none"""
+        off = self._columns[offsets]
+        start, stop = off[index], off[index + 1]
+        if start == stop:
+            return None
+        # Copy the data, since the decoder may hold on to it
+        # until garbage collection, preventing the file from being closed
+        return decode(bytes(self._columns[heap][start:stop]))
+
+    def lemmas(self, index: int) -> Optional[List[str]]:
+        """Return the lemmas of the terminals of the sentence with the
+        given index, as _Sentence.lemmas does, or None if the sentence
+        has no parse tree. The lemmas are read from the columns,
+        without creating a tree."""
+        sent_nodes = self._sent_nodes
+        first = sent_nodes[index]
+        stop = sent_nodes[index + 1]
+        if first == stop:
+            return None
+        end = self._node_end
+        s = self._string_columns["s"]
+        x = self._string_columns["x"]
+        shape = self._node_shape
+        shapes = self._shapes
+        string = self.string
+        result: List[str] = []
+        # Terminals are descendants of the root without children
+        for gi in range(first + 1, stop):
+            if end[gi] != gi - first + 1:
+                continue
+            sid = s[gi]
+            if sid:
+                result.append(string(sid - 1))
+                continue
+            keys = shapes[shape[gi]]
+            if "s" not in keys:
+                sid = x[gi]
+                if sid:
+                    result.append(string(sid - 1))
+                    continue
+                if "x" not in keys:
+                    result.append("")
+                    continue
+            # A lemma or text that is not a string: use the node record
+            node = _CorpusNode(CorpusSentence(self, index), gi - first)
+            result.append(node.get("s", node.get("x", "")))
+        return result
@@ -48,6 +48,10 @@
 #include <stdint.h>
 #include <assert.h>
 #include <time.h>
+#include <chrono>
+#include <vector>
+#include <deque>
+#include <unordered_map>
 
 #include "eparser.h"
 
@@ -67,6 +71,7 @@ public:
    ~AllocReporter(void);
 
    void report(void) const;
+   void getCounts(AllocationCounts* pCounts) const;
 
 };
 
@@ -76,6 +81,12 @@ void printAllocationReport(void)
    reporter.report();
 }
 
+void getAllocationCounts(AllocationCounts* pCounts)
+{
+   AllocReporter reporter;
+   reporter.getCounts(pCounts);
+}
+
 
 class State {
 
@@ -173,6 +184,7 @@ private:
    State** m_pNtStates; // States linked by the nonterminal at their prod[dot]
    MatchingFunc m_pMatchingFunc; // Pointer to the token/terminal matching function
    BYTE* m_abCache; // Matching cache, a true/false flag for every terminal in the grammar
+   const BYTE* m_pbMatrixRow; // Precomputed matching bitmap for the token, or NULL
    BOOL m_bNeedsRelease; // Does the matching cache need to be explicitly released?
    HashBin m_aHash[HASH_BINS]; // The hash bin array
    UINT m_nEnumBin; // Round robin used during enumeration of states
@@ -184,7 +196,7 @@ protected:
 
 public:
 
-   Column(Parser*, UINT nToken);
+   Column(Parser*, UINT nToken, const BYTE* pbMatrixRow = NULL);
    ~Column(void);
 
    UINT getToken(void) const
@@ -260,6 +272,10 @@ private:
    };
 
    NdEntry* m_pHead;
+   // Number of nodes created via this dictionary (not affected by reset())
+   UINT m_nCreated;
+   // Number of family entries added to those nodes
+   UINT m_nFamilies;
 
    static AllocCounter acLookups;
 
@@ -274,6 +290,14 @@ public:
 
    void reset(void);
 
+   UINT numCreated(void) const
+      { return this->m_nCreated; }
+
+   void countFamily(void)
+      { this->m_nFamilies++; }
+   UINT numFamilies(void) const
+      { return this->m_nFamilies; }
+
 };
 
 AllocCounter NodeDict::acLookups;
@@ -456,12 +480,12 @@ Node* State::getResult(INT iStartNt) const
 AllocCounter Column::ac;
 AllocCounter Column::acMatches;
 
-Column::Column(Parser* pParser, UINT nToken)
+Column::Column(Parser* pParser, UINT nToken, const BYTE* pbMatrixRow)
    : m_pParser(pParser),
       m_nToken(nToken),
       m_pNtStates(NULL),
       m_pMatchingFunc(pParser->getMatchingFunc()),
-      m_abCache(NULL), m_bNeedsRelease(false),
+      m_abCache(NULL), m_pbMatrixRow(pbMatrixRow), m_bNeedsRelease(false),
       m_nEnumBin(0)
 {
    Column::ac++;
@@ -504,8 +528,9 @@ void Column::startParse(UINT nHandle)
    // Called when the parser starts processing this column
    ASSERT(this->m_abCache == NULL);
    // Ask the parser to create a matching cache for us
-   // (or eventually re-use a previous one)
-   if (this->m_nToken != (UINT)-1)
+   // (or eventually re-use a previous one), unless we
+   // have a precomputed matching bitmap for the token
+   if (this->m_nToken != (UINT)-1 && !this->m_pbMatrixRow)
       this->m_abCache = this->m_pParser->allocCache(nHandle, this->m_nToken, &this->m_bNeedsRelease);
 }
 
@@ -601,6 +626,9 @@ BOOL Column::matches(UINT nHandle, UINT nTerminal) const
    if (this->m_nToken == (UINT)-1)
       // Sentinel token in last column never matches
       return false;
+   if (this->m_pbMatrixRow)
+      // Precomputed bitmap: one bit per terminal, indexed from bit 0
+      return (BOOL)((this->m_pbMatrixRow[nTerminal >> 3] >> (nTerminal & 7)) & 0x01);
    ASSERT(this->m_abCache != NULL);
    if (this->m_abCache[nTerminal] & 0x80)
       // We already have a cached result for this terminal
@@ -856,14 +884,15 @@ void Node::delRef(void)
       delete this;
 }
 
-void Node::addFamily(Production* pProd, Node* pW, Node* pV)
+BOOL Node::addFamily(Production* pProd, Node* pW, Node* pV)
 {
-   // pW may be NULL, or both may be NULL if epsilon
+   // pW may be NULL, or both may be NULL if epsilon.
+   // Returns true if a new family entry was created.
    FamilyEntry* p = this->m_pHead;
    while (p) {
       if (p->pProd == pProd && p->p1 == pW && p->p2 == pV)
          // We already have the same family entry
-         return;
+         return false;
       p = p->pNext;
    }
    // Not already there: create a new entry
@@ -877,6 +906,7 @@ void Node::addFamily(Production* pProd, Node* pW, Node* pV)
       pV->addRef();
    p->pNext = this->m_pHead;
    this->m_pHead = p;
+   return true;
 }
 
 void Node::_dump(Grammar* pGrammar, UINT nIndent)
@@ -932,30 +962,583 @@ void Node::dump(Grammar* pGrammar)
    this->_dump(pGrammar, 0);
 }
 
-UINT Node::numCombinations(Node* pNode)
+class ForestFlattener {
+
+   // Converts a parse forest into a FlatForest. Interior nodes are
+   // coalesced as far as possible into the child lists of their
+   // enclosing nonterminals, and only the highest-priority families
+   // of children are kept for each node.
+
+private:
+
+   std::vector<INT> m_vNodes;
+   std::vector<INT> m_vFamilies;
+   std::vector<INT> m_vChildren;
+   // Map of already flattened nonterminal nodes to their indices
+   std::unordered_map<const Node*, INT> m_mapNodes;
+
+   void pushChild(INT iNt, Node* p, std::vector<Node*>& vChildren);
+   void pushPair(INT iNt, Node* p1, Node* p2, std::vector<Node*>& vChildren);
+   INT addNode(Node* p, const Production* pParentProd, UINT nIndex);
+   UINT64 countCombinations(UINT nNode, std::vector<UINT64>& vCounts) const;
+
+public:
+
+   FlatForest* flatten(Node* pRoot);
+
+};
+
+void ForestFlattener::pushPair(INT iNt, Node* p1, Node* p2, std::vector<Node*>& vChildren)
+{
+   // Push a pair of child nodes onto the child list
+   if (p1 && p2) {
+      this->pushChild(iNt, p1, vChildren);
+      this->pushChild(iNt, p2, vChildren);
+   }
+   else
+   if (p2)
+      this->pushChild(iNt, p2, vChildren);
+   else
+      this->pushChild(iNt, p1, vChildren);
+}
+
+void ForestFlattener::pushChild(INT iNt, Node* p, std::vector<Node*>& vChildren)
+{
+   // Push a single child node onto the child list
+   if (p && p->m_label.m_iNt == iNt && p->m_label.m_pProd) {
+      // Interior node for the same nonterminal
+      if (!p->m_pHead->pNext)
+         // Unambiguous: recurse
+         this->pushPair(iNt, p->m_pHead->p1, p->m_pHead->p2, vChildren);
+      else {
+         // Ambiguous node, i.e. more than one family of children.
+         // In this case we don't know which (p1,p2) pair
+         // to add as a child of the parent, so we must
+         // retain the original node with its family of children
+         // and end the recursion. We also need to add
+         // placeholder (NULL) nodes to keep the child
+         // list in sync with the nonterminal's production.
+         for (UINT i = 2; i < p->m_label.m_nDot; i++)
+            vChildren.push_back(NULL);
+         vChildren.push_back(p);
+         vChildren.push_back(NULL);
+      }
+   }
+   else
+      // Terminal, epsilon or unrelated nonterminal
+      vChildren.push_back(p);
+}
+
+INT ForestFlattener::addNode(Node* p, const Production* pParentProd, UINT nIndex)
 {
-   // Be careful when calling this function: it may take a long
-   // time to execute since it visits nodes for every possible
-   // combination of nodes in the tree. In other words, it ignores
-   // the packing of the tree. The Python version keeps track of
-   // already visited nodes and is much more efficient for large
-   // trees.
-   if (!pNode || pNode->m_label.m_iNt >= 0)
+   // Add a node to the flat forest, if not already there, and return its index
+   if (!p)
+      return -1;
+   const Label& label = p->m_label;
+   if (label.m_nI >= label.m_nJ)
+      // Empty node (no tokens matched within it)
+      return -1;
+   INT iNode = (INT)(this->m_vNodes.size() / FLAT_NODE_SIZE);
+   if (label.m_iNt >= 0) {
+      // Token node: the terminal is found in the parent production
+      ASSERT(pParentProd != NULL);
+      INT aiNode[FLAT_NODE_SIZE] = {
+         (INT)label.m_nI, (INT)label.m_nJ, label.m_iNt, (*pParentProd)[nIndex], 0, 0
+      };
+      this->m_vNodes.insert(this->m_vNodes.end(), aiNode, aiNode + FLAT_NODE_SIZE);
+      return iNode;
+   }
+   // Nonterminal node: only flatten it once
+   std::unordered_map<const Node*, INT>::const_iterator it = this->m_mapNodes.find(p);
+   if (it != this->m_mapNodes.end())
+      return it->second;
+   this->m_mapNodes[p] = iNode;
+   INT aiNode[FLAT_NODE_SIZE] = {
+      (INT)label.m_nI, (INT)label.m_nJ, label.m_iNt, label.m_pProd ? 0 : 1, 0, 0
+   };
+   this->m_vNodes.insert(this->m_vNodes.end(), aiNode, aiNode + FLAT_NODE_SIZE);
+
+   // Collect the families of children, keeping those of highest priority
+   // (note that lower priority values mean higher priority)
+   std::vector<const Production*> vProds;
+   std::vector<std::vector<Node*> > vChildren;
+   UINT nHighestPrio = 0;
+   for (Node::FamilyEntry* pFe = p->m_pHead; pFe; pFe = pFe->pNext) {
+      UINT nPrio = pFe->pProd->getPriority();
+      if (!vProds.empty() && nPrio > nHighestPrio)
+         // Lower priority than a family we already have
+         continue;
+      if (nPrio < nHighestPrio) {
+         // Higher priority than the families we already have: replace them
+         vProds.clear();
+         vChildren.clear();
+      }
+      vProds.push_back(pFe->pProd);
+      vChildren.push_back(std::vector<Node*>());
+      this->pushPair(label.m_iNt, pFe->p1, pFe->p2, vChildren.back());
+      nHighestPrio = nPrio;
+   }
+   // Only add the children of the surviving families, so that
+   // all nodes in the flat forest are reachable from its root
+   std::vector<std::vector<INT> > vFamilies(vProds.size());
+   for (UINT i = 0; i < vProds.size(); i++) {
+      vFamilies[i].reserve(vChildren[i].size());
+      for (UINT j = 0; j < vChildren[i].size(); j++)
+         vFamilies[i].push_back(this->addNode(vChildren[i][j], vProds[i], j));
+   }
+
+   INT* piNode = &this->m_vNodes[iNode * FLAT_NODE_SIZE];
+   piNode[4] = (INT)(this->m_vFamilies.size() / FLAT_FAMILY_SIZE);
+   piNode[5] = (INT)vProds.size();
+   for (UINT i = 0; i < vProds.size(); i++) {
+      INT aiFamily[FLAT_FAMILY_SIZE] = {
+         (INT)vProds[i]->getId(), (INT)this->m_vChildren.size(), (INT)vFamilies[i].size()
+      };
+      this->m_vFamilies.insert(this->m_vFamilies.end(), aiFamily, aiFamily + FLAT_FAMILY_SIZE);
+      this->m_vChildren.insert(this->m_vChildren.end(), vFamilies[i].begin(), vFamilies[i].end());
+   }
+   return iNode;
+}
+
+static UINT64 saturatingAdd(UINT64 n1, UINT64 n2)
+{
+   UINT64 n = n1 + n2;
+   return n < n1 ? COMBINATIONS_MAX : n;
+}
+
+static UINT64 saturatingMul(UINT64 n1, UINT64 n2)
+{
+   if (n1 && n2 > COMBINATIONS_MAX / n1)
+      return COMBINATIONS_MAX;
+   return n1 * n2;
+}
+
+UINT64 ForestFlattener::countCombinations(UINT nNode, std::vector<UINT64>& vCounts) const
+{
+   // Count the parse trees in the flattened subtree rooted at nNode.
+   // A count of zero in vCounts means that the node has not been visited.
+   const INT* piNode = &this->m_vNodes[nNode * FLAT_NODE_SIZE];
+   if (piNode[2] >= 0)
+      // Token node
       return 1;
-   UINT nComb = 0;
-   FamilyEntry* p = pNode->m_pHead;
-   while (p) {
-      UINT n1 = p->p1 ? Node::numCombinations(p->p1) : 1;
-      UINT n2 = p->p2 ? Node::numCombinations(p->p2) : 1;
-      nComb += n1 * n2;
-      p = p->pNext;
+   if (vCounts[nNode])
+      // Already counted (or being counted, in the unlikely case of a loop)
+      return vCounts[nNode];
+   vCounts[nNode] = 1;
+   UINT64 nComb = 0;
+   for (INT iFamily = piNode[4]; iFamily < piNode[4] + piNode[5]; iFamily++) {
+      const INT* piFamily = &this->m_vFamilies[iFamily * FLAT_FAMILY_SIZE];
+      UINT64 nProduct = 1;
+      for (INT iChild = piFamily[1]; iChild < piFamily[1] + piFamily[2]; iChild++) {
+         INT iNode = this->m_vChildren[iChild];
+         if (iNode >= 0)
+            nProduct = saturatingMul(nProduct, this->countCombinations((UINT)iNode, vCounts));
+      }
+      nComb = saturatingAdd(nComb, nProduct);
    }
-   return nComb == 0 ? 1 : nComb;
+   return vCounts[nNode] = (nComb ? nComb : 1);
+}
+
+FlatForest* ForestFlattener::flatten(Node* pRoot)
+{
+   if (this->addNode(pRoot, NULL, 0) < 0)
+      return NULL;
+   FlatForest* pForest = new FlatForest();
+   std::vector<UINT64> vCounts(this->m_vNodes.size() / FLAT_NODE_SIZE, 0);
+   pForest->nCombinations = this->countCombinations(0, vCounts);
+   pForest->nNodes = (UINT)(this->m_vNodes.size() / FLAT_NODE_SIZE);
+   pForest->pNodes = new INT[this->m_vNodes.size()];
+   memcpy(pForest->pNodes, this->m_vNodes.data(), this->m_vNodes.size() * sizeof(INT));
+   pForest->nFamilies = (UINT)(this->m_vFamilies.size() / FLAT_FAMILY_SIZE);
+   pForest->pFamilies = new INT[this->m_vFamilies.size() + 1];
+   memcpy(pForest->pFamilies, this->m_vFamilies.data(), this->m_vFamilies.size() * sizeof(INT));
+   pForest->nChildren = (UINT)this->m_vChildren.size();
+   pForest->pChildren = new INT[this->m_vChildren.size() + 1];
+   memcpy(pForest->pChildren, this->m_vChildren.data(), this->m_vChildren.size() * sizeof(INT));
+   return pForest;
+}
+
+
+class ForestReducer {
+
+   // Reduces a FlatForest in place to its highest-scoring tree,
+   // and then prunes the nodes that are no longer reachable from
+   // the root. This is a port of ParseForestReducer in reducer.py,
+   // which remains the reference implementation: nodes and families
+   // are visited in the same order, with the same memoization and
+   // the same verb/preposition scoping, so both yield identical
+   // trees and scores.
+
+private:
+
+   // A list of verbs, as flat forest indices of verb token nodes
+   typedef std::vector<UINT> VerbList;
+
+   // The result of scoring a node (cf. ResultDict in reducer.py),
+   // where a NULL verb list corresponds to a missing key
+   struct Result {
+      INT nScore;
+      VerbList* pSo;  // Verbs contained within the node
+      VerbList* pSl;  // Verbs picked up by the node
+   };
+
+   FlatForest* m_pForest;
+   const ReducerInfo* m_pInfo;
+   const INT* m_pnTokenScores;
+   UINT m_nHandle;
+   PrepBonusFunc m_fpPrepBonus;
+
+   // Owner of all verb lists created during the reduction.
+   // A list is not modified once it has been returned in a Result.
+   std::deque<VerbList> m_dqLists;
+   std::vector<const VerbList*> m_vPrepBonus;
+   std::vector<const VerbList*> m_vCurrentVerb;
+   // Memoized results, keyed by node index and memoization key
+   std::unordered_map<UINT64, Result> m_mapVisited;
+   // Memoized verb/preposition bonuses, keyed by node indices
+   std::unordered_map<UINT64, INT> m_mapBonus;
+   UINT m_nKey;
+   UINT m_nNextKey;
+   std::vector<INT> m_vScores;
+
+   INT* node(UINT nNode) const
+      { return this->m_pForest->pNodes + nNode * FLAT_NODE_SIZE; }
+   const INT* family(UINT nFamily) const
+      { return this->m_pForest->pFamilies + nFamily * FLAT_FAMILY_SIZE; }
+   static BOOL isCompleted(const INT* piNode)
+      { return piNode[2] < 0 && piNode[3] != 0; }
+
+   UINT ntFlags(const INT* piNode) const;
+   INT ntScore(const INT* piNode) const;
+   UINT terminalFlags(const INT* piNode) const;
+   BOOL isEmpty(const INT* piNode) const;
+   BOOL enterKeyScope(UINT nNode) const;
+   BOOL exitKeyScope(UINT nNode) const;
+
+   VerbList* newList(const VerbList* pSource);
+   INT prepBonus(UINT nPrepNode, UINT nVerbNode);
+   void addChild(Result& r, const Result& rChild);
+
+   Result calcScore(UINT nNode);
+   Result visitToken(UINT nNode, const INT* piNode);
+   Result visitNonterminal(INT* piNode);
+
+   INT pruneNode(UINT nNode, std::vector<INT>& vMap, std::vector<INT>& vNodes,
+      std::vector<INT>& vFamilies, std::vector<INT>& vChildren,
+      std::vector<INT>& vScores) const;
+   void prune(void);
+
+public:
+
+   ForestReducer(FlatForest* pForest, const ReducerInfo* pInfo,
+      const INT* pnTokenScores, UINT nHandle, PrepBonusFunc fpPrepBonus);
+
+   INT reduce(void);
+
+};
+
+ForestReducer::ForestReducer(FlatForest* pForest, const ReducerInfo* pInfo,
+   const INT* pnTokenScores, UINT nHandle, PrepBonusFunc fpPrepBonus)
+   : m_pForest(pForest), m_pInfo(pInfo), m_pnTokenScores(pnTokenScores),
+      m_nHandle(nHandle), m_fpPrepBonus(fpPrepBonus),
+      m_nKey(0), m_nNextKey(0), m_vScores(pForest->nNodes, 0)
+{
+   this->m_vPrepBonus.push_back(NULL);
+   this->m_vCurrentVerb.push_back(NULL);
+}
+
+UINT ForestReducer::ntFlags(const INT* piNode) const
+{
+   // Return the REDUCE_NT_* flags of a completed nonterminal node
+   if (!isCompleted(piNode))
+      return 0;
+   UINT nIndex = (UINT)(-piNode[2] - 1);
+   return nIndex < this->m_pInfo->nNonterminals ? this->m_pInfo->pnNtFlags[nIndex] : 0;
+}
+
+INT ForestReducer::ntScore(const INT* piNode) const
+{
+   // Return the score adjustment of a completed nonterminal node
+   UINT nIndex = (UINT)(-piNode[2] - 1);
+   return nIndex < this->m_pInfo->nNonterminals ? this->m_pInfo->pnNtScores[nIndex] : 0;
+}
+
+UINT ForestReducer::terminalFlags(const INT* piNode) const
+{
+   // Return the REDUCE_TERMINAL_* flags of a token node
+   UINT nTerminal = (UINT)piNode[3];
+   return nTerminal <= this->m_pInfo->nTerminals ? this->m_pInfo->pnTerminalFlags[nTerminal] : 0;
+}
+
+BOOL ForestReducer::isEmpty(const INT* piNode) const
+{
+   // Return true if the node has no family of children,
+   // or only a single family with an empty child list
+   if (!piNode[5])
+      return true;
+   return piNode[5] == 1 && this->family((UINT)piNode[4])[2] == 0;
+}
+
+BOOL ForestReducer::enterKeyScope(UINT nNode) const
+{
+   // Return true for a node whose score should not be
+   // memoized within the shared packed parse forest
+   return (this->ntFlags(this->node(nNode)) & REDUCE_NT_ENABLE_PREP_BONUS) != 0;
+}
+
+BOOL ForestReducer::exitKeyScope(UINT nNode) const
+{
+   // Return true if it is safe to resume memoization
+   // of subtree scores from this node onwards
+   const INT* piNode = this->node(nNode);
+   if (!isCompleted(piNode))
+      return false;
+   if (this->ntFlags(piNode) & (REDUCE_NT_PREP_SCOPE | REDUCE_NT_NOUN_PHRASE))
+      return true;
+   return this->isEmpty(piNode);
+}
+
+ForestReducer::VerbList* ForestReducer::newList(const VerbList* pSource)
+{
+   // Create a new verb list, optionally as a copy of another one
+   if (pSource)
+      this->m_dqLists.push_back(*pSource);
+   else
+      this->m_dqLists.push_back(VerbList());
+   return &this->m_dqLists.back();
+}
+
+INT ForestReducer::prepBonus(UINT nPrepNode, UINT nVerbNode)
+{
+   // Return the bonus for a preposition within the context of a verb,
+   // calling the bonus function only once for each pair of nodes
+   UINT64 nKey = ((UINT64)nPrepNode << 32) | nVerbNode;
+   std::unordered_map<UINT64, INT>::const_iterator it = this->m_mapBonus.find(nKey);
+   if (it != this->m_mapBonus.end())
+      return it->second;
+   INT nBonus = this->m_fpPrepBonus(this->m_nHandle, nPrepNode, nVerbNode);
+   this->m_mapBonus[nKey] = nBonus;
+   return nBonus;
+}
+
+void ForestReducer::addChild(Result& r, const Result& rChild)
+{
+   // Add a child node's result to the result of a family of children
+   r.nScore += rChild.nScore;
+   // Carry information about contained verbs up the tree
+   if (rChild.pSo) {
+      if (r.pSo)
+         r.pSo->insert(r.pSo->end(), rChild.pSo->begin(), rChild.pSo->end());
+      else
+         r.pSo = this->newList(rChild.pSo);
+   }
+   if (rChild.pSl) {
+      if (r.pSl)
+         r.pSl->insert(r.pSl->end(), rChild.pSl->begin(), rChild.pSl->end());
+      else
+         r.pSl = this->newList(rChild.pSl);
+      this->m_vCurrentVerb.back() = rChild.pSl;
+   }
+}
+
+ForestReducer::Result ForestReducer::visitToken(UINT nNode, const INT* piNode)
+{
+   // Return the score of a token/terminal match
+   Result v = { this->m_pnTokenScores[nNode], NULL, NULL };
+   UINT nFlags = this->terminalFlags(piNode);
+   if (nFlags & REDUCE_TERMINAL_PREP) {
+      // Preposition terminal: if we are inside a preposition bonus zone,
+      // give the highest bonus available from the enclosing verbs
+      const VerbList* pVerbs = this->m_vPrepBonus.back();
+      if (pVerbs && !pVerbs->empty() && this->m_fpPrepBonus) {
+         INT nFinal = this->prepBonus(nNode, (*pVerbs)[0]);
+         for (UINT i = 1; i < pVerbs->size(); i++) {
+            INT nBonus = this->prepBonus(nNode, (*pVerbs)[i]);
+            if (nBonus > nFinal)
+               nFinal = nBonus;
+         }
+         v.nScore += nFinal;
+      }
+   }
+   else
+   if (nFlags & REDUCE_TERMINAL_VERB) {
+      // Verb terminal: pick up the verb
+      v.pSo = this->newList(NULL);
+      v.pSo->push_back(nNode);
+   }
+   return v;
+}
+
+ForestReducer::Result ForestReducer::visitNonterminal(INT* piNode)
+{
+   // Score each family of children of a nonterminal node, and reduce
+   // the node to the highest-scoring family
+   UINT nFlags = this->ntFlags(piNode);
+   BOOL bPushedPrepBonus = false;
+   const VerbList* pVerb = this->m_vCurrentVerb.back();
+   if (nFlags & REDUCE_NT_ENABLE_PREP_BONUS) {
+      this->m_vPrepBonus.push_back(pVerb);
+      bPushedPrepBonus = true;
+   }
+   else
+   if (nFlags & (REDUCE_NT_BEGIN_PREP_SCOPE | REDUCE_NT_NOUN_PHRASE)) {
+      this->m_vPrepBonus.push_back(NULL);
+      bPushedPrepBonus = true;
+      pVerb = NULL;
+   }
+   this->m_vCurrentVerb.push_back(pVerb);
+
+   UINT nFamilies = (UINT)piNode[5];
+   std::vector<Result> vResults(nFamilies);
+   for (UINT ix = 0; ix < nFamilies; ix++) {
+      const INT* piFamily = this->family((UINT)piNode[4] + ix);
+      Result& r = vResults[ix];
+      // Productions with higher priorities (lower values) get a starting bonus
+      UINT nProd = (UINT)piFamily[0];
+      r.nScore = nProd < this->m_pInfo->nProductions ?
+         -10 * (INT)this->m_pInfo->pnPriorities[nProd] : 0;
+      r.pSo = r.pSl = NULL;
+      this->m_vCurrentVerb.back() = pVerb;
+      for (INT iChild = piFamily[1]; iChild < piFamily[1] + piFamily[2]; iChild++) {
+         INT iNode = this->m_pForest->pChildren[iChild];
+         if (iNode < 0)
+            continue;
+         UINT nPrevKey = this->m_nKey;
+         if (this->enterKeyScope((UINT)iNode))
+            // Navigate separately through a subtree with an enable_prep_bonus
+            // tag, since enclosed prepositions may have different scores
+            // in other subtrees
+            this->m_nKey = ++this->m_nNextKey;
+         else
+         if (this->m_nKey && this->exitKeyScope((UINT)iNode))
+            this->m_nKey = 0;
+         this->addChild(r, this->calcScore((UINT)iNode));
+         this->m_nKey = nPrevKey;
+      }
+   }
+
+   // Find the highest-scoring family, or the one with
+   // the lowest index if several have the same score
+   UINT ixBest = 0;
+   for (UINT ix = 1; ix < nFamilies; ix++)
+      if (vResults[ix].nScore > vResults[ixBest].nScore)
+         ixBest = ix;
+   if (nFamilies > 1 && !(nFlags & REDUCE_NT_NO_REDUCE)) {
+      // Eliminate all other families
+      piNode[4] += (INT)ixBest;
+      piNode[5] = 1;
+   }
+
+   Result v = vResults[ixBest];
+   if (isCompleted(piNode)) {
+      // Apply the $score() pragma and other nonterminal adjustments
+      v.nScore += this->ntScore(piNode);
+      if (nFlags & REDUCE_NT_APPLY_LENGTH_BONUS)
+         v.nScore += (piNode[1] - piNode[0] - 1) * this->m_pInfo->nLengthBonusFactor;
+      if ((nFlags & REDUCE_NT_APPLY_PREP_BONUS) && this->m_vPrepBonus.back())
+         v.nScore += this->m_pInfo->nVerbPrepBonus;
+      if ((nFlags & REDUCE_NT_PICK_UP_VERB) && v.pSo)
+         v.pSl = this->newList(v.pSo);
+      if (nFlags & REDUCE_NT_CONTAINED_VERBS)
+         v.pSo = v.pSl = NULL;
+   }
+
+   if (bPushedPrepBonus)
+      this->m_vPrepBonus.pop_back();
+   this->m_vCurrentVerb.pop_back();
+   return v;
+}
+
+ForestReducer::Result ForestReducer::calcScore(UINT nNode)
+{
+   // Calculate the score of a node, memoized by node
+   // and the current memoization key
+   UINT64 nKey = ((UINT64)nNode << 32) | this->m_nKey;
+   std::unordered_map<UINT64, Result>::const_iterator it = this->m_mapVisited.find(nKey);
+   if (it != this->m_mapVisited.end())
+      return it->second;
+   INT* piNode = this->node(nNode);
+   Result v = { 0, NULL, NULL };
+   if (piNode[2] >= 0)
+      v = this->visitToken(nNode, piNode);
+   else
+   if (piNode[1] > piNode[0] && piNode[5] > 0)
+      v = this->visitNonterminal(piNode);
+   this->m_mapVisited[nKey] = v;
+   this->m_vScores[nNode] = v.nScore;
+   return v;
+}
+
+INT ForestReducer::pruneNode(UINT nNode, std::vector<INT>& vMap, std::vector<INT>& vNodes,
+   std::vector<INT>& vFamilies, std::vector<INT>& vChildren, std::vector<INT>& vScores) const
+{
+   // Copy a reachable node to the pruned arrays, if not already there,
+   // and return its new index
+   if (vMap[nNode] >= 0)
+      return vMap[nNode];
+   INT iNode = (INT)(vNodes.size() / FLAT_NODE_SIZE);
+   vMap[nNode] = iNode;
+   const INT* piNode = this->node(nNode);
+   vNodes.insert(vNodes.end(), piNode, piNode + FLAT_NODE_SIZE);
+   vScores.push_back(this->m_vScores[nNode]);
+   // Renumber the children of the remaining families
+   std::vector<std::vector<INT> > vRenumbered((UINT)piNode[5]);
+   for (INT i = 0; i < piNode[5]; i++) {
+      const INT* piFamily = this->family((UINT)(piNode[4] + i));
+      for (INT iChild = piFamily[1]; iChild < piFamily[1] + piFamily[2]; iChild++) {
+         INT iOld = this->m_pForest->pChildren[iChild];
+         vRenumbered[i].push_back(iOld < 0 ? -1 :
+            this->pruneNode((UINT)iOld, vMap, vNodes, vFamilies, vChildren, vScores));
+      }
+   }
+   vNodes[iNode * FLAT_NODE_SIZE + 4] = (INT)(vFamilies.size() / FLAT_FAMILY_SIZE);
+   for (INT i = 0; i < piNode[5]; i++) {
+      INT aiFamily[FLAT_FAMILY_SIZE] = {
+         this->family((UINT)(piNode[4] + i))[0], (INT)vChildren.size(), (INT)vRenumbered[i].size()
+      };
+      vFamilies.insert(vFamilies.end(), aiFamily, aiFamily + FLAT_FAMILY_SIZE);
+      vChildren.insert(vChildren.end(), vRenumbered[i].begin(), vRenumbered[i].end());
+   }
+   return iNode;
+}
+
+void ForestReducer::prune(void)
+{
+   // Replace the forest's arrays with ones containing only the nodes
+   // that are reachable from the root, i.e. the reduced tree plus any
+   // alternatives that were kept in no_reduce nodes, and their scores
+   std::vector<INT> vMap(this->m_pForest->nNodes, -1);
+   std::vector<INT> vNodes, vFamilies, vChildren, vScores;
+   this->pruneNode(0, vMap, vNodes, vFamilies, vChildren, vScores);
+   FlatForest* pForest = this->m_pForest;
+   delete [] pForest->pNodes;
+   delete [] pForest->pFamilies;
+   delete [] pForest->pChildren;
+   delete [] pForest->pScores;
+   pForest->nNodes = (UINT)vScores.size();
+   pForest->pNodes = new INT[vNodes.size()];
+   memcpy(pForest->pNodes, vNodes.data(), vNodes.size() * sizeof(INT));
+   pForest->nFamilies = (UINT)(vFamilies.size() / FLAT_FAMILY_SIZE);
+   pForest->pFamilies = new INT[vFamilies.size() + 1];
+   memcpy(pForest->pFamilies, vFamilies.data(), vFamilies.size() * sizeof(INT));
+   pForest->nChildren = (UINT)vChildren.size();
+   pForest->pChildren = new INT[vChildren.size() + 1];
+   memcpy(pForest->pChildren, vChildren.data(), vChildren.size() * sizeof(INT));
+   pForest->pScores = new INT[vScores.size()];
+   memcpy(pForest->pScores, vScores.data(), vScores.size() * sizeof(INT));
+}
+
+INT ForestReducer::reduce(void)
+{
+   // Score and reduce the forest from the root, then prune it
+   INT nScore = this->calcScore(0).nScore;
+   this->prune();
+   return nScore;
 }
 
 
 NodeDict::NodeDict(void)
-   : m_pHead(NULL)
+   : m_pHead(NULL), m_nCreated(0), m_nFamilies(0)
 {
 }
 
@@ -982,6 +1565,7 @@ Node* NodeDict::lookupOrAdd(const Label& label)
    p->pNode = new Node(label);
    p->pNext = this->m_pHead;
    this->m_pHead = p;
+   this->m_nCreated++;
    return p->pNode;
 }
 
@@ -1054,18 +1638,21 @@ Node* Parser::makeNode(State* pState, UINT nEnd, Node* pV, NodeDict& ndV)
    }
    Label label(iNtB, nDot, pProdLabel, nStart, nEnd);
    Node* pY = ndV.lookupOrAdd(label);
-   pY->addFamily(pProd, pW, pV); // pW may be NULL
+   if (pY->addFamily(pProd, pW, pV)) // pW may be NULL
+      ndV.countFamily();
    return pY;
 }
 
-void Parser::push(UINT nHandle, State* pState, Column* pE, State*& pQ, StateChunk* pChunkHead)
+BOOL Parser::push(UINT nHandle, State* pState, Column* pE, State*& pQ, StateChunk* pChunkHead)
 {
+   // Push a state to a column or to the scanner queue whose head is pQ,
+   // returning true if the state was kept and false if it was discarded
    INT iItem = pState->prodDot();
    if (iItem <= 0) {
       // Nonterminal or epsilon: add state to column
       if (pE->addState(pState))
          // State did not already exist in the column: we're done
-         return;
+         return true;
    }
    else
    if (pE->matches(nHandle, (UINT)iItem)) {
@@ -1073,7 +1660,7 @@ void Parser::push(UINT nHandle, State* pState, Column* pE, State*& pQ, StateChun
       // Link into list whose head is pQ
       pState->setNext(pQ);
       pQ = pState;
-      return;
+      return true;
    }
    // We did not actually push the state; discard it
    pState->~State();
@@ -1085,12 +1672,49 @@ void Parser::push(UINT nHandle, State* pState, Column* pE, State*& pQ, StateChun
       pChunkHead->m_nIndex -= sizeof(State);
       nDiscardedStates++;
    }
+   return false;
+}
+
+static void discardQueue(State*& pQ)
+{
+   // Destroy the states in a scanner queue, which are not owned by any column.
+   // The states are allocated via placement new, so we just run their destructor.
+   while (pQ) {
+      State* pNext = pQ->getNext();
+      pQ->~State();
+      pQ = pNext;
+   }
+}
+
+static UINT elapsedMillis(const std::chrono::steady_clock::time_point& tStart)
+{
+   return (UINT)std::chrono::duration_cast<std::chrono::milliseconds>(
+      std::chrono::steady_clock::now() - tStart).count();
+}
+
+static UINT overBudget(const ParseBudget* pBudget, UINT nStates, UINT nNodes,
+   const std::chrono::steady_clock::time_point& tStart, BOOL bCheckTime)
+{
+   // Return the PARSE_BUDGET_* flags of the limits that have been exceeded,
+   // or zero if the parse is still within its budget
+   UINT nExceeded = 0;
+   if (pBudget->nMaxStates && nStates > pBudget->nMaxStates)
+      nExceeded |= PARSE_BUDGET_STATES;
+   if (pBudget->nMaxNodes && nNodes > pBudget->nMaxNodes)
+      nExceeded |= PARSE_BUDGET_NODES;
+   if (bCheckTime && pBudget->nMaxMillis && elapsedMillis(tStart) > pBudget->nMaxMillis)
+      nExceeded |= PARSE_BUDGET_TIME;
+   return nExceeded;
 }
 
 Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
-   UINT nTokens, const UINT pnToklist[])
+   UINT nTokens, const UINT pnToklist[], const BYTE* pbMatrix, ParseBudget* pBudget)
 {
    // If pnToklist is NULL, a sequence of integers 0..nTokens-1 will be used
+   // If pbMatrix is not NULL, it is a bitmap of token/terminal matches,
+   // having one row of getMatrixStride() bytes per token
+   // If pBudget is not NULL, the parse is aborted if it creates more
+   // states or nodes, or takes longer, than the budget allows
    // Sanity checks
    if (!nTokens)
       return NULL;
@@ -1106,11 +1730,21 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
    if (pnErrorToken)
       *pnErrorToken = 0;
 
+   // Resource accounting for the parse budget
+   std::chrono::steady_clock::time_point tStart = std::chrono::steady_clock::now();
+   UINT nStates = 0; // Number of Earley states created
+   UINT nTokenNodes = 0; // Number of token nodes created by the scanner
+   UINT nExceeded = 0; // PARSE_BUDGET_* flags of exceeded limits
+   UINT nBudgetChecks = 0;
+
    // Initialize the Earley columns
    UINT i;
+   UINT nStride = this->getMatrixStride();
    Column** pCol = new Column* [nTokens + 1];
-   for (i = 0; i < nTokens; i++)
-      pCol[i] = new Column(this, pnToklist ? pnToklist[i] : i);
+   for (i = 0; i < nTokens; i++) {
+      UINT nToken = pnToklist ? pnToklist[i] : i;
+      pCol[i] = new Column(this, nToken, pbMatrix ? pbMatrix + nToken * nStride : NULL);
+   }
    pCol[i] = new Column(this, (UINT)-1); // Sentinel column
 
    // Initialize parser state
@@ -1127,7 +1761,7 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
 #ifdef DEBUG
       printf("For initial state, pushing production starting with nonterminal %d\n", (INT)(*p)[0]);
 #endif
-      this->push(nHandle, ps, pCol[0], pQ0, pChunkHead);
+      nStates += this->push(nHandle, ps, pCol[0], pQ0, pChunkHead);
       p = p->getNext();
    }
 
@@ -1179,7 +1813,7 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
                p = (*this->m_pGrammar)[iItem]->getHead();
                while (p) {
                   State* psNew = new (pChunkHead) State(iItem, 0, p, i, NULL);
-                  this->push(nHandle, psNew, pEi, pQ, pChunkHead);
+                  nStates += this->push(nHandle, psNew, pEi, pQ, pChunkHead);
                   p = p->getNext();
                }
             }
@@ -1191,7 +1825,7 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
                if (ph->getNt() == iItem) {
                   Node* pY = this->makeNode(pState, i, ph->getV(), ndV);
                   State* psNew = new (pChunkHead) State(pState, pY);
-                  this->push(nHandle, psNew, pEi, pQ, pChunkHead);
+                  nStates += this->push(nHandle, psNew, pEi, pQ, pChunkHead);
                }
                ph = ph->getNext();
             }
@@ -1205,7 +1839,8 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
             if (!pW) {
                Label label(iNtB, 0, NULL, i, i);
                pW = ndV.lookupOrAdd(label);
-               pW->addFamily(pState->getProd(), NULL, NULL); // Epsilon production
+               if (pW->addFamily(pState->getProd(), NULL, NULL)) // Epsilon production
+                  ndV.countFamily();
             }
             if (nStart == i) {
                HNode* ph = new HNode(iNtB, pW);
@@ -1216,11 +1851,19 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
             while (psNt) {
                Node* pY = this->makeNode(psNt, i, pW, ndV);
                State* psNew = new (pChunkHead) State(psNt, pY);
-               this->push(nHandle, psNew, pEi, pQ, pChunkHead);
+               nStates += this->push(nHandle, psNew, pEi, pQ, pChunkHead);
                psNt = psNt->getNtNext();
             }
          }
 
+         if (pBudget) {
+            // Check the budget, but only look at the clock every 64 states
+            nExceeded = overBudget(pBudget, nStates, ndV.numCreated() + nTokenNodes,
+               tStart, (++nBudgetChecks & 0x3F) == 0);
+            if (nExceeded)
+               break;
+         }
+
          // Move to the next item on the agenda
          // (which may have been enlarged by the previous code)
          pState = pEi->nextState();
@@ -1241,9 +1884,18 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
       // Done processing this column: let it clean up
       pEi->stopParse();
 
+      if (nExceeded) {
+         // Over budget: abort the parse
+         discardQueue(pQ);
+         if (pnErrorToken)
+            *pnErrorToken = i;
+         break;
+      }
+
       if (pQ) {
          Label label(pEi->getToken(), 0, NULL, i, i + 1);
          pV = new Node(label); // Reference is deleted below
+         nTokenNodes++;
          // Open up the next column
          pCol[i + 1]->startParse(nHandle);
       }
@@ -1257,7 +1909,7 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
          // 'incrementing' it by moving the dot one step to the right
          pQ->increment(pY);
          ASSERT(i + 1 <= nTokens);
-         this->push(nHandle, pQ, pCol[i + 1], pQ0, pChunkHead);
+         nStates += this->push(nHandle, pQ, pCol[i + 1], pQ0, pChunkHead);
          pQ = psNext;
       }
 
@@ -1318,8 +1970,28 @@ Node* Parser::parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
       delete pCol[i];
    delete [] pCol;
 
+   UINT nChunks = 0;
+   for (StateChunk* pc = pChunkHead; pc; pc = pc->m_pNext)
+      nChunks++;
    freeStates(pChunkHead);
 
+   if (pBudget) {
+      // Report the resources consumed by the parse
+      pBudget->nExceeded = nExceeded;
+      pBudget->nStates = nStates;
+      pBudget->nNodes = ndV.numCreated() + nTokenNodes;
+      pBudget->nFamilies = ndV.numFamilies();
+      pBudget->nMillis = elapsedMillis(tStart);
+      // Estimate the peak memory use: all state chunks, columns and
+      // SPPF nodes are alive until the parse is complete
+      pBudget->nPeakBytes =
+         (UINT64)nChunks * sizeof(StateChunk) +
+         (UINT64)(nTokens + 1) *
+            (sizeof(Column) + this->getNumNonterminals() * sizeof(State*)) +
+         (UINT64)pBudget->nNodes * sizeof(Node) +
+         (UINT64)pBudget->nFamilies * Node::familyEntrySize();
+   }
+
 #ifdef DEBUG
    clockNow = clock() - clockStart;
    printf("Cleanup finished, elapsed %.3f sec\n",
@@ -1358,6 +2030,18 @@ void AllocReporter::report(void) const
    fflush(stdout); // !!! Debugging
 }
 
+void AllocReporter::getCounts(AllocationCounts* pCounts) const
+{
+   pCounts->nNodes = Node::ac.numAllocs();
+   pCounts->nStates = State::ac.numAllocs();
+   pCounts->nDiscardedStates = nDiscardedStates;
+   pCounts->nStateChunks = acChunks.numAllocs();
+   pCounts->nColumns = Column::ac.numAllocs();
+   pCounts->nHNodes = HNode::ac.numAllocs();
+   pCounts->nNodeDictLookups = NodeDict::acLookups.numAllocs();
+   pCounts->nMatchingCalls = Column::acMatches.numAllocs();
+}
+
 
 // The functions below are declared extern "C" for external invocation
 // of the parser (e.g. from CFFI)
@@ -1416,12 +2100,52 @@ void dumpForest(Node* pNode, Grammar* pGrammar)
       pNode->dump(pGrammar);
 }
 
-UINT numCombinations(Node* pNode)
+FlatForest* flattenForest(Node* pNode)
 {
-   return pNode ? Node::numCombinations(pNode) : 0;
+   if (!pNode)
+      return NULL;
+   ForestFlattener flattener;
+   return flattener.flatten(pNode);
 }
 
-Node* earleyParse(Parser* pParser, UINT nTokens, INT iRoot, UINT nHandle, UINT* pnErrorToken)
+void deleteFlatForest(FlatForest* pForest)
+{
+   if (pForest) {
+      delete [] pForest->pNodes;
+      delete [] pForest->pFamilies;
+      delete [] pForest->pChildren;
+      delete [] pForest->pScores;
+      delete pForest;
+   }
+}
+
+UINT64 numCombinations(Node* pNode)
+{
+   FlatForest* pForest = flattenForest(pNode);
+   if (!pForest)
+      return 0;
+   UINT64 nComb = pForest->nCombinations;
+   deleteFlatForest(pForest);
+   return nComb;
+}
+
+INT reduceForest(FlatForest* pForest, const ReducerInfo* pInfo, const INT* pnTokenScores,
+   UINT nHandle, PrepBonusFunc fpPrepBonus)
+{
+   // Reduce the forest in place to its highest-scoring tree, where
+   // pnTokenScores contains the scores of the forest's token nodes,
+   // and return the tree's score. Nodes that are not part of the
+   // tree are removed from the forest, and pScores is set to the
+   // scores of the remaining nodes. The preposition bonus function,
+   // if given, is called with nHandle as its first parameter.
+   if (!pForest || !pInfo || !pnTokenScores || !pForest->nNodes)
+      return 0;
+   ForestReducer reducer(pForest, pInfo, pnTokenScores, nHandle, fpPrepBonus);
+   return reducer.reduce();
+}
+
+static Node* doParse(Parser* pParser, UINT nTokens, INT iRoot, UINT nHandle,
+   const BYTE* pbMatrix, ParseBudget* pBudget, UINT* pnErrorToken)
 {
    // Preparation and sanity checks
    if (!nTokens)
@@ -1442,7 +2166,7 @@ Node* earleyParse(Parser* pParser, UINT nTokens, INT iRoot, UINT nHandle, UINT*
 #ifdef DEBUG
    printf("Calling pParser->parse()\n"); fflush(stdout);
 #endif
-   Node* pNode = pParser->parse(nHandle, iRoot, pnErrorToken, nTokens);
+   Node* pNode = pParser->parse(nHandle, iRoot, pnErrorToken, nTokens, NULL, pbMatrix, pBudget);
 #ifdef DEBUG
    printf("Back from pParser->parse()\n"); fflush(stdout);
 #endif
@@ -1450,4 +2174,29 @@ Node* earleyParse(Parser* pParser, UINT nTokens, INT iRoot, UINT nHandle, UINT*
    return pNode;
 }
 
+Node* earleyParse(Parser* pParser, UINT nTokens, INT iRoot, UINT nHandle, UINT* pnErrorToken)
+{
+   // Parse, calling the matching function to match tokens with terminals
+   return doParse(pParser, nTokens, iRoot, nHandle, NULL, NULL, pnErrorToken);
+}
+
+Node* earleyParseWithMatrix(Parser* pParser, UINT nTokens, INT iRoot,
+   const BYTE* pbMatrix, ParseBudget* pBudget, UINT* pnErrorToken)
+{
+   // Parse using a precomputed token/terminal matching bitmap, without
+   // calling the matching function. The bitmap has one row per token,
+   // of getMatrixStride() bytes, where bit (n & 7) of byte (n >> 3) is set
+   // if the token matches terminal n. If pBudget is not NULL, the parse
+   // is aborted if it exceeds the budget, and the resources consumed
+   // are reported in the budget structure.
+   if (!pbMatrix)
+      return NULL;
+   return doParse(pParser, nTokens, iRoot, 0, pbMatrix, pBudget, pnErrorToken);
+}
+
+UINT matrixStride(Parser* pParser)
+{
+   return pParser ? pParser->getMatrixStride() : 0;
+}
+
 
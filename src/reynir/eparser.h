@@ -56,6 +56,7 @@
 
 
 typedef unsigned int UINT;
+typedef unsigned long long UINT64;
 typedef int INT;
 typedef wchar_t WCHAR;
 typedef char CHAR;
@@ -69,6 +70,7 @@ class State;
 class Column;
 class NodeDict;
 class Label;
+class ForestFlattener;
 struct StateChunk;
 
 
@@ -238,6 +240,7 @@ class Label {
    // A Label is associated with a Node.
 
    friend class Node;
+   friend class ForestFlattener;
 
 private:
 
@@ -262,6 +265,7 @@ public:
 class Node {
 
    friend class AllocReporter;
+   friend class ForestFlattener;
 
 private:
 
@@ -291,17 +295,117 @@ public:
       { this->m_nRefCount++; }
    void delRef(void);
 
-   void addFamily(Production*, Node* pW, Node* pV);
+   BOOL addFamily(Production*, Node* pW, Node* pV);
+
+   static UINT familyEntrySize(void)
+      { return (UINT)sizeof(FamilyEntry); }
 
    BOOL hasLabel(const Label& label) const
       { return this->m_label == label; }
 
    void dump(Grammar*);
 
-   static UINT numCombinations(Node*);
+};
+
+
+// A parse forest flattened into integer arrays, for efficient
+// conversion into Python objects. The root node has index 0.
+// Each node is described by FLAT_NODE_SIZE integers:
+//    start token, end token,
+//    token index (if >= 0) or nonterminal index (if < 0),
+//    terminal index for tokens, or 1 if the nonterminal is completed
+//       and 0 if it is an interior node,
+//    index of first family, number of families.
+// Each family is described by FLAT_FAMILY_SIZE integers:
+//    production id, index of first child, number of children.
+// Children are node indices, or -1 for empty nodes and placeholders.
+// nCombinations is the number of parse trees in the forest, saturating
+// at COMBINATIONS_MAX if the count does not fit in 64 bits.
+// pScores is NULL, or, once the forest has been reduced, an array of
+// nNodes node scores.
+struct FlatForest {
+   UINT64 nCombinations;
+   UINT nNodes;
+   INT* pNodes;
+   UINT nFamilies;
+   INT* pFamilies;
+   UINT nChildren;
+   INT* pChildren;
+   INT* pScores;
+};
+
+static const UINT FLAT_NODE_SIZE = 6;
+static const UINT FLAT_FAMILY_SIZE = 3;
+static const UINT64 COMBINATIONS_MAX = ~(UINT64)0;
+
+
+// Limits on the resources that a single parse may consume, where zero
+// means no limit. If a limit is exceeded, the parse is aborted and the
+// corresponding PARSE_BUDGET_* flag is set in nExceeded. In any case,
+// nStates and nNodes are set to the number of Earley states and
+// SPPF nodes created, nFamilies to the number of SPPF family entries
+// created, nMillis to the elapsed wall-clock time and nPeakBytes to an
+// estimate of the peak memory held by the parser's data structures.
+struct ParseBudget {
+   UINT nMaxStates;
+   UINT nMaxNodes;
+   UINT nMaxMillis;
+   UINT nExceeded;
+   UINT nStates;
+   UINT nNodes;
+   UINT nMillis;
+   UINT nFamilies;
+   UINT64 nPeakBytes;
+};
+
+static const UINT PARSE_BUDGET_STATES = 1;
+static const UINT PARSE_BUDGET_NODES = 2;
+static const UINT PARSE_BUDGET_TIME = 4;
+
+// Cumulative counts of instances allocated by the parser since the
+// module was loaded, as returned from getAllocationCounts()
+struct AllocationCounts {
+   UINT nNodes;
+   UINT nStates;
+   UINT nDiscardedStates;
+   UINT nStateChunks;
+   UINT nColumns;
+   UINT nHNodes;
+   UINT nNodeDictLookups;
+   UINT nMatchingCalls;
+};
+
 
+// Information about the grammar that is required to reduce a flattened
+// parse forest to its highest-scoring tree (cf. ParseForestReducer in
+// reducer.py). pnNtFlags and pnNtScores are indexed by -iNt - 1,
+// where iNt is the (negative) index of a nonterminal, pnTerminalFlags
+// by terminal index and pnPriorities by production id.
+struct ReducerInfo {
+   UINT nNonterminals;
+   const UINT* pnNtFlags;     // REDUCE_NT_* flags
+   const INT* pnNtScores;     // Score adjustments, from $score() pragmas
+   UINT nTerminals;
+   const UINT* pnTerminalFlags;  // REDUCE_TERMINAL_* flags
+   UINT nProductions;
+   const UINT* pnPriorities;  // Production priorities
+   INT nVerbPrepBonus;        // Bonus for a verb/preposition context
+   INT nLengthBonusFactor;    // Bonus per enclosed token, minus one
 };
 
+static const UINT REDUCE_NT_ENABLE_PREP_BONUS = 0x0001;
+static const UINT REDUCE_NT_BEGIN_PREP_SCOPE = 0x0002;
+static const UINT REDUCE_NT_NOUN_PHRASE = 0x0004;
+static const UINT REDUCE_NT_PREP_SCOPE = 0x0008;
+static const UINT REDUCE_NT_APPLY_LENGTH_BONUS = 0x0010;
+static const UINT REDUCE_NT_APPLY_PREP_BONUS = 0x0020;
+static const UINT REDUCE_NT_PICK_UP_VERB = 0x0040;
+static const UINT REDUCE_NT_CONTAINED_VERBS = 0x0080;
+static const UINT REDUCE_NT_NO_REDUCE = 0x0100;
+
+static const UINT REDUCE_TERMINAL_PREP = 0x0001;
+static const UINT REDUCE_TERMINAL_VERB = 0x0002;
+
 
 // Token-terminal matching function
 typedef BOOL (*MatchingFunc)(UINT nHandle, UINT nToken, UINT nTerminal);
@@ -309,6 +413,10 @@ typedef BOOL (*MatchingFunc)(UINT nHandle, UINT nToken, UINT nTerminal);
 // Allocator for token/terminal matching cache
 typedef BYTE* (*AllocFunc)(UINT nHandle, UINT nToken, UINT nTerminals);
 
+// Verb/preposition bonus function, called with the flat forest indices
+// of a preposition token node and of an enclosing verb token node
+typedef INT (*PrepBonusFunc)(UINT nHandle, UINT nPrepNode, UINT nVerbNode);
+
 // Default matching function that simply
 // compares the token value with the terminal number
 BOOL defaultMatcher(UINT nHandle, UINT nToken, UINT nTerminal);
@@ -328,7 +436,7 @@ private:
    MatchingFunc m_pMatchingFunc;
    AllocFunc m_pAllocFunc;
 
-   void push(UINT nHandle, State*, Column*, State*&, StateChunk*);
+   BOOL push(UINT nHandle, State*, Column*, State*&, StateChunk*);
 
    Node* makeNode(State* pState, UINT nEnd, Node* pV, NodeDict& ndV);
 
@@ -351,19 +459,37 @@ public:
       { return this->m_pMatchingFunc; }
    Grammar* getGrammar(void) const
       { return this->m_pGrammar; }
+   // Number of bytes per token in a token/terminal matching bitmap
+   // (one bit per terminal, with terminals indexed from 1)
+   UINT getMatrixStride(void) const
+      { return (this->getNumTerminals() + 8) / 8; }
 
    // If pnToklist is NULL, a sequence of integers 0..nTokens-1 will be used
+   // If pbMatrix is not NULL, it is used instead of the matching function
+   // If pBudget is not NULL, the parse is aborted if it exceeds the budget
    Node* parse(UINT nHandle, INT iStartNt, UINT* pnErrorToken,
-      UINT nTokens, const UINT pnToklist[] = NULL);
+      UINT nTokens, const UINT pnToklist[] = NULL, const BYTE* pbMatrix = NULL,
+      ParseBudget* pBudget = NULL);
 
 };
 
 // Print a report on memory allocation
 extern "C" void printAllocationReport(void);
 
+// Obtain the cumulative allocation counts
+extern "C" void getAllocationCounts(AllocationCounts* pCounts);
+
 // Parse a token stream
 extern "C" Node* earleyParse(Parser*, UINT nTokens, INT iRoot, UINT nHandle, UINT* pnErrorToken);
 
+// Parse a token stream, using a precomputed token/terminal matching bitmap,
+// within an optional budget
+extern "C" Node* earleyParseWithMatrix(Parser*, UINT nTokens, INT iRoot,
+   const BYTE* pbMatrix, ParseBudget* pBudget, UINT* pnErrorToken);
+
+// Return the number of bytes per token in a matching bitmap
+extern "C" UINT matrixStride(Parser*);
+
 extern "C" Grammar* newGrammar(const CHAR* pszGrammarFile);
 
 extern "C" void deleteGrammar(Grammar*);
@@ -376,5 +502,16 @@ extern "C" void deleteForest(Node*);
 
 extern "C" void dumpForest(Node*, Grammar*);
 
-extern "C" UINT numCombinations(Node*);
+// Flatten a parse forest into arrays
+extern "C" FlatForest* flattenForest(Node*);
+
+extern "C" void deleteFlatForest(FlatForest*);
+
+// Count the parse trees in a forest (saturating at COMBINATIONS_MAX)
+extern "C" UINT64 numCombinations(Node*);
+
+// Reduce a flat forest in place to its highest-scoring tree,
+// given the scores of its token nodes, and return the score of the tree
+extern "C" INT reduceForest(FlatForest*, const ReducerInfo*, const INT* pnTokenScores,
+   UINT nHandle, PrepBonusFunc fpPrepBonus);
 
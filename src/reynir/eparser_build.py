@@ -52,6 +52,7 @@ IMPLEMENTATION = platform.python_implementation()
 declarations = """
 
     typedef unsigned int UINT;
+    typedef unsigned long long UINT64;
     typedef int INT;
     typedef int BOOL; // Different from C++
     typedef char CHAR;
@@ -95,19 +96,72 @@ declarations = """
         UINT nRefCount;
     };
 
+    struct FlatForest {
+        UINT64 nCombinations; // Number of parse trees (saturating)
+        UINT nNodes;          // Number of nodes (6 integers each)
+        INT* pNodes;
+        UINT nFamilies;       // Number of families (3 integers each)
+        INT* pFamilies;
+        UINT nChildren;       // Number of child indices
+        INT* pChildren;
+        INT* pScores;         // Node scores, once reduced, or NULL
+    };
+
+    struct ParseBudget {
+        UINT nMaxStates;      // Maximum number of Earley states, or 0
+        UINT nMaxNodes;       // Maximum number of SPPF nodes, or 0
+        UINT nMaxMillis;      // Maximum wall-clock time in milliseconds, or 0
+        UINT nExceeded;       // Out: PARSE_BUDGET_* flags of exceeded limits
+        UINT nStates;         // Out: number of Earley states created
+        UINT nNodes;          // Out: number of SPPF nodes created
+        UINT nMillis;         // Out: elapsed wall-clock time in milliseconds
+        UINT nFamilies;       // Out: number of SPPF family entries created
+        UINT64 nPeakBytes;    // Out: estimated peak bytes held by the parser
+    };
+
+    struct AllocationCounts {
+        UINT nNodes;
+        UINT nStates;
+        UINT nDiscardedStates;
+        UINT nStateChunks;
+        UINT nColumns;
+        UINT nHNodes;
+        UINT nNodeDictLookups;
+        UINT nMatchingCalls;
+    };
+
+    struct ReducerInfo {
+        UINT nNonterminals;
+        const UINT* pnNtFlags;        // REDUCE_NT_* flags, by -iNt - 1
+        const INT* pnNtScores;        // Score adjustments, by -iNt - 1
+        UINT nTerminals;
+        const UINT* pnTerminalFlags;  // REDUCE_TERMINAL_* flags, by terminal index
+        UINT nProductions;
+        const UINT* pnPriorities;     // Production priorities, by production id
+        INT nVerbPrepBonus;
+        INT nLengthBonusFactor;
+    };
+
     typedef BOOL (*MatchingFunc)(UINT nHandle, UINT nToken, UINT nTerminal);
     typedef BYTE* (*AllocFunc)(UINT nHandle, UINT nToken, UINT nSize);
+    typedef INT (*PrepBonusFunc)(UINT nHandle, UINT nPrepNode, UINT nVerbNode);
 
     struct Node* earleyParse(struct Parser*, UINT nTokens, INT iRoot, UINT nHandle, UINT* pnErrorToken);
+    struct Node* earleyParseWithMatrix(struct Parser*, UINT nTokens, INT iRoot, const BYTE* pbMatrix, struct ParseBudget* pBudget, UINT* pnErrorToken);
+    UINT matrixStride(struct Parser*);
     struct Grammar* newGrammar(const CHAR* pszGrammarFile);
     void deleteGrammar(struct Grammar*);
     struct Parser* newParser(struct Grammar*, MatchingFunc fpMatcher, AllocFunc fpAlloc);
     void deleteParser(struct Parser*);
     void deleteForest(struct Node*);
     void dumpForest(struct Node*, struct Grammar*);
-    UINT numCombinations(struct Node*);
+    struct FlatForest* flattenForest(struct Node*);
+    void deleteFlatForest(struct FlatForest*);
+    UINT64 numCombinations(struct Node*);
+    INT reduceForest(struct FlatForest*, const struct ReducerInfo*, const INT* pnTokenScores, UINT nHandle, PrepBonusFunc fpPrepBonus);
 
     void printAllocationReport(void);
+    void getAllocationCounts(struct AllocationCounts*);
 
 """
 
@@ -118,6 +172,7 @@ callbacks = """
 
     extern "Python" BOOL matching_func(UINT, UINT, UINT);
     extern "Python" BYTE* alloc_func(UINT, UINT, UINT);
+    extern "Python" INT prep_bonus_func(UINT, UINT, UINT);
 
 """
 
@@ -70,15 +70,23 @@ from typing import (
     Iterator,
     Hashable,
     IO,
+    Callable,
+    NamedTuple,
+    TYPE_CHECKING,
     cast,
 )
 
 import os
+import mmap
+import struct
 import operator
+from array import array
 from threading import Lock
 from functools import reduce
+from hashlib import blake2b
 
 from .binparser import (
+    BIN_Grammar,
     BIN_Parser,
     BIN_Token,
     simplify_terminal,
@@ -89,18 +97,253 @@ from .binparser import (
 from .grammar import Grammar, GrammarError, Nonterminal, Terminal, Production
 from .settings import Settings
 from .glock import GlobalLock
+from .cache import LFU_Cache
 
 # Import the CFFI wrapper module for the _eparser.*.so library
 # which is compiled from eparser.cpp (see eparser_build.py)
 # pylint: disable=no-name-in-module
 from ._eparser import lib as eparser, ffi  # type: ignore
 
+if TYPE_CHECKING:
+    from .reducer import Reducer
+
 
 ffi_NULL: Any = cast(Any, ffi).NULL
 
 # The type of an entry on a ParseTreeFlattener stack
 FlattenerType = Union[Tuple[Terminal, BIN_Token], Nonterminal]
 ProductionTuple = Tuple[Production, List[Optional["Node"]]]
+# The type of a token key, cf. BIN_Token.key
+TokenKey = Tuple[Hashable, ...]
+
+# Default maximum number of distinct tokens in the matching cache
+MATCHING_CACHE_SIZE = 20_000
+
+# Size of the C++ INT type, used for the columns of a CompactForest
+_INT_SIZE: int = cast(Any, ffi).sizeof("INT")
+
+
+class _SharedMatchingTable:
+
+    """A fixed-size hash table of token/terminal matching bitmaps,
+    stored in a memory-mapped file that can be shared between processes.
+    Each slot contains a digest of the token key, a checksum and the bitmap.
+    Writers invalidate a slot before overwriting it, and readers verify the
+    checksum, so no locking is required: a slot that is being concurrently
+    written simply reads as a cache miss."""
+
+    _MAGIC = b"GreynirMatch01\n\0"
+    # Magic, bitmap stride, number of slots, digest of grammar version
+    _HEADER = struct.Struct("<16sII16s")
+    _HEADER_SIZE = 64
+    _DIGEST_SIZE = 16
+    _CHECK_SIZE = 8
+    # Number of slots to probe before evicting an entry
+    _PROBES = 8
+
+    def __init__(self, fname: str, stride: int, nslots: int, version: str) -> None:
+        self._stride = stride
+        self._nslots = nslots
+        self._slot_size = self._DIGEST_SIZE + self._CHECK_SIZE + stride
+        self._empty = bytes(self._DIGEST_SIZE)
+        header = self._HEADER.pack(
+            self._MAGIC,
+            stride,
+            nslots,
+            blake2b(version.encode("utf-8"), digest_size=16).digest(),
+        )
+        size = self._HEADER_SIZE + nslots * self._slot_size
+        self._mmap: Optional[mmap.mmap] = None
+        f = self._open(fname, header, size)
+        if f is not None:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), size)
+            except (OSError, ValueError):
+                pass
+            finally:
+                f.close()
+        if self._mmap is None:
+            # The shared file could not be used: fall back to a private,
+            # anonymous table, which works the same but is not shared
+            self._mmap = mmap.mmap(-1, size)
+            self._mmap[0 : len(header)] = header
+
+    @staticmethod
+    def _open(fname: str, header: bytes, size: int) -> Optional[IO[bytes]]:
+        """Open the shared file, (re)creating it if it is missing or was
+        created for a different grammar version or table geometry.
+        Return None if the file cannot be opened or created."""
+        tmp = "{0}.{1}.tmp".format(fname, os.getpid())
+        try:
+            try:
+                f = open(fname, "r+b")
+            except FileNotFoundError:
+                pass
+            else:
+                try:
+                    valid = (
+                        f.read(len(header)) == header
+                        and os.fstat(f.fileno()).st_size == size
+                    )
+                except OSError:
+                    f.close()
+                    raise
+                if valid:
+                    return f
+                f.close()
+            # Create a fresh, zero-filled file under a temporary name and move
+            # it into place atomically, so that other processes never see a
+            # partial file
+            with open(tmp, "wb") as t:
+                t.truncate(size)
+                t.write(header)
+            os.replace(tmp, fname)
+            return open(fname, "r+b")
+        except OSError:
+            # The directory may not exist or may not be writable, the file
+            # may not be writable, or (on Windows) the file cannot be replaced
+            # while another process has it mapped into memory
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return None
+
+    def _offsets(self, digest: bytes) -> Iterator[int]:
+        """Yield the file offsets of the slots to probe for a key digest"""
+        h = int.from_bytes(digest[0:8], "little")
+        for i in range(self._PROBES):
+            yield self._HEADER_SIZE + ((h + i) % self._nslots) * self._slot_size
+
+    def _check(self, digest: bytes, row: bytes) -> bytes:
+        """Return a checksum of a slot's contents"""
+        return blake2b(digest + row, digest_size=self._CHECK_SIZE).digest()
+
+    def get(self, digest: bytes) -> Optional[bytes]:
+        """Return the bitmap for the given key digest, or None if not found"""
+        m = self._mmap
+        assert m is not None
+        ds = self._DIGEST_SIZE
+        cs = ds + self._CHECK_SIZE
+        for offset in self._offsets(digest):
+            # Copy the slot in one go, then verify it
+            slot = m[offset : offset + self._slot_size]
+            d = slot[0:ds]
+            if d == digest:
+                row = slot[cs:]
+                return row if slot[ds:cs] == self._check(digest, row) else None
+            if d == self._empty:
+                break
+        return None
+
+    def put(self, digest: bytes, row: bytes) -> None:
+        """Store the bitmap for the given key digest"""
+        m = self._mmap
+        assert m is not None
+        assert len(row) == self._stride
+        ds = self._DIGEST_SIZE
+        cs = ds + self._CHECK_SIZE
+        target: Optional[int] = None
+        for offset in self._offsets(digest):
+            d = m[offset : offset + ds]
+            if d == digest or d == self._empty:
+                target = offset
+                break
+            if target is None:
+                # If all probed slots are occupied, evict the first one
+                target = offset
+        assert target is not None
+        # Invalidate the slot while writing, then write the digest last
+        m[target : target + ds] = self._empty
+        m[target + cs : target + self._slot_size] = row
+        m[target + ds : target + cs] = self._check(digest, row)
+        m[target : target + ds] = digest
+
+    def close(self) -> None:
+        """Unmap the shared file"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class MatchingCache:
+
+    """A size-bounded cache of token/terminal matching bitmaps, keyed
+    by BIN_Token.key. Entries are evicted on a least-frequently-used basis.
+    Optionally, the cache is backed by a memory-mapped file that is shared
+    by all processes that open it, e.g. parallel parser worker processes,
+    so that each of them has a warm cache from startup."""
+
+    def __init__(
+        self,
+        stride: int,
+        *,
+        maxsize: int = MATCHING_CACHE_SIZE,
+        shared_file: Optional[str] = None,
+        version: str = "",
+    ) -> None:
+        self._cache: LFU_Cache[TokenKey, bytes] = LFU_Cache(maxsize=maxsize)
+        self._shared: Optional[_SharedMatchingTable] = None
+        if shared_file:
+            # Allow for a load factor of at most 50% in the shared table
+            self._shared = _SharedMatchingTable(
+                shared_file, stride, 2 * maxsize, version
+            )
+        self._shared_hits = 0
+
+    def lookup(self, key: TokenKey, func: Callable[[], bytes]) -> bytes:
+        """Return the bitmap for the given token key, calling func()
+        to calculate it if not found in the cache"""
+        shared = self._shared
+        if shared is None:
+            return self._cache.lookup(key, lambda _: func())
+
+        def fetch(key: TokenKey) -> bytes:
+            # Not found in the local cache: try the shared one
+            digest = blake2b(repr(key).encode("utf-8"), digest_size=16).digest()
+            row = shared.get(digest)
+            if row is not None:
+                self._shared_hits += 1
+                return row
+            row = func()
+            shared.put(digest, row)
+            return row
+
+        return self._cache.lookup(key, fetch)
+
+    def __len__(self) -> int:
+        return len(self._cache.cache)
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups that were found in the local cache"""
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that were not found in the local cache"""
+        return self._cache.misses
+
+    @property
+    def shared_hits(self) -> int:
+        """Number of local cache misses that were found in the shared cache"""
+        return self._shared_hits
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return a dict of cache statistics"""
+        return dict(
+            size=len(self),
+            hits=self.hits,
+            misses=self.misses,
+            shared_hits=self.shared_hits,
+        )
+
+    def close(self) -> None:
+        """Release the shared cache file, if any"""
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
 
 
 class ParseJob:
@@ -119,37 +362,61 @@ class ParseJob:
         grammar: Grammar,
         tokens: List[BIN_Token],
         terminals: Dict[int, Terminal],
-        matching_cache: Dict[Tuple[Hashable, ...], Any],
+        matching_cache: MatchingCache,
     ) -> None:
         self._handle = handle
         self.tokens = tokens
         self.terminals = terminals
         self.grammar = grammar
-        self.c_dict: Dict[Any, "Node"] = dict()  # Node pointer conversion dictionary
-        self.matching_cache = matching_cache  # Token/terminal matching buffers
+        self.matching_cache = matching_cache  # Token/terminal matching bitmaps
+        self.terminal_index = cast(BIN_Grammar, grammar).terminal_index
+        # Number of token/terminal matching calls made for this job
+        self.num_matching_calls = 0
+        # Number of tokens whose matching bitmap was found in the cache
+        self.num_matching_cache_hits = 0
 
     def matches(self, token_index: int, terminal_index: int) -> bool:
         """Convert the token reference from a 0-based token index
         to the token object itself; convert the terminal from a
         1-based terminal index to a terminal object."""
+        self.num_matching_calls += 1
         return self.tokens[token_index].matches(self.terminals[terminal_index])
 
-    def alloc_cache(self, token: int, size: int) -> Any:
-        """Allocate a token/terminal matching cache buffer for the given token"""
-        key = self.tokens[token].key  # Obtain the (hashable) key of the BIN_Token
+    def match_row(self, token: int, stride: int) -> bytes:
+        """Return a bitmap of the terminals that the given token matches,
+        with bit (n & 7) of byte (n >> 3) set if the token matches terminal n"""
+        t = self.tokens[token]
+        calculated = False
+
+        def calc_row() -> bytes:
+            nonlocal calculated
+            calculated = True
+            # Match the token with those terminals in the grammar
+            # that it can possibly match, as found via the terminal index;
+            # it cannot match any other terminal
+            bits = 0
+            candidates = self.terminal_index.candidates(t)
+            for ix, terminal in candidates.items():
+                if t.matches(terminal):
+                    bits |= 1 << ix
+            self.num_matching_calls += len(candidates)
+            return bits.to_bytes(stride, "little")
+
         try:
-            # Do we already have a token/terminal cache match buffer for this key?
-            b: Any = self.matching_cache.get(key)
-            if b is None:
-                # No: create a fresh one (assumed to be initialized to zero)
-                b = self.matching_cache[key] = ffi.new("BYTE[]", size)  # type: ignore
+            # Obtain the bitmap from the cache, keyed by the
+            # (hashable) key of the BIN_Token
+            row = self.matching_cache.lookup(t.key, calc_row)
+            if not calculated:
+                # The row came from the local or the shared cache
+                self.num_matching_cache_hits += 1
+            return row
         except TypeError:
-            assert False, "alloc_cache() unable to hash key: {0}".format(repr(key))
-        return b
+            assert False, "match_row() unable to hash key: {0}".format(repr(t.key))
 
-    def reset(self) -> None:
-        """Reset the node pointer conversion dictionary"""
-        self.c_dict = dict()
+    def match_matrix(self, stride: int) -> bytes:
+        """Return a token/terminal matching bitmap for all tokens in the job,
+        consisting of one row of stride bytes per token"""
+        return b"".join(self.match_row(ix, stride) for ix in range(len(self.tokens)))
 
     @property
     def handle(self) -> int:
@@ -172,7 +439,7 @@ class ParseJob:
         grammar: Grammar,
         tokens: List[BIN_Token],
         terminals: Dict[int, Terminal],
-        matching_cache: Dict[Tuple[Hashable, ...], Any],
+        matching_cache: MatchingCache,
     ) -> "ParseJob":
         """Create a new parse job with for a given token sequence and set of terminals"""
         with cls._lock:
@@ -194,11 +461,6 @@ class ParseJob:
         """Dispatch a match request to the correct parse job"""
         return cls._jobs[handle].matches(token_index, terminal_index)
 
-    @classmethod
-    def alloc(cls, handle: int, token_index: int, size: int):
-        """Dispatch a cache buffer allocation request to the correct parse job"""
-        return cls._jobs[handle].alloc_cache(token_index, size)
-
 
 # Declare CFFI callback functions to be called from the C++ code
 # See: https://cffi.readthedocs.io/en/latest/using.html#extern-python-new-style-callbacks
@@ -219,9 +481,10 @@ def matching_func(handle: int, token_index: int, terminal_index: int) -> bool:
 def alloc_func(handle: int, token_index: int, size: int):
     """Allocate a token/terminal matching cache buffer, at least size bytes.
     If the callback returns ffi.NULL, the parser will allocate its own buffer.
-    The point of this callback is to allow re-using buffers for identical tokens,
-    so we avoid making unnecessary matching calls."""
-    return ParseJob.alloc(handle, token_index, size)
+    Since Fast_Parser passes precomputed matching bitmaps to the C++ parser
+    (cf. earleyParseWithMatrix()), matching cache buffers are not shared
+    between parses, and this callback is only a fallback for earleyParse()."""
+    return ffi_NULL
 
 
 class Node:
@@ -248,10 +511,11 @@ class Node:
     a family of child (derivative) productions represented as a
     linked list starting with pHead. Since the SPPF trees coming
     from the Earley-Scott parser are binarized, the families have
-    at most two child nodes each. When creating the Python nodes,
-    interior nodes are coalesced as far as possible to form longer
-    lists of children, thereby decreasing the total number of nodes
-    necessary to represent the forest.
+    at most two child nodes each. Before creating the Python nodes,
+    the C++ forest is flattened into arrays (cf. flattenForest()
+    in eparser.cpp), where interior nodes are coalesced as far as
+    possible to form longer lists of children, thereby decreasing
+    the total number of nodes necessary to represent the forest.
 
     A forest of Nodes can be navigated using a subclass of
     ParseForestNavigator.
@@ -294,91 +558,62 @@ class Node:
         self.score = 0
 
     @classmethod
-    def from_c_node(
-        cls, job: ParseJob, c_node: Any, parent: Any = None, index: int = 0
-    ) -> Optional["Node"]:
-        """Initialize a Python node from a C++ SPPF node structure"""
-        if c_node == ffi_NULL:
-            return None
-
-        lb = c_node.label
-        if lb.nI >= lb.nJ:
-            # Empty node (no tokens matched within it):
-            # don't bother creating a corresponding Python object;
-            # we never use these nodes anyway except as fillers
-            # to help in matching children with the parent production
-            return None
-
-        node = cls(lb.nI, lb.nJ)  # Start token index, end token index
-
-        if lb.iNt >= 0:
-            # Token node: find the corresponding terminal
-            assert parent is not None
-            tix: int = parent.pList[index]
-            node._terminal = job.grammar.lookup_terminal(tix)
-            node._token = job.tokens[lb.iNt]
-            return node
-
-        # Nonterminal node
-        nt = lb.iNt
-        node._nonterminal = job.grammar.lookup_nonterminal(nt)
-        node._completed = lb.pProd == ffi_NULL
-        # Cache nonterminal nodes
-        job.c_dict[c_node] = node
-
-        # Loop through the families of children of this node
-        fe = c_node.pHead
-        while fe != ffi_NULL:
-
-            # Save on node count by coalescing interior nodes
-            # into the child list of the enclosing completed
-            # nonterminal. Nodes can be coalesced while they
-            # refer to the same nonterminal, are interior,
-            # and not ambiguous.
-            ch: List[Any] = []
-
-            def push_pair(p1: Any, p2: Any) -> None:
-                """Push a pair of child nodes onto the child list"""
-
-                def push_child(p: Any) -> None:
-                    """Push a single child node onto the child list"""
-                    if p.label.iNt == nt and p.label.pProd != ffi_NULL:
-                        # Interior node for the same nonterminal
-                        if p.pHead.pNext == ffi_NULL:
-                            # Unambiguous: recurse
-                            push_pair(p.pHead.p1, p.pHead.p2)
-                        else:
-                            # Ambiguous node, i.e. more than one family of children.
-                            # In this case we don't know which (p1,p2) pair
-                            # to add as a child of the parent, so we must
-                            # retain the original node with its family of children
-                            # and end the recursion. We also need to add
-                            # placeholder (dummy) nodes to keep the child
-                            # list in sync with the nonterminal's production.
-                            if p.label.nDot > 2:
-                                # Add placeholders for the part of the production
-                                # that is missing from the front since we abandon
-                                # the recursion here
-                                ch.extend([ffi_NULL] * (p.label.nDot - 2))
-                            ch.append(p)
-                            ch.append(ffi_NULL)  # Placeholder
-                    else:
-                        # Terminal, epsilon or unrelated nonterminal
-                        ch.append(p)
-
-                if p1 != ffi_NULL and p2 != ffi_NULL:
-                    push_child(p1)
-                    push_child(p2)
-                elif p2 != ffi_NULL:
-                    push_child(p2)
-                else:
-                    push_child(p1)
-
-            push_pair(fe.p1, fe.p2)
-            node._add_family(job, fe.pProd, ch)
-            fe = fe.pNext
-
-        return node
+    def from_flat_forest(cls, job: ParseJob, c_forest: Any) -> "Node":
+        """Create a Python forest of nodes from a flattened C++ forest
+        (cf. flattenForest() in eparser.cpp). Interior node coalescing
+        and priority filtering of families have already been done
+        on the C++ side, so this is a simple linear pass over the
+        node and family tables. If the forest has been reduced in C++
+        (cf. reduceForest() in eparser.cpp), the node scores
+        are copied as well."""
+        nn: int = c_forest.nNodes
+        nf: int = c_forest.nFamilies
+        node_table: List[int] = ffi.unpack(c_forest.pNodes, nn * 6)  # type: ignore
+        family_table: List[int] = ffi.unpack(c_forest.pFamilies, nf * 3)  # type: ignore
+        children: List[int] = ffi.unpack(c_forest.pChildren, c_forest.nChildren)  # type: ignore
+        scores: Optional[List[int]] = None
+        if c_forest.pScores != ffi_NULL:
+            scores = ffi.unpack(c_forest.pScores, nn)  # type: ignore
+        grammar = job.grammar
+        tokens = job.tokens
+        lookup_terminal = grammar.lookup_terminal
+        lookup_nonterminal = grammar.lookup_nonterminal
+        productions = grammar.productions_by_ix
+        nodes: List[Optional[Node]] = []
+        for i in range(0, nn * 6, 6):
+            node = cls(node_table[i], node_table[i + 1])
+            ix = node_table[i + 2]
+            if ix >= 0:
+                # Token node
+                node._terminal = lookup_terminal(node_table[i + 3])
+                node._token = tokens[ix]
+            else:
+                # Nonterminal node, completed or interior
+                node._nonterminal = lookup_nonterminal(ix)
+                node._completed = node_table[i + 3] != 0
+            if scores is not None:
+                node.score = scores[i // 6]
+            nodes.append(node)
+        # Child index -1 denotes an empty node or a placeholder:
+        # map it to the None at the end of the list
+        nodes.append(None)
+        node_at = nodes.__getitem__
+        for i in range(nn):
+            num_families = node_table[i * 6 + 5]
+            if num_families:
+                node = cast(Node, nodes[i])
+                first = node_table[i * 6 + 4] * 3
+                families: List[ProductionTuple] = []
+                for j in range(first, first + num_families * 3, 3):
+                    prod = productions[family_table[j]]
+                    c = family_table[j + 1]
+                    families.append(
+                        (prod, list(map(node_at, children[c : c + family_table[j + 2]])))
+                    )
+                node._families = families
+                # All remaining families have the same priority
+                node._highest_prio = families[0][0].priority
+        return cast(Node, nodes[0])
 
     @classmethod
     def copy(cls, other: "Node") -> "Node":
@@ -395,32 +630,6 @@ class Node:
             node._families = other._families[:]
         return node
 
-    def _add_family(self, job: ParseJob, c_prod: Any, c_children: Any) -> None:
-        """Add a family of children to this node, in parallel with other families"""
-        assert c_prod != ffi_NULL
-        prod: Production = job.grammar.productions_by_ix[c_prod.nId]
-        prio: int = prod.priority
-        # Note: lower priority values mean higher priority!
-        if self._families and prio > self._highest_prio:
-            # Lower priority than a family we already have: don't bother adding it
-            return
-        # Recreate the pc tuple from the production index
-        pc: ProductionTuple = (
-            prod,
-            [
-                # Convert child node from C++ form to Python form
-                job.c_dict.get(ch) or Node.from_c_node(job, ch, c_prod, ix)
-                for ix, ch in enumerate(c_children)
-            ],
-        )
-        if self._families is None or prio < self._highest_prio:
-            # First family of children, or highest priority so far: add as the only family
-            self._families = [pc]
-        else:
-            # Same priority as the families we have already: add this
-            self._families.append(pc)
-        self._highest_prio = prio
-
     @property
     def start(self) -> int:
         """Return the start token index"""
@@ -603,6 +812,261 @@ class Node:
         return "<Node: " + str(self._nonterminal or self._token) + ">"
 
 
+class CompactForest:
+
+    """An array-backed representation of a parse forest, as an alternative
+    to a forest of Node objects. The flattened C++ forest (cf. flattenForest()
+    in eparser.cpp) is copied into typed array columns, one entry per node,
+    family and child, instead of being mapped to one Python object per node
+    plus a list of (Production, List[Node]) tuples per node. This reduces
+    the memory footprint of large, highly ambiguous forests by an order
+    of magnitude.
+
+    The forest is navigated via lightweight CompactNode views, which are
+    created on demand and expose the same interface as Node. Therefore,
+    ParseForestNavigator subclasses, the Reducer and the Simplifier
+    can consume a CompactForest directly, starting from its root property.
+
+    Node columns:
+        start, end: Token span of the node
+        label: Token index if >= 0 (token node), otherwise
+            the (negative) nonterminal index
+        aux: Terminal index for token nodes, otherwise 1 for
+            completed nonterminals and 0 for interior nodes
+        fam_first, fam_count: Index and number of the node's
+            families in the family columns
+
+    Family columns:
+        prod: Production index
+        child_first, child_count: Index and number of the family's
+            children in the children column
+
+    Children column: node indices, where -1 denotes an epsilon (empty) child.
+
+    Reduction of the forest (cf. CompactNode.reduce_to()) modifies the
+    fam_first and fam_count columns in place, and node scores
+    are stored in a separate score column.
+
+    """
+
+    __slots__ = (
+        "_grammar",
+        "_tokens",
+        "start",
+        "end",
+        "label",
+        "aux",
+        "fam_first",
+        "fam_count",
+        "prod",
+        "child_first",
+        "child_count",
+        "children",
+        "score",
+    )
+
+    def __init__(self, job: ParseJob, c_forest: Any) -> None:
+        self._grammar = job.grammar
+        self._tokens = job.tokens
+        nn: int = c_forest.nNodes
+        nf: int = c_forest.nFamilies
+        # Copy the C++ tables into typed arrays in one go,
+        # then split them into separate columns
+        nodes = self._copy(c_forest.pNodes, nn * 6)
+        families = self._copy(c_forest.pFamilies, nf * 3)
+        self.start = nodes[0::6]
+        self.end = nodes[1::6]
+        self.label = nodes[2::6]
+        self.aux = nodes[3::6]
+        self.fam_first = nodes[4::6]
+        self.fam_count = nodes[5::6]
+        self.prod = families[0::3]
+        self.child_first = families[1::3]
+        self.child_count = families[2::3]
+        self.children = self._copy(c_forest.pChildren, c_forest.nChildren)
+        if c_forest.pScores != ffi_NULL:
+            # The forest has been reduced in C++: copy the node scores
+            self.score = array("q", self._copy(c_forest.pScores, nn))
+        else:
+            self.score = array("q", bytes(8 * nn))
+
+    @staticmethod
+    def _copy(c_array: Any, n: int) -> "array[int]":
+        """Copy n integers from a C++ INT array into a Python array"""
+        a = array("i")
+        a.frombytes(ffi.buffer(c_array, n * _INT_SIZE))  # type: ignore
+        return a
+
+    @property
+    def root(self) -> "CompactNode":
+        """Return a view of the root node of the forest"""
+        return CompactNode(self, 0)
+
+    @property
+    def num_nodes(self) -> int:
+        """Return the number of nodes in the forest"""
+        return len(self.start)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the number of bytes occupied by the forest's columns"""
+        return sum(
+            len(a) * a.itemsize
+            for a in (
+                self.start,
+                self.end,
+                self.label,
+                self.aux,
+                self.fam_first,
+                self.fam_count,
+                self.prod,
+                self.child_first,
+                self.child_count,
+                self.children,
+                self.score,
+            )
+        )
+
+    def node(self, ix: int) -> Optional["CompactNode"]:
+        """Return a view of the node with the given index,
+        or None for an epsilon (empty) child"""
+        return None if ix < 0 else CompactNode(self, ix)
+
+
+class CompactNode:
+
+    """A lightweight view of a single node within a CompactForest,
+    exposing the same interface as Node. Views are created on demand
+    and compare equal (and hash identically) if they refer to the same
+    node within the same forest, so they can be used as keys in
+    memoization dictionaries just like Node instances."""
+
+    __slots__ = ("_forest", "_ix")
+
+    def __init__(self, forest: CompactForest, ix: int) -> None:
+        self._forest = forest
+        self._ix = ix
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, CompactNode)
+            and self._ix == other._ix
+            and self._forest is other._forest
+        )
+
+    def __hash__(self) -> int:
+        return self._ix
+
+    @property
+    def _start(self) -> int:
+        return self._forest.start[self._ix]
+
+    @property
+    def _end(self) -> int:
+        return self._forest.end[self._ix]
+
+    @property
+    def _token(self) -> Optional[BIN_Token]:
+        ix = self._forest.label[self._ix]
+        return self._forest._tokens[ix] if ix >= 0 else None
+
+    @property
+    def _terminal(self) -> Optional[Terminal]:
+        f = self._forest
+        if f.label[self._ix] < 0:
+            return None
+        return f._grammar.lookup_terminal(f.aux[self._ix])
+
+    @property
+    def _nonterminal(self) -> Optional[Nonterminal]:
+        f = self._forest
+        ix = f.label[self._ix]
+        return f._grammar.lookup_nonterminal(ix) if ix < 0 else None
+
+    @property
+    def _completed(self) -> bool:
+        f = self._forest
+        return f.label[self._ix] < 0 and f.aux[self._ix] != 0
+
+    @property
+    def _families(self) -> Optional[List[ProductionTuple]]:
+        """Return the families of children of this node as a list of
+        (Production, List[CompactNode]) tuples, created on the fly"""
+        f = self._forest
+        num_families = f.fam_count[self._ix]
+        if not num_families:
+            return None
+        productions = f._grammar.productions_by_ix
+        node = f.node
+        children = f.children
+        first = f.fam_first[self._ix]
+        families: List[ProductionTuple] = []
+        for j in range(first, first + num_families):
+            c = f.child_first[j]
+            families.append(
+                (
+                    productions[f.prod[j]],
+                    [node(ch) for ch in children[c : c + f.child_count[j]]],
+                )
+            )
+        return cast(List[ProductionTuple], families)
+
+    @property
+    def score(self) -> int:
+        return self._forest.score[self._ix]
+
+    @score.setter
+    def score(self, sc: int) -> None:
+        self._forest.score[self._ix] = sc
+
+    def reduce_to(self, child_ix: int) -> None:
+        """Eliminate all child families except the given one"""
+        f = self._forest
+        if f.fam_count[self._ix] > 1:
+            # More than one family to choose from:
+            # collapse the family range to one survivor
+            f.fam_first[self._ix] += child_ix
+            f.fam_count[self._ix] = 1
+
+    @property
+    def num_families(self) -> int:
+        """Return the number of families of children of this node"""
+        return self._forest.fam_count[self._ix]
+
+    @property
+    def is_ambiguous(self) -> bool:
+        """Return True if this node has more than one family of children"""
+        return self._forest.fam_count[self._ix] >= 2
+
+    @property
+    def has_children(self) -> bool:
+        """Return True if there are any families of children of this node"""
+        return self._forest.fam_count[self._ix] > 0
+
+    # The remainder of the interface is shared with Node
+    start = Node.start
+    end = Node.end
+    is_span = Node.is_span
+    _first_token = Node._first_token
+    _last_token = Node._last_token
+    token_span = Node.token_span
+    nonterminal = Node.nonterminal
+    is_interior = Node.is_interior
+    is_completed = Node.is_completed
+    is_token = Node.is_token
+    terminal = Node.terminal
+    token = Node.token
+    is_empty = Node.is_empty
+    enum_children = Node.enum_children
+    enum_child_nodes = Node.enum_child_nodes
+    _repr = Node._repr
+    __repr__ = Node.__repr__
+
+    def __str__(self) -> str:
+        """Return a string representation of this node"""
+        return "<CompactNode: " + str(self._nonterminal or self._token) + ">"
+
+
 class ParseError(Exception):
 
     """Exception class for parser errors"""
@@ -630,6 +1094,155 @@ class ParseError(Exception):
         """Return a string representation of the parse error"""
         return self.args[0]
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Allow the exception to be pickled, e.g. to be passed from
+        a worker process, keeping the token index but not the info object"""
+        return (self.__class__, (self.args[0], self._token_index))
+
+
+class ParseBudget(NamedTuple):
+
+    """Limits on the resources that a single parse may consume: the number
+    of Earley states, the number of nodes in the shared packed parse forest
+    (SPPF), and the wall-clock time in milliseconds. Zero means no limit."""
+
+    max_states: int = 0
+    max_nodes: int = 0
+    max_ms: int = 0
+
+
+class ParseStats:
+
+    """Counters describing a single parse, filled in by Fast_Parser.go()
+    and its siblings when passed as their stats parameter: the number of
+    tokens parsed, the number of Earley states, SPPF nodes and SPPF family
+    entries created by the C++ parser, the number of token/terminal matching
+    calls and of tokens whose matches were found in the matching cache,
+    an estimate of the peak
+    number of bytes held by the parser, and the elapsed time of the
+    C++ parse in milliseconds."""
+
+    __slots__ = (
+        "tokens",
+        "states",
+        "nodes",
+        "families",
+        "matching_calls",
+        "matching_cache_hits",
+        "peak_bytes",
+        "elapsed_ms",
+    )
+
+    def __init__(self) -> None:
+        self.tokens = 0
+        self.states = 0
+        self.nodes = 0
+        self.families = 0
+        self.matching_calls = 0
+        self.matching_cache_hits = 0
+        self.peak_bytes = 0
+        self.elapsed_ms = 0
+
+    def _update(self, job: "ParseJob", c_budget: Any) -> None:
+        """Copy the counters from a parse job and a C++ ParseBudget structure"""
+        self.tokens = len(job.tokens)
+        self.states = c_budget.nStates
+        self.nodes = c_budget.nNodes
+        self.families = c_budget.nFamilies
+        self.matching_calls = job.num_matching_calls
+        self.matching_cache_hits = job.num_matching_cache_hits
+        self.peak_bytes = c_budget.nPeakBytes
+        self.elapsed_ms = c_budget.nMillis
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a dict"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return "ParseStats({0})".format(
+            ", ".join("{0}={1}".format(k, v) for k, v in self.as_dict().items())
+        )
+
+
+class ParseBudgetExceeded(ParseError):
+
+    """Exception raised when a parse is aborted because
+    it exceeded its ParseBudget"""
+
+    # The resource names corresponding to the PARSE_BUDGET_* flags in eparser.h
+    _RESOURCES = ((1, "states"), (2, "nodes"), (4, "time"))
+
+    def __init__(
+        self,
+        txt: str,
+        token_index: Optional[int] = None,
+        exceeded: Tuple[str, ...] = (),
+        states: int = 0,
+        nodes: int = 0,
+        elapsed_ms: int = 0,
+    ) -> None:
+        super().__init__(txt, token_index)
+        self._exceeded = exceeded
+        self._states = states
+        self._nodes = nodes
+        self._elapsed_ms = elapsed_ms
+
+    @classmethod
+    def from_budget(
+        cls, c_budget: Any, token_index: Optional[int]
+    ) -> "ParseBudgetExceeded":
+        """Create an exception from a C++ ParseBudget structure"""
+        exceeded = tuple(
+            name for flag, name in cls._RESOURCES if c_budget.nExceeded & flag
+        )
+        return cls(
+            "Parse budget exceeded ({0}) after {1} states, {2} nodes and {3} ms".format(
+                ", ".join(exceeded),
+                c_budget.nStates,
+                c_budget.nNodes,
+                c_budget.nMillis,
+            ),
+            token_index,
+            exceeded,
+            c_budget.nStates,
+            c_budget.nNodes,
+            c_budget.nMillis,
+        )
+
+    @property
+    def exceeded(self) -> Tuple[str, ...]:
+        """Return the names of the exceeded limits,
+        i.e. one or more of 'states', 'nodes' and 'time'"""
+        return self._exceeded
+
+    @property
+    def states(self) -> int:
+        """Return the number of Earley states created before the parse was aborted"""
+        return self._states
+
+    @property
+    def nodes(self) -> int:
+        """Return the number of SPPF nodes created before the parse was aborted"""
+        return self._nodes
+
+    @property
+    def elapsed_ms(self) -> int:
+        """Return the time spent on the parse before it was aborted, in milliseconds"""
+        return self._elapsed_ms
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            self.__class__,
+            (
+                self.args[0],
+                self._token_index,
+                self._exceeded,
+                self._states,
+                self._nodes,
+                self._elapsed_ms,
+            ),
+        )
+
 
 class Fast_Parser(BIN_Parser):
 
@@ -676,7 +1289,14 @@ class Fast_Parser(BIN_Parser):
                 )
         return cls._c_grammar
 
-    def __init__(self, verbose: bool = False, root: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        verbose: bool = False,
+        root: Optional[str] = None,
+        *,
+        matching_cache_size: int = MATCHING_CACHE_SIZE,
+        matching_cache_file: Optional[str] = None,
+    ) -> None:
 
         # Only one initialization at a time, since we don't want a race
         # condition between threads with regards to reading and parsing the grammar file
@@ -695,12 +1315,20 @@ class Fast_Parser(BIN_Parser):
             self._root_index = (
                 0 if root is None else self.grammar.nonterminals[root].index
             )
+            # The number of bytes per token in a token/terminal matching bitmap
+            self._matrix_stride: int = eparser.matrixStride(self._c_parser)  # type: ignore
             # Maintain a token/terminal matching cache for the duration
-            # of this parser instance. Note that this cache will grow with use,
-            # as it includes an entry (consisting of one byte per terminal in the
-            # grammar, or currently about 5K bytes for Greynir.grammar) for every
-            # distinct token that the parser encounters.
-            self._matching_cache: Dict[Tuple[Hashable, ...], Any] = dict()
+            # of this parser instance. The cache includes an entry (consisting
+            # of one bit per terminal in the grammar, or currently about 750 bytes
+            # for Greynir.grammar) for up to matching_cache_size distinct tokens.
+            # If a file name is given, the cache is shared via that file
+            # with other processes that use the same grammar.
+            self._matching_cache = MatchingCache(
+                self._matrix_stride,
+                maxsize=matching_cache_size,
+                shared_file=matching_cache_file,
+                version=self.version,
+            )
 
     def __enter__(self):
         """Python context manager protocol"""
@@ -712,15 +1340,93 @@ class Fast_Parser(BIN_Parser):
         self.cleanup()
         return False
 
-    def go(self, tokens: Iterable[Tok], *, root: Optional[str] = None) -> Node:
+    def go(
+        self,
+        tokens: Iterable[Tok],
+        *,
+        root: Optional[str] = None,
+        compact: bool = False,
+        budget: Optional[ParseBudget] = None,
+        stats: Optional[ParseStats] = None,
+    ) -> Node:
         """Call the C++ parser module to parse the tokens. The parser's
         default root nonterminal can be overridden by passing its
-        name in the root parameter."""
+        name in the root parameter. All token/terminal matches are
+        resolved into a bitmap before calling the C++ parser, which then
+        runs without the Python global interpreter lock (GIL), allowing
+        concurrent parsing in multiple threads. If compact is True,
+        the forest is returned as the root CompactNode of
+        an array-backed CompactForest. If a budget is given, the
+        C++ parser aborts the parse if it exceeds the budget, and
+        ParseBudgetExceeded is raised. If a ParseStats instance is given,
+        it is filled in with counters from the parse, also if the
+        parse fails once the C++ parser has been invoked."""
+        return self.go_with_count(
+            tokens, root=root, compact=compact, budget=budget, stats=stats
+        )[0]
+
+    def go_with_count(
+        self,
+        tokens: Iterable[Tok],
+        *,
+        root: Optional[str] = None,
+        compact: bool = False,
+        budget: Optional[ParseBudget] = None,
+        stats: Optional[ParseStats] = None,
+    ) -> Tuple[Node, int]:
+        """Parse the tokens as in go(), returning a tuple of the parse
+        forest and the number of parse tree combinations within it.
+        The count saturates at 2**64 - 1; use num_combinations() on the
+        forest for an exact count of extremely ambiguous forests."""
+        forest, num, _ = self._parse(tokens, root, compact, budget, None, stats)
+        return forest, num
+
+    def go_reduced(
+        self,
+        tokens: Iterable[Tok],
+        reducer: "Reducer",
+        *,
+        root: Optional[str] = None,
+        compact: bool = False,
+        budget: Optional[ParseBudget] = None,
+        stats: Optional[ParseStats] = None,
+    ) -> Tuple[Node, int, int]:
+        """Parse the tokens as in go() and, if the sentence is ambiguous,
+        reduce the parse forest to its highest-scoring tree in C++
+        before creating any Python nodes. Returns a tuple of the tree,
+        the number of parse tree combinations in the original forest
+        (saturating at 2**64 - 1), and the score of the tree. The result is the same as from
+        Reducer.go_with_score() applied to the forest from go()."""
+        return self._parse(tokens, root, compact, budget, reducer, stats)
+
+    def _parse(
+        self,
+        tokens: Iterable[Tok],
+        root: Optional[str],
+        compact: bool,
+        budget: Optional[ParseBudget],
+        reducer: Optional["Reducer"],
+        stats: Optional[ParseStats] = None,
+    ) -> Tuple[Node, int, int]:
+        """Parse the tokens, optionally reducing the forest in C++,
+        and return a tuple of the forest, the number of
+        parse tree combinations and the score"""
 
         wrapped_tokens = self._wrap(tokens)  # Inherited from BIN_Parser
         lw = len(wrapped_tokens)
         err: Sequence[int] = cast(Any, ffi).new("unsigned int*")
+        c_budget: Any = ffi_NULL
+        if budget is not None or stats is not None:
+            # The C++ parser reports its resource use in the budget
+            # structure, whose limits are zero (i.e. none) by default
+            c_budget = cast(Any, ffi).new("struct ParseBudget*")
+        if budget is not None:
+            c_budget.nMaxStates = budget.max_states
+            c_budget.nMaxNodes = budget.max_nodes
+            c_budget.nMaxMillis = budget.max_ms
         result: Optional[Node] = None
+        num = 0
+        score = 0
 
         # Use the context manager protocol to guarantee that the parse job
         # handle will be properly deleted even if an exception is thrown
@@ -737,10 +1443,28 @@ class Fast_Parser(BIN_Parser):
                 # Override the default root for this parse
                 root_index = self.grammar.nonterminals[root].index
 
-            node: Any = eparser.earleyParse(self._c_parser, lw, root_index, job.handle, err)  # type: ignore
+            # Resolve all token/terminal matches up front, in one pass
+            matrix = job.match_matrix(self._matrix_stride)
+
+            node: Any = eparser.earleyParseWithMatrix(  # type: ignore
+                self._c_parser,
+                lw,
+                root_index,
+                ffi.from_buffer(matrix),  # type: ignore
+                c_budget,
+                err,
+            )
+            if stats is not None:
+                stats._update(job, c_budget)
 
             if node == ffi_NULL:
                 ix = err[0]  # Token index
+                if c_budget != ffi_NULL and c_budget.nExceeded:
+                    # The parse was aborted: report the original index
+                    # of the last token that was consumed
+                    raise ParseBudgetExceeded.from_budget(
+                        c_budget, wrapped_tokens[max(ix - 1, 0)].index
+                    )
                 if ix >= 1:
                     # Find the error token index in the original (unwrapped) token list
                     orig_ix = wrapped_tokens[ix].index if ix < lw else ix
@@ -760,13 +1484,33 @@ class Fast_Parser(BIN_Parser):
                     )
 
             # eparser.dumpForest(node, Fast_Parser._c_grammar) # !!! DEBUG
-            # Create a new Python-side node forest corresponding to the C++ one
-            result = Node.from_c_node(job, node)
+            # Flatten the C++ forest into arrays, and create a new
+            # Python-side node forest from them
+            c_forest: Any = eparser.flattenForest(node)  # type: ignore
+            try:
+                # The combination count is calculated in C++, saturating
+                # at the maximum 64-bit unsigned integer value
+                num = c_forest.nCombinations
+                if reducer is not None and num > 1:
+                    # Reduce the flattened forest to a single tree,
+                    # leaving only that tree to be converted
+                    score = reducer.reduce_flat_forest(job, c_forest)
+                if compact:
+                    result = cast(Node, CompactForest(job, c_forest).root)
+                else:
+                    result = Node.from_flat_forest(job, c_forest)
+            finally:
+                eparser.deleteFlatForest(c_forest)  # type: ignore
 
         # Delete the C++ nodes
         eparser.deleteForest(node)  # type: ignore
         assert result is not None
-        return result
+        return result, num, score
+
+    @property
+    def matching_cache(self) -> MatchingCache:
+        """Return the token/terminal matching cache of this parser"""
+        return self._matching_cache
 
     def go_no_exc(self, tokens: Iterable[Tok], **kwargs: Any) -> Optional[Node]:
         """Simple version of go() that returns None instead of throwing ParseError"""
@@ -785,8 +1529,13 @@ class Fast_Parser(BIN_Parser):
         if Settings.DEBUG:
             eparser.printAllocationReport()  # type: ignore
             print(
-                "Matching cache contains {0} entries".format(len(self._matching_cache))
+                "Matching cache contains {0} entries ({1} hits, {2} misses)".format(
+                    len(self._matching_cache),
+                    self._matching_cache.hits,
+                    self._matching_cache.misses,
+                )
             )
+        self._matching_cache.close()
 
     @classmethod
     def discard_grammar(cls) -> None:
@@ -796,6 +1545,23 @@ class Fast_Parser(BIN_Parser):
         cls._c_grammar = ffi_NULL
         cls._c_grammar_ts = None
 
+    @staticmethod
+    def allocation_counts() -> Dict[str, int]:
+        """Return the cumulative numbers of instances allocated by the
+        C++ parser in this process, such as Earley states and SPPF nodes"""
+        counts = ffi.new("struct AllocationCounts*")
+        eparser.getAllocationCounts(counts)  # type: ignore
+        return dict(
+            nodes=counts.nNodes,
+            states=counts.nStates,
+            discarded_states=counts.nDiscardedStates,
+            state_chunks=counts.nStateChunks,
+            columns=counts.nColumns,
+            hnodes=counts.nHNodes,
+            node_dict_lookups=counts.nNodeDictLookups,
+            matching_calls=counts.nMatchingCalls,
+        )
+
     @classmethod
     def num_combinations(cls, forest: Node) -> int:
         """Count the number of possible parse tree combinations in the given forest"""
@@ -903,12 +1669,13 @@ class ParseForestNavigator:
                     # results; instead _nav_helper() returns NotImplemented
                     v = results
                 else:
-                    if w._families:
-                        if w.is_interior and not w.is_ambiguous:
+                    families = w._families
+                    if families:
+                        if w.is_interior and len(families) < 2:
                             child_level = level
                         else:
                             child_level = level + 1
-                        for ix, (prod, children) in enumerate(w._families):
+                        for ix, (prod, children) in enumerate(families):
                             self.visit_family(results, level, w, ix, prod)
                             for ch in children:
                                 self.add_result(
@@ -76,14 +76,19 @@ from typing import (
     Optional,
     Union,
     Any,
+    BinaryIO,
     cast,
 )
 
 import os
+import json
+import mmap
 import struct
 
+from array import array
 from datetime import datetime
 from collections import defaultdict
+from hashlib import blake2b
 
 # pylint: disable=no-name-in-module
 if TYPE_CHECKING or __package__:
@@ -96,6 +101,19 @@ else:
 
 ProductionTuple = Tuple[int, "Production"]
 
+# Signature at the start of a binary grammar file. The C++ code
+# (Grammar::readBinary() in eparser.cpp) only checks the initial 'Greynir'
+# and reads the productions of each nonterminal, ignoring the metadata
+# sections that follow them. The Python side requires an exact match.
+_BINARY_SIGNATURE = "Greynir00.00.02\n".encode("ascii")  # 16 bytes
+# The binary grammar file ends with a trailer giving the offset of the
+# metadata header, which is followed by a table of contents
+# of (tag, typecode, offset, byte length) entries, one per section
+_BINARY_META_MAGIC = b"GreynirMeta\x00"
+_BINARY_TRAILER = struct.Struct("<Q12s")
+_BINARY_META_HEADER = struct.Struct("<12sI")
+_BINARY_TOC_ENTRY = struct.Struct("<4sc3xQQ")
+
 
 class GrammarError(Exception):
 
@@ -423,6 +441,15 @@ class Production:
         """Reset the production index sequence to zero"""
         cls._index = 0
 
+    @classmethod
+    def set_next_index(cls, ix: int) -> None:
+        """Set the index to be assigned to the next production"""
+        cls._index = ix
+
+    def set_index(self, ix: int) -> None:
+        """Set a new sequence number for this production"""
+        self._index = ix
+
     def append(self, t: GrammarItem) -> None:
         """Append a terminal or nonterminal to this production"""
         self._rhs.append(t)
@@ -681,11 +708,14 @@ class Grammar:
     def _write_binary(self, fname: str) -> None:
         """Write grammar to binary file. Called after reading a grammar text file
         that is newer than the corresponding binary file."""
-        with open(fname, "wb") as f:
+        # Write to a temporary file and then replace the binary file,
+        # since other processes may be reading it at the same time
+        tmp_fname = "{0}.{1}.tmp".format(fname, os.getpid())
+        with open(tmp_fname, "wb") as f:
             if Settings.DEBUG:
                 print("Writing binary grammar file {0}".format(fname))
             # Version header
-            f.write("Greynir00.00.01\n".encode("ascii"))  # 16 bytes total
+            f.write(_BINARY_SIGNATURE)  # 16 bytes total
             num_nt = self.num_nonterminals
             # Number of terminals and nonterminals in grammar
             f.write(struct.pack("<II", self.num_terminals, num_nt))
@@ -705,6 +735,9 @@ class Grammar:
                     f.write(struct.pack("<III", p.index, prio, lenp))
                     if lenp:
                         f.write(struct.pack("<" + str(lenp) + "i", *p.prod))
+            # Metadata sections for the Python side, ignored by the C++ code
+            self._write_metadata(f, f.tell())
+        os.replace(tmp_fname, fname)
         if Settings.DEBUG:
             print("Writing of binary grammar file completed")
             print(
@@ -713,18 +746,267 @@ class Grammar:
                 )
             )
 
+    def _binary_fingerprint(self) -> str:
+        """Return a string identifying the grammar class and any class-specific
+        metadata stored in a binary grammar file. A binary file with a
+        different fingerprint is considered stale."""
+        # Override this in derived classes that store additional metadata
+        return type(self).__name__
+
+    def _terminal_meta(self, t: Terminal) -> int:
+        """Return an integer of class-specific metadata for the given
+        terminal, to be stored in a binary grammar file"""
+        # Override this in derived classes, along with _load_terminal()
+        return 0
+
+    def _load_terminal(self, name: str, literal: bool, meta: int) -> Terminal:
+        """Create a terminal when loading a binary grammar file,
+        given its name and metadata from _terminal_meta()"""
+        if literal:
+            return self._make_literal_terminal(name)
+        return self._make_terminal(name)
+
+    @staticmethod
+    def _text_digest(fname: str) -> str:
+        """Return a digest of the contents of a grammar text file"""
+        with open(fname, "rb") as f:
+            return blake2b(f.read(), digest_size=16).hexdigest()
+
+    def _write_metadata(self, f: BinaryIO, offset: int) -> None:
+        """Write the metadata sections of a binary grammar file, describing
+        the names, tags, scores, productions and terminal variants of the
+        grammar, so that it can be loaded without reading the text file.
+        offset is the current position within the file."""
+        strings: Dict[str, int] = dict()
+
+        def sx(s: str) -> int:
+            """Return the index of a string in the string table"""
+            ix = strings.get(s)
+            if ix is None:
+                ix = strings[s] = len(strings)
+            return ix
+
+        num_nt = self.num_nonterminals
+        num_t = self.num_terminals
+        # Nonterminals in index order, -1 first downto -N:
+        # name, file name, line, score, first tag, tag count, referenced flag
+        ntrm = array("i")
+        tags = array("i")
+        for ix in range(num_nt):
+            nt = self._nonterminals_by_ix[-1 - ix]
+            nt_tags = sorted(nt._tags) if nt._tags else []
+            ntrm.extend(
+                (
+                    sx(nt.name),
+                    sx(nt.fname),
+                    nt.line,
+                    self._nt_scores.get(nt, 0),
+                    len(tags),
+                    len(nt_tags),
+                    int(nt.has_ref),
+                )
+            )
+            tags.extend(sx(tag) for tag in nt_tags)
+        # Terminals in index order, 1 first upto N: name, literal flag
+        term = array("i")
+        tvar = array("q")
+        for ix in range(1, num_t + 1):
+            t = self._terminals_by_ix[ix]
+            term.extend((sx(t.name), int(t.is_literal)))
+            tvar.append(self._terminal_meta(t))
+        # Nonterminals in rule order, with their number of productions
+        ntdi = array("i")
+        # Productions of each nonterminal in rule order: rule priority,
+        # production index, production priority, file name, line, length
+        prod = array("i")
+        rhsi = array("i")
+        for nt, plist in self._nt_dict.items():
+            ntdi.extend((nt.index, len(plist)))
+            for prio, p in plist:
+                prod.extend(
+                    (prio, p.index, p.priority, sx(p.fname or ""), p.line, len(p))
+                )
+                rhsi.extend(p.prod)
+        assert self._root is not None
+        root = array("i", [self._root.index] + [r.index for r in self._secondary_roots])
+        info = dict(
+            digest=self._text_digest(cast(str, self._file_name)),
+            file_name=self._file_name,
+            fingerprint=self._binary_fingerprint(),
+            conditions=sorted(self._conditions),
+            num_nonterminals=num_nt,
+            num_terminals=num_t,
+        )
+        sections: List[Tuple[bytes, bytes, bytes]] = [
+            (b"INFO", b"B", json.dumps(info, ensure_ascii=False).encode("utf-8")),
+            (b"STRS", b"B", "\0".join(strings).encode("utf-8")),
+            (b"NTRM", b"i", ntrm.tobytes()),
+            (b"TAGS", b"i", tags.tobytes()),
+            (b"TERM", b"i", term.tobytes()),
+            (b"TVAR", b"q", tvar.tobytes()),
+            (b"NTDI", b"i", ntdi.tobytes()),
+            (b"PROD", b"i", prod.tobytes()),
+            (b"RHSI", b"i", rhsi.tobytes()),
+            (b"ROOT", b"i", root.tobytes()),
+        ]
+        f.write(_BINARY_META_HEADER.pack(_BINARY_META_MAGIC, len(sections)))
+        # Sections start after the table of contents, aligned at 8 bytes
+        pos = offset + _BINARY_META_HEADER.size + len(sections) * _BINARY_TOC_ENTRY.size
+        toc: List[bytes] = []
+        for tag, typecode, data in sections:
+            pos += -pos % 8
+            toc.append(_BINARY_TOC_ENTRY.pack(tag, typecode, pos, len(data)))
+            pos += len(data)
+        f.write(b"".join(toc))
+        for tag, typecode, data in sections:
+            f.write(b"\0" * (-f.tell() % 8))
+            f.write(data)
+        f.write(_BINARY_TRAILER.pack(offset, _BINARY_META_MAGIC))
+
+    def _read_binary(self, fname: str, binary_fname: str) -> bool:
+        """Attempt to load the grammar from the metadata sections of a
+        memory-mapped binary grammar file. Returns False if the binary
+        file is missing, in an unknown format, or stale, i.e. made from
+        a different version of the grammar text file."""
+        try:
+            digest = self._text_digest(fname)
+            with open(binary_fname, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                if mm[0 : len(_BINARY_SIGNATURE)] != _BINARY_SIGNATURE:
+                    return False
+                offset, magic = _BINARY_TRAILER.unpack_from(
+                    mm, len(mm) - _BINARY_TRAILER.size
+                )
+                magic_h, num_sections = _BINARY_META_HEADER.unpack_from(mm, offset)
+                if magic != _BINARY_META_MAGIC or magic_h != _BINARY_META_MAGIC:
+                    return False
+                sections: Dict[bytes, Any] = dict()
+                pos = offset + _BINARY_META_HEADER.size
+                for _ in range(num_sections):
+                    tag, typecode, start, length = _BINARY_TOC_ENTRY.unpack_from(mm, pos)
+                    pos += _BINARY_TOC_ENTRY.size
+                    with memoryview(mm)[start : start + length] as mv:
+                        if typecode == b"B":
+                            sections[tag] = bytes(mv)
+                        else:
+                            with mv.cast(typecode.decode("ascii")) as a:
+                                sections[tag] = a.tolist()
+        except (OSError, ValueError, TypeError, struct.error):
+            return False
+        try:
+            info = json.loads(sections[b"INFO"].decode("utf-8"))
+            if (
+                info["digest"] != digest
+                or info["fingerprint"] != self._binary_fingerprint()
+                or info["conditions"] != sorted(self._conditions)
+            ):
+                # Stale binary file
+                return False
+            self._load_metadata(fname, info, sections)
+        except (KeyError, ValueError, IndexError):
+            return False
+        return True
+
+    def _load_metadata(
+        self, fname: str, info: Dict[str, Any], sections: Dict[bytes, Any]
+    ) -> None:
+        """Create the grammar's nonterminals, terminals and
+        productions from the metadata sections of a binary grammar file"""
+        strings: List[str] = sections[b"STRS"].decode("utf-8").split("\0")
+        # Point the grammar items to the grammar file at its current location
+        old_fname = info["file_name"]
+        strings = [fname if s == old_fname else s for s in strings]
+        nonterminals = self._nonterminals
+        nt_by_ix = self._nonterminals_by_ix
+        tags: List[int] = sections[b"TAGS"]
+        ntrm: List[int] = sections[b"NTRM"]
+        num_nt: int = info["num_nonterminals"]
+        for ix, name, nt_fname, line, score, tag_first, tag_count, ref in zip(
+            range(-1, -1 - num_nt, -1), *(ntrm[i::7] for i in range(7))
+        ):
+            nt = self._make_nonterminal(strings[name], strings[nt_fname], line)
+            nt.set_index(ix)
+            for tag in tags[tag_first : tag_first + tag_count]:
+                nt.add_tag(strings[tag])
+            if ref:
+                nt.add_ref()
+            if score:
+                self._nt_scores[nt] = score
+            nonterminals[nt.name] = nt
+            nt_by_ix[ix] = nt
+        terminals = self._terminals
+        t_by_ix = self._terminals_by_ix
+        term: List[int] = sections[b"TERM"]
+        load_terminal = self._load_terminal
+        for ix, name, literal, meta in zip(
+            range(1, info["num_terminals"] + 1),
+            term[0::2],
+            term[1::2],
+            sections[b"TVAR"],
+        ):
+            t = load_terminal(strings[name], bool(literal), meta)
+            t.set_index(ix)
+            terminals[t.name] = t
+            t_by_ix[ix] = t
+        # List of grammar items, where terminals have positive
+        # and nonterminals negative indices
+        items: List[GrammarItem] = [cast(GrammarItem, None)]
+        items.extend(t_by_ix[ix] for ix in range(1, len(t_by_ix) + 1))
+        items.extend(nt_by_ix[ix] for ix in range(-num_nt, 0))
+        item_at = items.__getitem__
+        ntdi: List[int] = sections[b"NTDI"]
+        prod: List[int] = sections[b"PROD"]
+        rhsi: List[int] = sections[b"RHSI"]
+        productions = self._productions_by_ix
+        prods = zip(*(prod[i::6] for i in range(6)))
+        ri = 0
+        for nt_ix, num in zip(ntdi[0::2], ntdi[1::2]):
+            plist: List[ProductionTuple] = []
+            for _, (prio, p_ix, p_prio, p_fname, line, length) in zip(
+                range(num), prods
+            ):
+                p = Production(
+                    strings[p_fname] or None,
+                    line,
+                    list(map(item_at, rhsi[ri : ri + length])),
+                    p_prio,
+                )
+                ri += length
+                p.set_index(p_ix)
+                plist.append((prio, p))
+                productions[p_ix] = p
+            self._nt_dict[nt_by_ix[nt_ix]] = plist
+        Production.set_next_index(max(productions, default=-1) + 1)
+        root: List[int] = sections[b"ROOT"]
+        self._root = nt_by_ix[root[0]]
+        self._secondary_roots = [nt_by_ix[ix] for ix in root[1:]]
+        # Grammar successfully loaded: note the file name and timestamp
+        self._file_name = fname
+        self._file_time = datetime.fromtimestamp(os.path.getmtime(fname))
+
     def read(
         self, fname: str, verbose: bool = False, binary_fname: Optional[str] = None
     ) -> None:
         """Read grammar from a text file. Set verbose=True to get diagnostic messages
         about unused nonterminals and nonterminals that are unreachable
         from the root.
-        Pass a file name in binary_fname to write a fresh binary file if the
-        grammar text file is newer than the existing binary file."""
+        If a file name is passed in binary_fname, the grammar is loaded
+        from that binary file, if it exists and was made from the current
+        contents of the text file. Otherwise, the text file is read and
+        a fresh binary file is written."""
+        if binary_fname is not None and self._read_binary(fname, binary_fname):
+            return
         try:
             with open(fname, "r", encoding="utf-8") as inp:
                 # Read grammar file line-by-line
-                self.read_from_generator(fname, inp, verbose, binary_fname)
+                self.read_from_generator(
+                    fname,
+                    inp,
+                    verbose,
+                    binary_fname,
+                    force_new_binary=binary_fname is not None,
+                )
         except (IOError, OSError):
             raise GrammarError("Unable to open or read grammar file", fname, 0)
 
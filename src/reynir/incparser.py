@@ -110,13 +110,11 @@ class IncrementalParser:
                     raise ParseError(
                         "Sentence is probably not in Icelandic", token_index=0
                     )
-                forest = self._ip._parser.go(self._s)
-                num = Fast_Parser.num_combinations(forest)
-                if num > 1:
-                    forest, score = self._ip._reducer.go_with_score(forest)
+                # Parse the sentence and reduce the forest to a single tree
+                forest, num, score = self._ip._parser.go_reduced(
+                    self._s, self._ip._reducer
+                )
             except ParseError as e:
-                # The ParseError may originate in the reducer.go_with_score()
-                # function, and in that case, forest is not None; be sure to reset it
                 forest = None
                 score = 0
                 num = 0
@@ -29,7 +29,14 @@
 
 
     This module exports the function match_pattern() which can determine
-    whether a SimpleTree instance matches a pattern string.
+    whether a SimpleTree instance matches a pattern string, and the function
+    match_patterns() which matches many patterns against a tree and all
+    its subtrees in a single traversal.
+
+    Patterns are compiled once into nested Python closures, which are kept
+    in a bounded cache. The functions single_match(), run_sequence() and
+    run_set() interpret the uncompiled form of a pattern; they define the
+    semantics that the compiled closures implement.
 
     The match patterns are as follows:
     ----------------------------------
@@ -129,6 +136,8 @@
 from typing import (
     Callable,
     Dict,
+    FrozenSet,
+    Iterable,
     Iterator,
     List,
     Optional,
@@ -140,6 +149,10 @@ from typing import (
 )
 
 import re
+from functools import lru_cache
+from itertools import chain
+
+from .cache import LFU_Cache
 
 if TYPE_CHECKING:
     from .simpletree import SimpleTree
@@ -147,6 +160,12 @@ if TYPE_CHECKING:
 ContextFunc = Callable[["SimpleTree"], Union[bool, str]]
 ContextDict = Dict[str, Union[str, ContextFunc]]
 ItemList = List[Union["_NestedList", str]]
+# A compiled matcher for a single tree node
+NodeMatcher = Callable[["SimpleTree", ContextDict], bool]
+# A compiled matcher for a sequence of tree nodes
+RunMatcher = Callable[[Iterator["SimpleTree"], ContextDict], bool]
+# A set of alternative keys, at least one of which must be present
+KeySet = FrozenSet[str]
 
 # Reserved strings in matching expressions
 _NOT_ITEMS = frozenset((">", "*", "+", "?", "[", "(", "{", "]", ")", "}", "$"))
@@ -154,6 +173,12 @@ _NEST = {"(": ")", "[": "]", "{": "}"}
 _FINISHERS = frozenset(_NEST.values())
 _PATTERN_REGEX = r"\s+|([\.\|\(\)\{\}\[\]\*\+\?\>\$])"
 
+# Maximum number of compiled patterns to keep in the pattern cache
+PATTERN_CACHE_SIZE = 1024
+# Maximum number of compiled single items, such as the values
+# of context macros, to keep in the item cache
+_ITEM_CACHE_SIZE = 2048
+
 
 class _NestedList(List[Union[str, "_NestedList"]]):
 
@@ -175,28 +200,50 @@ class _NestedList(List[Union[str, "_NestedList"]]):
 class _CompiledPattern:
 
     """This class encapsulates a matching pattern that has
-    been parsed into a nested list of matching items"""
+    been parsed into a nested list of matching items, and
+    compiled from there into a matching function"""
 
-    _pattern_cache: Dict[str, "_CompiledPattern"] = dict()
+    _pattern_cache: LFU_Cache[str, "_CompiledPattern"] = LFU_Cache(
+        maxsize=PATTERN_CACHE_SIZE
+    )
 
     @classmethod
     def compile(cls, pattern: str) -> "_CompiledPattern":
         """Check whether we've parsed this pattern before, and if so,
         re-use the result"""
-        if pattern in cls._pattern_cache:
-            return cls._pattern_cache[pattern]
-        # Not already in cache: compile the pattern and cache it
-        cp = cls._pattern_cache[pattern] = cls(pattern)
-        return cp
+        return cls._pattern_cache.lookup(pattern, cls)
 
     def __init__(self, pattern: str) -> None:
         self._items = self._compile(pattern)
+        self._match = _compile_node_set(self._items)
+        # The tag or terminal category keys, one of which a tree node
+        # must have to match the pattern, or None if any node may match
+        self._heads = _set_head_keys(self._items)
+        # Sets of alternative keys, one from each of which must be
+        # present somewhere in a tree for the pattern to match within it
+        self._required = _required_keys(self._items, "{")
 
     @property
     def items(self) -> ItemList:
         """Return the embedded nested list of matching items"""
         return self._items
 
+    @property
+    def heads(self) -> Optional[KeySet]:
+        """Return the keys that a matching node may have, or None
+        if the pattern can match any node"""
+        return self._heads
+
+    @property
+    def required(self) -> List[KeySet]:
+        """Return the sets of alternative keys that must be present
+        within a tree for the pattern to match any of its subtrees"""
+        return self._required
+
+    def match(self, tree: "SimpleTree", context: ContextDict) -> bool:
+        """Return True if the tree matches this pattern"""
+        return self._match(tree, context)
+
     def _compile(self, pattern: str) -> ItemList:
         """Compile a matching pattern into a nested list of matching items"""
 
@@ -610,9 +657,560 @@ def run_set(gen: Iterator["SimpleTree"], items: ItemList, context: ContextDict)
     return False
 
 
+def _raiser(message: str) -> NodeMatcher:
+    """Return a matcher that raises a ValueError with the given message.
+    Errors in patterns are thus reported when the faulty part of the
+    pattern is reached, as in the uncompiled form."""
+
+    def raise_error(tree: "SimpleTree", context: ContextDict) -> bool:
+        raise ValueError(message)
+
+    return raise_error
+
+
+def _and_then(first: NodeMatcher, second: NodeMatcher) -> NodeMatcher:
+    """Return a matcher that calls both matchers, returning the result
+    of the second one"""
+
+    def match_both(tree: "SimpleTree", context: ContextDict) -> bool:
+        first(tree, context)
+        return second(tree, context)
+
+    return match_both
+
+
+def _always(tree: "SimpleTree", context: ContextDict) -> bool:
+    return True
+
+
+def _never(tree: "SimpleTree", context: ContextDict) -> bool:
+    return False
+
+
+def _is_ip(tree: "SimpleTree") -> bool:
+    return tree.tag == "IP"
+
+
+@lru_cache(maxsize=_ITEM_CACHE_SIZE)
+def _compile_plain(item: str) -> NodeMatcher:
+    """Compile a single item string, other than a macro, into a matcher
+    for a tree node. This corresponds to the latter part of single_match()."""
+    if item in _NOT_ITEMS:
+        return _raiser("Spurious '{0}' in pattern".format(item))
+    if item == ".":
+        # Wildcard: always matches
+        return _always
+    if item.startswith('@"'):
+        # @ + double quote: literal string, matching a terminal only
+        text = item[2:-1].casefold()
+
+        def match_terminal_text(tree: "SimpleTree", context: ContextDict) -> bool:
+            return tree.is_terminal and text == tree.text.casefold()
+
+        return match_terminal_text
+    if item.startswith("@'"):
+        # @ + single quote: match word lemma(s) of this terminal only
+        lemma = item[2:-1]
+
+        def match_terminal_lemma(tree: "SimpleTree", context: ContextDict) -> bool:
+            return tree.is_terminal and lemma == tree.lemma
+
+        return match_terminal_lemma
+    if item.startswith('"'):
+        # Double quote: literal string, compared case-neutrally
+        text = item[1:-1].casefold()
+
+        def match_text(tree: "SimpleTree", context: ContextDict) -> bool:
+            return text == tree.text.casefold()
+
+        return match_text
+    if item.startswith("'"):
+        # Single quote: match word lemma(s) of the subtree
+        lemma = item[1:-1]
+
+        def match_lemma(tree: "SimpleTree", context: ContextDict) -> bool:
+            return lemma == tree.lemma
+
+        return match_lemma
+    ilist = item.split("_")
+    cat = ilist[0]
+    variants = frozenset(ilist[1:])
+    is_p = item == "p"
+    # NP matches NP as well as NP-POSS, etc., while NP-POSS only matches NP-POSS
+    tags = re.split(r"[_\-]", item)
+
+    def match_node(tree: "SimpleTree", context: ContextDict) -> bool:
+        if tree.is_terminal:
+            if tree.kind == "PUNCTUATION":
+                return is_p
+            if tree.terminal == item:
+                return True
+            # First parts must match (i.e., no_xxx != so_xxx), and the
+            # remaining variants must be a subset of those in the terminal
+            return cat == tree.tcat and variants <= tree._vset
+        # Check nonterminal tag
+        return tree.match_tag(tags)
+
+    return match_node
+
+
+def _compile_macro(item: str) -> NodeMatcher:
+    """Compile a %macro item, which is resolved via the context dictionary
+    each time it is matched"""
+    name = item[1:]
+    # Without a context, the item is matched as-is
+    plain = _compile_plain(item)
+
+    def match_macro(tree: "SimpleTree", context: ContextDict) -> bool:
+        if not context:
+            return plain(tree, context)
+        result: Union[None, str, bool, ContextFunc] = context.get(name)
+        if callable(result):
+            # The macro resolves to a function: call it with the tree as an argument
+            result = result(tree)
+            if isinstance(result, bool):
+                # The function yielded a bool result: return it
+                return result
+        if result is None:
+            raise ValueError("Macro '{0}' not found in context".format(name))
+        if not isinstance(result, str):  # type: ignore
+            raise ValueError("Macro '{0}' must yield a callable or string".format(name))
+        # Match the string retrieved from the context as an item
+        return _compile_plain(result)(tree, context)
+
+    return match_macro
+
+
+def _compile_single(item: Union[str, _NestedList]) -> NodeMatcher:
+    """Compile an item into a matcher for a tree node,
+    corresponding to single_match()"""
+    if isinstance(item, _NestedList):
+        if item.kind != "(":
+            return _never
+        # A list of choices separated by '|': OR
+        choices = tuple(
+            # Not just one simple item: probably NONTERMINAL >|>>|>>> condition
+            _compile_node_set(it)
+            if isinstance(it, _NestedList) and it.kind == "|"
+            else _compile_single(it)
+            for it in item
+        )
+
+        def match_choice(tree: "SimpleTree", context: ContextDict) -> bool:
+            for choice in choices:
+                if choice(tree, context):
+                    return True
+            return False
+
+        return match_choice
+    if item.startswith("%"):
+        return _compile_macro(item)
+    return _compile_plain(item)
+
+
+def _compile_contained(items: ItemList, pc: int, op: str) -> NodeMatcher:
+    """Compile the argument at items[pc] of a containment operator
+    into a matcher for a tree node, corresponding to contained()"""
+    subseq, kind = unpack(items, pc)
+    run = _compile_sequence(subseq) if kind == "[" else _compile_set(subseq)
+    if op == ">>>":
+        # Deep containment
+        def match_deep(tree: "SimpleTree", context: ContextDict) -> bool:
+            return any(run(children, context) for children in tree.deep_children)
+
+        return match_deep
+    if op == ">>":
+        # Deep containment, except skipping IP subtrees
+        def match_deep_filtered(tree: "SimpleTree", context: ContextDict) -> bool:
+            return any(
+                run(children, context)
+                for children in tree.deep_children_filtered(_is_ip)
+            )
+
+        return match_deep_filtered
+
+    # Shallow containment: the direct children
+    def match_children(tree: "SimpleTree", context: ContextDict) -> bool:
+        return run(tree.children, context)
+
+    return match_children
+
+
+def _containment_op(items: ItemList, pc: int) -> Tuple[str, int]:
+    """Parse a '>', '>>' or '>>>' operator starting at items[pc],
+    returning the operator and the index of its argument"""
+    op = ">"
+    pc += 1
+    if pc < len(items) and items[pc] == ">":
+        # '>>' operator: arbitrary depth containment, but skipping IP subtrees
+        op = ">>"
+        pc += 1
+        if pc < len(items) and items[pc] == ">":
+            # '>>>' operator: arbitrary depth containment
+            op = ">>>"
+            pc += 1
+    return op, pc
+
+
+# An entry in a compiled set: a matcher for the item itself,
+# and a matcher for the children required by a containment operator, if any
+_SetEntry = Tuple[NodeMatcher, Optional[NodeMatcher]]
+
+
+def _set_entries(items: ItemList) -> List[_SetEntry]:
+    """Compile the items of a set into a list of entries, each of which
+    must be matched by some tree node for the set to match"""
+    entries: List[_SetEntry] = []
+    len_items = len(items)
+    pc = 0
+    while pc < len_items:
+        match = _compile_single(items[pc])
+        pc += 1
+        contains: Optional[NodeMatcher] = None
+        if pc < len_items and items[pc] == ">":
+            # Containment: Not a match unless the children match as well
+            op, pc = _containment_op(items, pc)
+            if pc >= len_items:
+                # The error is raised whether or not the item matches
+                match = _and_then(
+                    match, _raiser("Missing argument to '{0}' operator".format(op))
+                )
+            else:
+                contains = _compile_contained(items, pc, op)
+                pc += 1
+        entries.append((match, contains))
+    return entries
+
+
+def _compile_node_set(items: ItemList) -> NodeMatcher:
+    """Compile a set of items into a matcher for a single tree node,
+    which must match all the items. This is equivalent to matching
+    a set against a sequence containing the node only."""
+    entries = tuple(_set_entries(items))
+
+    def match_all(tree: "SimpleTree", context: ContextDict) -> bool:
+        assert entries
+        result = True
+        # All entries are tried, even after a failed one,
+        # so that errors in the pattern are always reported
+        for match, contains in entries:
+            if not match(tree, context) or (
+                contains is not None and not contains(tree, context)
+            ):
+                result = False
+        return result
+
+    return match_all
+
+
+def _compile_set(items: ItemList) -> RunMatcher:
+    """Compile a set of items into a matcher for a sequence
+    of tree nodes, corresponding to run_set()"""
+    entries = _set_entries(items)
+
+    def run(gen: Iterator["SimpleTree"], context: ContextDict) -> bool:
+        assert entries
+        # Entries that have not yet been matched by any tree node
+        unmatched = entries
+        for tree in gen:
+            still_unmatched: List[_SetEntry] = []
+            for entry in unmatched:
+                match, contains = entry
+                if not match(tree, context) or (
+                    contains is not None and not contains(tree, context)
+                ):
+                    still_unmatched.append(entry)
+            if not still_unmatched:
+                # All items have been matched: Short-circuit
+                return True
+            unmatched = still_unmatched
+        return False
+
+    return run
+
+
+def _sequence_tail(items: ItemList, pc: int) -> Union[bool, str]:
+    """Return the result of a sequence match where the tree nodes
+    ran out at items[pc], or an error message if the remaining items
+    are faulty. This corresponds to the end of run_sequence()."""
+    len_items = len(items)
+    try:
+        # Skip any nullable items
+        while pc + 1 < len_items and items[pc + 1] in ("*", "?"):
+            item = items[pc]
+            if isinstance(item, str) and item in _NOT_ITEMS:
+                raise ValueError("Spurious '{0}' in pattern".format(item))
+            pc += 2
+    except ValueError as e:
+        return str(e)
+    if pc < len_items:
+        if items[pc] == "$":
+            # Move past the end-of-list marker, if any
+            pc += 1
+    elif pc > 0 and items[pc - 1] == "$":
+        # Gone too far: back up
+        pc -= 1
+    return pc >= len_items
+
+
+# A step in a compiled sequence: the matcher for the first node,
+# the matcher for repeated nodes, the repeat specifier, the matcher
+# of the stopper item of a wildcard repeat, the matcher for the
+# argument of a containment operator, and the item index after the step
+_SequenceStep = Tuple[
+    NodeMatcher,
+    NodeMatcher,
+    Optional[str],
+    Optional[NodeMatcher],
+    Optional[NodeMatcher],
+    int,
+]
+
+
+def _compile_sequence(items: ItemList) -> RunMatcher:
+    """Compile a sequence of items into a matcher for a sequence
+    of tree nodes, corresponding to run_sequence()"""
+    len_items = len(items)
+    steps: List[_SequenceStep] = []
+    # The result of the match if the tree nodes run out at each index
+    tails: Dict[int, Union[bool, str]] = {0: _sequence_tail(items, 0)}
+    pc = 0
+    while pc < len_items:
+        item = items[pc]
+        pc += 1
+        repeat: Optional[str] = None
+        stopper: Optional[NodeMatcher] = None
+        contains: Optional[NodeMatcher] = None
+        if pc < len_items:
+            ipc = items[pc]
+            if isinstance(ipc, str) and ipc in {"*", "+", "?", ">"}:
+                # Repeat specifier
+                repeat = ipc
+                pc += 1
+                if item == "." and repeat in {"*", "+", "?"}:
+                    # Limit wildcard repeats if the following item
+                    # is concrete, i.e. non-wildcard and non-end
+                    if pc < len_items:
+                        ipc = items[pc]
+                        if isinstance(ipc, _NestedList):
+                            if ipc.kind == "(":
+                                stopper = _compile_single(ipc)
+                        elif ipc not in {".", "$"}:
+                            stopper = _compile_single(ipc)
+        match = _compile_single(item)
+        # The end marker only matches at the end of the list
+        first = (_always if pc >= len_items else _never) if item == "$" else match
+        if repeat == ">":
+            op, pc = _containment_op(items, pc - 1)
+            if pc >= len_items:
+                contains = _raiser("Missing argument to '{0}' operator".format(op))
+            else:
+                contains = _compile_contained(items, pc, op)
+                pc += 1
+        steps.append((first, match, repeat, stopper, contains, pc))
+        tails[pc] = _sequence_tail(items, pc)
+    # Found end marker but the node iterator is not complete
+    at_end = not (len_items and items[-1] == "$")
+
+    def run(gen: Iterator["SimpleTree"], context: ContextDict) -> bool:
+        pc = 0
+        try:
+            tree = next(gen)
+            for first, match, repeat, stopper, contains, pc in steps:
+                result = first(tree, context)
+                if repeat is None:
+                    # Plain item-for-item match
+                    if not result:
+                        return False
+                    tree = next(gen)
+                elif repeat == "+" or repeat == "*":
+                    if repeat == "+":
+                        if not result:
+                            return False
+                    elif stopper is not None and stopper(tree, context):
+                        # Greedy stop
+                        result = False
+                    while result:
+                        tree = next(gen)
+                        if stopper is not None:
+                            # Greedy stop
+                            result = not stopper(tree, context)
+                        else:
+                            result = match(tree, context)
+                elif repeat == "?":
+                    if stopper is not None and stopper(tree, context):
+                        # Greedy stop
+                        result = False
+                    if result:
+                        tree = next(gen)
+                else:
+                    # Containment: no match if the head item does not match
+                    if not result or not cast(NodeMatcher, contains)(tree, context):
+                        return False
+                    tree = next(gen)
+        except StopIteration:
+            tail = tails[pc]
+            if isinstance(tail, str):
+                raise ValueError(tail)
+            return tail
+        return at_end
+
+    return run
+
+
+def _item_keys(
+    item: Union[str, _NestedList], literals: bool = False
+) -> Optional[KeySet]:
+    """Return the set of keys, one of which a tree node must have
+    to match the item, or None if the item may match any node.
+    Nonterminals are keyed by the first part of their tag (NP for NP-OBJ)
+    and terminals by their category (no for no_et_nf_kk), or 'p' for
+    punctuation. If literals is True, lemma literals are keyed by the
+    lemma of a terminal, prefixed with ', and text literals by the
+    case-folded text of a terminal, prefixed with ". Since a literal may
+    match a nonterminal, such keys only tell whether a matching node
+    may be present within a tree, not whether a given node matches."""
+    if isinstance(item, _NestedList):
+        if item.kind != "(":
+            # Never matches
+            return frozenset()
+        keys: Set[str] = set()
+        for it in item:
+            if isinstance(it, _NestedList) and it.kind == "|":
+                k = _set_head_keys(it, literals)
+            else:
+                k = _item_keys(it, literals)
+            if k is None:
+                return None
+            keys |= k
+        return frozenset(keys)
+    if item.startswith("%") or item in _NOT_ITEMS or item == ".":
+        return None
+    if item.startswith(("@'", "@\"", "'", '"')):
+        if not literals:
+            return None
+        at = item.startswith("@")
+        literal = item[2:-1] if at else item[1:-1]
+        if not at and " " in literal:
+            # May match a subtree spanning several terminals
+            return None
+        if item[1 if at else 0] == '"':
+            return frozenset(('"' + literal.casefold(),))
+        return frozenset(("'" + literal,))
+    return frozenset((re.split(r"[_\-]", item)[0], item.split("_")[0]))
+
+
+def _set_head_keys(items: ItemList, literals: bool = False) -> Optional[KeySet]:
+    """Return the keys, one of which a tree node must have to match
+    all the items of a set, or None if any node may match"""
+    len_items = len(items)
+    pc = 0
+    while pc < len_items:
+        keys = _item_keys(items[pc], literals)
+        if keys is not None:
+            return keys
+        pc += 1
+        if pc < len_items and items[pc] == ">":
+            # Skip the containment operator and its argument
+            _, pc = _containment_op(items, pc)
+            pc += 1
+    return None
+
+
+def _required_keys(items: ItemList, kind: str) -> List[KeySet]:
+    """Return a list of key sets, one key from each of which must be
+    present within a tree for the items, a set if kind is '{' or a
+    sequence if kind is '[', to match anywhere within it"""
+    required: List[KeySet] = []
+
+    def require(item: Union[str, _NestedList]) -> None:
+        keys = _item_keys(item, literals=True)
+        if keys is not None:
+            required.append(keys)
+
+    len_items = len(items)
+    pc = 0
+    while pc < len_items:
+        item = items[pc]
+        pc += 1
+        repeat: Optional[str] = None
+        if pc < len_items:
+            ipc = items[pc]
+            if isinstance(ipc, str) and ipc in {"*", "+", "?", ">"}:
+                repeat = ipc
+                if ipc != ">":
+                    pc += 1
+        if kind == "{" or repeat not in {"*", "?"}:
+            if not (isinstance(item, str) and item == "$"):
+                require(item)
+        if repeat == ">":
+            op, pc = _containment_op(items, pc)
+            if pc < len_items:
+                subseq, sub_kind = unpack(items, pc)
+                required.extend(_required_keys(cast(ItemList, subseq), sub_kind))
+                pc += 1
+    return required
+
+
+def _node_key(tree: "SimpleTree") -> Optional[str]:
+    """Return the key of a tree node, i.e. the first part of the tag
+    of a nonterminal, the category of a terminal, or 'p' for punctuation"""
+    if tree.is_terminal:
+        return "p" if tree.kind == "PUNCTUATION" else tree.tcat
+    tag = tree.tag
+    return None if tag is None else tag.split("-")[0]
+
+
 def match_pattern(
     tree: "SimpleTree", pattern: str, context: Optional[ContextDict] = None
-):
+) -> bool:
     """Return the result of a pattern match on a SimpleTree instance"""
-    cp = _CompiledPattern.compile(pattern)
-    return run_set(iter([tree]), cp.items, context or {})
+    return _CompiledPattern.compile(pattern).match(tree, context or {})
+
+
+def match_patterns(
+    tree: "SimpleTree",
+    patterns: Iterable[str],
+    context: Optional[ContextDict] = None,
+) -> Dict[str, List["SimpleTree"]]:
+    """Match many patterns against a tree and all its subtrees, in a
+    single traversal. Returns a dict of the patterns that matched, in the
+    given order, each mapped to a list of the subtree roots, including
+    the tree itself, that match it, in the same order as all_matches()."""
+    context = context or {}
+    compiled: Dict[str, _CompiledPattern] = {
+        pattern: _CompiledPattern.compile(pattern) for pattern in patterns
+    }
+    nodes = list(chain([tree], tree.descendants))
+    keys = [_node_key(node) for node in nodes]
+    # Skip patterns requiring keys that are not present in the tree
+    present: Set[Optional[str]] = set(keys)
+    if any(
+        k[:1] in ("'", '"') for cp in compiled.values() for ks in cp.required for k in ks
+    ):
+        # Some pattern requires lemma or text literals
+        for node in nodes:
+            if node.is_terminal:
+                present.add("'" + node.lemma)
+                present.add('"' + node.text.casefold())
+    # Patterns that may match any node, and patterns indexed by node key
+    anywhere: List[Tuple[str, _CompiledPattern]] = []
+    by_key: Dict[str, List[Tuple[str, _CompiledPattern]]] = {}
+    for pattern, cp in compiled.items():
+        if not all(present.intersection(ks) for ks in cp.required):
+            continue
+        if cp.heads is None:
+            anywhere.append((pattern, cp))
+        else:
+            for k in cp.heads:
+                by_key.setdefault(k, []).append((pattern, cp))
+    matches: Dict[str, List["SimpleTree"]] = {}
+    for node, key in zip(nodes, keys):
+        candidates = anywhere
+        if key is not None and key in by_key:
+            candidates = anywhere + by_key[key]
+        for pattern, cp in candidates:
+            if cp.match(node, context):
+                matches.setdefault(pattern, []).append(node)
+    # Return the matched patterns in the order in which they were given
+    return {pattern: matches[pattern] for pattern in compiled if pattern in matches}
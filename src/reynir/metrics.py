@@ -0,0 +1,273 @@
+"""
+
+    Greynir: Natural language processing for Icelandic
+
+    Process-wide metrics
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    This module implements the Metrics class, a process-wide registry
+    of statistics that outlives individual parse jobs. It holds latency
+    histograms for tokenization, parsing and reduction, bucketed by
+    sentence length, counters of parse failures by cause, and hit counts
+    for the parse and matching caches. Long-running services can read
+    the registry as a dict, or export it in the Prometheus text format.
+
+    The registry is shared by all Greynir instances within a process,
+    and is available via Greynir.metrics. Sentences that are parsed in
+    worker processes are recorded in the registry of the process that
+    collects their results.
+
+"""
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+)
+
+from bisect import bisect_left
+from threading import Lock
+
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Upper bounds, in tokens, of the sentence length classes
+# by which the latency histograms are kept
+LENGTH_CLASSES = (10, 20, 40, 90)
+
+# The latencies that are recorded, with their descriptions
+LATENCIES = {
+    "tokenize": "Sentence tokenization latency in seconds",
+    "parse": "Sentence parse latency in seconds, including reduction"
+    " (parse cache hits are not included)",
+    "reduce": "Parse forest reduction latency in seconds",
+}
+
+# The causes of parse failures that are counted
+FAILURE_CAUSES = ("too_long", "foreign", "no_parse", "budget")
+
+# The caches whose hit ratios are recorded
+CACHES = ("parse", "matching")
+
+# Prefix of the metric names in the Prometheus text format
+PROMETHEUS_PREFIX = "greynir"
+
+
+def _length_class(length: int) -> str:
+    """Return the name of the length class of a sentence with
+    the given number of tokens, such as '11-20' or '91+'"""
+    ix = bisect_left(LENGTH_CLASSES, length)
+    if ix >= len(LENGTH_CLASSES):
+        return "{0}+".format(LENGTH_CLASSES[-1] + 1)
+    lower = LENGTH_CLASSES[ix - 1] + 1 if ix > 0 else 1
+    return "{0}-{1}".format(lower, LENGTH_CLASSES[ix])
+
+
+def _format_float(f: float) -> str:
+    """Format a number for the Prometheus text format"""
+    return repr(float(f))
+
+
+class Histogram:
+
+    """A histogram of observed values, with a count of the values
+    in each bucket, i.e. that are at most the bucket's upper bound
+    but greater than the bound of the previous bucket"""
+
+    __slots__ = ("_bounds", "_counts", "_sum")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._bounds = tuple(bounds)
+        # The last count is for values above the highest bound
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram"""
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._sum += value
+
+    @property
+    def count(self) -> int:
+        """Number of observed values"""
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        """Sum of the observed values"""
+        return self._sum
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return a list of (upper bound, number of values at most that
+        bound) tuples, ending with an infinite bound"""
+        result: List[Tuple[float, int]] = []
+        total = 0
+        for bound, cnt in zip(self._bounds + (float("inf"),), self._counts):
+            total += cnt
+            result.append((bound, total))
+        return result
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the histogram as a dict"""
+        return dict(
+            buckets={
+                ("+Inf" if bound == float("inf") else str(bound)): cnt
+                for bound, cnt in self.cumulative()
+            },
+            count=self.count,
+            sum=self._sum,
+        )
+
+
+class Metrics:
+
+    """A thread-safe registry of parsing metrics"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all metrics"""
+        with self._lock:
+            # Latency histograms, keyed by (latency name, length class)
+            self._histograms: Dict[Tuple[str, str], Histogram] = {}
+            self._sentences = 0
+            self._failures: Dict[str, int] = {cause: 0 for cause in FAILURE_CAUSES}
+            self._cache_hits: Dict[str, int] = {cache: 0 for cache in CACHES}
+            self._cache_lookups: Dict[str, int] = {cache: 0 for cache in CACHES}
+
+    def observe(self, latency: str, length: int, seconds: float) -> None:
+        """Record a latency, in seconds, for a sentence of the given length"""
+        assert latency in LATENCIES
+        key = (latency, _length_class(length))
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = Histogram()
+            h.observe(seconds)
+
+    def sentence(self, failure: str = "") -> None:
+        """Count a processed sentence, and its failure cause, if any"""
+        assert not failure or failure in self._failures
+        with self._lock:
+            self._sentences += 1
+            if failure:
+                self._failures[failure] += 1
+
+    def cache(self, cache: str, hits: int, lookups: int) -> None:
+        """Count lookups in the given cache, and the hits among them"""
+        with self._lock:
+            self._cache_hits[cache] += hits
+            self._cache_lookups[cache] += lookups
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a snapshot of the metrics as a dict"""
+        with self._lock:
+            latencies: Dict[str, Dict[str, Any]] = {name: {} for name in LATENCIES}
+            for (name, length), h in sorted(self._histograms.items()):
+                latencies[name][length] = h.as_dict()
+            return dict(
+                sentences=self._sentences,
+                failures=dict(self._failures),
+                caches={
+                    cache: dict(
+                        hits=self._cache_hits[cache],
+                        lookups=lookups,
+                        ratio=self._cache_hits[cache] / lookups if lookups else 0.0,
+                    )
+                    for cache, lookups in self._cache_lookups.items()
+                },
+                latencies=latencies,
+            )
+
+    def prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Return the metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, text: str) -> None:
+            lines.append("# HELP {0} {1}".format(name, text))
+            lines.append("# TYPE {0} {1}".format(name, kind))
+
+        with self._lock:
+            name = prefix + "_sentences_total"
+            header(name, "counter", "Number of sentences processed")
+            lines.append("{0} {1}".format(name, self._sentences))
+            name = prefix + "_parse_failures_total"
+            header(name, "counter", "Number of sentences not parsed, by cause")
+            for cause, cnt in self._failures.items():
+                lines.append('{0}{{cause="{1}"}} {2}'.format(name, cause, cnt))
+            name = prefix + "_cache_hits_total"
+            header(name, "counter", "Number of cache hits, by cache")
+            for cache, cnt in self._cache_hits.items():
+                lines.append('{0}{{cache="{1}"}} {2}'.format(name, cache, cnt))
+            name = prefix + "_cache_lookups_total"
+            header(name, "counter", "Number of cache lookups, by cache")
+            for cache, cnt in self._cache_lookups.items():
+                lines.append('{0}{{cache="{1}"}} {2}'.format(name, cache, cnt))
+            for latency, text in LATENCIES.items():
+                name = "{0}_{1}_seconds".format(prefix, latency)
+                header(name, "histogram", text + ", by sentence length")
+                for (n, length), h in sorted(self._histograms.items()):
+                    if n != latency:
+                        continue
+                    for bound, cnt in h.cumulative():
+                        le = "+Inf" if bound == float("inf") else _format_float(bound)
+                        lines.append(
+                            '{0}_bucket{{length="{1}",le="{2}"}} {3}'.format(
+                                name, length, le, cnt
+                            )
+                        )
+                    lines.append(
+                        '{0}_sum{{length="{1}"}} {2}'.format(
+                            name, length, _format_float(h.sum)
+                        )
+                    )
+                    lines.append(
+                        '{0}_count{{length="{1}"}} {2}'.format(name, length, h.count)
+                    )
+        return "\n".join(lines) + "\n"
+
+
+# The process-wide metrics registry
+METRICS = Metrics()
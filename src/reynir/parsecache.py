@@ -0,0 +1,216 @@
+"""
+
+    Greynir: Natural language processing for Icelandic
+
+    Sentence parse cache
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+    This module implements the ParseCache class, a content-addressed
+    cache of sentence parse results. Text such as news and forum posts
+    contains many recurring sentences (bylines, boilerplate, headlines),
+    and a cache hit returns the simplified parse tree of such a sentence
+    without invoking the parser and reducer.
+
+    The cache is kept in memory, with least-recently-used eviction,
+    and can optionally be backed by a local SQLite database file,
+    which persists between runs and can be shared by multiple processes.
+
+"""
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import json
+import sqlite3
+from hashlib import blake2b
+from collections import OrderedDict
+from threading import Lock
+
+from tokenizer import Tok
+
+from .binparser import BIN_Token
+
+
+# The default maximum number of sentences kept in memory
+PARSE_CACHE_SIZE = 4096
+
+# A cached parse result: (simplified tree, num_combinations, score, error),
+# where the simplified tree is in serialized form (cf. _Sentence.dump())
+# and error is None or a (message, token_index) tuple
+ParseCacheEntry = Tuple[
+    Optional[Dict[str, Any]], int, int, Optional[Tuple[str, Optional[int]]]
+]
+
+
+class ParseCache:
+
+    """A cache of sentence parse results, keyed by a digest of the
+    sentence's token sequence, the parse root and the grammar version.
+    Each token contributes its BIN_Token.key, which determines how it
+    matches grammar terminals, along with its original text and value,
+    which are carried over into the simplified tree. Entries are evicted
+    from memory on a least-recently-used basis. If a file name is given,
+    entries are additionally stored in a SQLite database in that file;
+    entries for a different grammar version are discarded on opening."""
+
+    # Increment this if the format of the cached entries changes
+    _SCHEMA = "1"
+
+    def __init__(
+        self,
+        maxsize: int = PARSE_CACHE_SIZE,
+        *,
+        file: Optional[str] = None,
+        version: str = "",
+    ) -> None:
+        self._maxsize = maxsize
+        self._version = version
+        self._cache: "OrderedDict[bytes, ParseCacheEntry]" = OrderedDict()
+        self._lock = Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if file:
+            self._db = self._open(file)
+        self._hits = 0
+        self._misses = 0
+        self._disk_hits = 0
+
+    def _open(self, fname: str) -> sqlite3.Connection:
+        """Open the cache database, discarding its contents
+        if they were stored for a different grammar version"""
+        db = sqlite3.connect(
+            fname, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS sentences (key BLOB PRIMARY KEY, value TEXT)"
+        )
+        version = self._SCHEMA + "/" + self._version
+        row = db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != version:
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                db.execute("DELETE FROM sentences")
+                db.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)",
+                    (version,),
+                )
+        return db
+
+    def key(self, tokens: List[Tok], root: Optional[str] = None) -> bytes:
+        """Return the cache key for a sentence, parsed from the given root"""
+        h = blake2b(digest_size=16)
+        h.update(self._version.encode("utf-8"))
+        h.update(repr(root).encode("utf-8"))
+        for ix, t in enumerate(tokens):
+            h.update(repr((BIN_Token(t, ix).key, t.txt, t.val)).encode("utf-8"))
+        return h.digest()
+
+    def get(self, key: bytes) -> Optional[ParseCacheEntry]:
+        """Return the cached parse result for the given key, or None"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value FROM sentences WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            tree, num, score, err = json.loads(row[0])
+            entry = (tree, num, score, None if err is None else tuple(err))
+            self._disk_hits += 1
+            self._add(key, entry)
+            return entry
+
+    def put(self, key: bytes, entry: ParseCacheEntry) -> None:
+        """Store a parse result in the cache"""
+        with self._lock:
+            self._add(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sentences (key, value) VALUES (?, ?)",
+                    (key, json.dumps(entry, ensure_ascii=False)),
+                )
+
+    def _add(self, key: bytes, entry: ParseCacheEntry) -> None:
+        """Add an entry to the in-memory cache, evicting
+        the least recently used entry if the cache is full"""
+        cache = self._cache
+        cache[key] = entry
+        cache.move_to_end(key)
+        if len(cache) > self._maxsize:
+            cache.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups that were found in memory"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that were not found in memory"""
+        return self._misses
+
+    @property
+    def disk_hits(self) -> int:
+        """Number of memory misses that were found in the cache file"""
+        return self._disk_hits
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return a dict of cache statistics"""
+        return dict(
+            size=len(self),
+            hits=self.hits,
+            misses=self.misses,
+            disk_hits=self.disk_hits,
+        )
+
+    def clear(self) -> None:
+        """Remove all entries from the cache, including the cache file"""
+        with self._lock:
+            self._cache.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentences")
+
+    def close(self) -> None:
+        """Close the cache file, if any"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
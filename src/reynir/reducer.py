@@ -85,17 +85,44 @@
     different scores depending on the context are terminal nodes whose names
     have the form fs_*.
 
+    The reduction can also be performed in C++ on the flattened parse forest,
+    before any Python nodes are created (cf. Reducer.reduce_flat_forest()
+    and Fast_Parser.go_reduced()). The terminal scores are still calculated
+    in Python, and are passed to the C++ code along with a description of
+    the grammar's nonterminals. The C++ code is a port of ParseForestReducer,
+    which remains the reference implementation.
+
+    Terminal scores and verb-preposition bonuses only depend on the token,
+    its candidate terminals and a small amount of context. They are therefore
+    memoized in a process-wide, size-bounded ScoringCache that is shared
+    between sentences, so that scoring a large corpus mostly consists
+    of cache lookups.
+
 """
 
-from typing import Dict, DefaultDict, List, Set, Tuple, Optional, Any, cast
+from typing import (
+    Callable,
+    Dict,
+    DefaultDict,
+    FrozenSet,
+    Hashable,
+    List,
+    Set,
+    Tuple,
+    Optional,
+    Any,
+    cast,
+)
 from typing_extensions import TypedDict, Required
 
 from collections import defaultdict
+from threading import Lock
 
 from tokenizer.definitions import BIN_Tuple
 
+from .cache import LFU_Cache
 from .grammar import Grammar, Production
-from .fastparser import Node, ParseForestNavigator
+from .fastparser import Node, ParseForestNavigator, ParseJob, eparser, ffi
 from .settings import Preferences, NounPreferences
 from .verbframe import VerbFrame
 from .binparser import BIN_Token, BIN_Terminal
@@ -122,6 +149,17 @@ BonusCache = Dict[Tuple[BIN_Terminal, str, BIN_Terminal, BIN_Token], int]
 FinalsDict = Dict[int, Set[BIN_Terminal]]
 TokensDict = Dict[int, BIN_Token]
 KeyTuple = Tuple[Node, int]
+# Key of a cached terminal score dictionary: the token key, whether the
+# token has meanings (t2), its candidate terminals, whether it is the first
+# token in the sentence, whether it is not the first token in the text,
+# and whether the preceding token can match an nhm terminal
+TerminalScoreKey = Tuple[
+    Tuple[Hashable, ...], bool, FrozenSet[BIN_Terminal], bool, bool, bool
+]
+# A cached terminal score dictionary, along with the bonus
+# to be given to an nhm terminal matching the preceding token
+TerminalScores = Tuple[Dict[BIN_Terminal, int], int]
+BonusKey = Tuple[BIN_Terminal, str, BIN_Terminal, Tuple[Hashable, ...]]
 
 # Reducer result dictionary with a null score
 NULL_SC: ResultDict = {"sc": 0}
@@ -130,6 +168,9 @@ _VERB_PREP_BONUS = 7  # Give 7 extra points for a verb/preposition match
 _VERB_PREP_PENALTY = -2  # Subtract 2 points for a non-match
 _LENGTH_BONUS_FACTOR = 10  # For length bonus, multiply number of tokens by this factor
 
+# Maximum number of entries in each of the process-wide scoring caches
+SCORING_CACHE_SIZE = 50_000
+
 _CASES_SET = BIN_Token.CASES_SET
 
 # Tags of nonterminals that allow us to stop copying nodes
@@ -144,6 +185,21 @@ _NAMED_ENTITY_FL = frozenset(
     ("ism", "erm", "gæl", "nafn", "föð", "móð", "ætt", "entity")
 )
 
+# Nonterminal and terminal flags for the C++ reducer,
+# corresponding to the REDUCE_* constants in eparser.h
+_REDUCE_NT_ENABLE_PREP_BONUS = 0x0001
+_REDUCE_NT_BEGIN_PREP_SCOPE = 0x0002
+_REDUCE_NT_NOUN_PHRASE = 0x0004
+_REDUCE_NT_PREP_SCOPE = 0x0008
+_REDUCE_NT_APPLY_LENGTH_BONUS = 0x0010
+_REDUCE_NT_APPLY_PREP_BONUS = 0x0020
+_REDUCE_NT_PICK_UP_VERB = 0x0040
+_REDUCE_NT_CONTAINED_VERBS = 0x0080
+_REDUCE_NT_NO_REDUCE = 0x0100
+
+_REDUCE_TERMINAL_PREP = 0x0001
+_REDUCE_TERMINAL_VERB = 0x0002
+
 
 class _ReductionScope:
 
@@ -274,6 +330,63 @@ class _ReductionScope:
             self.reducer.pop_current_verb()
 
 
+class ScoringCache:
+
+    """A size-bounded cache of token/terminal scores and verb/preposition
+    bonuses. A single instance is shared by all reducers in the process,
+    so that the scores of recurring tokens are calculated only once
+    across sentences. Entries are evicted on a least-frequently-used basis."""
+
+    def __init__(self, maxsize: int = SCORING_CACHE_SIZE) -> None:
+        self._terminals: LFU_Cache[TerminalScoreKey, TerminalScores] = LFU_Cache(
+            maxsize=maxsize
+        )
+        self._bonuses: LFU_Cache[BonusKey, int] = LFU_Cache(maxsize=maxsize)
+
+    def terminal_scores(
+        self, key: TerminalScoreKey, func: Callable[[], TerminalScores]
+    ) -> TerminalScores:
+        """Return the terminal scores for the given key, calling func()
+        to calculate them if not found in the cache. Note that the
+        returned dictionary is shared and must not be modified."""
+        return self._terminals.lookup(key, lambda _: func())
+
+    def verb_prep_bonus(self, key: BonusKey, func: Callable[[], int]) -> int:
+        """Return the verb/preposition bonus for the given key, calling
+        func() to calculate it if not found in the cache"""
+        return self._bonuses.lookup(key, lambda _: func())
+
+    def __len__(self) -> int:
+        return len(self._terminals.cache) + len(self._bonuses.cache)
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups that were found in the cache"""
+        return self._terminals.hits + self._bonuses.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that were not found in the cache"""
+        return self._terminals.misses + self._bonuses.misses
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return a dict of cache statistics"""
+        return dict(
+            size=len(self),
+            hits=self.hits,
+            misses=self.misses,
+            terminal_hits=self._terminals.hits,
+            terminal_misses=self._terminals.misses,
+            bonus_hits=self._bonuses.hits,
+            bonus_misses=self._bonuses.misses,
+        )
+
+
+# The process-wide scoring cache
+_SCORING_CACHE = ScoringCache()
+
+
 class ParseForestReducer:
 
     """Subclass to navigate a parse forest and reduce it
@@ -348,6 +461,24 @@ class ParseForestReducer:
         # If no match, discourage
         return _VERB_PREP_PENALTY
 
+    def cached_verb_prep_bonus(
+        self,
+        prep_terminal: BIN_Terminal,
+        prep_token: str,
+        verb_terminal: BIN_Terminal,
+        verb_token: BIN_Token,
+    ) -> int:
+        """Return a verb/preposition match bonus, via a per-sentence cache
+        which is backed by the process-wide scoring cache"""
+        key = (prep_terminal, prep_token, verb_terminal, verb_token)
+        bonus = self._bonus_cache.get(key)
+        if bonus is None:
+            bonus = self._bonus_cache[key] = _SCORING_CACHE.verb_prep_bonus(
+                (prep_terminal, prep_token, verb_terminal, verb_token.key),
+                lambda: self.verb_prep_bonus(*key),
+            )
+        return bonus
+
     def visit_token(self, node: Node) -> ResultDict:
         """At token node"""
         # Return the score of this token/terminal match
@@ -367,10 +498,9 @@ class ParseForestReducer:
                 # pylint: disable=not-an-iterable
                 for terminal, token in prep_bonus:
                     # Attempt to find the preposition matching bonus in the cache
-                    key = (nt, cast(BIN_Token, node.token).lower, terminal, token)
-                    bonus = self._bonus_cache.get(key)
-                    if bonus is None:
-                        bonus = self._bonus_cache[key] = self.verb_prep_bonus(*key)
+                    bonus = self.cached_verb_prep_bonus(
+                        nt, cast(BIN_Token, node.token).lower, terminal, token
+                    )
                     # Found a bonus, which can be positive or negative
                     if final_bonus is None:
                         final_bonus = bonus
@@ -444,13 +574,13 @@ class ParseForestReducer:
             if w._token is not None:
                 # Return the score of this terminal option
                 v = self.visit_token(w)
-            elif w.is_span and w._families:
+            elif w.is_span and (families := w._families):
                 # We have a nonempty nonterminal node with one or more families
                 # of children, i.e. multiple possible derivations:
                 # Init container for family results
                 scope = _ReductionScope(self, w)
                 # Go through each family and calculate its score
-                for family_ix, (prod, children) in enumerate(w._families):
+                for family_ix, (prod, children) in enumerate(families):
                     scope.start_family(family_ix, prod)
                     for ch in children:
                         if ch is not None:
@@ -491,6 +621,77 @@ class ParseForestReducer:
         return calc_score(root_node)
 
 
+class _NativeReduction:
+
+    """Dispatch verb/preposition bonus requests coming in from the
+    C++ reducer (cf. reduceForest() in eparser.cpp), where tokens
+    and terminals are referenced by flat forest node index"""
+
+    # Reductions have rotating integer IDs, reaching _MAX_REDUCTIONS
+    # before cycling back
+    _MAX_REDUCTIONS = 10_000
+    _seq = 0
+    _reductions: Dict[int, "_NativeReduction"] = dict()
+    _lock = Lock()
+
+    def __init__(
+        self,
+        reducer: ParseForestReducer,
+        job: ParseJob,
+        node_table: List[int],
+    ) -> None:
+        self._reducer = reducer
+        self._tokens = job.tokens
+        self._lookup_terminal = job.grammar.lookup_terminal
+        self._node_table = node_table
+        with self._lock:
+            self._handle = h = _NativeReduction._seq
+            _NativeReduction._seq = (h + 1) % self._MAX_REDUCTIONS
+            self._reductions[h] = self
+
+    def _leaf(self, node: int) -> Tuple[BIN_Terminal, BIN_Token]:
+        """Return the terminal and token of a token node"""
+        i = node * 6
+        return (
+            cast(BIN_Terminal, self._lookup_terminal(self._node_table[i + 3])),
+            self._tokens[self._node_table[i + 2]],
+        )
+
+    def prep_bonus(self, prep_node: int, verb_node: int) -> int:
+        prep_terminal, prep_token = self._leaf(prep_node)
+        verb_terminal, verb_token = self._leaf(verb_node)
+        return self._reducer.cached_verb_prep_bonus(
+            prep_terminal, prep_token.lower, verb_terminal, verb_token
+        )
+
+    @property
+    def handle(self) -> int:
+        return self._handle
+
+    def __enter__(self):
+        """Python context manager protocol"""
+        return self
+
+    # noinspection PyUnusedLocal
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any):
+        """Python context manager protocol"""
+        with self._lock:
+            del self._reductions[self._handle]
+        return False
+
+    @classmethod
+    def dispatch(cls, handle: int, prep_node: int, verb_node: int) -> int:
+        """Dispatch a bonus request to the correct reduction"""
+        return cls._reductions[handle].prep_bonus(prep_node, verb_node)
+
+
+@ffi.def_extern()  # type: ignore
+def prep_bonus_func(handle: int, prep_node: int, verb_node: int) -> int:
+    """This function is called from the C++ reducer to obtain the bonus
+    for a preposition token node within the context of a verb token node"""
+    return _NativeReduction.dispatch(handle, prep_node, verb_node)
+
+
 class OptionFinder(ParseForestNavigator):
 
     """Subclass to navigate a parse forest and populate the set
@@ -513,8 +714,13 @@ class Reducer:
 
     """Reduces parse forests to a single most likely parse tree"""
 
+    # The process-wide cache of terminal scores and verb/preposition bonuses
+    scoring_cache = _SCORING_CACHE
+
     def __init__(self, grammar: Grammar) -> None:
         self._grammar = grammar
+        # Grammar information for the C++ reducer, created on first use
+        self._c_info: Any = None
 
     def _find_options(
         self, forest: Node, finals: FinalsDict, tokens: TokensDict
@@ -530,257 +736,406 @@ class Reducer:
         finals: FinalsDict = defaultdict(set)
         tokens: TokensDict = dict()
         self._find_options(w, finals, tokens)
+        return self._score_terminals(w.start, w.end, finals, tokens)
+
+    def _score_terminals(
+        self, start: int, end: int, finals: FinalsDict, tokens: TokensDict
+    ) -> ScoreDict:
+        """Calculate the score for each possible terminal/token match,
+        given the terminals that match each token in the forest"""
 
         # Second pass: find a (partial) ordering by scoring
         # the terminal alternatives for each token
         scores: ScoreDict = dict()
-        noun_prefs = NounPreferences.DICT
+        cache = self.scoring_cache
 
         # Loop through the indices of the tokens spanned by this tree
-        for i in range(w.start, w.end):
+        for i in range(start, end):
 
             s = finals[i]
-            # Initially, each alternative has a score of 0
-            scores[i] = {terminal: 0 for terminal in s}
 
             if len(s) <= 1:
-                # No ambiguity to resolve here
+                # No ambiguity to resolve here:
+                # each alternative has a score of 0
+                scores[i] = {terminal: 0 for terminal in s}
                 continue
 
             token = tokens[i]
-            # More than one terminal in the option set for the token at index i
-            # Calculate the relative scores
-            # Find out whether the first part of all the terminals are the same
-            same_first = len(set(terminal.first for terminal in s)) == 1
-            txt = txt_last = token.lower
-            composite = False
-            # Get the last part of a composite word (e.g. 'jaðar-áhrifin' -> 'áhrifin')
-            if (
-                token.is_word
-                and token.has_meanings
-                and "-" in token.meanings[0].ordmynd
-            ):
-                composite = True
-                txt_last = token.meanings[0].ordmynd.rsplit("-", maxsplit=1)[-1]
-            # No need to check preferences if the first parts of
-            # all possible terminals are equal
-            # Look up the preference ordering from GreynirEngine.conf, if any
-            prefs = None if same_first else Preferences.get(txt_last)
-            sc = scores[i]
-            if prefs:
-                adj_worse: Dict[BIN_Terminal, int] = defaultdict(int)
-                adj_better: Dict[BIN_Terminal, int] = defaultdict(int)
-                for worse, better, factor in prefs:
-                    for wt in s:
-                        if wt.first in worse:
-                            for bt in s:
-                                if wt is not bt and bt.first in better:
-                                    if bt.is_literal:
-                                        # Literal terminal:
-                                        # be even more aggressive in promoting it
-                                        adj_w = -2 * factor
-                                        adj_b = +6 * factor
-                                    else:
-                                        adj_w = -2 * factor
-                                        adj_b = +4 * factor
-                                    adj_worse[wt] = min(adj_worse[wt], adj_w)
-                                    adj_better[bt] = max(adj_better[bt], adj_b)
-                for wt, adj in adj_worse.items():
-                    sc[wt] += adj
-                for bt, adj in adj_better.items():
-                    sc[bt] += adj
-
-            # Apply heuristics to each terminal that potentially matches this token
-            for t in s:
-
-                if t.is_literal:
-                    # Give a bonus for exact or semi-exact matches with
-                    # literal terminals
-                    sc[t] += 2
+            # More than one terminal in the option set for the token at index i.
+            # The scores only depend on the token, its terminals and the
+            # context captured in the key, so they are looked up in the cache.
+            first, not_first = i == start, i > 0
+            prev_nhm = not_first and any(pt.first == "nhm" for pt in finals[i - 1])
+            key: TerminalScoreKey = (
+                token.key,
+                bool(token.t2),
+                frozenset(s),
+                first,
+                not_first,
+                prev_nhm,
+            )
+            sc, nhm_bonus = cache.terminal_scores(
+                key,
+                lambda: self._score_token(token, s, first, not_first, prev_nhm),
+            )
+            # Copy the cached dictionary, since it may be modified below
+            scores[i] = dict(sc)
+            if nhm_bonus:
+                for pt in scores[i - 1].keys():
+                    if pt.first == "nhm":
+                        # Prop up the nhm terminal
+                        scores[i - 1][pt] += nhm_bonus
+                        break
 
-                tfirst = t.first
-                if tfirst == "ao" or tfirst == "eo":
-                    # Subtract from the score of all ao and eo
+        return scores
+
+    def _score_token(
+        self,
+        token: BIN_Token,
+        s: Set[BIN_Terminal],
+        first: bool,
+        not_first: bool,
+        prev_nhm: bool,
+    ) -> TerminalScores:
+        """Calculate the relative scores of the terminals in s that can
+        match the given token. first is True if the token is the first one
+        in the sentence, not_first is True if it is not the first one
+        in the token list, and prev_nhm is True if the preceding token
+        can match an nhm terminal. Returns the scores, along with the bonus
+        to be given to the nhm terminal matching the preceding token."""
+        noun_prefs = NounPreferences.DICT
+        # Find out whether the first part of all the terminals are the same
+        same_first = len(set(terminal.first for terminal in s)) == 1
+        txt = txt_last = token.lower
+        composite = False
+        # Get the last part of a composite word (e.g. 'jaðar-áhrifin' -> 'áhrifin')
+        if (
+            token.is_word
+            and token.has_meanings
+            and "-" in token.meanings[0].ordmynd
+        ):
+            composite = True
+            txt_last = token.meanings[0].ordmynd.rsplit("-", maxsplit=1)[-1]
+        # No need to check preferences if the first parts of
+        # all possible terminals are equal
+        # Look up the preference ordering from GreynirEngine.conf, if any
+        prefs = None if same_first else Preferences.get(txt_last)
+        # Initially, each alternative has a score of 0
+        sc: Dict[BIN_Terminal, int] = {terminal: 0 for terminal in s}
+        nhm_bonus = 0
+        if prefs:
+            adj_worse: Dict[BIN_Terminal, int] = defaultdict(int)
+            adj_better: Dict[BIN_Terminal, int] = defaultdict(int)
+            for worse, better, factor in prefs:
+                for wt in s:
+                    if wt.first in worse:
+                        for bt in s:
+                            if wt is not bt and bt.first in better:
+                                if bt.is_literal:
+                                    # Literal terminal:
+                                    # be even more aggressive in promoting it
+                                    adj_w = -2 * factor
+                                    adj_b = +6 * factor
+                                else:
+                                    adj_w = -2 * factor
+                                    adj_b = +4 * factor
+                                adj_worse[wt] = min(adj_worse[wt], adj_w)
+                                adj_better[bt] = max(adj_better[bt], adj_b)
+            for wt, adj in adj_worse.items():
+                sc[wt] += adj
+            for bt, adj in adj_better.items():
+                sc[bt] += adj
+
+        # Apply heuristics to each terminal that potentially matches this token
+        for t in s:
+
+            if t.is_literal:
+                # Give a bonus for exact or semi-exact matches with
+                # literal terminals
+                sc[t] += 2
+
+            tfirst = t.first
+            if tfirst == "ao" or tfirst == "eo":
+                # Subtract from the score of all ao and eo
+                sc[t] -= 1
+            elif tfirst == "no":
+                if t.is_singular:
+                    # Add to singular nouns relative to plural ones
+                    sc[t] += 1
+                elif t.is_abbrev:
+                    # Punish abbreviations in favor of other more specific terminals
                     sc[t] -= 1
-                elif tfirst == "no":
-                    if t.is_singular:
-                        # Add to singular nouns relative to plural ones
-                        sc[t] += 1
-                    elif t.is_abbrev:
-                        # Punish abbreviations in favor of other more specific terminals
-                        sc[t] -= 1
-                    if token.is_word and token.is_upper and token.t2:
-                        # Punish connection of normal noun terminal to an
-                        # uppercase word that can be a person or entity name and
-                        # would thus normally be matched with person or entity
-                        # terminal
-                        if any(m.fl in _NAMED_ENTITY_FL for m in token.meanings):
-                            # logging.info(
-                            #     "Punishing connection of {0} with 'no' terminal"
-                            #     .format(tokens[i].t1))
-                            sc[t] -= 5
-                    # Noun priorities, i.e. between different genders
-                    # of the same word form (for example "ára" which can refer to
-                    # three stems with different genders)
-                    if txt_last in noun_prefs and t.gender is not None:
-                        np = noun_prefs[txt_last].get(t.gender, 0)
-                        sc[t] += np
-                elif tfirst == "fs":
-                    if t.has_variant("nf"):
-                        # Reduce the weight of the 'artificial' nominative prepositions
-                        # 'næstum', 'sem', 'um'
-                        # Make other cases outweigh the Nl_nf bonus of +4 (-2 -3 = -5)
-                        sc[t] -= 10
-                        if txt == "sem":
-                            # Further subtraction for 'sem:fs'_nf
-                            sc[t] -= 8
-                    elif txt == "við" and t.has_variant("þgf"):
-                        # Smaller bonus for við + þgf (is rarer than við + þf)
-                        sc[t] += 1
-                    elif txt == "sem" and t.has_variant("þf"):
-                        sc[t] -= 4
-                    elif txt == "á" and t.has_variant("þgf"):
-                        # Larger bonus for á + þgf to resolve conflict with verb 'eiga'
-                        sc[t] += 4
+                if token.is_word and token.is_upper and token.t2:
+                    # Punish connection of normal noun terminal to an
+                    # uppercase word that can be a person or entity name and
+                    # would thus normally be matched with person or entity
+                    # terminal
+                    if any(m.fl in _NAMED_ENTITY_FL for m in token.meanings):
+                        # logging.info(
+                        #     "Punishing connection of {0} with 'no' terminal"
+                        #     .format(tokens[i].t1))
+                        sc[t] -= 5
+                # Noun priorities, i.e. between different genders
+                # of the same word form (for example "ára" which can refer to
+                # three stems with different genders)
+                if txt_last in noun_prefs and t.gender is not None:
+                    np = noun_prefs[txt_last].get(t.gender, 0)
+                    sc[t] += np
+            elif tfirst == "fs":
+                if t.has_variant("nf"):
+                    # Reduce the weight of the 'artificial' nominative prepositions
+                    # 'næstum', 'sem', 'um'
+                    # Make other cases outweigh the Nl_nf bonus of +4 (-2 -3 = -5)
+                    sc[t] -= 10
+                    if txt == "sem":
+                        # Further subtraction for 'sem:fs'_nf
+                        sc[t] -= 8
+                elif txt == "við" and t.has_variant("þgf"):
+                    # Smaller bonus for við + þgf (is rarer than við + þf)
+                    sc[t] += 1
+                elif txt == "sem" and t.has_variant("þf"):
+                    sc[t] -= 4
+                elif txt == "á" and t.has_variant("þgf"):
+                    # Larger bonus for á + þgf to resolve conflict with verb 'eiga'
+                    sc[t] += 4
+                else:
+                    # Else, give a bonus for each matched preposition
+                    sc[t] += 2
+            elif tfirst == "lo":
+                if composite:
+                    # If this is a composite word, it's less likely
+                    # to be an adjective, so give it a penalty
+                    sc[t] -= 3
+                # For adjectives ending with 'andi', we strongly prefer verbs in
+                # present participle (lýsingarháttur nútíðar)
+                if txt.endswith("andi") and any(
+                    (m.ordfl == "so" and m.beyging in {"LH-NT", "LHNT"})
+                    for m in token.meanings
+                ):
+                    sc[t] -= 50
+            elif tfirst == "so":
+                if t.num_variants > 0 and t.variant(0) in "012":
+                    # Consider verb arguments
+                    # Normally, we give a bonus for verb arguments:
+                    # the more matched, the better
+                    numcases = int(t.variant(0))
+                    adj = 2 * numcases
+                    # Apply score adjustments for verbs with particular
+                    # object cases, as specified by $score(n) pragmas in Verbs.conf
+                    # In the (rare) cases where there are conflicting scores,
+                    # apply the most positive adjustment
+                    adjmax: Optional[int] = None
+                    for m in token.meanings:
+                        if m.ordfl == "so":
+                            key = m.stofn + t.verb_cases
+                            score = VerbFrame.verb_score(key)
+                            if score is not None:
+                                if adjmax is None:
+                                    adjmax = score
+                                else:
+                                    adjmax = max(adjmax, score)
+                    sc[t] += adj + (adjmax or 0)
+                if t.is_bh:
+                    # Discourage 'boðháttur'
+                    sc[t] -= 4
+                elif t.is_sagnb:
+                    # We like sagnb and lh, it means that more
+                    # than one piece clicks into place
+                    sc[t] += 6
+                elif t.is_lh:
+                    # sagnb is preferred to lh, but vb (veik beyging) is discouraged
+                    if t.has_variant("vb"):
+                        sc[t] -= 2
                     else:
-                        # Else, give a bonus for each matched preposition
-                        sc[t] += 2
-                elif tfirst == "lo":
-                    if composite:
-                        # If this is a composite word, it's less likely
-                        # to be an adjective, so give it a penalty
-                        sc[t] -= 3
-                    # For adjectives ending with 'andi', we strongly prefer verbs in
-                    # present participle (lýsingarháttur nútíðar)
-                    if txt.endswith("andi") and any(
-                        (m.ordfl == "so" and m.beyging in {"LH-NT", "LHNT"})
-                        for m in token.meanings
-                    ):
-                        sc[t] -= 50
-                elif tfirst == "so":
-                    if t.num_variants > 0 and t.variant(0) in "012":
-                        # Consider verb arguments
-                        # Normally, we give a bonus for verb arguments:
-                        # the more matched, the better
-                        numcases = int(t.variant(0))
-                        adj = 2 * numcases
-                        # Apply score adjustments for verbs with particular
-                        # object cases, as specified by $score(n) pragmas in Verbs.conf
-                        # In the (rare) cases where there are conflicting scores,
-                        # apply the most positive adjustment
-                        adjmax: Optional[int] = None
-                        for m in token.meanings:
-                            if m.ordfl == "so":
-                                key = m.stofn + t.verb_cases
-                                score = VerbFrame.verb_score(key)
-                                if score is not None:
-                                    if adjmax is None:
-                                        adjmax = score
-                                    else:
-                                        adjmax = max(adjmax, score)
-                        sc[t] += adj + (adjmax or 0)
-                    if t.is_bh:
-                        # Discourage 'boðháttur'
-                        sc[t] -= 4
-                    elif t.is_sagnb:
-                        # We like sagnb and lh, it means that more
-                        # than one piece clicks into place
-                        sc[t] += 6
-                    elif t.is_lh:
-                        # sagnb is preferred to lh, but vb (veik beyging) is discouraged
-                        if t.has_variant("vb"):
-                            sc[t] -= 2
-                        else:
-                            sc[t] += 3
-                    elif t.is_lh_nt:
-                        sc[t] += 12  # Encourage LHNT rather than LO
-                    elif t.is_mm:
-                        # Encourage mm forms. The encouragement should be better than
-                        # the score for matching a single case, so we pick so_0_mm
-                        # rather than so_1_þgf, for instance.
                         sc[t] += 3
-                    elif t.is_vh:
-                        # Encourage vh forms
-                        sc[t] += 2
-                    if t.is_subj:
-                        # Give a small bonus for subject matches
-                        if t.has_variant("none"):
-                            # ... but a punishment for subj_none
-                            sc[t] -= 3
-                        else:
-                            sc[t] += 1
-                    if t.is_nh:
-                        if (i > 0) and any(pt.first == "nhm" for pt in finals[i - 1]):
-                            # Give a bonus for adjacent nhm + so_nh terminals
-                            sc[t] += 4  # Prop up the verb terminal with the nh variant
-                            for pt in scores[i - 1].keys():
-                                if pt.first == "nhm":
-                                    # Prop up the nhm terminal
-                                    scores[i - 1][pt] += 2
-                                    break
-                        if any(
-                            pt.first == "no" and pt.has_variant("ef") and pt.is_plural
-                            for pt in s
-                        ):
-                            # If this is a so_nh and an alternative no_ef_ft exists,
-                            # choose this one (for example, 'hafa', 'vera', 'gera',
-                            # 'fara', 'mynda', 'berja', 'borða')
-                            sc[t] += 4
-                    if (i > 0) and token.is_upper:
-                        # The token is uppercase and not at the start of a sentence:
-                        # discourage it from being a verb
-                        sc[t] -= 4
-                elif tfirst == "tala":
-                    if t.has_variant("ef"):
-                        # Try to avoid interpreting plain numbers as possessive phrases
-                        sc[t] -= 4
-                elif tfirst == "person":
-                    if t.has_variant("nf"):
-                        # Prefer person names in the nominative case
-                        sc[t] += 2
-                elif tfirst == "sérnafn":
-                    if not token.t2:
-                        # If there are no BÍN meanings, we had no choice but
-                        # to use sérnafn, so alleviate some of the penalty given
-                        # by the grammar
-                        sc[t] += 12
+                elif t.is_lh_nt:
+                    sc[t] += 12  # Encourage LHNT rather than LO
+                elif t.is_mm:
+                    # Encourage mm forms. The encouragement should be better than
+                    # the score for matching a single case, so we pick so_0_mm
+                    # rather than so_1_þgf, for instance.
+                    sc[t] += 3
+                elif t.is_vh:
+                    # Encourage vh forms
+                    sc[t] += 2
+                if t.is_subj:
+                    # Give a small bonus for subject matches
+                    if t.has_variant("none"):
+                        # ... but a punishment for subj_none
+                        sc[t] -= 3
                     else:
-                        # BÍN meanings are available: discourage this
-                        # print(f"Discouraging sérnafn {txt}, "
-                        #     "BÍN meanings are {tokens[i].t2}")
-                        sc[t] -= 10
-                        if i == w.start:
-                            # First token in sentence, and we have BÍN meanings:
-                            # further discourage this
-                            sc[t] -= 6
-                elif tfirst == "fyrirtæki":
-                    # We encourage company names to be interpreted as such,
-                    # so we give company abbreviations ('hf.', 'Corp.', 'Limited')
-                    # a high priority
-                    sc[t] += 24
-                elif tfirst == "st" or (tfirst == "sem" and t.colon_cat == "st"):
-                    if txt == "sem":
-                        # Discourage "sem" as a pure conjunction (samtenging)
-                        # (it does not get a penalty when occurring as
-                        # a connective conjunction, 'stt')
-                        sc[t] -= 6
-                elif tfirst == "abfn":
-                    # If we have number and gender information with the reflexive
-                    # pronoun, that's good: encourage it
-                    sc[t] += 6 if t.num_variants > 1 else 2
-                elif tfirst == "gr":
-                    # Encourage separate definite article rather than pronoun
+                        sc[t] += 1
+                if t.is_nh:
+                    if prev_nhm:
+                        # Give a bonus for adjacent nhm + so_nh terminals
+                        sc[t] += 4  # Prop up the verb terminal with the nh variant
+                        # The caller props up the nhm terminal
+                        nhm_bonus += 2
+                    if any(
+                        pt.first == "no" and pt.has_variant("ef") and pt.is_plural
+                        for pt in s
+                    ):
+                        # If this is a so_nh and an alternative no_ef_ft exists,
+                        # choose this one (for example, 'hafa', 'vera', 'gera',
+                        # 'fara', 'mynda', 'berja', 'borða')
+                        sc[t] += 4
+                if not_first and token.is_upper:
+                    # The token is uppercase and not at the start of a sentence:
+                    # discourage it from being a verb
+                    sc[t] -= 4
+            elif tfirst == "tala":
+                if t.has_variant("ef"):
+                    # Try to avoid interpreting plain numbers as possessive phrases
+                    sc[t] -= 4
+            elif tfirst == "person":
+                if t.has_variant("nf"):
+                    # Prefer person names in the nominative case
                     sc[t] += 2
-                elif tfirst == "nhm":
-                    # Encourage the infinitive
-                    sc[t] += 4
-
-        return scores
+            elif tfirst == "sérnafn":
+                if not token.t2:
+                    # If there are no BÍN meanings, we had no choice but
+                    # to use sérnafn, so alleviate some of the penalty given
+                    # by the grammar
+                    sc[t] += 12
+                else:
+                    # BÍN meanings are available: discourage this
+                    # print(f"Discouraging sérnafn {txt}, "
+                    #     "BÍN meanings are {tokens[i].t2}")
+                    sc[t] -= 10
+                    if first:
+                        # First token in sentence, and we have BÍN meanings:
+                        # further discourage this
+                        sc[t] -= 6
+            elif tfirst == "fyrirtæki":
+                # We encourage company names to be interpreted as such,
+                # so we give company abbreviations ('hf.', 'Corp.', 'Limited')
+                # a high priority
+                sc[t] += 24
+            elif tfirst == "st" or (tfirst == "sem" and t.colon_cat == "st"):
+                if txt == "sem":
+                    # Discourage "sem" as a pure conjunction (samtenging)
+                    # (it does not get a penalty when occurring as
+                    # a connective conjunction, 'stt')
+                    sc[t] -= 6
+            elif tfirst == "abfn":
+                # If we have number and gender information with the reflexive
+                # pronoun, that's good: encourage it
+                sc[t] += 6 if t.num_variants > 1 else 2
+            elif tfirst == "gr":
+                # Encourage separate definite article rather than pronoun
+                sc[t] += 2
+            elif tfirst == "nhm":
+                # Encourage the infinitive
+                sc[t] += 4
+
+        return sc, nhm_bonus
 
     def _reduce(self, w: Node, scores: ScoreDict) -> ResultDict:
         """Reduce a forest with a root in w based on subtree scores"""
         return ParseForestReducer(self._grammar, scores).go(w)
 
+    def _reducer_info(self) -> Any:
+        """Return a C++ ReducerInfo structure describing the grammar's
+        nonterminals, terminals and productions, creating it on first use"""
+        if self._c_info is not None:
+            return self._c_info[0]
+        grammar = self._grammar
+        nonterminals = grammar.nonterminals_by_ix
+        nt_flags: List[int] = [0] * len(nonterminals)
+        nt_scores: List[int] = [0] * len(nonterminals)
+        for ix, nt in nonterminals.items():
+            flags = 0
+            if nt.has_tag("enable_prep_bonus"):
+                flags |= _REDUCE_NT_ENABLE_PREP_BONUS
+            if nt.has_tag("begin_prep_scope"):
+                flags |= _REDUCE_NT_BEGIN_PREP_SCOPE
+            if nt.is_noun_phrase:
+                flags |= _REDUCE_NT_NOUN_PHRASE
+            if nt.has_any_tag(_PREP_SCOPE_SET):
+                flags |= _REDUCE_NT_PREP_SCOPE
+            if nt.has_tag("apply_length_bonus"):
+                flags |= _REDUCE_NT_APPLY_LENGTH_BONUS
+            if nt.has_tag("apply_prep_bonus"):
+                flags |= _REDUCE_NT_APPLY_PREP_BONUS
+            if nt.has_tag("pick_up_verb"):
+                flags |= _REDUCE_NT_PICK_UP_VERB
+            if nt.has_any_tag(_CONTAINED_VERBS_SET):
+                flags |= _REDUCE_NT_CONTAINED_VERBS
+            if nt.no_reduce:
+                flags |= _REDUCE_NT_NO_REDUCE
+            nt_flags[-1 - ix] = flags
+            nt_scores[-1 - ix] = grammar.nt_score(nt)
+        terminals = grammar.terminals_by_ix
+        terminal_flags: List[int] = [0] * (max(terminals, default=0) + 1)
+        for ix, t in terminals.items():
+            if cast(BIN_Terminal, t).matches_category("fs"):
+                terminal_flags[ix] = _REDUCE_TERMINAL_PREP
+            elif cast(BIN_Terminal, t).matches_category("so"):
+                terminal_flags[ix] = _REDUCE_TERMINAL_VERB
+        productions = grammar.productions_by_ix
+        priorities: List[int] = [0] * (max(productions, default=0) + 1)
+        for ix, prod in productions.items():
+            priorities[ix] = prod.priority
+        arrays = (
+            ffi.new("UINT[]", nt_flags),  # type: ignore
+            ffi.new("INT[]", nt_scores),  # type: ignore
+            ffi.new("UINT[]", terminal_flags),  # type: ignore
+            ffi.new("UINT[]", priorities),  # type: ignore
+        )
+        info: Any = ffi.new("struct ReducerInfo*")  # type: ignore
+        info.nNonterminals = len(nt_flags)
+        info.pnNtFlags = arrays[0]
+        info.pnNtScores = arrays[1]
+        info.nTerminals = len(terminal_flags) - 1
+        info.pnTerminalFlags = arrays[2]
+        info.nProductions = len(priorities)
+        info.pnPriorities = arrays[3]
+        info.nVerbPrepBonus = _VERB_PREP_BONUS
+        info.nLengthBonusFactor = _LENGTH_BONUS_FACTOR
+        # Keep the arrays alive for as long as the structure
+        self._c_info = (info, arrays)
+        return info
+
+    def reduce_flat_forest(self, job: ParseJob, c_forest: Any) -> int:
+        """Reduce a flattened C++ parse forest (cf. flattenForest() in
+        eparser.cpp) in place to its highest-scoring tree, and return
+        the score of the tree. The terminal scores are calculated here,
+        while the reduction itself is done by the C++ reducer, which is
+        a port of ParseForestReducer. Only the nodes of the reduced
+        tree are left in the flattened forest, along with their scores."""
+        nn: int = c_forest.nNodes
+        node_table: List[int] = ffi.unpack(c_forest.pNodes, nn * 6)  # type: ignore
+        lookup_terminal = self._grammar.lookup_terminal
+        job_tokens = job.tokens
+        # First pass: for each token, find the possible terminals that
+        # can correspond to that token, by scanning the token nodes
+        finals: FinalsDict = defaultdict(set)
+        tokens: TokensDict = dict()
+        leaves: List[Tuple[int, int, BIN_Terminal]] = []
+        for i in range(0, nn * 6, 6):
+            if node_table[i + 2] >= 0:
+                start = node_table[i]
+                terminal = cast(BIN_Terminal, lookup_terminal(node_table[i + 3]))
+                finals[start].add(terminal)
+                tokens[start] = job_tokens[node_table[i + 2]]
+                leaves.append((i // 6, start, terminal))
+        scores = self._score_terminals(node_table[0], node_table[1], finals, tokens)
+        token_scores: Any = ffi.new("INT[]", nn)  # type: ignore
+        for ix, start, terminal in leaves:
+            token_scores[ix] = scores[start][terminal]
+        # Third pass: navigate the tree bottom-up in C++, eliminating
+        # lower-rated options (subtrees) in favor of higher rated ones
+        with _NativeReduction(
+            ParseForestReducer(self._grammar, scores), job, node_table
+        ) as reduction:
+            return eparser.reduceForest(  # type: ignore
+                c_forest,
+                self._reducer_info(),
+                token_scores,
+                reduction.handle,
+                eparser.prep_bonus_func,  # type: ignore
+            )
+
     def go_with_score(self, forest: Optional[Node]) -> Tuple[Optional[Node], int]:
         """Returns the argument forest after pruning it down to a single tree"""
         if forest is None:
@@ -42,10 +42,12 @@ from typing import (
     Sequence,
     Union,
     Callable,
+    Deque,
     Dict,
     List,
     Tuple,
     NamedTuple,
+    Set,
     Type,
     cast,
 )
@@ -54,7 +56,14 @@ from typing_extensions import TypedDict
 import time
 import operator
 import json
+from collections import deque
 from threading import Lock
+from concurrent.futures import (
+    CancelledError,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 
 from tokenizer import Tok, correct_spaces, paragraphs, mark_paragraphs
 
@@ -62,15 +71,27 @@ from .bintokenizer import (
     StringIterable,
     TokenList,
     CanonicalTokenDict,
+    PhaseMeter,
+    PhaseStats,
     tokenize as bin_tokenize,
     tokens_are_foreign,
     load_token,
 )
 from .binparser import BIN_Token
-from .fastparser import Fast_Parser, Node, ParseError
+from .fastparser import (
+    Fast_Parser,
+    Node,
+    ParseBudget,
+    ParseBudgetExceeded,
+    ParseError,
+    ParseStats,
+)
 from .reducer import Reducer
+from .parsecache import PARSE_CACHE_SIZE, ParseCache, ParseCacheEntry
+from .metrics import METRICS, Metrics
 from .cache import cached_property
-from .simpletree import SimpleTree
+from .simpletree import SimpleTree, terminals_from_deep_tree
+from .codec import encode, decode
 from .incparser import ICELANDIC_RATIO
 from .lemmatize import LemmaTuple, Comparable, simple_lemmatize
 
@@ -97,6 +118,23 @@ Terminal = NamedTuple(
 
 # Progress function parameter type
 ProgressFunc = Optional[Callable[[float], None]]
+# Streaming progress function parameter type, called with
+# the number of sentences done and the number of input bytes consumed
+StreamProgressFunc = Optional[Callable[[int, int], None]]
+
+# The type of a sentence parse result returned from a worker process:
+# (simplified tree, num_combinations, score, parse_time, reduce_time,
+# error, stats), where error is None or the ParseError raised in the worker,
+# and stats is None or the ParseStats of the parse
+_WorkerResult = Tuple[
+    Optional[Dict[str, Any]],
+    int,
+    int,
+    float,
+    float,
+    Optional[ParseError],
+    Optional[ParseStats],
+]
 
 # The type of a parse result
 class ParseResult(TypedDict):
@@ -112,6 +150,13 @@ class ParseResult(TypedDict):
 # The default maximum length of a sentence, in tokens, that we attempt to parse
 DEFAULT_MAX_SENT_TOKENS = 90
 
+# The error message of sentences that are not parsed since they seem foreign
+_FOREIGN_SENTENCE = "Sentence is probably not in Icelandic"
+
+# The default maximum number of sentences that Greynir.parse_stream()
+# dispatches to worker processes ahead of the sentence being returned
+DEFAULT_LOOKAHEAD = 64
+
 
 class _Sentence:
 
@@ -138,6 +183,10 @@ class _Sentence:
         self._score: Optional[int] = None
         # Cached terminals
         self._terminals: Optional[List[Terminal]] = None
+        # Cached terminal nodes, extracted directly from the deep tree
+        self._leaves: Optional[List[SimpleTree]] = None
+        # Parser statistics
+        self._stats: Optional[ParseStats] = None
         if self._job.parse_immediately:
             # We want an immediate parse of the sentence
             self.parse()
@@ -161,12 +210,20 @@ class _Sentence:
         except ParseError as e:
             self._err_index = self._len - 1 if e.token_index is None else e.token_index
             self._error = e
+        self._stats = job.parse_stats(self._s)
         self._tree = tree
-        if tree is None:
-            self._simplified_tree = None
-        else:
-            # Create a simplified tree as well
-            self._simplified_tree = SimpleTree.from_deep_tree(tree, self._s)
+        self._simplified_tree = None
+        self._leaves = None
+        if isinstance(tree, dict):
+            # The sentence was parsed in a worker process, which returned
+            # a simplified tree in serialized form (cf. _Sentence.dump()).
+            # The deep tree is not available in this case.
+            self._tree = None
+            self._simplified_tree = SimpleTree([[tree]])
+        elif tree is not None and job.caching(self._s):
+            # The simplified tree is normally created on demand, but
+            # the parse cache stores it, so we need it right away
+            job.cache_result(self._s, self.tree, num, score)
         self._num = num
         self._score = score
         return num > 0
@@ -176,6 +233,13 @@ class _Sentence:
         """Return the ParseError that occurred when parsing this sentence, or None"""
         return self._error
 
+    @property
+    def parse_stats(self) -> Optional[ParseStats]:
+        """Return the ParseStats of the C++ parser for this sentence,
+        or None if the parser was not invoked, e.g. if the sentence
+        hasn't been parsed or its result came from the parse cache"""
+        return self._stats
+
     @property
     def err_index(self) -> Optional[int]:
         """Return the index of the error token, if an error occurred;
@@ -194,8 +258,8 @@ class _Sentence:
     @property
     def combinations(self) -> Optional[int]:
         """Return the number of different parse tree combinations
-        for the sentence, or 0 if no parse tree was found,
-        or None if the sentence hasn't been parsed"""
+        for the sentence (saturating at 2**64 - 1), or 0 if no parse
+        tree was found, or None if the sentence hasn't been parsed"""
         return self._num
 
     @property
@@ -206,7 +270,10 @@ class _Sentence:
     @property
     def tree(self) -> Optional[SimpleTree]:
         """Return the simplified parse tree, or None
-        if the sentence hasn't been parsed"""
+        if the sentence hasn't been parsed. The tree is
+        created from the deep tree upon first access."""
+        if self._simplified_tree is None and self._tree is not None:
+            self._simplified_tree = SimpleTree.from_deep_tree(self._tree, self._s)
         return self._simplified_tree
 
     @property
@@ -229,32 +296,45 @@ class _Sentence:
     @property
     def tidy_text(self) -> str:
         """Return a [more] correctly spaced text representation of the sentence"""
-        if self.tree is None:
+        leaves = self._terminal_leaves()
+        if leaves is None:
             txt = self.text
         else:
-            terminals = self.terminal_nodes
             # Use the terminal text representation -
             # it's got fancy em/en-dashes and stuff
-            txt = " ".join(t.text for t in terminals)
+            txt = " ".join(t.text for t in leaves)
         return correct_spaces(txt)
 
+    def _terminal_leaves(self) -> Optional[List[SimpleTree]]:
+        """Return a list of the terminal nodes of the parse tree, or None
+        if the sentence hasn't been parsed. If the simplified tree hasn't
+        been created, the terminal nodes are extracted directly from the
+        deep tree, which is much cheaper than simplifying it."""
+        if self._simplified_tree is not None:
+            return self.terminal_nodes
+        if self._tree is None:
+            return None
+        if self._leaves is None:
+            self._leaves = terminals_from_deep_tree(self._tree, self._s)
+        return self._leaves
+
     @property
     def terminals(self) -> Optional[List[Terminal]]:
         """Return a list of tuples, one for each terminal in the sentence.
         The tuples contain the original text of the token that matched
         the terminal, the associated word lemma, the category, and a set
         of variants (case, number, gender, etc.)"""
-        if self.tree is None:
-            # Must parse the sentence first, without errors
-            return None
         if self._terminals is not None:
             # Already calculated and cached
             return self._terminals
+        leaves = self._terminal_leaves()
+        if leaves is None:
+            # Must parse the sentence first, without errors
+            return None
         # Generate the terminal list from the parse tree
-        # pylint: disable=not-an-iterable
         self._terminals = [
             Terminal(d.text, d.lemma, d.tcat, d.all_variants, d.index or 0)
-            for d in self.terminal_nodes
+            for d in leaves
         ]
         return self._terminals
 
@@ -292,42 +372,46 @@ class _Sentence:
     @property
     def categories(self) -> Optional[List[str]]:
         """Convenience property to return the categories only"""
-        if self.tree is None:
+        leaves = self._terminal_leaves()
+        if leaves is None:
             return None
         # Note that here we return the BÍN category,
         # not the terminal category (tcat)
-        # pylint: disable=not-an-iterable
-        return [d.cat for d in self.terminal_nodes]
+        return [d.cat for d in leaves]
 
     @property
     def lemmas_and_cats(self) -> Optional[List[Tuple[str, str]]]:
         """Convenience property to return (lemma, category) tuples"""
-        if self.tree is None:
+        leaves = self._terminal_leaves()
+        if leaves is None:
             return None
         # Note that we return the "lemma category", which is suitable for
         # topic indexing and similar applications. Unknown words and entity
         # names have the category 'entity' in this case, and person names
         # have one of 'person_kk'/'person_kvk'/'person_hk'.
-        # pylint: disable=not-an-iterable
-        return [(d.lemma, d.lemma_cat) for d in self.terminal_nodes]
+        return [(d.lemma, d.lemma_cat) for d in leaves]
 
     @property
     def ifd_tags(self) -> Optional[List[str]]:
         """Return a list of Icelandic Frequency Dictionary (IFD) tags for
         the terminals/tokens in this sentence."""
-        if self.tree is None:
+        leaves = self._terminal_leaves()
+        if leaves is None:
             return None
-        # Flatten the ifd_tags lists for the individual nodes
-        # (nonterminal nodes return an empty list in the ifd_tags property)
-        return [ifd_tag for d in self.tree.descendants for ifd_tag in d.ifd_tags]
+        # Flatten the ifd_tags lists for the individual terminal nodes
+        return [ifd_tag for d in leaves for ifd_tag in d.ifd_tags]
 
     def dump(self, greynir_cls: GreynirType) -> Dict[str, Any]:
         """Dump internal data of the class instance for serialization.
         Useful for storing parsed data in a database.
         Note: Normally, sentences are dumped using Greynir.dumps_single()."""
+        tree = None if self.tree is None else self.tree._head
+        if tree is not None and not isinstance(tree, dict):
+            # Lazy node record of a sentence loaded from a Corpus
+            tree = tree.to_dict()
         return {
             "tokens": [greynir_cls._dump_token(t) for t in self._s],
-            "tree": None if self.tree is None else self.tree._head,
+            "tree": tree,
         }
 
     def dumps(self, greynir_cls: GreynirType, **kwargs: Any) -> str:
@@ -339,6 +423,12 @@ class _Sentence:
             return json.dumps(self.dump(greynir_cls), ensure_ascii=False, **kwargs)
         return json.dumps(self.dump(greynir_cls), **kwargs)
 
+    def dumpb(self, greynir_cls: GreynirType) -> bytes:
+        """Dump internal data of the class instance in a compact binary form,
+        which holds the same data as the JSON string returned by dumps().
+        Note: Normally, sentences are dumped using Greynir.dumpb_single()."""
+        return encode(self.dump(greynir_cls))
+
     @classmethod
     def load(
         cls,
@@ -355,10 +445,13 @@ class _Sentence:
             "len": len(tokens),
             "_simplified_tree": None if tree is None else SimpleTree([[tree]]),
             "_terminals": None,
+            "_leaves": None,
+            "_tree": None,
             "_job": None,
             "_err_index": None,
             "_error": None,
             "_score": None,
+            "_stats": None,
         }
         return instance
 
@@ -372,6 +465,12 @@ class _Sentence:
         data = json.loads(json_str, **kwargs)
         return cls.load(greynir_cls, **data)
 
+    @classmethod
+    def loadb(cls, greynir_cls: GreynirType, data: bytes) -> "_Sentence":
+        """Load data previously dumped by dumpb().
+        Note: Normally, sentences are loaded using Greynir.loadb_single()."""
+        return cls.load(greynir_cls, **decode(data))
+
     def __str__(self) -> str:
         """Return a text representation of a sentence"""
         return self.text
@@ -472,6 +571,8 @@ class _Job:
         root: Optional[str] = None,
         progress_func: ProgressFunc = None,
         max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS,
+        workers: int = 0,
+        lookahead: int = DEFAULT_LOOKAHEAD,
     ) -> None:
         self._r = greynir
         self._parser = self._r.parser
@@ -498,12 +599,51 @@ class _Job:
         self._progress_func = progress_func
         # The maximum length, in tokens, of a sentence that we will attempt to parse
         self._max_sent_tokens = max_sent_tokens
+        # The number of worker processes to parse sentences in, if any
+        self._workers = workers
+        # The maximum number of sentences that are dispatched to the
+        # worker processes ahead of the sentence being parsed
+        self._lookahead = max(lookahead, 1)
+        # Sentences waiting to be dispatched to the worker processes, in
+        # order, and the identities of their token lists. A sentence that
+        # is parsed before it is dispatched is removed from the latter.
+        self._queue: Deque[TokenList] = deque()
+        self._queued: Set[int] = set()
+        # Parse results pending from worker processes, keyed by the
+        # identity of the token list of each sentence
+        self._pending: Dict[int, "Future[_WorkerResult]"] = {}
+        # The sentence parse cache, if any, and the cache keys of
+        # sentences whose parse results are to be stored in it,
+        # keyed by the identity of the token list of each sentence
+        self._cache = self._r.parse_cache
+        self._cache_keys: Dict[int, bytes] = {}
+        # Parse cache entries of sentences that were found in the cache
+        # before being dispatched to worker processes, keyed likewise
+        self._cache_hits: Dict[int, ParseCacheEntry] = {}
+        # Parser statistics of sentences that have been parsed but not
+        # yet collected by their _Sentence objects, keyed likewise
+        self._stats: Dict[int, ParseStats] = {}
 
     def _add_sentence(
-        self, s: TokenList, num: int, parse_time: float, reduce_time: float
+        self,
+        s: TokenList,
+        num: int,
+        parse_time: float,
+        reduce_time: float,
+        err: Optional[ParseError] = None,
+        cached: bool = False,
     ) -> None:
         """Add a processed sentence to the statistics"""
         slen = len(s)
+        # Record the sentence in the process-wide metrics. The latencies
+        # of parse cache hits are left out, since no parsing took place.
+        if not cached:
+            METRICS.observe("parse", slen, parse_time)
+            METRICS.observe("reduce", slen, reduce_time)
+        METRICS.sentence(self._failure_cause(s, err))
+        stats = self._stats.get(id(s))
+        if stats is not None:
+            METRICS.cache("matching", stats.matching_cache_hits, stats.tokens)
         self._num_sent += 1
         self._num_tokens += slen
         if num > 0:
@@ -525,6 +665,28 @@ class _Job:
             # have an additional first step that we call after tokenization
             self._progress_func((self._num_sent + 1) / self._cnt_sent)
 
+    def _failure_cause(self, s: TokenList, err: Optional[ParseError]) -> str:
+        """Return the cause of a parse failure, as counted in the
+        process-wide metrics, or an empty string if there was none"""
+        if err is None:
+            return ""
+        if isinstance(err, ParseBudgetExceeded):
+            return "budget"
+        if self._max_sent_tokens and len(s) > self._max_sent_tokens:
+            return "too_long"
+        if str(err) == _FOREIGN_SENTENCE:
+            return "foreign"
+        return "no_parse"
+
+    def _parseable(self, s: TokenList) -> bool:
+        """Return False if parse() would reject the sentence without
+        attempting to parse it, since it is too long or foreign"""
+        if self._max_sent_tokens and len(s) > self._max_sent_tokens:
+            return False
+        return self.parse_foreign_sentences or not tokens_are_foreign(
+            s, min_icelandic_ratio=ICELANDIC_RATIO
+        )
+
     def _create_sentence(self, s: TokenList) -> _Sentence:
         """Create a fresh _Sentence object"""
         return self._r.create_sentence(self, s)
@@ -534,42 +696,167 @@ class _Job:
         """Return True if sentences in the job should be parsed immediately"""
         return self._parse
 
+    def _dispatch(self, pg_list: List[List[SentenceTuple]]) -> None:
+        """Queue all sentences in the given paragraph list to be parsed
+        in parallel in the worker process pool, and dispatch the first
+        of them"""
+        for p in pg_list:
+            for _, sent in p:
+                self._queue.append(sent)
+                self._queued.add(id(sent))
+        self._fill()
+
+    def _fill(self) -> None:
+        """Dispatch queued sentences to the worker process pool, until
+        as many are pending as the job's lookahead allows"""
+        queue = self._queue
+        if not queue:
+            return
+        executor = self._r._worker_pool(self._workers)
+        dump_token = self._r._dump_token
+        cache = self._cache
+        while queue and len(self._pending) < self._lookahead:
+            sent = queue.popleft()
+            if id(sent) not in self._queued:
+                # Already parsed in this process
+                continue
+            self._queued.discard(id(sent))
+            if cache is not None and self._parseable(sent):
+                # Look the sentence up in the parse cache before
+                # sending it to a worker process
+                key = cache.key(sent, self._root)
+                entry = cache.get(key)
+                if entry is not None:
+                    self._cache_hits[id(sent)] = entry
+                    continue
+                # Note the key, so that the result from the
+                # worker process can be stored in the cache
+                self._cache_keys[id(sent)] = key
+            self._pending[id(sent)] = executor.submit(
+                _parse_in_worker,
+                [dump_token(t) for t in sent],
+                self._root,
+                self._max_sent_tokens,
+            )
+
+    def close(self) -> None:
+        """Stop parsing the sentences of this job in worker processes,
+        cancelling those that have been dispatched but not yet started.
+        Sentences of the job that are parsed after this are parsed in
+        the calling process. This is called automatically if iteration
+        through the job is abandoned, and when the job is finalized."""
+        self._queue.clear()
+        self._queued.clear()
+        for ident, future in list(self._pending.items()):
+            if future.cancel():
+                del self._pending[ident]
+                self._cache_keys.pop(ident, None)
+
+    def __del__(self) -> None:
+        # Don't keep the worker processes busy with abandoned sentences
+        if getattr(self, "_pending", None) or getattr(self, "_queue", None):
+            self.close()
+
     def paragraphs(self) -> Iterable[_Paragraph]:
         """Yield the paragraphs from the token stream"""
-        if self._progress_func is not None:
-            # We have a progress function, so we must pre-count
-            # the sentences to be processed. This means that all input
+        if self._progress_func is not None or self._workers > 0:
+            # We have a progress function and/or worker processes,
+            # so we must pre-count and/or pre-dispatch the sentences
+            # to be processed. This means that all input
             # data must be converted to lists, exhausting generators.
             # Note that the paragraph splitting phase applies the
             # token-level corrections, so they are not really
             # counted in the progress.
             pg_list = [
-                [(ix, list(sent)) for ix, sent in p] for p in paragraphs(self._tokens)
+                [(ix, list(sent)) for ix, sent in self._timed(p)]
+                for p in paragraphs(self._tokens)
             ]
-            self._cnt_sent = sum(len(p) for p in pg_list) + 1
-            # Make an "first step" initial call to the progress function
-            # with a progress of 1, after we've tokenized the input
-            self._progress_func(1 / self._cnt_sent)
+            if self._progress_func is not None:
+                self._cnt_sent = sum(len(p) for p in pg_list) + 1
+                # Make an "first step" initial call to the progress function
+                # with a progress of 1, after we've tokenized the input
+                self._progress_func(1 / self._cnt_sent)
+            if self._workers > 0:
+                # Start parsing all sentences in the worker processes
+                self._dispatch(pg_list)
             plist = iter(pg_list)
         else:
             # No progress function: use generators throughout
-            plist = paragraphs(self._tokens)
-        for p in plist:
-            yield _Paragraph(self, p)
+            plist = (self._timed(p) for p in paragraphs(self._tokens))
+        try:
+            for p in plist:
+                yield _Paragraph(self, p)
+        except GeneratorExit:
+            # The caller stopped iterating through the job
+            self.close()
+            raise
+
+    @staticmethod
+    def _timed(p: Iterable[SentenceTuple]) -> Iterator[SentenceTuple]:
+        """Yield the sentences of a paragraph, recording the time taken
+        to tokenize each of them in the process-wide metrics"""
+        t0 = time.perf_counter()
+        for ix, sent in p:
+            METRICS.observe("tokenize", len(sent), time.perf_counter() - t0)
+            yield ix, sent
+            t0 = time.perf_counter()
 
     def sentences(self) -> Iterable[_Sentence]:
         """Yield the sentences from the token stream"""
         for p in self.paragraphs():
             yield from p.sentences()
 
-    def parse(self, tokens: TokenList) -> Tuple[Node, int, int]:
+    def _collect(
+        self, tokens: TokenList, future: "Future[_WorkerResult]"
+    ) -> Tuple[Dict[str, Any], int, int]:
+        """Wait for and return the result of a sentence parse
+        from a worker process"""
+        tree, num, score, parse_time, reduce_time, err, stats = future.result()
+        if stats is not None:
+            self._stats[id(tokens)] = stats
+        key = self._cache_keys.pop(id(tokens), None)
+        if key is not None and self._cache is not None:
+            # The sentence was not found in the parse cache: store the
+            # result, unless the parse was aborted, as in parse() below
+            METRICS.cache("parse", 0, 1)
+            if err is None:
+                self._cache.put(key, (tree, num, score, None))
+            elif self._failure_cause(tokens, err) == "no_parse":
+                self._cache.put(key, (None, 0, 0, (str(err), err.token_index)))
+        # Accumulate statistics in the job object
+        self._add_sentence(
+            tokens, num, parse_time=parse_time, reduce_time=reduce_time, err=err
+        )
+        if err is not None:
+            raise err
+        assert tree is not None
+        return tree, num, score
+
+    def parse(self, tokens: TokenList) -> Tuple[Union[Node, Dict[str, Any]], int, int]:
         """Parse the token sequence, returning a parse tree,
         the number of trees in the parse forest, and the
-        score of the best tree"""
+        score of the best tree. If the sentence was parsed
+        in a worker process, the returned tree is a simplified
+        tree in serialized form."""
+        future = self._pending.pop(id(tokens), None)
+        if future is not None:
+            # Keep the worker processes busy while waiting for the result
+            self._fill()
+            try:
+                return self._collect(tokens, future)
+            except CancelledError:
+                # The worker pool was shut down: parse the sentence here
+                self._cache_keys.pop(id(tokens), None)
+        else:
+            # Not dispatched yet: this process parses the sentence
+            self._queued.discard(id(tokens))
         num = 0
         score = 0
         forest = None
-        t0 = t1 = time.time()
+        err: Optional[ParseError] = None
+        cached = False
+        reduce_time = 0.0
+        t0 = time.time()
         try:
             if self._max_sent_tokens and len(tokens) > self._max_sent_tokens:
                 # Sentence is above the maximum length: don't attempt to parse it
@@ -581,20 +868,110 @@ class _Job:
                 tokens, min_icelandic_ratio=ICELANDIC_RATIO
             ):
                 # Sentence is foreign: don't attempt to parse it
-                raise ParseError("Sentence is probably not in Icelandic", token_index=0)
-            forest = self.parser.go(tokens, root=self._root)
-            t1 = time.time()
-            num = Fast_Parser.num_combinations(forest)
-            if num > 1:
+                raise ParseError(_FOREIGN_SENTENCE, token_index=0)
+            cache = self._cache
+            if cache is not None:
+                # The sentence may already have been looked up in the
+                # cache, before being dispatched to the worker processes
+                entry = self._cache_hits.pop(id(tokens), None)
+                if entry is None:
+                    key = cache.key(tokens, self._root)
+                    entry = cache.get(key)
+                METRICS.cache("parse", int(entry is not None), 1)
+                if entry is not None:
+                    # Cache hit: return the simplified tree in serialized form
+                    cached = True
+                    tree, num, score, err = entry
+                    if err is not None:
+                        raise ParseError(err[0], token_index=err[1])
+                    assert tree is not None
+                    return tree, num, score
+                try:
+                    forest, num, score, reduce_time = self._parse_forest(tokens)
+                except ParseBudgetExceeded:
+                    # The outcome of a parse that was aborted is not cached,
+                    # as the sentence might well be parsed next time
+                    raise
+                except ParseError as e:
+                    cache.put(key, (None, 0, 0, (str(e), e.token_index)))
+                    raise
+                # Note the key, so that the result can be stored in the
+                # cache once the caller has created a simplified tree
+                self._cache_keys[id(tokens)] = key
+            else:
+                forest, num, score, reduce_time = self._parse_forest(tokens)
+            if num > 1 and not self._r.native_reducer:
                 # Reduce the parse forest to a single
                 # "best" (highest-scoring) parse tree
+                t1 = time.time()
                 forest, score = self.reducer.go_with_score(forest)
+                reduce_time = time.time() - t1
                 assert forest is not None
             return forest, num, score
+        except ParseError as e:
+            err = e
+            raise
         finally:
             # Accumulate statistics in the job object
-            now = time.time()
-            self._add_sentence(tokens, num, parse_time=now - t0, reduce_time=now - t1)
+            self._add_sentence(
+                tokens,
+                num,
+                parse_time=time.time() - t0,
+                reduce_time=reduce_time,
+                err=err,
+                cached=cached,
+            )
+
+    def _parse_forest(self, tokens: TokenList) -> Tuple[Node, int, int, float]:
+        """Call the parser, returning a tuple of the parse forest, the number
+        of trees in it, the score of the best tree and the time spent on
+        reduction. If the native reducer is enabled, the forest is reduced
+        to that tree in C++, and the reduction time is the wall time of
+        the call less the elapsed time of the C++ parse proper, as reported
+        in the parse statistics (with a resolution of one millisecond).
+        Otherwise, the forest is returned unreduced, with a score and
+        a reduction time of zero. The statistics of the parse
+        are kept until collected via parse_stats()."""
+        stats = self._stats[id(tokens)] = ParseStats()
+        if self._r.native_reducer:
+            t0 = time.time()
+            forest, num, score = self.parser.go_reduced(
+                tokens,
+                self.reducer,
+                root=self._root,
+                compact=self._r.compact_forest,
+                budget=self._r.parse_budget,
+                stats=stats,
+            )
+            reduce_time = max(0.0, time.time() - t0 - stats.elapsed_ms / 1000.0)
+            return forest, num, score, reduce_time
+        forest, num = self.parser.go_with_count(
+            tokens,
+            root=self._root,
+            compact=self._r.compact_forest,
+            budget=self._r.parse_budget,
+            stats=stats,
+        )
+        return forest, num, 0, 0.0
+
+    def parse_stats(self, tokens: TokenList) -> Optional[ParseStats]:
+        """Return and forget the parser statistics of the given
+        token sequence, or None if the parser was not invoked for it"""
+        return self._stats.pop(id(tokens), None)
+
+    def caching(self, tokens: TokenList) -> bool:
+        """Return True if the result of a sentence parse is to be
+        stored in the parse cache via cache_result()"""
+        return id(tokens) in self._cache_keys
+
+    def cache_result(
+        self, tokens: TokenList, tree: Optional[SimpleTree], num: int, score: int
+    ) -> None:
+        """Store the result of a sentence parse in the parse cache,
+        if the sentence was parsed with a cache key in place"""
+        key = self._cache_keys.pop(id(tokens), None)
+        if key is not None and self._cache is not None:
+            self._cache.put(key, (None if tree is None else tree._head, num, score, None))
 
     def __iter__(self) -> Iterator[_Sentence]:
         """Allow easy iteration of sentences within this job"""
@@ -655,11 +1032,55 @@ class _Job:
         """Return True if foreign-looking sentences should be parsed"""
         return self._r.parse_foreign_sentences
 
+    @property
+    def pipeline_report(self) -> Optional[List[PhaseStats]]:
+        """Return statistics for each phase of the tokenization pipeline,
+        if the Greynir instance was created with instrument=True,
+        or None otherwise"""
+        if isinstance(self._tokens, PhaseMeter):
+            return self._tokens.report()
+        return None
+
 
 # Create a public alias for the _Job class
 Job = _Job
 
 
+# The Greynir instance used for parsing within a worker process
+_worker_greynir: Optional["Greynir"] = None
+
+
+def _init_worker(greynir_cls: GreynirType, options: Dict[str, Any]) -> None:
+    """Initialize a worker process with its own Greynir instance,
+    and thereby its own parser and reducer"""
+    global _worker_greynir
+    _worker_greynir = greynir_cls(**options)
+    # Load the grammar up front, before the first sentence arrives
+    _worker_greynir.parser
+
+
+def _parse_in_worker(
+    dumped_tokens: List[Tuple[Any, ...]], root: Optional[str], max_sent_tokens: int
+) -> _WorkerResult:
+    """Parse a single sentence within a worker process, returning
+    the simplified tree in the same format as _Sentence.dump()"""
+    g = _worker_greynir
+    assert g is not None
+    tokens = [g._load_token(*t) for t in dumped_tokens]
+    job = _Job(g, [], root=root, max_sent_tokens=max_sent_tokens)
+    tree: Optional[Dict[str, Any]] = None
+    num = score = 0
+    err: Optional[ParseError] = None
+    try:
+        forest, num, score = job.parse(tokens)
+        simple_tree = SimpleTree.from_deep_tree(cast(Node, forest), tokens)
+        tree = None if simple_tree is None else simple_tree._head
+    except ParseError as e:
+        err = e
+    stats = job.parse_stats(tokens)
+    return tree, num, score, job.parse_time, job.reduce_time, err, stats
+
+
 class _Job_NP(_Job):
 
     """Specialized _Job class that creates _NounPhrase objects
@@ -744,7 +1165,36 @@ class Greynir:
         self._parse_foreign_sentences: bool = options.pop(
             "parse_foreign_sentences", False
         )
+        # Set matching_cache_file to a file name to share the parser's
+        # token/terminal matching cache between processes, such as
+        # parallel worker processes, via a memory-mapped file
+        self._matching_cache_file: Optional[str] = options.pop(
+            "matching_cache_file", None
+        )
+        # Set compact_forest to True to store parse forests in
+        # array-backed CompactForest instances instead of Node objects,
+        # trading some reduction speed for a much smaller memory footprint
+        self._compact_forest: bool = options.pop("compact_forest", False)
+        # Set parse_cache_size to a positive number to cache the parse
+        # results of up to that many distinct sentences in memory, and/or
+        # parse_cache_file to a file name to persist them in a local
+        # SQLite database, which can be shared between processes
+        self._parse_cache_size: int = options.pop("parse_cache_size", 0)
+        self._parse_cache_file: Optional[str] = options.pop("parse_cache_file", None)
+        self._parse_cache: Optional[ParseCache] = None
+        self._parse_cache_lock = Lock()
+        # Set parse_budget to a ParseBudget instance to limit the number of
+        # Earley states, parse forest nodes and/or milliseconds that the
+        # parser may spend on each sentence. Sentences that exceed the
+        # budget fail with a ParseBudgetExceeded error.
+        self._parse_budget: Optional[ParseBudget] = options.pop("parse_budget", None)
+        # Set native_reducer to False to reduce parse forests with the
+        # Python reducer (ParseForestReducer) instead of its C++ port
+        self._native_reducer: bool = options.pop("native_reducer", True)
         self._options = options
+        # Pool of worker processes for parallel parsing, created on demand
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
 
     @property
     def parse_foreign_sentences(self) -> bool:
@@ -752,6 +1202,43 @@ class Greynir:
         that look to be foreign, i.e. not in Icelandic"""
         return self._parse_foreign_sentences
 
+    @property
+    def compact_forest(self) -> bool:
+        """Return True if parse forests should be stored
+        in array-backed CompactForest instances"""
+        return self._compact_forest
+
+    @property
+    def parse_budget(self) -> Optional[ParseBudget]:
+        """Return the per-sentence parse budget, if any"""
+        return self._parse_budget
+
+    @property
+    def native_reducer(self) -> bool:
+        """Return True if parse forests should be reduced in C++,
+        before they are converted to Python objects"""
+        return self._native_reducer
+
+    @property
+    def metrics(self) -> Metrics:
+        """Return the process-wide metrics registry, which accumulates
+        latencies, failures and cache hits across all parse jobs"""
+        return METRICS
+
+    @property
+    def parse_cache(self) -> Optional[ParseCache]:
+        """Return the sentence parse cache, or None if not enabled"""
+        if not (self._parse_cache_size or self._parse_cache_file):
+            return None
+        with self._parse_cache_lock:
+            if self._parse_cache is None:
+                self._parse_cache = ParseCache(
+                    self._parse_cache_size or PARSE_CACHE_SIZE,
+                    file=self._parse_cache_file,
+                    version=self.parser.version,
+                )
+            return self._parse_cache
+
     @classmethod
     def _dump_token(cls, tok: Tok) -> Tuple[Any, ...]:
         """Allow derived classes to override how tokens are dumped"""
@@ -774,6 +1261,17 @@ class Greynir:
         Useful for retrieving parsed data from a database."""
         return _Sentence.loads(self.__class__, json_str, **kwargs)
 
+    def dumpb_single(self, sent: _Sentence) -> bytes:
+        """Return a _Sentence object in a compact binary form, which
+        can be loaded again using loadb_single(). The binary form holds
+        the same data as the JSON string returned by dumps_single()."""
+        return sent.dumpb(self.__class__)
+
+    def loadb_single(self, data: bytes) -> _Sentence:
+        """Load a single sentence that was previously dumped
+        using dumpb_single()"""
+        return _Sentence.loadb(self.__class__, data)
+
     def tokenize(self, text: StringIterable) -> Iterable[Tok]:
         """Call the tokenizer (overridable in derived classes)"""
         return bin_tokenize(text, **self._options)
@@ -790,7 +1288,9 @@ class Greynir:
             if Greynir._parser is None:
                 # Initialize a singleton instance of the parser and the reducer.
                 # Both classes are re-entrant and thread safe.
-                Greynir._parser = Fast_Parser()
+                Greynir._parser = Fast_Parser(
+                    matching_cache_file=self._matching_cache_file
+                )
                 Greynir._reducer = Reducer(Greynir._parser.grammar)
             return Greynir._parser
 
@@ -801,6 +1301,38 @@ class Greynir:
         assert Greynir._reducer is not None
         return Greynir._reducer
 
+    def _worker_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Return a pool of the given number of parser worker processes,
+        creating it if required. The pool is kept for subsequent jobs."""
+        with self._lock:
+            if self._executor is None or self._executor_workers != workers:
+                if self._executor is not None:
+                    self._executor.shutdown()
+                options = dict(self._options)
+                options["parse_foreign_sentences"] = self._parse_foreign_sentences
+                options["matching_cache_file"] = self._matching_cache_file
+                options["compact_forest"] = self._compact_forest
+                options["parse_budget"] = self._parse_budget
+                options["native_reducer"] = self._native_reducer
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(self.__class__, options),
+                )
+                self._executor_workers = workers
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Shut down the pool of parser worker processes, if any"""
+        with self._lock:
+            if self._executor is not None:
+                # Sentences that have been dispatched to the workers but
+                # not started are cancelled, and parsed in this process
+                # if their jobs are resumed
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+                self._executor_workers = 0
+
     def submit(
         self,
         text: StringIterable,
@@ -809,6 +1341,8 @@ class Greynir:
         split_paragraphs: bool = False,
         progress_func: ProgressFunc = None,
         max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS,
+        workers: int = 0,
+        lookahead: int = DEFAULT_LOOKAHEAD,
     ) -> _Job:
         """Submit a text to the tokenizer and parser, yielding a job object.
         The paragraphs and sentences of the text can then be iterated
@@ -820,7 +1354,14 @@ class Greynir:
 
         If progress_func is given, it will be called during processing
         with a single float parameter between 0.0..1.0 indicating the
-        ratio of progress so far with the parsing job."""
+        ratio of progress so far with the parsing job.
+
+        If workers is given as a positive number, the sentences are
+        parsed in parallel in a pool of that many worker processes.
+        At most lookahead sentences are dispatched to the workers ahead
+        of the sentence being parsed, and if the caller stops iterating
+        through the job, the sentences not yet started are cancelled.
+        Sentences are nevertheless returned in their original order."""
 
         if split_paragraphs:
             # Original text consists of paragraphs separated by newlines:
@@ -834,6 +1375,8 @@ class Greynir:
             parse=parse,
             progress_func=progress_func,
             max_sent_tokens=max_sent_tokens,
+            workers=workers,
+            lookahead=lookahead,
         )
 
     def parse(
@@ -842,10 +1385,12 @@ class Greynir:
         *,
         progress_func: ProgressFunc = None,
         max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS,
+        workers: int = 0,
+        lookahead: int = DEFAULT_LOOKAHEAD,
     ) -> ParseResult:
         """Convenience function to parse text synchronously and return
-        a summary of all contained sentences. The progress_func parameter
-        works as described for Greynir.submit()."""
+        a summary of all contained sentences. The progress_func, workers
+        and lookahead parameters work as described for Greynir.submit()."""
         tokens = self.tokenize(text)
         job = _Job(
             self,
@@ -853,7 +1398,100 @@ class Greynir:
             parse=True,
             progress_func=progress_func,
             max_sent_tokens=max_sent_tokens,
+            workers=workers,
+            lookahead=lookahead,
         )
+        return self._job_result(job)
+
+    def parse_many(
+        self,
+        texts: Iterable[str],
+        *,
+        threads: int = 4,
+        max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS,
+    ) -> List[ParseResult]:
+        """Parse multiple texts concurrently in a pool of threads,
+        returning a list of parse results, one for each text, as they
+        would be returned from Greynir.parse(). Token/terminal matching
+        is resolved ahead of each call to the C++ parser, so that the
+        parser runs in parallel without holding the global interpreter lock."""
+
+        def parse_text(text: str) -> ParseResult:
+            job = _Job(
+                self, self.tokenize(text), parse=True, max_sent_tokens=max_sent_tokens
+            )
+            return self._job_result(job)
+
+        # Make sure that the parser singleton exists before starting the threads
+        self.parser
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(parse_text, texts))
+
+    def parse_stream(
+        self,
+        texts: Iterable[str],
+        *,
+        progress_func: StreamProgressFunc = None,
+        max_sent_tokens: int = DEFAULT_MAX_SENT_TOKENS,
+        workers: int = 0,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+    ) -> Iterator[_Sentence]:
+        """Parse a stream of texts, such as the lines or paragraphs
+        of a large corpus file, yielding each sentence as soon as it
+        has been parsed. The texts are read lazily and only a bounded
+        number of sentences is held in memory at any time, so input of
+        any size can be processed in constant memory.
+
+        If progress_func is given, it is called after each sentence
+        with the number of sentences done so far and the number of
+        bytes (UTF-8 encoded) consumed from the input so far. No pre-count
+        of the sentences is required.
+
+        If workers is given as a positive number, the sentences are
+        parsed in parallel in a pool of that many worker processes.
+        At most lookahead sentences, plus the sentences of a single
+        text, are then dispatched ahead of the one being returned.
+        Sentences are always returned in their original order."""
+
+        bytes_consumed = 0
+        sentences_done = 0
+
+        def jobs() -> Iterator[_Job]:
+            nonlocal bytes_consumed
+            for text in texts:
+                bytes_consumed += len(text.encode("utf-8"))
+                yield _Job(
+                    self,
+                    self.tokenize(text),
+                    max_sent_tokens=max_sent_tokens,
+                    workers=workers,
+                    lookahead=lookahead,
+                )
+
+        # Without worker processes, there is no point in looking ahead
+        window_size = max(lookahead, 1) if workers > 0 else 1
+        window: Deque[_Sentence] = deque()
+
+        def completed() -> _Sentence:
+            nonlocal sentences_done
+            sent = window.popleft()
+            sent.parse()
+            sentences_done += 1
+            if progress_func is not None:
+                progress_func(sentences_done, bytes_consumed)
+            return sent
+
+        for job in jobs():
+            for sent in job:
+                window.append(sent)
+                if len(window) >= window_size:
+                    yield completed()
+        while window:
+            yield completed()
+
+    @staticmethod
+    def _job_result(job: _Job) -> ParseResult:
+        """Parse all sentences in a job and return a summary of the results"""
         # Iterating through the sentences in the job causes
         # them to be parsed and their statistics collected
         sentences = [sent for sent in job]
@@ -58,6 +58,7 @@ from typing_extensions import Protocol
 import re
 from pprint import pformat
 from itertools import chain
+from functools import lru_cache
 
 from tokenizer import TOK, Tok, correct_spaces
 from tokenizer.definitions import BIN_Tuple, BIN_TupleList
@@ -81,7 +82,7 @@ from .bintokenizer import (
     DECLINABLE_MULTIPLIERS,
 )
 from .bindb import GreynirBin
-from .matcher import match_pattern, ContextDict
+from .matcher import match_pattern, match_patterns, ContextDict
 from .ifdtagger import IFD_Tagset  # type: ignore
 
 
@@ -652,6 +653,25 @@ _DECLINABLE_CATEGORIES = frozenset(("kvk", "kk", "hk", "lo", "to", "fn", "pfn",
 
 _CONJUNCTIONS = frozenset(("og", "eða"))
 
+# Tag accessors such as NP2 or NP_OBJ3: a tag identifier followed by a number
+_ACCESSOR_RE = re.compile(r"^(\D+)(\d+)$")
+
+# Maximum number of distinct tag accessor names to keep parsed
+_ACCESSOR_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_ACCESSOR_CACHE_SIZE)
+def _parse_accessor(name: str) -> Tuple[str, int]:
+    """Parse a tag accessor name, such as NP_POSS or NP2, into a
+    tuple of the tag prefix it matches (NP-POSS or NP) and its 1-based
+    index among the matching children"""
+    name = name.replace("_", "-")  # Convert NP_POSS to NP-POSS
+    # Check for NP1, NP2 etc., i.e. a tag identifier followed by a number
+    m = _ACCESSOR_RE.match(name)
+    if m:
+        return m.group(1), int(m.group(2))  # Should never fail
+    return name, 1
+
 
 def cut_definite_pronouns(txt: str) -> str:
     """Removes definite pronouns from the front of txt and returns the result.
@@ -747,6 +767,13 @@ class SimpleTree:
         self._children = self._head.get("p")
         self._children_cache: Optional[Tuple["SimpleTree", ...]] = None
         self._tag_cache: Optional[List[str]] = None
+        # Map of tag prefixes (NP, NP-OBJ, ...) to the children having them
+        self._tag_index: Optional[Dict[str, List["SimpleTree"]]] = None
+        # Root nodes keep the wrappers of the nodes within the tree,
+        # keyed by the identity of the wrapped node dict
+        self._wrappers: Optional[Dict[int, "SimpleTree"]] = (
+            {} if root is None else None
+        )
 
     def __str__(self) -> str:
         """Return a pretty-printed representation of the contained trees"""
@@ -962,9 +989,7 @@ class SimpleTree:
     @cached_property
     def sentences(self) -> List["SimpleTree"]:
         """A list of the contained sentences"""
-        return [
-            SimpleTree([[sent]], root=self.root, parent=self) for sent in self._sents
-        ]
+        return [self._wrap(sent) for sent in self._sents]
 
     @property
     def has_children(self) -> bool:
@@ -985,7 +1010,29 @@ class SimpleTree:
         elif self._children:
             # Proper children: yield'em
             for child in self._children:
-                yield SimpleTree([[child]], root=self.root, parent=self)
+                yield self._wrap(child)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the wrapper and tag caches when copying or pickling,
+        since the wrappers are keyed by the identity of node dicts"""
+        state = self.__dict__.copy()
+        state["_children_cache"] = None
+        state["_tag_index"] = None
+        if state["_wrappers"] is not None:
+            state["_wrappers"] = {}
+        return state
+
+    def _wrap(self, child: CanonicalTokenDict) -> "SimpleTree":
+        """Return the wrapper of a child node dict of this subtree,
+        creating it if required. There is only one wrapper
+        per node within a tree."""
+        root = self.root
+        wrappers = root._wrappers
+        assert wrappers is not None
+        w = wrappers.get(id(child))
+        if w is None:
+            w = wrappers[id(child)] = SimpleTree([[child]], root=root, parent=self)
+        return w
 
     @property
     def children(self) -> Iterator["SimpleTree"]:
@@ -1326,33 +1373,40 @@ class SimpleTree:
         """Return a bracketed representation of the tree"""
         return self._bracket_form()
 
+    def _children_with_tag(self, name: str) -> List["SimpleTree"]:
+        """Return the children of this subtree whose tags start with
+        the given hyphen-separated prefix, using an index of the
+        children by tag prefix that is built on first use"""
+        index = self._tag_index
+        if index is None:
+            index = self._tag_index = {}
+            for ch in self.children:
+                tag = ch.tag
+                if tag is None:
+                    continue
+                # NP matches NP-POSS, NP-OBJ, etc.
+                # NP-OBJ matches NP-OBJ-PRIMARY, NP-OBJ-SECONDARY, etc.
+                parts = tag.split("-")
+                for i in range(1, len(parts) + 1):
+                    index.setdefault("-".join(parts[0:i]), []).append(ch)
+        return index.get(name, [])
+
     def __getattr__(self, name: str) -> "SimpleTree":
         """Return the first child of this subtree having the given tag"""
-        name = name.replace("_", "-")  # Convert NP_POSS to NP-POSS
-        index = 1
-        # Check for NP1, NP2 etc., i.e. a tag identifier followed by a number
-        s = re.match(r"^(\D+)(\d+)$", name)
-        if s:
-            name = s.group(1)
-            index = int(s.group(2))  # Should never fail
-            if index < 1:
-                raise AttributeError("Subtree indices start at 1")
-        multi = index
-        # NP matches NP-POSS, NP-OBJ, etc.
-        # NP-OBJ matches NP-OBJ-PRIMARY, NP-OBJ-SECONDARY, etc.
-        names = name.split("-")
-        for ch in self.children:
-            if ch.match_tag(names):
-                # Match: check whether it's the requested index
-                index -= 1
-                if index == 0:
-                    # Yes, it is
-                    return ch
+        if name.startswith("__"):
+            # Not a tag accessor, but for instance a probe by copy or pickle
+            raise AttributeError(name)
+        name, index = _parse_accessor(name)
+        if index < 1:
+            raise AttributeError("Subtree indices start at 1")
+        matches = self._children_with_tag(name)
+        if index <= len(matches):
+            return matches[index - 1]
         # No match
-        if multi > index:
+        if matches:
             raise AttributeError(
                 "Subtree has {0} {1} but index {2} was requested".format(
-                    multi - index, name, multi
+                    len(matches), name, index
                 )
             )
         raise AttributeError("Subtree has no child named '{0}'".format(name))
@@ -1369,9 +1423,9 @@ class SimpleTree:
         if self._children_cache is not None:
             return self._children_cache[index]
         if self._len > 1:
-            return SimpleTree([[self._sents[index]]], root=self.root, parent=self)
+            return self._wrap(self._sents[index])
         if self._children:
-            return SimpleTree([[self._children[index]]], root=self.root, parent=self)
+            return self._wrap(self._children[index])
         raise IndexError("Subtree has no children")
 
     def __len__(self) -> int:
@@ -2086,6 +2140,14 @@ class SimpleTree:
         """Return True if this subtree matches the given pattern"""
         return match_pattern(self, pattern, context)
 
+    def match_patterns(
+        self, patterns: Iterable[str], context: Optional[ContextDict] = None
+    ) -> Dict[str, List["SimpleTree"]]:
+        """Match many patterns in a single traversal of this subtree,
+        returning a dict of the patterns that matched, each mapped to a list
+        of the matching subtree roots, as all_matches() would return them"""
+        return match_patterns(self, patterns, context)
+
 
 class SimpleTreeBuilder:
 
@@ -2246,6 +2308,52 @@ class Annotator(ParseForestNavigator):
         return None
 
 
+def _canonical_terminal(
+    w: Node, tokens: List[Tok], first_token_index: int
+) -> CanonicalTokenDict:
+    """Return the canonical dictionary describing the token
+    matched by the terminal node w"""
+    assert w.token is not None
+    t = cast(BIN_Terminal, w.terminal)
+    meaning = w.token.match_with_meaning(t)
+    token_index = (w.token.index or 0) - first_token_index
+    d = describe_token(
+        token_index,
+        tokens[token_index],
+        t,
+        None if isinstance(meaning, bool) else meaning,
+    )
+    # Convert from compact form to external (more verbose and descriptive) form
+    return canonicalize_token(d)
+
+
+def terminals_from_deep_tree(
+    deep_tree: Optional[Node], toklist: List[Tok], first_token_index: int = 0
+) -> List[SimpleTree]:
+    """Return a list of terminal SimpleTree nodes, in token order,
+    for the terminals of a reduced deep (detailed) parse tree. The
+    terminals are the same as those of SimpleTree.from_deep_tree(),
+    but no simplified nonterminal structure is built, and the returned
+    nodes have no parent."""
+    result: List[SimpleTree] = []
+    if deep_tree is None or not toklist:
+        return result
+    stack: List[Optional[Node]] = [deep_tree]
+    while stack:
+        w = stack.pop()
+        if w is None:
+            # Epsilon node
+            continue
+        if w._token is not None:
+            ct = _canonical_terminal(w, toklist, first_token_index)
+            result.append(SimpleTree([[ct]]))
+        elif w._families:
+            # A reduced tree has a single family of children per node
+            assert len(w._families) == 1, "Deep tree is not reduced"
+            stack.extend(reversed(w._families[0][1]))
+    return result
+
+
 class Simplifier(ParseForestNavigator):
 
     """Utility class to construct a simplified, condensed representation of
@@ -2267,18 +2375,7 @@ class Simplifier(ParseForestNavigator):
 
     def visit_token(self, level: int, w: Node) -> Any:
         """At terminal node, matching a token"""
-        assert w.token is not None
-        t = cast(BIN_Terminal, w.terminal)
-        meaning = w.token.match_with_meaning(t)
-        token_index = (w.token.index or 0) - self._first_token_index
-        d = describe_token(
-            token_index,
-            self._tokens[token_index],
-            t,
-            None if isinstance(meaning, bool) else meaning,
-        )
-        # Convert from compact form to external (more verbose and descriptive) form
-        ct = canonicalize_token(d)
+        ct = _canonical_terminal(w, self._tokens, self._first_token_index)
         self._builder.push_terminal(ct)
         return None
 
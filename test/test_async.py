@@ -0,0 +1,148 @@
+"""
+
+    test_async.py
+
+    Tests for the asyncio front-end of Greynir
+
+    Copyright © 2023 Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from reynir import Greynir, AsyncGreynir
+
+
+@pytest.fixture(scope="module")
+def r():
+    """Provide a module-scoped Greynir instance as a test fixture"""
+    r = Greynir()
+    yield r
+    # Do teardown here
+    r.__class__.cleanup()
+
+
+TEXT = (
+    "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+    "Það var 17. júní árið 2020. "
+    "Í gær og og."
+)
+
+
+def test_async_parse(r):
+    async def main():
+        async with AsyncGreynir(r, max_in_flight=2) as ag:
+            result = await ag.parse(TEXT)
+            sent = await ag.parse_single("Klukkan var orðin tólf.")
+            job = await ag.submit(TEXT)
+            sentences = [s async for s in job]
+            return result, sent, sentences, job.num_parsed
+
+    result, sent, sentences, num_parsed = asyncio.run(main())
+    assert result["num_sentences"] == 3
+    assert result["num_parsed"] == 2
+    assert [s.tree is not None for s in result["sentences"]] == [True, True, False]
+    assert sent is not None and sent.tree is not None
+    assert [s.text for s in sentences] == [s.text for s in result["sentences"]]
+    assert num_parsed == 2
+
+
+def test_async_coalescing(r):
+    async def main():
+        async with AsyncGreynir(r) as ag:
+            results = await asyncio.gather(*(ag.parse(TEXT) for _ in range(5)))
+            # Requests are no longer shared once completed
+            later = await ag.parse(TEXT)
+            return results, later
+
+    results, later = asyncio.run(main())
+    # Concurrent identical requests share a single parse
+    assert all(res is results[0] for res in results)
+    assert later is not results[0]
+    assert later["num_parsed"] == results[0]["num_parsed"]
+
+
+def test_async_backpressure(r):
+    order = []
+    release = threading.Event()
+
+    async def main():
+        async with AsyncGreynir(r, max_in_flight=1) as ag:
+            # Occupy the single slot until released
+            blocker = asyncio.ensure_future(ag._call(0, release.wait))
+            await asyncio.sleep(0.05)
+
+            async def request(text):
+                await ag.parse_single(text)
+                order.append(text)
+
+            long_text = "Klukkan var orðin tólf þegar við fórum loksins heim."
+            short_text = "Ég fór heim."
+            tasks = [
+                asyncio.ensure_future(request(long_text)),
+                asyncio.ensure_future(request(short_text)),
+                asyncio.ensure_future(request("Hún sá sól.")),
+            ]
+            await asyncio.sleep(0.05)
+            assert ag.waiting == 3
+            # Cancelled requests give up their place in the queue
+            tasks[2].cancel()
+            await asyncio.sleep(0.05)
+            assert ag.waiting == 2
+            release.set()
+            await blocker
+            await asyncio.gather(*tasks[:2])
+            return short_text, long_text
+
+    short_text, long_text = asyncio.run(main())
+    # The shorter request was admitted first
+    assert order == [short_text, long_text]
+
+
+def test_async_cancel(r):
+    parsed = []
+
+    class CountingGreynir(Greynir):
+        def create_sentence(self, job, s):
+            parsed.append(s)
+            return super().create_sentence(job, s)
+
+    async def main():
+        g = CountingGreynir()
+        async with AsyncGreynir(g) as ag:
+            text = " ".join(["Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær."] * 50)
+            task = asyncio.ensure_future(ag.parse(text))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # Wait for the executor to finish the sentence in progress
+        return len(parsed)
+
+    num = asyncio.run(main())
+    # The request was aborted between sentences
+    assert 0 < num < 50
@@ -143,3 +143,55 @@ def test_matcher(r: Greynir, verbose: bool = False) -> None:
         )
     )
     assert len(m) == 0
+
+
+def test_match_patterns(r: Greynir) -> None:
+    from reynir.matcher import _CompiledPattern, run_set
+
+    patterns = [
+        "NP",
+        "NP-POSS",
+        "NP > { (no_kk | pfn_kk) }",
+        "S0 >>> { no_kk }",
+        "VP > [ VP NP-OBJ $ ]",
+        "VP > [ .* NP-OBJ .* $ ]",
+        "NP > [ lo* no $ ]",
+        "PP > [ P? NP $ ]",
+        ". > [ .+ p ]",
+        "( NP > { lo } | VP > { %verb } )",
+        "@'hús'",
+        "'Steingrímur'",
+        '"hús Steingríms"',
+        "NP >> { 'jólasveinn' }",
+        "CP",
+    ]
+    context = {"verb": lambda t: t.tcat == "so"}
+    s = r.parse_single("Kristín málaði stóra hús Steingríms í gær.")
+    nodes = [s.tree] + list(s.tree.descendants)
+    # The compiled patterns match the same nodes as the interpreted ones
+    for pattern in patterns:
+        items = _CompiledPattern.compile(pattern).items
+        for node in nodes:
+            assert node.match(pattern, context) == run_set(
+                iter([node]), items, context
+            )
+    # Matching many patterns at once gives the same result as matching
+    # them one by one, omitting patterns that did not match
+    m = s.tree.match_patterns(patterns, context)
+    expected = {p: list(s.tree.all_matches(p, context)) for p in patterns}
+    assert m == {p: nodes for p, nodes in expected.items() if nodes}
+    assert list(m) == [p for p in patterns if p in m]
+    assert "NP-POSS" in m and "CP" not in m
+    assert [n.text for n in m["'Steingrímur'"]] == ["Steingríms"] * len(
+        m["'Steingrímur'"]
+    )
+    assert "NP >> { 'jólasveinn' }" not in m
+
+    # The pattern cache is bounded
+    cache = _CompiledPattern._pattern_cache
+    for i in range(cache.maxsize + 100):
+        _CompiledPattern.compile("NP > {{ 'orð{0}' }}".format(i))
+    assert len(cache.cache) <= cache.maxsize
+
+    with pytest.raises(ValueError, match="Missing argument"):
+        s.tree.match("NP >")
@@ -515,6 +515,682 @@ def test_long_parse(r, verbose=False):
         print("Reduction time      : {0:.2f}".format(job.reduce_time))
 
 
+def test_workers(r):
+    txt = (
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+        "Það var 17. júní árið 2020. "
+        "Í gær og og. "
+        "Klukkan var orðin tólf þegar við fórum heim. "
+        "Linie lotnicze WOW Air ogłosiły wznowienie lotów."
+    )
+    serial = r.parse(txt)
+    parallel = r.parse(txt, workers=2)
+    try:
+        # Sentences must be returned in input order with identical statistics
+        assert parallel["num_sentences"] == serial["num_sentences"] == 5
+        assert parallel["num_parsed"] == serial["num_parsed"] == 3
+        assert parallel["num_tokens"] == serial["num_tokens"]
+        assert parallel["ambiguity"] == serial["ambiguity"]
+        assert parallel["parse_time"] > 0.0
+        for s, p in zip(serial["sentences"], parallel["sentences"]):
+            assert s.text == p.text
+            assert s.err_index == p.err_index
+            assert s.combinations == p.combinations
+            assert s.score == p.score
+            assert (s.tree is None) == (p.tree is None)
+            if s.tree is not None:
+                assert s.categories == p.categories
+                assert s.lemmas == p.lemmas
+        # Incremental parsing via submit() also works with workers
+        job = r.submit(txt, workers=2)
+        assert [sent.parse() for sent in job] == [True, True, False, True, False]
+        assert job.num_parsed == 3
+        # At most lookahead sentences are dispatched ahead, and when the
+        # caller stops iterating, those not yet started are cancelled
+        job = r.submit(txt, workers=2, lookahead=2)
+        for sent in job:
+            assert len(job._pending) <= 2
+            break
+        assert not job._queue
+        assert all(f.running() or f.done() for f in job._pending.values())
+        assert sent.parse()
+        # Sentences that are cancelled by shutting down the worker pool
+        # are parsed in this process
+        job = r.submit(txt, workers=2)
+        sents = list(job)
+        r.shutdown()
+        assert [sent.parse() for sent in sents] == [True, True, False, True, False]
+        assert job.num_parsed == 3
+    finally:
+        r.shutdown()
+
+
+def test_parse_many(r):
+    texts = [
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær.",
+        "Það var 17. júní árið 2020. Í gær og og.",
+        "Klukkan var orðin tólf þegar við fórum heim.",
+        "Við sáum tvo seli og örugglega fleiri en 100 máva.",
+    ]
+    results = r.parse_many(texts, threads=3)
+    assert len(results) == len(texts)
+    assert [result["num_sentences"] for result in results] == [1, 2, 1, 1]
+    assert [result["num_parsed"] for result in results] == [1, 1, 1, 1]
+    for text, result in zip(texts, results):
+        # Results are in input order and identical to those of serial parsing
+        serial = r.parse(text)
+        for s, p in zip(serial["sentences"], result["sentences"]):
+            assert s.text == p.text
+            assert s.err_index == p.err_index
+            assert s.combinations == p.combinations
+            assert s.categories == p.categories
+
+
+def test_parse_stream(r):
+    texts = [
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær.\n",
+        "Það var 17. júní árið 2020. Í gær og og.\n",
+        "Klukkan var orðin tólf þegar við fórum heim.\n",
+    ]
+    pulled = 0
+
+    def gen():
+        nonlocal pulled
+        for text in texts:
+            pulled += 1
+            yield text
+
+    progress = []
+    stream = r.parse_stream(gen(), progress_func=lambda n, b: progress.append((n, b)))
+    # The input is consumed lazily
+    first = next(stream)
+    assert pulled == 1
+    assert first.tree is not None
+    assert progress == [(1, len(texts[0].encode("utf-8")))]
+    rest = list(stream)
+    assert pulled == 3
+    assert [s.tree is not None for s in rest] == [True, False, True]
+    assert rest[1].err_index == 3
+    assert progress[-1] == (4, sum(len(t.encode("utf-8")) for t in texts))
+    # Worker processes with a bounded look-ahead return the same results
+    try:
+        parallel = list(r.parse_stream(texts, workers=2, lookahead=1))
+    finally:
+        r.shutdown()
+    assert [s.text for s in parallel] == [s.text for s in [first] + rest]
+    assert [s.combinations for s in parallel] == [
+        s.combinations for s in [first] + rest
+    ]
+
+
+def test_matching_matrix(r, monkeypatch):
+    from reynir.fastparser import ParseJob
+
+    def no_callback(*args):
+        assert False, "The C++ parser should not call back into Python"
+
+    # Token/terminal matches are passed to the C++ parser in a bitmap,
+    # so the parser should never need to call back into Python to match tokens
+    monkeypatch.setattr(ParseJob, "matches", no_callback)
+    s = r.parse_single("Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær.")
+    assert s.tree is not None
+    assert s.combinations > 1
+    s = r.parse_single("Í gær og og.")
+    assert s.tree is None
+    assert s.err_index == 3
+
+
+def test_matching_cache(r, tmp_path, monkeypatch):
+    from reynir.fastparser import MatchingCache
+
+    calls = []
+
+    def calc(n):
+        calls.append(n)
+        return bytes([n]) * 4
+
+    # The cache is bounded in size, and counts hits and misses
+    mc = MatchingCache(4, maxsize=100)
+    for n in range(250):
+        assert mc.lookup((n,), lambda: calc(n % 256)) == bytes([n % 256]) * 4
+    assert len(mc) <= 100
+    assert mc.lookup((249,), lambda: calc(0)) == bytes([249]) * 4
+    assert mc.hits == 1 and mc.misses == 250
+    assert len(calls) == 250
+
+    # The shared cache file is visible to other cache instances
+    fname = str(tmp_path / "matching.cache")
+    mc1 = MatchingCache(4, maxsize=100, shared_file=fname, version="v1")
+    mc2 = MatchingCache(4, maxsize=100, shared_file=fname, version="v1")
+    calls.clear()
+    for n in range(50):
+        mc1.lookup((1, "x", n), lambda: calc(n))
+    for n in range(50):
+        assert mc2.lookup((1, "x", n), lambda: calc(255)) == bytes([n]) * 4
+    assert len(calls) == 50
+    assert mc2.shared_hits == 50
+    mc1.close()
+    mc2.close()
+    # A cache file for a different grammar version is discarded
+    mc3 = MatchingCache(4, maxsize=100, shared_file=fname, version="v2")
+    assert mc3.lookup((1, "x", 0), lambda: calc(7)) == bytes([7]) * 4
+    assert mc3.shared_hits == 0
+    mc3.close()
+
+    # If the shared file cannot be replaced, e.g. on Windows while another
+    # process has it mapped, a private table is used instead
+    with open(fname, "rb") as f:
+        contents = f.read()
+
+    def no_replace(src, dst):
+        raise PermissionError(dst)
+
+    monkeypatch.setattr("os.replace", no_replace)
+    mc4 = MatchingCache(4, maxsize=100, shared_file=fname, version="v3")
+    mc5 = MatchingCache(4, maxsize=100, shared_file=fname, version="v3")
+    calls.clear()
+    assert mc4.lookup((1, "x", 0), lambda: calc(9)) == bytes([9]) * 4
+    assert mc5.lookup((1, "x", 0), lambda: calc(8)) == bytes([8]) * 4
+    assert mc4.lookup((1, "y", 0), lambda: calc(9)) == bytes([9]) * 4
+    assert len(calls) == 3 and mc5.shared_hits == 0
+    mc4.close()
+    mc5.close()
+    monkeypatch.undo()
+    with open(fname, "rb") as f:
+        assert f.read() == contents
+    assert [p.name for p in tmp_path.iterdir()] == ["matching.cache"]
+    # The same goes for a shared file that cannot be opened or created
+    for fname in (str(tmp_path / "nonexistent" / "matching.cache"), str(tmp_path)):
+        mc6 = MatchingCache(4, maxsize=100, shared_file=fname, version="v1")
+        assert mc6.lookup((1, "x", 0), lambda: calc(6)) == bytes([6]) * 4
+        assert mc6.lookup((1, "x", 0), lambda: calc(5)) == bytes([6]) * 4
+        mc6.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["matching.cache"]
+
+    # The parser's own cache serves repeated tokens
+    stats = r.parser.matching_cache.stats
+    r.parse_single("Hundurinn gelti og hundurinn gelti.")
+    assert r.parser.matching_cache.hits > stats["hits"]
+
+
+def test_terminal_index(r):
+    # The terminal index rules out terminals that a token cannot match,
+    # without changing the result of matching the token with any terminal
+    txt = (
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+        "Jón Jónsson keypti 3 bíla á 5 milljónir króna 17. júní 2020. "
+        "Verðbólgan var 4,5% árið 1998 og krónan veiktist um $10. "
+        "Hann hringdi í síma 581-2345 kl. 14:30 og sendi póst á jon@example.com. "
+        "Síðan „fór“ hann heim, (þ.e. til Reykjavíkur) og svaf: fyrstur manna!"
+    )
+    grammar = r.parser.grammar
+    terminals = grammar.terminals_by_ix
+    index = grammar.terminal_index
+    num_full = num_candidates = 0
+    for t in r.parser._wrap(r.tokenize(txt)):
+        candidates = index.candidates(t)
+        assert {ix for ix, term in terminals.items() if t.matches(term)} == {
+            ix for ix, term in candidates.items() if t.matches(term)
+        }, str(t)
+        num_full += len(terminals)
+        num_candidates += len(candidates)
+    assert num_candidates < num_full // 10
+
+
+def test_num_combinations(r):
+    from reynir.fastparser import Fast_Parser
+
+    # The combination count from the C++ code equals the Python count
+    for text in (
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær.",
+        "Við sáum tvo seli og örugglega fleiri en 100 máva.",
+        "Þá þarf minna fylgi nú en áður til að ná inn borgarfulltrúa, "
+        "því borgarfulltrúum verður fjölgað úr fimmtán í tuttugu og þrjá.",
+    ):
+        tokens = list(r.tokenize(text))[1:-1]  # Cut off sentence begin and end
+        forest, num = r.parser.go_with_count(tokens)
+        assert num > 1
+        assert num == Fast_Parser.num_combinations(forest)
+
+
+def test_compact_forest(r):
+    from reynir import Greynir
+    from reynir.fastparser import CompactNode, Fast_Parser
+
+    text = "Við sáum tvo seli og örugglega fleiri en 100 máva."
+    tokens = list(r.tokenize(text))[1:-1]  # Cut off sentence begin and end
+    root, num = r.parser.go_with_count(tokens, compact=True)
+    assert isinstance(root, CompactNode)
+    forest = root._forest
+    assert forest.num_nodes == len(forest.start) > 1
+    assert forest.nbytes > 0
+    # Views of the same node compare equal and can be used as dict keys
+    assert root == forest.root and hash(root) == hash(forest.root)
+    assert root.is_completed and root.nonterminal is not None
+    assert root.start == 0 and root.end == len(tokens)
+    assert num > 1
+    assert num == Fast_Parser.num_combinations(root)
+    # The reducer collapses the forest in place to a single tree
+    r.reducer.go(root)
+    assert Fast_Parser.num_combinations(root) == 1
+    assert all(not w.is_ambiguous for w in map(forest.node, range(forest.num_nodes)))
+
+    # Sentences parsed into compact forests yield the same results
+    txt = (
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+        "Það var 17. júní árið 2020. "
+        "Í gær og og. "
+        "Klukkan var orðin tólf þegar við fórum heim."
+    )
+    rc = Greynir(compact_forest=True)
+    assert rc.compact_forest
+    for s, c in zip(r.parse(txt)["sentences"], rc.parse(txt)["sentences"]):
+        assert s.err_index == c.err_index
+        assert s.combinations == c.combinations
+        assert (s.tree is None) == (c.tree is None)
+        if s.tree is not None:
+            assert isinstance(c.deep_tree, CompactNode)
+            assert s.categories == c.categories
+            assert s.lemmas == c.lemmas
+
+
+def test_native_reducer(r):
+    from reynir import Greynir
+    from reynir.fastparser import CompactNode, Fast_Parser, Node, ParseForestDumper
+    from reynir.reducer import Reducer
+
+    class CheckingReducer(Reducer):
+        """Reduce each flattened forest with the Python reducer as well,
+        as the order of families in a forest may vary between parses"""
+
+        def reduce_flat_forest(self, job, c_forest):
+            forest = Node.from_flat_forest(job, c_forest)
+            self.expected = self.go_with_score(forest)
+            return super().reduce_flat_forest(job, c_forest)
+
+    # The C++ reducer must yield the same trees and scores as the Python reducer
+    reducer = CheckingReducer(r.parser.grammar)
+    for text in (
+        "Barnið fór í augnrannsóknina eftir húsnæðiskaupin.",
+        "Dómarinn frestaði mótinu vegna veðurs.",
+        "Ég setti gleraugun ofan á kommóðuna.",
+        "Það var 17. júní árið 2020.",
+        "Þá þarf minna fylgi nú en áður til að ná inn borgarfulltrúa, "
+        "því borgarfulltrúum verður fjölgað úr fimmtán í tuttugu og þrjá.",
+    ):
+        tokens = list(r.tokenize(text))[1:-1]  # Cut off sentence begin and end
+        for compact in (False, True):
+            tree, num, score = r.parser.go_reduced(tokens, reducer, compact=compact)
+            assert isinstance(tree, CompactNode if compact else Node)
+            assert num > 1
+            assert Fast_Parser.num_combinations(tree) == 1
+            forest, expected_score = reducer.expected
+            assert score == expected_score
+            assert tree.score == score
+            assert ParseForestDumper.dump_forest(tree) == ParseForestDumper.dump_forest(
+                forest
+            )
+        # Only the nodes of the reduced tree are left in the forest
+        reachable = set()
+        stack = [tree]
+        while stack:
+            w = stack.pop()
+            if w is not None and w not in reachable:
+                reachable.add(w)
+                stack.extend(w.enum_child_nodes())
+        assert len(reachable) == tree._forest.num_nodes
+
+    # Greynir uses the C++ reducer by default
+    txt = (
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+        "Dómarinn frestaði mótinu vegna veðurs."
+    )
+    rp = Greynir(native_reducer=False)
+    assert r.native_reducer and not rp.native_reducer
+    for s, p in zip(r.parse(txt)["sentences"], rp.parse(txt)["sentences"]):
+        assert s.combinations == p.combinations > 1
+        assert s.score == p.score
+        assert s.tree is not None and p.tree is not None
+
+
+def test_scoring_cache(r):
+    from reynir.reducer import Reducer, ScoringCache
+
+    # Terminal scores are memoized across sentences in a process-wide cache
+    assert isinstance(Reducer.scoring_cache, ScoringCache)
+    assert r.reducer.scoring_cache is Reducer.scoring_cache
+    txt = (
+        "Hann ætlar að fara heim á morgun. "
+        "Dómarinn frestaði mótinu vegna veðurs. "
+        "Hún ætlar að fara heim á morgun."
+    )
+    forests = []
+    for sent in r.submit(txt):
+        forest = r.parser.go(sent.tokens)
+        assert forest is not None
+        forests.append(forest)
+    # A small cache, which must evict entries, yields the same scores
+    reducer = Reducer(r.parser.grammar)
+    reducer.scoring_cache = ScoringCache(maxsize=10)
+    for forest in forests:
+        stats = Reducer.scoring_cache.stats
+        scores = r.reducer._calc_terminal_scores(forest)
+        assert Reducer.scoring_cache.misses + Reducer.scoring_cache.hits > (
+            stats["misses"] + stats["hits"]
+        )
+        assert reducer._calc_terminal_scores(forest) == scores
+    assert len(reducer.scoring_cache) <= 10
+    # Scoring the same sentences again only involves cache lookups
+    stats = Reducer.scoring_cache.stats
+    for forest in forests:
+        r.reducer._calc_terminal_scores(forest)
+    assert Reducer.scoring_cache.misses == stats["misses"]
+    assert Reducer.scoring_cache.stats["terminal_hits"] > stats["terminal_hits"]
+    # Verb/preposition bonuses are memoized as well
+    r.parse_single("Dómarinn frestaði mótinu vegna veðurs.")
+    stats = Reducer.scoring_cache.stats
+    r.parse_single("Dómarinn frestaði mótinu vegna veðurs.")
+    assert Reducer.scoring_cache.stats["bonus_hits"] > stats["bonus_hits"]
+    assert Reducer.scoring_cache.stats["bonus_misses"] == stats["bonus_misses"]
+
+
+def test_parse_cache(r, tmp_path):
+    from reynir import Greynir
+
+    txt = (
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+        "Í gær og og. "
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær. "
+        "Í gær og og."
+    )
+    fname = str(tmp_path / "parse.cache")
+    g = Greynir(parse_cache_size=10, parse_cache_file=fname)
+    sents = g.parse(txt)["sentences"]
+    # Repeated sentences, including failed parses, are served from the cache
+    assert g.parse_cache.stats == dict(size=2, hits=2, misses=2, disk_hits=0)
+    assert sents[0].deep_tree is not None
+    assert sents[2].deep_tree is None
+    expected = r.parse(txt)["sentences"]
+    for s, e in zip(sents, expected):
+        assert s.combinations == e.combinations
+        assert s.score == e.score
+        assert s.err_index == e.err_index
+        assert s.lemmas == e.lemmas
+    # Noun phrases are parsed from a different root and cached separately
+    np = g.parse_noun_phrase("bryggjuna")
+    assert np is not None and np.tree is not None
+    assert np.tree.match_tag("NP")
+    assert g.parse_cache.misses == 3
+    g.parse_cache.close()
+    # The cache file persists between instances
+    g2 = Greynir(parse_cache_file=fname)
+    sents = g2.parse(txt)["sentences"]
+    assert g2.parse_cache.disk_hits == 2
+    assert [s.lemmas for s in sents] == [s.lemmas for s in expected]
+    assert sents[1].err_index == expected[1].err_index
+    g2.parse_cache.close()
+    # With worker processes, the cache is consulted before the sentences
+    # are dispatched, and the results from the workers are stored in it
+    g3 = Greynir(parse_cache_size=10)
+    try:
+        g3.parse(txt, workers=2)
+        assert len(g3.parse_cache) == 2
+        assert g3.parse_cache.hits == 0
+        job = g3.submit(txt, parse=True, workers=2)
+        sents = list(job)
+        # All sentences were served from the cache, without a worker
+        assert not job._pending
+        assert g3.parse_cache.hits == 4
+        assert [s.lemmas for s in sents] == [s.lemmas for s in expected]
+        assert sents[1].err_index == expected[1].err_index
+    finally:
+        g3.shutdown()
+
+
+def test_parse_budget(r):
+    import pickle
+    from reynir import ParseBudget, ParseBudgetExceeded
+
+    txt = (
+        "Þá þarf minna fylgi nú en áður til að ná inn borgarfulltrúa, "
+        "því borgarfulltrúum verður fjölgað úr fimmtán í tuttugu og þrjá."
+    )
+    tokens = list(r.tokenize(txt))[1:-1]
+    with pytest.raises(ParseBudgetExceeded) as e:
+        r.parser.go(tokens, budget=ParseBudget(max_states=1000))
+    assert e.value.exceeded == ("states",)
+    assert e.value.states >= 1000
+    assert e.value.token_index is not None
+    # The exception survives pickling, e.g. from worker processes
+    e2 = pickle.loads(pickle.dumps(e.value))
+    assert type(e2) is ParseBudgetExceeded
+    assert e2.exceeded == e.value.exceeded
+    assert e2.token_index == e.value.token_index
+    with pytest.raises(ParseBudgetExceeded) as e:
+        r.parser.go(tokens, budget=ParseBudget(max_nodes=500))
+    assert e.value.exceeded == ("nodes",)
+    # A generous budget does not affect the parse
+    assert r.parser.go(tokens, budget=ParseBudget(max_states=10**7)) is not None
+    # The budget applies to each sentence separately
+    g = Greynir(parse_budget=ParseBudget(max_states=50000), parse_cache_size=10)
+    sents = g.parse(txt + " Hún sá hund.")["sentences"]
+    assert isinstance(sents[0].error, ParseBudgetExceeded)
+    assert sents[0].tree is None
+    assert sents[1].tree is not None
+    assert sents[1].error is None
+    # Sentences that exceed the budget are not cached
+    assert len(g.parse_cache) == 1
+
+
+def test_tree_accessors():
+    import copy
+    from reynir.simpletree import SimpleTree
+
+    def nt(tag, *children):
+        return dict(k="NONTERMINAL", n=tag, i=tag, p=list(children))
+
+    def word(txt, terminal):
+        return dict(x=txt, t=terminal, s=txt)
+
+    t = SimpleTree(
+        [
+            [
+                nt(
+                    "S0",
+                    nt(
+                        "S-MAIN",
+                        nt(
+                            "IP",
+                            nt("NP-SUBJ", word("Jón", "person_nf_kk")),
+                            nt(
+                                "VP",
+                                nt("VP", word("ók", "so_1_þgf_et_p3")),
+                                nt("NP-OBJ", word("þeim", "pfn_ft_þgf")),
+                                nt("ADVP", word("heim", "ao")),
+                                nt("ADVP-DATE-REL", word("í", "ao"), word("gær", "ao")),
+                            ),
+                        ),
+                    ),
+                )
+            ]
+        ]
+    )
+    vp = t.S_MAIN.IP.VP
+    # Child wrappers are created once per node within the tree
+    assert vp is t.S_MAIN.IP.VP
+    assert t.S_MAIN.IP.VP.NP_OBJ is vp.NP_OBJ
+    assert t[0][0] is t.S_MAIN.IP
+    assert t.S_MAIN.IP[-1] is vp
+    assert list(vp.children)[0] is vp[0]
+    assert vp.NP_OBJ.parent is vp
+    assert vp.NP_OBJ.root is t
+    # Tag prefixes and indices select among the children
+    assert vp.VP.tag == "VP"
+    assert vp.NP_OBJ.text == "þeim"
+    assert vp.ADVP.tag == "ADVP"
+    assert vp.ADVP2.tag == "ADVP-DATE-REL"
+    assert vp.ADVP_DATE.tag == "ADVP-DATE-REL"
+    assert vp.ADVP_DATE_REL is vp.ADVP2
+    assert vp["ADVP2"] is vp.ADVP2
+    with pytest.raises(AttributeError, match="has 2 ADVP but index 3"):
+        vp.ADVP3
+    with pytest.raises(AttributeError, match="no child named 'NP-SUBJ'"):
+        vp.NP_SUBJ
+    with pytest.raises(AttributeError, match="indices start at 1"):
+        vp.VP0
+    with pytest.raises(KeyError):
+        vp["NP-SUBJ"]
+    # Sentence wrappers of multi-sentence trees are also created once
+    multi = SimpleTree([[nt("S0", word("Já", "ao")), nt("S0", word("Nei", "ao"))]])
+    assert multi[1] is multi[1]
+    assert multi[1] is multi.sentences[1]
+    assert multi[0].text == "Já"
+    assert list(multi.children)[1] is multi[1]
+    # Trees can still be copied
+    t2 = copy.deepcopy(t)
+    assert isinstance(t2, SimpleTree)
+    assert t2.flat == t.flat
+    assert t2.S_MAIN.IP.VP.ADVP2.text == "í gær"
+
+
+def test_lazy_tree(r):
+    txt = "Jón keypti þrjá hesta af Guðrúnu – og ók þeim heim í gær."
+    s = r.parse_single(txt)
+    assert s.combinations > 0
+    # The simplified tree is only created on demand
+    assert s._simplified_tree is None
+    lemmas = s.lemmas
+    categories = s.categories
+    terminals = s.terminals
+    ifd_tags = s.ifd_tags
+    lemmas_and_cats = s.lemmas_and_cats
+    tidy_text = s.tidy_text
+    assert s._simplified_tree is None
+    assert lemmas[0:2] == ["Jón", "kaupa"]
+    # The directly extracted values are identical to those from the tree
+    assert s.tree is not None
+    assert s._simplified_tree is not None
+    # Once created, the tree is kept
+    assert s.tree is s.tree
+    s._terminals = None
+    assert s.lemmas == lemmas
+    assert s.categories == categories
+    assert s.terminals == terminals
+    assert s.ifd_tags == ifd_tags
+    assert s.lemmas_and_cats == lemmas_and_cats
+    assert s.tidy_text == tidy_text
+    assert s.tree.lemmas == lemmas
+    # Failed parses have neither a tree nor terminals
+    s = r.parse_single("Sigurður langaði í köttur")
+    assert s.combinations == 0
+    assert s.tree is None
+    assert s.lemmas is None
+    assert s.categories is None
+    assert s.ifd_tags is None
+    assert s.tidy_text == "Sigurður langaði í köttur"
+    # Sentences whose results are stored in the parse cache
+    # get their simplified tree right away
+    g = Greynir(parse_cache_size=10)
+    s = g.parse_single(txt)
+    assert s._simplified_tree is not None
+    assert g.parse_single(txt).lemmas == s.lemmas
+
+
+def test_parse_stats(r):
+    import pickle
+    from reynir import ParseBudget, ParseBudgetExceeded, ParseStats
+
+    tokens = list(r.tokenize("Hún sá hund í garðinum."))[1:-1]
+    stats = ParseStats()
+    r.parser.go(tokens, stats=stats)
+    assert stats.states > 0
+    assert stats.nodes > 0
+    assert stats.families >= stats.nodes - len(tokens)
+    assert stats.matching_calls > 0
+    assert stats.peak_bytes > 0
+    # The matching bitmaps are now cached, so the same tokens hit the cache
+    stats2 = ParseStats()
+    r.parser.go(tokens, stats=stats2)
+    assert stats2.matching_cache_hits == len(tokens)
+    assert stats2.matching_calls == 0
+    assert stats2.states > 0
+    d = pickle.loads(pickle.dumps(stats)).as_dict()
+    assert d == stats.as_dict()
+    assert set(d) == {
+        "tokens",
+        "states",
+        "nodes",
+        "families",
+        "matching_calls",
+        "matching_cache_hits",
+        "peak_bytes",
+        "elapsed_ms",
+    }
+    # The statistics are filled in even if the parse is aborted
+    stats = ParseStats()
+    with pytest.raises(ParseBudgetExceeded):
+        r.parser.go(tokens, budget=ParseBudget(max_states=10), stats=stats)
+    assert stats.states > 10
+    # Statistics are available on parsed sentences
+    s = r.parse_single("Hún sá hund í garðinum.")
+    assert s.parse_stats is not None
+    assert s.parse_stats.states > 0
+    # ...including sentences that are parsed in worker processes
+    sents = list(r.submit("Hún sá hund í garðinum.", parse=True, workers=1))
+    assert sents[0].parse_stats is not None
+    assert sents[0].parse_stats.nodes > 0
+    # ...but not on sentences whose result comes from the parse cache
+    g = Greynir(parse_cache_size=10)
+    assert g.parse_single("Hún sá hund í garðinum.").parse_stats is not None
+    assert g.parse_single("Hún sá hund í garðinum.").parse_stats is None
+
+
+def test_binary_grammar(tmp_path):
+    import os
+    import shutil
+    from reynir.binparser import BIN_Grammar, BIN_Parser
+
+    fname = str(tmp_path / "Greynir.grammar")
+    bname = str(tmp_path / "Greynir.grammar.bin")
+    shutil.copyfile(BIN_Parser._GRAMMAR_FILE, fname)
+    # Reading the text grammar writes a binary grammar file
+    g_text = BIN_Grammar()
+    g_text.read(fname, binary_fname=bname)
+    assert os.path.exists(bname)
+    # ...which is subsequently loaded instead of the text file
+    g_bin = BIN_Grammar()
+    assert g_bin._read_binary(fname, bname)
+    assert g_bin.num_nonterminals == g_text.num_nonterminals
+    assert g_bin.num_terminals == g_text.num_terminals
+    assert g_bin.num_productions == g_text.num_productions
+    assert g_bin.root.name == g_text.root.name
+    assert g_bin.file_name == fname
+    for name, nt in g_text.nonterminals.items():
+        nt_bin = g_bin.nonterminals[name]
+        assert nt_bin.index == nt.index
+        assert nt_bin.has_ref == nt.has_ref
+        assert nt_bin.no_reduce == nt.no_reduce
+        assert g_bin.nt_score(nt_bin) == g_text.nt_score(nt)
+    for name, t in g_text.terminals.items():
+        t_bin = g_bin.terminals[name]
+        assert t_bin.index == t.index
+        assert type(t_bin) is type(t)
+        assert t_bin._vbits == t._vbits
+    for ix, p in g_text.productions_by_ix.items():
+        p_bin = g_bin.productions_by_ix[ix]
+        assert [str(item) for item in p_bin] == [str(item) for item in p]
+        assert p_bin.priority == p.priority
+    # The binary file is stale once the text grammar changes
+    with open(fname, "a", encoding="utf-8") as f:
+        f.write("\n# Changed\n")
+    assert not BIN_Grammar()._read_binary(fname, bname)
+    # A damaged binary file is ignored
+    with open(bname, "r+b") as f:
+        f.seek(-4, os.SEEK_END)
+        f.write(b"\0\0\0\0")
+    assert not BIN_Grammar()._read_binary(fname, bname)
+
+
 def test_properties(r):
     s = r.parse("Þetta er prófun.")["sentences"][0]
     _ = s.score
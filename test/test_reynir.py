@@ -31,6 +31,8 @@
 
 """
 
+import pytest
+
 from reynir import Greynir
 from reynir.binparser import augment_terminal
 from reynir.bindb import GreynirBin
@@ -540,6 +542,205 @@ def test_compounds():
     assert m[0].ordmynd == "Félags- og barnamála-ráðherra"
 
 
+def test_lookup_cache():
+    from reynir.bintokenizer import Bin_TOK, annotate, tokenize_without_annotation
+
+    db = GreynirBin.get_db()
+    # Lookups are served from a process-wide cache
+    w, m = db.lookup_g("hestinum")
+    stats = GreynirBin.lookup_cache_stats()
+    w2, m2 = db.lookup_g("hestinum")
+    assert GreynirBin.lookup_cache_stats()["hits"] == stats["hits"] + 1
+    assert (w2, m2) == (w, m)
+    # The caller gets a fresh list that it may modify
+    assert m2 is not m
+    m2.clear()
+    assert db.lookup_g("hestinum")[1] == m
+
+    # Derived classes have their own caches
+    class NoMeanings(GreynirBin):
+        def _lookup(self, w, *args):
+            return w, []
+
+    assert NoMeanings._lookup_cache is not GreynirBin._lookup_cache
+    assert NoMeanings().lookup_g("hestinum") == ("hestinum", [])
+    assert db.lookup_g("hestinum") == (w, m)
+    # A batch lookup resolves each distinct key once
+    keys = [("hestinum", False, False), ("Hann", True, False)] * 3
+    found = db.lookup_g_batch(keys)
+    assert len(found) == 2
+    assert found[("hestinum", False, False)] == (w, m)
+    assert found[("Hann", True, False)] == db.lookup_g("Hann", True, False)
+
+    # Batched annotation yields the same tokens as annotating one token at a time
+    txt = (
+        "Hann sá hestinn. Hún sá hestinn: Hann var í þingkonur og -menn. "
+        "Það var marg-ítrekað að málfræði-greining væri góð. "
+        "Hann er t.d. stór og fór til Syðri-Hnaus."
+    )
+    for auto_uppercase in (False, True):
+        results = [
+            [
+                (t.kind, t.txt, t.val)
+                for t in annotate(
+                    db,
+                    Bin_TOK,
+                    tokenize_without_annotation(txt),
+                    auto_uppercase=auto_uppercase,
+                    batch_size=batch_size,
+                )
+            ]
+            for batch_size in (1, 7, 500)
+        ]
+        assert results[0] == results[1] == results[2]
+
+    # A finished sentence is not held back, even in batch mode
+    from reynir import tokenize, TOK
+
+    for options in ({}, {"annotate_batch_size": 500}):
+        lines_read = 0
+
+        def lines():
+            nonlocal lines_read
+            for _ in range(1000):
+                lines_read += 1
+                yield "Hann sá hestinn í gær.\n"
+
+        for t in tokenize(lines(), **options):
+            if t.kind == TOK.S_END:
+                break
+        assert lines_read <= 3
+
+
+def test_pipeline_report():
+    from reynir.bintokenizer import DefaultPipeline
+
+    txt = "Jón Jónsson fór til Reykjavíkur í gær. Hann keypti 3 bíla á 5 milljónir."
+    # Instrumentation does not change the tokens
+    plain = [(t.kind, t.txt, t.val) for t in DefaultPipeline(txt).tokenize()]
+    pipeline = DefaultPipeline(txt, instrument=True)
+    assert pipeline.report is None
+    tokens = [(t.kind, t.txt, t.val) for t in pipeline.tokenize()]
+    assert tokens == plain
+    report = pipeline.report
+    assert report is not None
+    assert [r["phase"] for r in report] == [
+        phase.__name__ for phase in pipeline._phases
+    ]
+    assert report[0]["tokens_in"] == 0
+    assert report[-1]["tokens_out"] == len(tokens)
+    for prev, r in zip(report, report[1:]):
+        assert r["tokens_in"] == prev["tokens_out"]
+        assert r["max_lookahead"] >= 1
+    # Person names and amounts are merged into fewer tokens
+    assert report[-1]["tokens_out"] < report[0]["tokens_out"]
+    assert all(r["cpu_time"] >= 0.0 for r in report)
+    assert DefaultPipeline(txt).report is None
+
+    # The report is available on parse jobs
+    g = Greynir(instrument=True)
+    job = g.submit(txt)
+    assert sum(1 for _ in job) == 2
+    report = job.pipeline_report
+    assert report is not None
+    assert report[-1]["tokens_out"] == len(tokens)
+    assert Greynir().submit(txt).pipeline_report is None
+
+
+def test_metrics():
+    from reynir import Metrics
+    from reynir.metrics import FAILURE_CAUSES, _length_class
+
+    assert _length_class(1) == "1-10"
+    assert _length_class(10) == "1-10"
+    assert _length_class(11) == "11-20"
+    assert _length_class(91) == "91+"
+
+    g = Greynir(parse_cache_size=10)
+    metrics = g.metrics
+    assert isinstance(metrics, Metrics)
+    metrics.reset()
+    txt = (
+        "Hún sá hund í garðinum. "
+        "This is clearly an English sentence. "
+        "Jón keypti bíl af Guðrúnu í gær og ók honum heim til sín."
+    )
+    job = g.submit(txt, parse=True, max_sent_tokens=10)
+    sents = list(job)
+    assert len(sents) == 3
+    d = metrics.as_dict()
+    assert d["sentences"] == 3
+    assert set(d["failures"]) == set(FAILURE_CAUSES)
+    assert d["failures"]["foreign"] == 1
+    assert d["failures"]["too_long"] == 1
+    assert d["failures"]["no_parse"] == 0
+    assert d["caches"]["parse"] == dict(hits=0, lookups=1, ratio=0.0)
+    matching = d["caches"]["matching"]
+    assert matching["lookups"] == sents[0].parse_stats.tokens
+    assert set(d["latencies"]) == {"tokenize", "parse", "reduce"}
+    assert d["latencies"]["tokenize"]["1-10"]["count"] == 2
+    assert d["latencies"]["tokenize"]["11-20"]["count"] == 1
+    parse = d["latencies"]["parse"]["1-10"]
+    assert parse["count"] == 2
+    assert parse["buckets"]["+Inf"] == 2
+    assert parse["sum"] > 0.0
+    assert d["latencies"]["reduce"]["1-10"]["count"] == 2
+    # A parse cache hit is counted, and its ratio calculated,
+    # but its latency is not recorded as a parse
+    g.parse_single("Hún sá hund í garðinum.")
+    d = metrics.as_dict()
+    assert d["sentences"] == 4
+    assert d["caches"]["parse"] == dict(hits=1, lookups=2, ratio=0.5)
+    assert d["latencies"]["parse"]["1-10"]["count"] == 2
+
+    text = metrics.prometheus()
+    assert "# TYPE greynir_parse_seconds histogram" in text
+    assert 'greynir_parse_failures_total{cause="foreign"} 1' in text
+    assert 'greynir_cache_hits_total{cache="parse"} 1' in text
+    assert 'greynir_parse_seconds_bucket{length="1-10",le="+Inf"} 2' in text
+    assert 'greynir_parse_seconds_count{length="1-10"} 2' in text
+    assert "greynir_sentences_total 4" in text
+    assert text.endswith("\n")
+    metrics.reset()
+    assert metrics.as_dict()["sentences"] == 0
+
+
+def test_benchmark():
+    import json
+    from reynir.bench import CORPUS_VERSION, STAGES, run_benchmark
+    from reynir.fastparser import Fast_Parser
+
+    result = run_benchmark("single", repeat=1, grades=["short"])
+    # The results are JSON-serializable
+    assert json.loads(json.dumps(result)) == result
+    assert result["corpus_version"] == CORPUS_VERSION
+    assert result["grades"] == ["short"]
+    short = result["results"]["grades"]["short"]
+    assert short["failures"] == 0
+    assert short["combinations"] >= short["sentences"]
+    assert set(short["stages"]) == set(STAGES)
+    assert all(s["best"] >= 0.0 for s in result["results"]["stages"].values())
+    counts = result["results"]["allocations"]
+    assert counts["nodes"] > 0 and counts["states"] > 0
+    assert counts["nodes"] <= Fast_Parser.allocation_counts()["nodes"]
+
+    result = run_benchmark("cold-start", repeat=1)
+    assert result["results"]["load_time"]["best"] > 0.0
+
+    result = run_benchmark("matching", repeat=1, texts=["Hundurinn gelti."])
+    matching = result["results"]
+    assert matching["sentences"] == 1
+    assert matching["rows_identical"]
+    methods = matching["methods"]
+    assert 0 < methods["indexed"]["calls"] < methods["full"]["calls"]
+    assert methods["full"]["calls"] == matching["tokens"] * matching["terminals"]
+
+    with pytest.raises(ValueError):
+        run_benchmark("nonexistent")
+    with pytest.raises(ValueError):
+        run_benchmark("single", grades=["nonexistent"])
+
+
 if __name__ == "__main__":
 
     test_augment_terminal()
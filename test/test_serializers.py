@@ -75,6 +75,133 @@ def test_serializers(r):
         )
 
 
+def test_binary_serializers(r):
+    from reynir.codec import MAGIC, SCHEMA_VERSION, decode, encode
+
+    sents = [
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær.",
+        "Bíllinn kostaði €30.000 en ég greiddi 25500 USD fyrir hann.",
+        "Hitastig vatnsins var 30,5 gráður og ég var ánægð með það.",
+        "Morguninn eftir vaknaði ég kl. 07:30.",
+        "Tölvan sagði ekki satt.",
+        "Sigurður langaði í köttur",
+    ]
+    cls = r.__class__
+    for sent in sents:
+        orig = r.parse_single(sent)
+        data = r.dumpb_single(orig)
+        json_str = r.dumps_single(orig)
+        assert isinstance(data, bytes)
+        assert len(data) < len(json_str.encode("utf-8"))
+        # The binary form holds exactly the same data as the JSON form
+        assert decode(data) == json.loads(json_str)
+        new = r.loadb_single(data)
+        assert new.dumps(cls) == json_str
+        assert all(ot.equal(nt) for ot, nt in zip(orig.tokens, new.tokens))
+        assert orig.terminals == new.terminals
+        if orig.tree is not None:
+            assert new.tree.flat_with_all_variants == orig.tree.flat_with_all_variants
+
+    # The codec round-trips any JSON-compatible value, as JSON would
+    values = [
+        None,
+        True,
+        False,
+        0,
+        30,
+        31,
+        10**40,
+        -1,
+        -32,
+        -(10**30),
+        2.5,
+        -1e300,
+        "",
+        "þjóð" * 20,
+        [1, (2, "3", [None])],
+        {"k": {"x": []}, 1: 2, None: 3, 2.5: "k"},
+        {True: 4, False: 5},
+        [[], {}, [[[{"x": [None]}]]], ""],
+        # More strings than can be referred to by a single-byte varint
+        ["s{0}".format(n) for n in range(200)] * 2 + list(range(100)),
+    ]
+    for value in values:
+        assert decode(encode(value)) == json.loads(json.dumps(value))
+
+    data = encode([1, 2])
+    assert data.startswith(MAGIC)
+    with pytest.raises(ValueError, match="schema version"):
+        decode(MAGIC + bytes([SCHEMA_VERSION + 1]) + data[len(MAGIC) + 1 :])
+    with pytest.raises(ValueError, match="truncated"):
+        decode(data[:-1])
+    with pytest.raises(ValueError, match="not in the binary"):
+        decode(b"{}")
+    with pytest.raises(TypeError):
+        encode(object())
+
+
+def test_corpus(r, tmp_path):
+    from reynir import Corpus, CorpusWriter
+
+    sents = [
+        "Ég fór niðrá bryggjuna með Reyni Vilhjálmssyni í gær.",
+        "Bíllinn kostaði €30.000 en ég greiddi 25500 USD fyrir hann.",
+        "Hitastig vatnsins var 30,5 gráður og ég var ánægð með það.",
+        "Morguninn eftir vaknaði ég kl. 07:30.",
+        "Sigurður langaði í köttur",
+    ]
+    parsed = [r.parse_single(sent) for sent in sents]
+    path = str(tmp_path / "corpus.bin")
+    with CorpusWriter(path) as w:
+        for sent in parsed:
+            w.add(sent)
+        assert len(w) == len(sents)
+    cls = r.__class__
+    with Corpus(path) as c:
+        assert len(c) == len(sents)
+        # Random access, in any order
+        for index in (3, 0, 4, -1, 1, 2):
+            orig = parsed[index]
+            cs = c[index]
+            assert cs.dump() == json.loads(r.dumps_single(orig))
+            assert cs.text == orig.text
+            assert cs.lemmas == orig.lemmas
+            if orig.tree is None:
+                assert cs.tree is None
+            else:
+                assert cs.tree.flat_with_all_variants == orig.tree.flat_with_all_variants
+                assert cs.tree.nouns == orig.tree.nouns
+                assert cs.tree.first_match("NP").text == orig.tree.first_match("NP").text
+                assert cs.tree.tidy_text == orig.tree.tidy_text
+            new = cs.to_sentence(cls)
+            assert new.terminals == orig.terminals
+            assert new.dumps(cls) == r.dumps_single(orig)
+        with pytest.raises(IndexError):
+            c[len(sents)]
+        # Lemmas are read from the columns, without creating trees
+        assert [cs.lemmas for cs in c] == [sent.lemmas for sent in parsed]
+        assert len(c.column("sent_nodes")) == len(sents) + 1
+
+    # The corpus can be closed while views of its columns are alive
+    c = Corpus(path)
+    kinds = c.column("node_k")[0:2]
+    view = memoryview(c.column("node_x"))
+    tree = c[0].tree
+    c.close()
+    assert kinds[0] > 0
+    del kinds, view
+    with pytest.raises(ValueError):
+        c[0]
+    with pytest.raises(ValueError):
+        tree.flat
+    c.close()
+
+    with open(path, "r+b") as f:
+        f.write(b"X")
+    with pytest.raises(ValueError, match="not a corpus file"):
+        Corpus(path)
+
+
 def test_annotree():
     s = """
             (META (ID-CORPUS 43bf66f3-51c4-11e6-8438-04014c605401.10)